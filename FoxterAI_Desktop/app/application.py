@@ -14,6 +14,8 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 # Импорт конфигурации и сервисов
 from app.config import ConfigManager
 from core.services.license_service import LicenseService
+from core.services.task_executor import TaskExecutor
+from core.services.ui_dispatch import UIDispatcher
 from core.models.license import License
 from core.models.stats import Statistics
 
@@ -21,12 +23,15 @@ from core.models.stats import Statistics
 from app.mixins.connection_mixin import ConnectionMixin
 from app.mixins.license_mixin import LicenseMixin
 from app.mixins.ui_mixin import UIMixin
+from app.mixins.refresh_mixin import AutoRefreshMixin
+from app.mixins.live_mixin import LiveUpdatesMixin
 
 # Импорт диалогов
 from app.dialogs.create_dialog import CreateLicenseDialog
 from app.dialogs.edit_dialog import EditLicenseDialog
 from app.dialogs.extend_dialog import ExtendLicenseDialog
 from app.dialogs.details_dialog import LicenseDetailsDialog
+from app.dialogs.diagnostics_dialog import DiagnosticsDialog
 
 
 def get_config():
@@ -34,7 +39,8 @@ def get_config():
     return ConfigManager()
 
 
-class Application(ctk.CTk, ConnectionMixin, LicenseMixin, UIMixin):
+class Application(ctk.CTk, ConnectionMixin, LicenseMixin, UIMixin, AutoRefreshMixin,
+                  LiveUpdatesMixin):
     """
     Главный класс приложения с премиум дизайном
     Использует миксины для разделения логики
@@ -47,6 +53,12 @@ class Application(ctk.CTk, ConnectionMixin, LicenseMixin, UIMixin):
         # Конфигурация
         self.config = get_config()
         
+        # Очередь обновлений интерфейса и общий пул фоновых задач:
+        # результаты задач попадают в UI только через очередь
+        self.ui_queue = UIDispatcher(self.after)
+        self.ui_queue.start()
+        self.executor = TaskExecutor(self.ui_queue.post)
+        
         # Сервисный слой
         self.license_service = LicenseService()
         self._setup_service_callbacks()
@@ -65,6 +77,7 @@ class Application(ctk.CTk, ConnectionMixin, LicenseMixin, UIMixin):
         
         # Состояние
         self.is_loading = False
+        self.current_page = 0
         
         # Настройка окна
         self._setup_window()
@@ -72,6 +85,9 @@ class Application(ctk.CTk, ConnectionMixin, LicenseMixin, UIMixin):
         # Создание интерфейса
         self._build_ui()
         
+        # Снимок прошлого запуска - таблица не пустая, пока идёт подключение
+        self.show_cached_snapshot()
+        
         # Автоподключение при запуске
         self.after(500, self.connect_to_server)
     
@@ -102,10 +118,34 @@ class Application(ctk.CTk, ConnectionMixin, LicenseMixin, UIMixin):
         if dialog.result:
             self.extend_license(license, dialog.result)
     
+    def bulk_extend_dialog(self, licenses):
+        """Спросить срок и продлить выделенные лицензии"""
+        dialog = ctk.CTkInputDialog(
+            title="Массовое продление",
+            text=f"На сколько месяцев продлить {len(licenses)} лицензий?"
+        )
+        value = dialog.get_input()
+        if value is None:
+            return
+        
+        try:
+            months = int(value.strip())
+        except ValueError:
+            months = 0
+        if not 1 <= months <= 120:
+            self.show_notification("Массовое продление", "Укажите число месяцев от 1 до 120", "warning")
+            return
+        
+        self.bulk_extend_licenses(licenses, months)
+    
     def show_license_details(self, license):
         """Показать детали лицензии"""
         dialog = LicenseDetailsDialog(self, license)
         self.wait_window(dialog)
+    
+    def show_diagnostics(self, event=None):
+        """Показать метрики запросов к серверу"""
+        DiagnosticsDialog(self, self.license_service)
 
 
 # ==================== ТОЧКА ВХОДА ====================
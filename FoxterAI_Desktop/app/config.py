@@ -24,6 +24,10 @@ class ConfigManager:
         'APP': {
             'auto_refresh': '60',
             'items_per_page': '50',
+            'paged_mode': 'false',
+            'metrics_file': '',
+            'live_updates': 'true',
+            'snapshot_cache': 'cache/licenses_snapshot.db',
             'theme': 'dark',
             'window_width': '1400',
             'window_height': '800',
@@ -310,6 +314,15 @@ class ConfigManager:
         """
         return self.get('APP', 'items_per_page', 50)
     
+    def is_paged_mode(self) -> bool:
+        """
+        Загружать ли список лицензий постранично
+        
+        Returns:
+            bool: True если включён постраничный режим
+        """
+        return self.get('APP', 'paged_mode', False)
+    
     def get_language(self) -> str:
         """
         Получить язык интерфейса
@@ -7,6 +7,7 @@ from .create_dialog import CreateLicenseDialog
 from .edit_dialog import EditLicenseDialog
 from .extend_dialog import ExtendLicenseDialog
 from .details_dialog import LicenseDetailsDialog
+from .diagnostics_dialog import DiagnosticsDialog
 
 __all__ = [
     'CustomDialog',
@@ -15,5 +16,6 @@ __all__ = [
     'CreateLicenseDialog',
     'EditLicenseDialog',
     'ExtendLicenseDialog',
-    'LicenseDetailsDialog'
+    'LicenseDetailsDialog',
+    'DiagnosticsDialog'
 ]
\ No newline at end of file
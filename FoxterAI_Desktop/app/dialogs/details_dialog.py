@@ -15,6 +15,7 @@ import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
 from app.dialogs.base_dialog import CustomDialog
+from core.models.dates import parse_date
 from themes.dark_theme import DarkTheme
 
 
@@ -532,28 +533,20 @@ class LicenseDetailsDialog(CustomDialog):
         if not date_str or date_str in ['-', 'None', None, '']:
             return '-'
         
-        try:
-            # Пробуем разные форматы
-            formats = [
-                '%Y-%m-%d %H:%M:%S',
-                '%Y-%m-%dT%H:%M:%S.%fZ',
-                '%Y-%m-%dT%H:%M:%S',
-                '%Y-%m-%d',
-                '%d.%m.%Y %H:%M',
-                '%d.%m.%Y'
-            ]
-            
-            for fmt in formats:
-                try:
-                    dt = datetime.strptime(str(date_str), fmt)
-                    return dt.strftime('%d.%m.%Y %H:%M')
-                except:
-                    continue
-            
-            # Если не удалось распарсить, возвращаем как есть
-            return str(date_str)
-        except:
-            return str(date_str)
+        # Даты сервера (ISO) - общим разбором с кэшем
+        parsed = parse_date(date_str)
+        if parsed is not None:
+            return parsed.formatted
+        
+        # Уже отформатированная дата
+        for fmt in ('%d.%m.%Y %H:%M', '%d.%m.%Y'):
+            try:
+                return datetime.strptime(str(date_str), fmt).strftime('%d.%m.%Y %H:%M')
+            except ValueError:
+                continue
+        
+        # Если не удалось распарсить, возвращаем как есть
+        return str(date_str)
     
     def _format_balance(self, balance):
         """Форматирование баланса"""
@@ -604,7 +597,7 @@ class LicenseDetailsDialog(CustomDialog):
                 # Можно добавить визуальную индикацию
                 if hasattr(self.master, 'set_status'):
                     self.master.set_status("📋 Ключ скопирован в буфер обмена", "success")
-                    
+            
             except Exception as e:
                 print(f"❌ Ошибка копирования: {e}")
     
@@ -638,7 +631,7 @@ class LicenseDetailsDialog(CustomDialog):
                 
                 if hasattr(self.master, 'set_status'):
                     self.master.set_status(f"✅ Экспортировано в {filename}", "success")
-                    
+        
         except Exception as e:
             print(f"❌ Ошибка экспорта: {e}")
             
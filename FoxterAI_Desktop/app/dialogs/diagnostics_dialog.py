@@ -0,0 +1,196 @@
+"""
+Диалог диагностики: задержки и объём запросов к серверу по эндпоинтам
+"""
+
+import customtkinter as ctk
+from datetime import datetime
+from tkinter import filedialog
+from typing import Any, Dict
+import sys
+import os
+
+# Добавляем путь к корню проекта
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from app.dialogs.base_dialog import CustomDialog
+from themes.dark_theme import DarkTheme
+
+
+class DiagnosticsDialog(CustomDialog):
+    """Сводка метрик LicenseService.metrics() с автообновлением"""
+    
+    # Период автообновления, мс
+    REFRESH_MS = 2000
+    
+    def __init__(self, parent, license_service):
+        """
+        Инициализация диалога
+        
+        Args:
+            parent: Родительское окно
+            license_service: Сервис лицензий (источник метрик)
+        """
+        self.license_service = license_service
+        self._refresh_job = None
+        
+        super().__init__(parent, "📈 Диагностика", 900, 560)
+        self.resizable(True, True)
+        
+        self._create_ui()
+        self._refresh()
+    
+    def _create_ui(self):
+        """Создание интерфейса"""
+        main_frame = ctk.CTkFrame(self, fg_color=DarkTheme.BG_SECONDARY)
+        main_frame.pack(fill='both', expand=True, padx=20, pady=20)
+        
+        self.summary_label = ctk.CTkLabel(
+            main_frame,
+            text="",
+            font=(DarkTheme.FONT_FAMILY, 12),
+            text_color=DarkTheme.TEXT_SECONDARY,
+            anchor='w'
+        )
+        self.summary_label.pack(fill='x', padx=15, pady=(15, 5))
+        
+        self.text = ctk.CTkTextbox(
+            main_frame,
+            fg_color=DarkTheme.BG_TERTIARY,
+            text_color=DarkTheme.TEXT_PRIMARY,
+            font=(DarkTheme.FONT_FAMILY_MONO, 11),
+            corner_radius=8,
+            wrap='none'
+        )
+        self.text.pack(fill='both', expand=True, padx=15, pady=5)
+        
+        button_frame = ctk.CTkFrame(main_frame, fg_color='transparent')
+        button_frame.pack(fill='x', padx=15, pady=(10, 15))
+        
+        ctk.CTkButton(
+            button_frame,
+            text="Закрыть",
+            width=120,
+            height=35,
+            fg_color=DarkTheme.BUTTON_SECONDARY,
+            hover_color=DarkTheme.BUTTON_SECONDARY_HOVER,
+            font=(DarkTheme.FONT_FAMILY, 12),
+            command=self.on_closing
+        ).pack(side='right')
+        
+        ctk.CTkButton(
+            button_frame,
+            text="💾 OpenMetrics",
+            width=140,
+            height=35,
+            fg_color=DarkTheme.BUTTON_SECONDARY,
+            hover_color=DarkTheme.BUTTON_SECONDARY_HOVER,
+            font=(DarkTheme.FONT_FAMILY, 12),
+            command=self._export_openmetrics
+        ).pack(side='right', padx=(0, 10))
+        
+        ctk.CTkButton(
+            button_frame,
+            text="🔄 Обновить",
+            width=120,
+            height=35,
+            fg_color=DarkTheme.BUTTON_PRIMARY,
+            hover_color=DarkTheme.BUTTON_PRIMARY_HOVER,
+            font=(DarkTheme.FONT_FAMILY, 12),
+            command=self._refresh
+        ).pack(side='left')
+    
+    # ==================== ДАННЫЕ ====================
+    
+    def _refresh(self):
+        """Перечитать метрики и запланировать следующее обновление"""
+        if self._refresh_job:
+            self.after_cancel(self._refresh_job)
+        
+        metrics = self.license_service.metrics()
+        self.summary_label.configure(text=self._format_summary(metrics))
+        
+        self.text.configure(state='normal')
+        self.text.delete('1.0', 'end')
+        self.text.insert('1.0', self._format_metrics(metrics))
+        self.text.configure(state='disabled')
+        
+        self._refresh_job = self.after(self.REFRESH_MS, self._refresh)
+    
+    @staticmethod
+    def _format_summary(metrics: Dict[str, Any]) -> str:
+        """Строка с общим состоянием"""
+        cache = metrics.get('cache') or {}
+        since = metrics.get('since')
+        since_text = datetime.fromtimestamp(since).strftime('%H:%M:%S') if since else '-'
+        live = metrics.get('live')
+        live_text = (f"События: {live['state']}, {live['received']} получено, "
+                     f"{live['coalesced']} объединено   •   " if live else '')
+        return (f"Лицензий: {metrics.get('licenses', 0)}   •   "
+                f"Предохранитель: {metrics.get('circuit') or '-'}   •   "
+                f"Кэш: {cache.get('hit_rate', 0) * 100:.0f}% попаданий   •   "
+                f"{live_text}С {since_text}")
+    
+    @staticmethod
+    def _format_bytes(value: int) -> str:
+        """Размер в читаемом виде"""
+        for unit in ('Б', 'КБ', 'МБ'):
+            if value < 1024:
+                return f"{value:.0f} {unit}"
+            value /= 1024
+        return f"{value:.1f} ГБ"
+    
+    def _format_metrics(self, metrics: Dict[str, Any]) -> str:
+        """Таблицы эндпоинтов и этапов обработки"""
+        lines = [
+            f"{'Эндпоинт':<38}{'Запр.':>7}{'Ошиб.':>7}{'Получено':>11}{'Отпр.':>9}"
+            f"{'p50':>9}{'p95':>9}{'p99':>9}",
+            '-' * 99
+        ]
+        for name, stats in metrics.get('endpoints', {}).items():
+            lines.append(
+                f"{name[:37]:<38}{stats['count']:>7}{stats['errors']:>7}"
+                f"{self._format_bytes(stats['bytes_in']):>11}{self._format_bytes(stats['bytes_out']):>9}"
+                f"{stats['p50_ms']:>7.0f}мс{stats['p95_ms']:>7.0f}мс{stats['p99_ms']:>7.0f}мс"
+            )
+        if not metrics.get('endpoints'):
+            lines.append("Запросов ещё не было")
+        
+        lines += [
+            '',
+            f"{'Этап':<10}{'Эндпоинт':<28}{'Раз':>7}{'Сред.':>11}{'p50':>9}{'p95':>9}{'p99':>9}",
+            '-' * 83
+        ]
+        for stage, endpoints in metrics.get('stages', {}).items():
+            for name, stats in endpoints.items():
+                lines.append(
+                    f"{stage:<10}{name[:27]:<28}{stats['count']:>7}{stats['avg_ms']:>9.1f}мс"
+                    f"{stats['p50_ms']:>7.0f}мс{stats['p95_ms']:>7.0f}мс{stats['p99_ms']:>7.0f}мс"
+                )
+        
+        search = metrics.get('search') or {}
+        if any(m.get('count') for m in search.values()):
+            lines += ['', 'Поиск:']
+            for path, stats in search.items():
+                lines.append(f"  {path:<8} {stats['count']:>6} раз, в среднем {stats['avg_ms']:.1f} мс, "
+                             f"максимум {stats['max_ms']:.1f} мс")
+        
+        return '\n'.join(lines)
+    
+    def _export_openmetrics(self):
+        """Сохранить метрики в файл OpenMetrics"""
+        path = filedialog.asksaveasfilename(
+            parent=self,
+            title="Сохранить метрики",
+            defaultextension='.prom',
+            initialfile=f"foxterai_metrics_{datetime.now():%Y%m%d_%H%M%S}.prom",
+            filetypes=[('OpenMetrics', '*.prom'), ('Текст', '*.txt'), ('Все файлы', '*.*')]
+        )
+        if path and self.license_service.dump_metrics(path):
+            self.summary_label.configure(text=f"💾 Метрики сохранены: {path}")
+    
+    def on_closing(self):
+        """Остановить автообновление и закрыть"""
+        if self._refresh_job:
+            self.after_cancel(self._refresh_job)
+            self._refresh_job = None
+        super().on_closing()
\ No newline at end of file
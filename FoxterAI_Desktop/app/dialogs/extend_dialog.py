@@ -5,8 +5,9 @@
 
 import customtkinter as ctk
 import tkinter as tk
-from datetime import datetime, timedelta
+from datetime import timedelta
 from app.dialogs.base_dialog import CustomDialog
+from core.models.dates import parse_datetime, utc_now
 from themes.dark_theme import DarkTheme
 
 
@@ -129,8 +130,8 @@ class ExtendLicenseDialog(CustomDialog):
         expiry_date = self.license_data.get('expiry_date', 'Не установлена')
         if expiry_date and expiry_date != 'Не установлена':
             try:
-                exp_dt = datetime.fromisoformat(expiry_date.replace('Z', '+00:00'))
-                days_left = (exp_dt - datetime.now()).days
+                exp_dt = parse_datetime(expiry_date)
+                days_left = (exp_dt - utc_now()).days
                 
                 if days_left > 0:
                     expiry_text = f"{expiry_date[:10]} (осталось {days_left} дн.)"
@@ -262,14 +263,14 @@ class ExtendLicenseDialog(CustomDialog):
         current_expiry = self.license_data.get('expiry_date')
         if current_expiry:
             try:
-                base_date = datetime.fromisoformat(current_expiry.replace('Z', '+00:00'))
+                base_date = parse_datetime(current_expiry) or utc_now()
                 # Если лицензия истекла, продлеваем от сегодня
-                if base_date < datetime.now():
-                    base_date = datetime.now()
+                if base_date < utc_now():
+                    base_date = utc_now()
             except:
-                base_date = datetime.now()
+                base_date = utc_now()
         else:
-            base_date = datetime.now()
+            base_date = utc_now()
         
         # Вычисляем новую дату
         new_date = base_date + timedelta(days=months * 30)
@@ -5,9 +5,13 @@
 from .connection_mixin import ConnectionMixin
 from .license_mixin import LicenseMixin
 from .ui_mixin import UIMixin
+from .refresh_mixin import AutoRefreshMixin
+from .live_mixin import LiveUpdatesMixin
 
 __all__ = [
     'ConnectionMixin',
     'LicenseMixin',
-    'UIMixin'
+    'UIMixin',
+    'AutoRefreshMixin',
+    'LiveUpdatesMixin'
 ]
\ No newline at end of file
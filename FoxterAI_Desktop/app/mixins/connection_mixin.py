@@ -4,9 +4,10 @@
 ИСПРАВЛЕНО: update_licenses заменен на load_licenses
 """
 
-import threading
 from typing import List, Dict
 
+from core.services.task_executor import CancellationToken
+
 
 class ConnectionMixin:
     """Методы для управления подключением к серверу лицензий"""
@@ -28,48 +29,89 @@ class ConnectionMixin:
         if hasattr(self, '_enable_controls'):
             self._enable_controls(False)
         
-        # Запускаем подключение в отдельном потоке
-        thread = threading.Thread(target=self._connect_thread)
-        thread.daemon = True
-        thread.start()
-    
-    def _connect_thread(self):
-        """Поток подключения к серверу"""
-        try:
-            # Пытаемся подключиться
-            result = self.license_service.connect()
-            
-            # Передаем результат в главный поток
-            self.after(0, self._handle_connection_result, result)
-            
-        except Exception as e:
-            print(f"❌ Ошибка при подключении: {e}")
-            self.after(0, self._handle_connection_error, str(e))
+        # Результат прежней попытки (переподключение) уже не нужен
+        previous = getattr(self, '_connect_token', None)
+        if previous is not None:
+            previous.cancel()
+        self._connect_token = CancellationToken()
+        
+        # Подключение и первая загрузка списка - одной задачей чтения
+        self.executor.submit(self.license_service.connect_and_load,
+                             token=self._connect_token,
+                             on_done=self._handle_connection_result,
+                             on_error=lambda e: self._handle_connection_error(str(e)))
     
-    def _handle_connection_result(self, success: bool):
-        """Обработка результата подключения"""
+    def _handle_connection_result(self, result):
+        """
+        Обработка результата подключения
+        
+        Args:
+            result: bool или {'connected': bool, 'licenses': [...] | None,
+                    'load_error': str | None} от connect_and_load
+        """
+        if isinstance(result, dict):
+            success, licenses = result.get('connected', False), result.get('licenses')
+            load_error = result.get('load_error')
+        else:
+            success, licenses, load_error = result, None, None
+        
         if success:
             print("✅ Подключение успешно!")
-            self.set_status("✅ Подключен к серверу", "success")
-            
-            # Включаем элементы управления
-            if hasattr(self, '_enable_controls'):
-                self._enable_controls(True)
+            self._show_connected()
             
-            # Обновляем индикатор в заголовке
-            if hasattr(self, 'header') and self.header:
-                self.header.set_connection_status(True)
-            
-            # Автоматически загружаем лицензии после подключения
-            if hasattr(self, 'load_licenses'):
+            stale = getattr(self, '_stale_since', None)
+            if load_error:
+                # Список не получен - снимок сервером не подтверждён,
+                # отметка устаревших данных остаётся до следующей загрузки
+                self._handle_connect_load_error(load_error)
+            elif stale and licenses is not None and \
+                    self.license_service.content_hash == getattr(self, '_rendered_hash', None):
+                # Сервер подтвердил сохранённый снимок - перерисовка не нужна
+                self._stale_since = None
+                self.set_status(f"✅ Данные актуальны: {len(licenses)} лицензий", "success")
+            elif licenses is not None and hasattr(self, '_handle_licenses_loaded'):
+                # Список уже получен при подключении - второй раз не грузим
+                self._handle_licenses_loaded(licenses)
+            elif hasattr(self, 'load_licenses'):
                 self.load_licenses()
+            
+            if hasattr(self, 'start_auto_refresh'):
+                self.start_auto_refresh()
+            if hasattr(self, 'start_live_updates'):
+                self.start_live_updates()
+        else:
+            error = getattr(self.license_service, 'last_error', None)
+            self._handle_connection_error(error or "Не удалось подключиться к серверу")
+    
+    def _handle_connect_load_error(self, error: str):
+        """Подключение есть, а первая загрузка списка не удалась"""
+        print(f"⚠️ Список при подключении не загружен: {error}")
+        if getattr(self, '_stale_since', None):
+            self.set_status(f"⚠️ {error} (показаны данные от {self._stale_text()})", "warning")
+        elif hasattr(self, '_handle_licenses_error'):
+            self._handle_licenses_error(error)
         else:
-            self._handle_connection_error("Не удалось подключиться к серверу")
+            self.set_status(f"❌ Ошибка загрузки: {error}", "error")
+    
+    def _show_connected(self):
+        """Показать состояние «подключено»"""
+        self.set_status("✅ Подключен к серверу", "success")
+        
+        # Включаем элементы управления
+        if hasattr(self, '_enable_controls'):
+            self._enable_controls(True)
+        
+        # Обновляем индикатор в заголовке
+        if hasattr(self, 'header') and self.header:
+            self.header.set_connection_status(True)
     
     def _handle_connection_error(self, error: str):
         """Обработка ошибки подключения"""
         print(f"❌ Ошибка подключения: {error}")
-        self.set_status(f"❌ Ошибка: {error}", "error")
+        if getattr(self, '_stale_since', None):
+            self.set_status(f"❌ Ошибка: {error} (показаны данные от {self._stale_text()})", "error")
+        else:
+            self.set_status(f"❌ Ошибка: {error}", "error")
         
         # Оставляем кнопки отключенными
         if hasattr(self, '_enable_controls'):
@@ -89,48 +131,34 @@ class ConnectionMixin:
     def _on_service_connected(self):
         """Callback при успешном подключении сервиса"""
         print("✅ Сервис подключен!")
-        self.after(0, lambda: self._handle_connection_result(True))
+        # Только индикатор: загрузку списка запускает тот, кто подключался
+        self.executor.call_in_ui(self._show_connected, key='connection')
     
     def _on_service_disconnected(self):
         """Callback при отключении сервиса"""
         print("⚠️ Сервис отключен")
-        self.after(0, lambda: self.set_status("⚠️ Отключен от сервера", "warning"))
+        self.executor.call_in_ui(self._show_disconnected, key='connection')
+    
+    def _show_disconnected(self):
+        """Показать состояние «отключено»"""
+        self.set_status("⚠️ Отключен от сервера", "warning")
         
         # Обновляем индикатор
         if hasattr(self, 'header') and self.header:
             self.header.set_connection_status(False)
     
     def _on_licenses_loaded(self, licenses: List[Dict]):
-        """Callback при загрузке лицензий от сервиса"""
+        """Callback при загрузке лицензий от сервиса (из фонового потока)"""
         print(f"📦 Получено лицензий от сервиса: {len(licenses) if licenses else 0}")
         
-        # Сохраняем лицензии
-        self.licenses = licenses if licenses else []
-        self.filtered_licenses = self.licenses.copy()
-        
-        # Обновляем таблицу - ИСПРАВЛЕНО: используем load_licenses вместо update_licenses
-        if hasattr(self, 'license_table') and self.license_table:
-            self.license_table.load_licenses(self.filtered_licenses)
-        
-        # Обновляем статистику
-        if hasattr(self, 'update_statistics'):
-            self.update_statistics()
-        
-        # Обновляем счетчик в UI
-        if hasattr(self, '_update_license_count'):
-            self._update_license_count()
-        
-        # Статус
-        count = len(self.licenses)
-        if count > 0:
-            self.set_status(f"✅ Загружено {count} лицензий", "success")
-        else:
-            self.set_status("ℹ️ Нет лицензий", "info")
+        # Тот же список приходит и результатом загрузки - ключ общий,
+        # отрисовка одна (см. _handle_licenses_loaded)
+        self.executor.call_in_ui(self._handle_licenses_loaded, licenses, key='licenses')
     
     def _on_service_error(self, error: str):
         """Callback при ошибке в сервисе"""
         print(f"❌ Ошибка сервиса: {error}")
-        self.after(0, lambda: self.set_status(f"❌ Ошибка: {error}", "error"))
+        self.executor.call_in_ui(self.set_status, f"❌ Ошибка: {error}", "error")
     
     def _setup_service_callbacks(self):
         """Настройка callback функций для сервиса"""
@@ -139,7 +167,8 @@ class ConnectionMixin:
                 on_connected=self._on_service_connected,
                 on_disconnected=self._on_service_disconnected,
                 on_licenses_loaded=self._on_licenses_loaded,
-                on_error=self._on_service_error
+                on_error=self._on_service_error,
+                on_licenses_batch=getattr(self, '_on_licenses_batch', None)
             )
         
         # Альтернативный способ установки callbacks
@@ -147,6 +176,7 @@ class ConnectionMixin:
         self.license_service.on_disconnected = self._on_service_disconnected
         self.license_service.on_licenses_loaded = self._on_licenses_loaded
         self.license_service.on_error = self._on_service_error
+        self.license_service.on_licenses_batch = getattr(self, '_on_licenses_batch', None)
     
     def _enable_controls(self, enabled: bool):
         """Включить/выключить элементы управления"""
@@ -165,13 +195,18 @@ class ConnectionMixin:
     def reconnect(self):
         """Переподключиться к серверу"""
         print("🔄 Переподключение к серверу...")
+        
+        # Пользователь явно просит попробовать - не ждём таймаут предохранителя
+        if hasattr(self, 'license_service') and hasattr(self.license_service, 'reset_circuit'):
+            self.license_service.reset_circuit()
+        
         self.connect_to_server()
     
     def disconnect(self):
         """Отключиться от сервера"""
         if hasattr(self, 'license_service'):
             self.license_service.disconnect()
-            
+        
         # Обновляем UI
         if hasattr(self, 'header') and self.header:
             self.header.set_connection_status(False)
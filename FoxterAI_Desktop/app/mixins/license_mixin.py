@@ -4,13 +4,15 @@
 ИСПРАВЛЕНО: update_licenses заменен на load_licenses
 """
 
-import threading
 from tkinter import filedialog, messagebox
 from typing import List, Dict, Any
 from datetime import datetime
 import pandas as pd
 import customtkinter as ctk
 
+from core.models.stats import panel_statistics
+from core.services.task_executor import CancellationToken
+
 
 class LicenseMixin:
     """Методы для работы с лицензиями"""
@@ -32,48 +34,66 @@ class LicenseMixin:
             # После подключения load_licenses будет вызван автоматически
             return
         
+        # Постраничный режим: грузим только видимую страницу
+        if self.license_service.paged_mode:
+            self.load_page(getattr(self, 'current_page', 0))
+            return
+        
+        # Чтение - в очереди 'io'. Одновременные вызовы сервис сводит в
+        # один запрос; результат нужен только последнему из них
+        print("📡 Запрос лицензий с сервера...")
+        previous = getattr(self, '_licenses_token', None)
+        if previous is not None:
+            previous.cancel()
+        self._licenses_token = CancellationToken()
+        
         self.set_status("⏳ Загрузка лицензий...", "loading")
         self.show_loading(True)
-        
-        # Запускаем в отдельном потоке
-        thread = threading.Thread(target=self._load_licenses_thread)
-        thread.daemon = True
-        thread.start()
-    
-    def _load_licenses_thread(self):
-        """Поток загрузки лицензий"""
-        try:
-            print("📡 Запрос лицензий с сервера...")
-            
-            # Получаем лицензии через сервис
-            licenses = self.license_service.get_licenses()
-            
-            print(f"✅ Получено лицензий: {len(licenses) if licenses else 0}")
-            
-            # Передаем результат в главный поток
-            self.after(0, self._handle_licenses_loaded, licenses)
-            
-        except Exception as e:
-            print(f"❌ Ошибка загрузки лицензий: {e}")
-            self.after(0, self._handle_licenses_error, str(e))
+        self.executor.submit(self.license_service.get_licenses,
+                             token=self._licenses_token,
+                             on_done=self._handle_licenses_loaded,
+                             on_error=lambda e: self._handle_licenses_error(str(e)),
+                             key='licenses')
     
     def _handle_licenses_loaded(self, licenses: List[Dict]):
-        """Обработка загруженных лицензий"""
-        print(f"🔄 Обработка {len(licenses) if licenses else 0} лицензий...")
+        """
+        Обработка загруженных лицензий
         
+        Одна загрузка доставляет список дважды - колбэком сервиса
+        on_licenses_loaded и результатом Future. Таблица рисуется один раз
+        на список: уже показанный (и не дорисовываемый потоком) пропускается.
+        """
         self.show_loading(False)
         
         # Сохраняем лицензии
         if licenses is None:
             licenses = []
         
+        table = getattr(self, 'license_table', None)
+        if licenses is getattr(self, '_rendered_licenses', None) and not getattr(table, '_streaming', False):
+            return
+        
+        print(f"🔄 Обработка {len(licenses)} лицензий...")
+        self._rendered_licenses = licenses
         self.licenses = licenses
         self.filtered_licenses = licenses.copy()
         
+        # Что сейчас показано (автообновление сравнивает с новым хэшем)
+        self._rendered_hash = getattr(self.license_service, 'content_hash', None)
+        self._stale_since = None
+        
+        # Столбцы списка, построенные сервисом в фоне (None - не строились)
+        service = getattr(self, 'license_service', None)
+        frame = service.peek_license_frame(licenses) if hasattr(service, 'peek_license_frame') else None
+        
         # ИСПРАВЛЕНО: используем load_licenses вместо update_licenses
         if hasattr(self, 'license_table') and self.license_table:
             print("📊 Обновляем таблицу лицензий...")
-            self.license_table.load_licenses(self.licenses)
+            self.license_table.load_licenses(self.licenses, frame=frame)
+        
+        # Подробная статистика (сроки, проблемы) - по тем же столбцам, в фоне
+        if frame is not None and hasattr(self, 'statistics'):
+            self.executor.submit(self.statistics.update, frame)
         
         # Вычисляем и обновляем статистику
         self._update_statistics_from_licenses()
@@ -89,8 +109,99 @@ class LicenseMixin:
         else:
             self.set_status("ℹ️ Нет лицензий", "info")
     
+    def show_cached_snapshot(self) -> bool:
+        """
+        Показать снимок прошлого запуска, пока идёт подключение
+        
+        Returns:
+            bool: True если снимок был и показан
+        """
+        cached = self.license_service.load_cached_snapshot()
+        if not cached:
+            self._stale_since = None
+            return False
+        
+        self._handle_licenses_loaded(cached['licenses'])
+        
+        # Данные устаревшие, пока сервер их не подтвердит
+        self._stale_since = cached['saved_at']
+        self.set_status(f"🕓 Сохранённые данные от {self._stale_text()}, обновление...", "warning")
+        return True
+    
+    def _stale_text(self) -> str:
+        """Время сохранения показанного снимка"""
+        return f"{datetime.fromtimestamp(self._stale_since):%d.%m.%Y %H:%M}"
+    
+    def load_page(self, page: int):
+        """Загрузка одной страницы лицензий (постраничный режим)"""
+        if page < 0:
+            return
+        
+        pages = getattr(self, 'page_count', None)
+        if pages is not None and page >= pages:
+            return
+        
+        self.set_status(f"⏳ Загрузка страницы {page + 1}...", "loading")
+        
+        # Показываем только последнюю запрошенную страницу
+        previous = getattr(self, '_page_token', None)
+        if previous is not None:
+            previous.cancel()
+        self._page_token = CancellationToken()
+    
+        self.executor.submit(self.license_service.get_page, page,
+                             token=self._page_token,
+                             on_done=self._handle_page_loaded,
+                             on_error=lambda e: self._handle_licenses_error(str(e)))
+    
+    def _handle_page_loaded(self, result: Dict):
+        """Показать загруженную страницу"""
+        if not result['success']:
+            self._handle_licenses_error(result.get('error') or 'Не удалось загрузить страницу')
+            return
+        
+        self.current_page = result['page']
+        self.page_count = result['pages']
+        self.licenses = result['licenses']
+        self._rendered_licenses = None
+        self.filtered_licenses = self.licenses.copy()
+        
+        if hasattr(self, 'license_table') and self.license_table:
+            self.license_table.load_licenses(self.licenses)
+        
+        if hasattr(self, 'page_label'):
+            self.page_label.configure(text=f"Стр. {result['page'] + 1} из {result['pages']}")
+        
+        if hasattr(self, 'license_count'):
+            self.license_count.configure(text=f"Всего: {result['total']}")
+        
+        # На странице только часть списка - цифры панели из агрегата сервера
+        self._update_statistics_from_licenses()
+        
+        self.set_status(
+            f"✅ Страница {result['page'] + 1} из {result['pages']} ({result['total']} лицензий)",
+            "success"
+        )
+    
+    def _on_licenses_batch(self, batch: List[Dict], first: bool):
+        """Пачка лицензий при потоковой загрузке (из фонового потока)"""
+        self.executor.call_in_ui(self._append_licenses_batch, batch, first)
+    
+    def _append_licenses_batch(self, batch: List[Dict], first: bool):
+        """Показать пачку лицензий, не дожидаясь конца загрузки"""
+        if not (hasattr(self, 'license_table') and self.license_table):
+            return
+        
+        if first:
+            self.license_table.begin_stream()
+        self.license_table.append_licenses(batch)
+        
+        count = len(self.license_table.get_all_licenses())
+        self.set_status(f"⏳ Загружено {count} лицензий...", "loading")
+    
     def _handle_licenses_error(self, error: str):
         """Обработка ошибки загрузки"""
+        print(f"❌ Ошибка загрузки лицензий: {error}")
         self.show_loading(False)
         self.set_status(f"❌ Ошибка загрузки: {error}", "error")
         
@@ -101,27 +212,38 @@ class LicenseMixin:
         )
     
     def _update_statistics_from_licenses(self):
-        """Обновить статистику на основе загруженных лицензий"""
-        if not self.licenses:
-            stats = {'total': 0, 'active': 0, 'expired': 0, 'blocked': 0, 'inactive': 0, 'balance': 0}
-        else:
-            stats = {
-                'total': len(self.licenses),
-                'active': len([l for l in self.licenses if self._get_field(l, 'status') == 'active']),
-                'expired': len([l for l in self.licenses if self._get_field(l, 'status') == 'expired']),
-                'blocked': len([l for l in self.licenses if self._get_field(l, 'status') == 'blocked']),
-                'inactive': len([l for l in self.licenses if self._get_field(l, 'status') == 'created']),
-                'balance': sum([float(self._get_field(l, 'last_balance', 0)) for l in self.licenses 
-                               if self._get_field(l, 'account_type') == 'Real'])
-            }
-        
-        print(f"📊 Статистика: Всего={stats['total']}, Активных={stats['active']}, "
-              f"Истекших={stats['expired']}, Заблокированных={stats['blocked']}, "
-              f"Неактивных={stats['inactive']}, Баланс REAL=${stats['balance']:.2f}")
-        
-        # Обновляем UI
-        if hasattr(self, 'update_statistics'):
-            self.update_statistics(stats)
+        """
+        Обновить панель статистики
+        
+        Цифры берутся из агрегата сервера (/api/statistics), а не
+        пересчитываются по списку - в постраничном режиме и при потоковой
+        загрузке списка целиком на клиенте может и не быть.
+        """
+        if not hasattr(self, 'update_statistics'):
+            return
+        
+        service = getattr(self, 'license_service', None)
+        if service is None:
+            self._show_statistics(panel_statistics(self.licenses))
+            return
+        
+        self.executor.submit(service.get_panel_statistics,
+                             on_done=self._show_statistics,
+                             on_error=self._handle_statistics_error)
+    
+    def _handle_statistics_error(self, error: Exception):
+        """Статистика сервера не получена - считаем по загруженному списку"""
+        print(f"⚠️ Статистика сервера недоступна, считаем локально: {error}")
+        self._show_statistics(panel_statistics(self.licenses))
+    
+    def _show_statistics(self, stats: Dict[str, Any]):
+        """Вывести статистику в панель"""
+        print(f"📊 Статистика ({stats.get('source', 'local')}): Всего={stats['total']}, "
+              f"Активных={stats['active']}, Истекших={stats['expired']}, "
+              f"Заблокированных={stats['blocked']}, Неактивных={stats['inactive']}, "
+              f"Баланс REAL=${stats['balance']:.2f}")
+        
+        self.update_statistics(stats)
     
     def _get_field(self, obj, field_name, default=None):
         """Универсальное получение поля из объекта или словаря"""
@@ -137,20 +259,15 @@ class LicenseMixin:
         """Создание новой лицензии"""
         self.set_status("⏳ Создание лицензии...", "loading")
         
-        def create_thread():
-            try:
-                # Добавляем флаг universal если его нет
-                if 'universal' not in license_data:
-                    license_data['universal'] = True
-                    
-                result = self.license_service.create_license(license_data)
-                self.after(0, self._handle_create_result, result, license_data)
-            except Exception as e:
-                self.after(0, self._handle_create_error, str(e))
-        
-        thread = threading.Thread(target=create_thread)
-        thread.daemon = True
-        thread.start()
+        # Добавляем флаг universal если его нет
+        if 'universal' not in license_data:
+            license_data['universal'] = True
+                
+        self.executor.submit(
+            self.license_service.create_license, license_data, lane='write',
+            on_done=lambda result: self._handle_create_result(result, license_data),
+            on_error=lambda e: self._handle_create_error(str(e))
+        )
     
     def _handle_create_result(self, result: Dict, license_data: Dict):
         """Обработка результата создания лицензии"""
@@ -184,16 +301,11 @@ class LicenseMixin:
         """Редактирование лицензии"""
         self.set_status(f"⏳ Обновление лицензии...", "loading")
         
-        def edit_thread():
-            try:
-                success = self.license_service.update_license(license_key, updates)
-                self.after(0, self._handle_edit_result, success, license_key)
-            except Exception as e:
-                self.after(0, self._handle_edit_error, license_key, str(e))
-        
-        thread = threading.Thread(target=edit_thread)
-        thread.daemon = True
-        thread.start()
+        self.executor.submit(
+            self.license_service.update_license, license_key, updates, lane='write',
+            on_done=lambda success: self._handle_edit_result(success, license_key),
+            on_error=lambda e: self._handle_edit_error(license_key, str(e))
+        )
     
     def _handle_edit_result(self, success: bool, license_key: str):
         """Обработка результата редактирования"""
@@ -234,16 +346,11 @@ class LicenseMixin:
         
         self.set_status("⏳ Удаление лицензии...", "loading")
         
-        def delete_thread():
-            try:
-                success = self.license_service.delete_license(key)
-                self.after(0, self._handle_delete_result, success, key)
-            except Exception as e:
-                self.after(0, self._handle_delete_error, key, str(e))
-        
-        thread = threading.Thread(target=delete_thread)
-        thread.daemon = True
-        thread.start()
+        self.executor.submit(
+            self.license_service.delete_license, key, lane='write',
+            on_done=lambda success: self._handle_delete_result(success, key),
+            on_error=lambda e: self._handle_delete_error(key, str(e))
+        )
     
     def _handle_delete_result(self, success: bool, key: str):
         """Обработка результата удаления"""
@@ -273,16 +380,11 @@ class LicenseMixin:
         key = self._get_field(license, 'license_key', 'Unknown')
         self.set_status(f"⏳ Продление лицензии...", "loading")
         
-        def extend_thread():
-            try:
-                success = self.license_service.extend_license(key, months)
-                self.after(0, self._handle_extend_result, success, key, months)
-            except Exception as e:
-                self.after(0, self._handle_extend_error, key, str(e))
-        
-        thread = threading.Thread(target=extend_thread)
-        thread.daemon = True
-        thread.start()
+        self.executor.submit(
+            self.license_service.extend_license, key, months, lane='write',
+            on_done=lambda success: self._handle_extend_result(success, key, months),
+            on_error=lambda e: self._handle_extend_error(key, str(e))
+        )
     
     def _handle_extend_result(self, success: bool, key: str, months: int):
         """Обработка результата продления"""
@@ -330,16 +432,13 @@ class LicenseMixin:
         
         self.set_status(f"⏳ Изменение статуса...", "loading")
         
-        def block_thread():
-            try:
-                success = self.license_service.block_license(key, not is_blocked)
-                self.after(0, self._handle_block_result, success, key, action)
-            except Exception as e:
-                self.after(0, self._handle_block_error, key, str(e))
-        
-        thread = threading.Thread(target=block_thread)
-        thread.daemon = True
-        thread.start()
+        service = self.license_service
+        operation = service.unblock_license if is_blocked else service.block_license
+        self.executor.submit(
+            operation, key, lane='write',
+            on_done=lambda success: self._handle_block_result(success, key, action),
+            on_error=lambda e: self._handle_block_error(key, str(e))
+        )
     
     def _handle_block_result(self, success: bool, key: str, action: str):
         """Обработка результата блокировки"""
@@ -364,6 +463,144 @@ class LicenseMixin:
             "error"
         )
     
+    # ==================== МАССОВЫЕ ОПЕРАЦИИ ====================
+    
+    def bulk_block_licenses(self, licenses: List, block: bool = True):
+        """
+        Массовая блокировка/разблокировка лицензий
+        
+        Args:
+            licenses: Лицензии (объекты или словари)
+            block: True - заблокировать, False - разблокировать
+        """
+        keys = [self._get_field(lic, 'license_key') for lic in licenses]
+        keys = [k for k in keys if k]
+        if not keys:
+            return
+        
+        action = 'заблокировать' if block else 'разблокировать'
+        if not messagebox.askyesno(
+            "Подтверждение",
+            f"Вы уверены, что хотите {action} {len(keys)} лицензий?"
+        ):
+            return
+        
+        status = 'blocked' if block else 'active'
+        self._run_bulk_operation(
+            f"Изменение статуса ({len(keys)})",
+            lambda progress: self.license_service.bulk_set_status_async(keys, status, progress),
+            self._handle_bulk_status_result
+        )
+    
+    def bulk_extend_licenses(self, licenses: List, months: int):
+        """
+        Массовое продление лицензий
+        
+        Args:
+            licenses: Лицензии (объекты или словари)
+            months: Количество месяцев
+        """
+        keys = [self._get_field(lic, 'license_key') for lic in licenses]
+        keys = [k for k in keys if k]
+        if not keys:
+            return
+        
+        self._run_bulk_operation(
+            f"Продление ({len(keys)})",
+            lambda progress: self.license_service.bulk_extend_async(keys, months, progress),
+            self._handle_bulk_keys_result
+        )
+    
+    def bulk_delete_licenses(self, licenses: List):
+        """
+        Массовое удаление лицензий
+        
+        Args:
+            licenses: Лицензии (объекты или словари)
+        """
+        keys = [self._get_field(lic, 'license_key') for lic in licenses]
+        keys = [k for k in keys if k]
+        if not keys:
+            return
+        
+        if not messagebox.askyesno(
+            "Подтверждение удаления",
+            f"Вы уверены, что хотите удалить {len(keys)} лицензий?\n\nЭто действие необратимо!"
+        ):
+            return
+        
+        self._run_bulk_operation(
+            f"Удаление ({len(keys)})",
+            lambda progress: self.license_service.bulk_delete_async(keys, progress),
+            self._handle_bulk_keys_result
+        )
+    
+    def _run_bulk_operation(self, title: str, operation, on_result):
+        """
+        Выполнить массовую операцию в фоне с прогрессом в статусной строке
+        
+        Args:
+            title: Название операции для статуса
+            operation: operation(on_progress) -> Future сервиса (запросы идут
+                       в его фоновом цикле, потоки пула не ждут)
+            on_result: Обработчик результата в главном потоке
+        """
+        self.set_status(f"⏳ {title}...", "loading")
+        
+        # Прогресс частый - в очереди UI держим только последний
+        def progress(done, total):
+            self.executor.call_in_ui(self.set_status, f"⏳ {title}: {done}/{total}", "loading",
+                                     key='bulk-progress')
+        
+        self.executor.track(
+            operation(progress),
+            on_done=lambda result: on_result(title, result),
+            on_error=lambda e: self._handle_bulk_error(title, str(e))
+        )
+    
+    def _handle_bulk_status_result(self, title: str, result: Dict):
+        """Обработка результата массовой смены статуса"""
+        # Одна сверка с сервером на всю операцию
+        self.load_licenses()
+        
+        if result.get('success'):
+            self.set_status(f"✅ {title}: обновлено {result.get('updated', 0)}", "success")
+        else:
+            errors = '\n'.join(result.get('errors', []))
+            self._handle_bulk_error(title, errors or 'Неизвестная ошибка')
+    
+    def _handle_bulk_keys_result(self, title: str, results: Dict[str, Dict]):
+        """Обработка результата массовой операции по ключам"""
+        # Одна сверка с сервером на всю операцию
+        self.load_licenses()
+        
+        failed = {k: r for k, r in results.items() if not r.get('success')}
+        succeeded = len(results) - len(failed)
+        
+        if not failed:
+            self.set_status(f"✅ {title}: успешно {succeeded}", "success")
+            return
+        
+        details = '\n'.join(f"{k[:12]}...: {r.get('error')}" for k, r in list(failed.items())[:10])
+        if len(failed) > 10:
+            details += f"\n... и ещё {len(failed) - 10}"
+        
+        self.set_status(f"⚠️ {title}: успешно {succeeded}, ошибок {len(failed)}", "warning")
+        self.show_notification(
+            "Массовая операция завершена с ошибками",
+            f"Успешно: {succeeded}\nОшибок: {len(failed)}\n\n{details}",
+            "warning"
+        )
+    
+    def _handle_bulk_error(self, title: str, error: str):
+        """Обработка ошибки массовой операции"""
+        self.set_status(f"❌ {title}: {error}", "error")
+        self.show_notification(
+            "Ошибка массовой операции",
+            f"{title}:\n{error}",
+            "error"
+        )
+    
     def export_licenses(self):
         """Экспорт лицензий в файл"""
         if not self.licenses:
@@ -426,7 +663,7 @@ class LicenseMixin:
                 f"Экспортировано {len(self.licenses)} лицензий",
                 "success"
             )
-            
+        
         except Exception as e:
             self.set_status(f"❌ Ошибка экспорта: {str(e)}", "error")
             messagebox.showerror("Ошибка", f"Не удалось экспортировать:\n{str(e)}")
\ No newline at end of file
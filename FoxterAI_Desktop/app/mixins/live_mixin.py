@@ -0,0 +1,85 @@
+"""
+Миксин живых обновлений: события сервера применяются к таблице
+точечно и не чаще, чем UI успевает их отрисовать
+"""
+
+import time
+
+from core.api.events import EventStream
+
+
+class LiveUpdatesMixin:
+    """Применение событий сервера к списку лицензий"""
+    
+    # Не чаще одного применения за столько, мс
+    LIVE_FLUSH_MS = 250
+    
+    # Какую долю времени UI могут занимать живые обновления
+    LIVE_UI_SHARE = 0.2
+    
+    def start_live_updates(self):
+        """Подписаться на события (после успешного подключения)"""
+        self._live_flush_job = None
+        self._live_flush_delay = self.LIVE_FLUSH_MS
+        
+        service = getattr(self, 'license_service', None)
+        if service is None:
+            return
+        
+        # Колбэки приходят из потока чтения - передаём в главный поток
+        started = service.start_live_updates(
+            on_pending=lambda: self.executor.call_in_ui(self._schedule_live_flush, key='live-pending'),
+            on_state=lambda state: self.executor.call_in_ui(self._on_live_state, state, key='live-state')
+        )
+        if not started:
+            print("⏸️ Живые обновления отключены (APP.live_updates = false)")
+    
+    def stop_live_updates(self):
+        """Отписаться от событий"""
+        job = getattr(self, '_live_flush_job', None)
+        if job:
+            self.after_cancel(job)
+        self._live_flush_job = None
+        
+        service = getattr(self, 'license_service', None)
+        if service is not None:
+            service.stop_live_updates()
+    
+    def _on_live_state(self, state: str):
+        """Поток событий открыт - автообновление только сверяет данные"""
+        if hasattr(self, 'set_auto_refresh_live'):
+            self.set_auto_refresh_live(state == EventStream.CONNECTED)
+    
+    def _schedule_live_flush(self):
+        """Запланировать применение; события до него объединятся в буфере"""
+        if getattr(self, '_live_flush_job', None):
+            return
+        self._live_flush_job = self.after(self._live_flush_delay, self._flush_live_updates)
+    
+    def _flush_live_updates(self):
+        """Применить накопленные события (в главном потоке)"""
+        self._live_flush_job = None
+        table = getattr(self, 'license_table', None)
+        
+        # Идёт загрузка списка - события подождут в буфере
+        if getattr(self, 'is_loading', False) or getattr(table, '_streaming', False):
+            self._schedule_live_flush()
+            return
+        
+        started = time.perf_counter()
+        result = self.license_service.apply_live_updates()
+        
+        if result['resync']:
+            print("🔁 Живые обновления: нужна сверка со списком")
+            if hasattr(self, 'request_auto_refresh'):
+                self.request_auto_refresh()
+        
+        rows = result['licenses']
+        # При активном поиске таблица показывает результаты поиска - их не трогаем
+        searching = hasattr(self, 'search_entry') and self.search_entry.get().strip()
+        if rows and table is not None and not searching:
+            table.patch_rows(rows)
+        
+        # Чем дольше применение, тем реже: UI занят не больше LIVE_UI_SHARE
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        self._live_flush_delay = max(self.LIVE_FLUSH_MS, int(elapsed_ms / self.LIVE_UI_SHARE))
\ No newline at end of file
@@ -0,0 +1,179 @@
+"""
+Миксин фонового автообновления списка лицензий
+Интервал APP.auto_refresh, адаптивный по нагрузке и состоянию окна
+"""
+
+import time
+
+from core.services.refresh_scheduler import RefreshScheduler
+
+
+class AutoRefreshMixin:
+    """Периодическое обновление данных без участия пользователя"""
+    
+    # Минимальная пауза перед повторной проверкой (окно занято, идёт поиск), секунд
+    AUTO_REFRESH_RETRY = 5.0
+    
+    def start_auto_refresh(self):
+        """Запустить автообновление (после успешного подключения)"""
+        if getattr(self, '_auto_refresh', None) is None:
+            interval = self.config.get_auto_refresh_interval() if hasattr(self, 'config') else 0
+            try:
+                interval = float(interval)
+            except (TypeError, ValueError):
+                interval = 0
+            
+            self._auto_refresh = RefreshScheduler(interval)
+            self._auto_refresh_job = None
+            self._auto_refresh_running = False
+            self._auto_refresh_last = time.monotonic()
+            
+            if not self._auto_refresh.enabled:
+                print("⏸️ Автообновление отключено (APP.auto_refresh = 0)")
+                return
+            
+            # Фокус и сворачивание главного окна
+            self.bind('<FocusIn>', self._on_window_focus_change, add='+')
+            self.bind('<FocusOut>', self._on_window_focus_change, add='+')
+            self.bind('<Unmap>', self._on_window_unmap, add='+')
+            self.bind('<Map>', self._on_window_map, add='+')
+            
+            print(f"⏱️ Автообновление каждые {interval:.0f}с")
+        
+        self._schedule_auto_refresh()
+    
+    def stop_auto_refresh(self):
+        """Остановить автообновление"""
+        job = getattr(self, '_auto_refresh_job', None)
+        if job:
+            self.after_cancel(job)
+        self._auto_refresh_job = None
+    
+    def request_auto_refresh(self):
+        """Обновить вне расписания (например, поток событий потерял данные)"""
+        if getattr(self, '_auto_refresh', None) is None or self._auto_refresh_running:
+            return
+        self.stop_auto_refresh()
+        self._auto_refresh_tick()
+    
+    def set_auto_refresh_live(self, live: bool):
+        """Изменения приходят потоком событий - опрашивать реже"""
+        if getattr(self, '_auto_refresh', None) is None or self._auto_refresh.live == live:
+            return
+        self._auto_refresh.set_live(live)
+        if not self._auto_refresh_running and self._auto_refresh_job:
+            self._schedule_auto_refresh()
+    
+    def _schedule_auto_refresh(self):
+        """
+        Запланировать следующее обновление по текущей политике
+        
+        Задержка отсчитывается от прошлого обновления, поэтому
+        перепланирование (фокус, разворот окна) не откладывает его.
+        """
+        self.stop_auto_refresh()
+        
+        delay = self._auto_refresh.next_delay()
+        if delay is not None:
+            remaining = delay - (time.monotonic() - self._auto_refresh_last)
+            remaining = max(remaining, self.AUTO_REFRESH_RETRY)
+            self._auto_refresh_job = self.after(int(remaining * 1000), self._auto_refresh_tick)
+    
+    def _auto_refresh_tick(self):
+        """Плановое обновление"""
+        self._auto_refresh_job = None
+        
+        # Свёрнуто - ждём <Map>
+        if self.state() == 'iconic':
+            self._auto_refresh.set_paused(True)
+            return
+        
+        service = getattr(self, 'license_service', None)
+        busy = (
+            self._auto_refresh_running
+            or getattr(self, 'is_loading', False)
+            or service is None
+            or not service.is_connected
+            # Пользователь ищет - не подменяем результаты поиска
+            or (hasattr(self, 'search_entry') and self.search_entry.get().strip())
+        )
+        if busy:
+            self._schedule_auto_refresh()
+            return
+        
+        self._auto_refresh_last = time.monotonic()
+        
+        if service.paged_mode:
+            # Страница из кэша устарела - перечитываем видимую
+            service.invalidate_pages()
+            self.load_page(getattr(self, 'current_page', 0))
+            self._schedule_auto_refresh()
+            return
+        
+        self._auto_refresh_running = True
+        started = time.monotonic()
+        self.executor.submit(
+            service.get_licenses,
+            on_done=lambda licenses: self._on_auto_refresh_done(licenses, started),
+            on_error=lambda e: self._on_auto_refresh_done(None, started, e)
+        )
+    
+    def _on_auto_refresh_done(self, licenses, started: float, error: Exception = None):
+        """Результат планового обновления (в главном потоке)"""
+        self._auto_refresh_running = False
+        self._auto_refresh_last = time.monotonic()
+        elapsed = self._auto_refresh_last - started
+        service = self.license_service
+        
+        if error is not None:
+            print(f"⚠️ Ошибка автообновления: {error}")
+            ok = False
+        else:
+            ok = service.last_load_ok
+        
+        self._auto_refresh.record_result(ok, elapsed)
+        if self._auto_refresh.backing_off:
+            print(f"🐢 Автообновление замедлено: ошибок {self._auto_refresh.failures}, "
+                  f"последний ответ {elapsed:.1f}с")
+        
+        # Содержимое то же - таблицу не перерисовываем
+        if ok and service.content_hash != getattr(self, '_rendered_hash', None):
+            print("🔄 Автообновление: данные изменились")
+            self._handle_licenses_loaded(licenses)
+        
+        self._schedule_auto_refresh()
+    
+    # ==================== СОСТОЯНИЕ ОКНА ====================
+    
+    def _on_window_focus_change(self, event):
+        """Фокус перешёл - проверяем, осталось ли приложение активным"""
+        # События приходят и от дочерних виджетов, итог ясен после обработки
+        self.after_idle(self._update_window_focus)
+    
+    def _update_window_focus(self):
+        """В фокусе - обновляем чаще, без фокуса - обычный интервал"""
+        try:
+            focused = self.focus_displayof() is not None
+        except KeyError:
+            # Фокус у служебного окна Tk (выпадающий список) - окно активно
+            focused = True
+        
+        if focused == self._auto_refresh.focused:
+            return
+        
+        self._auto_refresh.set_focused(focused)
+        # Ускорение применяем сразу, замедление - со следующим циклом
+        if focused and not self._auto_refresh_running:
+            self._schedule_auto_refresh()
+    
+    def _on_window_unmap(self, event):
+        """Окно свёрнуто - пауза"""
+        if event.widget is self:
+            self._auto_refresh.set_paused(True)
+            self.stop_auto_refresh()
+    
+    def _on_window_map(self, event):
+        """Окно развёрнуто - продолжаем"""
+        if event.widget is self and self._auto_refresh.paused:
+            self._auto_refresh.set_paused(False)
+            self._schedule_auto_refresh()
\ No newline at end of file
@@ -4,6 +4,7 @@
 ПОЛНЫЙ ФАЙЛ ДЛЯ ЗАМЕНЫ: FoxterAI_Desktop/app/mixins/ui_mixin.py
 """
 
+import time
 import customtkinter as ctk
 from tkinter import filedialog, messagebox
 from datetime import datetime
@@ -17,10 +18,16 @@ from ui.components.license_table import LicenseTable
 # Импорт темы
 from themes.dark_theme import DarkTheme
 
+from core.models.stats import panel_statistics
+from core.services.task_executor import CancellationToken
+
 
 class UIMixin:
     """Методы для управления премиальным интерфейсом"""
     
+    # Пауза в наборе перед поиском на сервере, мс
+    SEARCH_DELAY_MS = 300
+    
     def _setup_window(self):
         """Настройка окна приложения с премиальным дизайном"""
         # Заголовок и размер
@@ -40,6 +47,10 @@ class UIMixin:
         # Обработчик закрытия
         self.protocol("WM_DELETE_WINDOW", self.on_closing)
         
+        # F12 - диагностика запросов к серверу
+        if hasattr(self, 'show_diagnostics'):
+            self.bind('<F12>', self.show_diagnostics)
+        
         # Стиль окна с угольно-черным фоном
         self.configure(fg_color=DarkTheme.CHARCOAL_BLACK)
     
@@ -64,7 +75,7 @@ class UIMixin:
         """Создание заголовка с изумрудно-золотыми акцентами"""
         self.header = HeaderPanel(
             self.main_container,
-            on_reconnect_callback=self.connect_to_server
+            on_reconnect_callback=self.reconnect
         )
         self.header.pack(fill='x', padx=10, pady=(10, 5))
         
@@ -137,6 +148,22 @@ class UIMixin:
         )
         self.export_btn.pack(side='left')
         
+        # Кнопка диагностики (задержки и объём запросов)
+        if hasattr(self, 'show_diagnostics'):
+            self.diagnostics_btn = ctk.CTkButton(
+                left_frame,
+                text="📈",
+                command=self.show_diagnostics,
+                fg_color=DarkTheme.BG_TERTIARY,
+                hover_color=DarkTheme.BG_HOVER,
+                text_color=DarkTheme.WARM_GRAY,
+                width=40,
+                height=35,
+                corner_radius=DarkTheme.RADIUS_NORMAL,
+                font=("Inter", 13)
+            )
+            self.diagnostics_btn.pack(side='left', padx=(10, 0))
+        
         # Правая часть - фильтры и поиск
         right_frame = ctk.CTkFrame(control_container, fg_color='transparent')
         right_frame.pack(side='right', fill='y', padx=15, pady=10)
@@ -209,10 +236,17 @@ class UIMixin:
         )
         self.license_count.pack(side='right')
         
+        # Переключатель страниц (только в постраничном режиме)
+        if getattr(self.license_service, 'paged_mode', False):
+            self._build_pager(table_header)
+        
         # Таблица с премиальным дизайном
         self.license_table = LicenseTable(table_container)
         self.license_table.pack(fill='both', expand=True, padx=15, pady=(5, 15))
         
+        # Фильтры и поиск по всему списку - через индекс сервиса
+        self.license_table.search_provider = getattr(self.license_service, 'search_keys', None)
+        
         # Устанавливаем callbacks для таблицы
         self.license_table.set_callbacks(
             select=self._on_license_select,
@@ -220,6 +254,39 @@ class UIMixin:
             context_menu=self._show_context_menu
         )
     
+    def _build_pager(self, parent):
+        """Кнопки переключения страниц"""
+        pager = ctk.CTkFrame(parent, fg_color='transparent')
+        pager.pack(side='right', padx=(0, 15))
+        
+        button_style = dict(
+            width=32,
+            height=26,
+            fg_color=DarkTheme.BG_TERTIARY,
+            hover_color=DarkTheme.COPPER_BRONZE,
+            text_color=DarkTheme.PURE_WHITE,
+            corner_radius=DarkTheme.RADIUS_NORMAL,
+            font=("Inter", 12, "bold")
+        )
+        
+        ctk.CTkButton(
+            pager, text="◀", command=lambda: self.load_page(self.current_page - 1),
+            **button_style
+        ).pack(side='left')
+        
+        self.page_label = ctk.CTkLabel(
+            pager,
+            text="Стр. 1",
+            font=("Inter", 12),
+            text_color=DarkTheme.WARM_GRAY
+        )
+        self.page_label.pack(side='left', padx=8)
+        
+        ctk.CTkButton(
+            pager, text="▶", command=lambda: self.load_page(self.current_page + 1),
+            **button_style
+        ).pack(side='left')
+    
     def _build_status_bar(self):
         """Создание статусной строки с градиентом"""
         status_container = ctk.CTkFrame(
@@ -259,9 +326,64 @@ class UIMixin:
     def _on_search(self, event):
         """Обработка поиска"""
         query = self.search_entry.get()
-        if self.license_table:
+        if not self.license_table:
+            return
+        
+        # Полный список уже загружен - фильтруем таблицу на месте
+        if self.license_service.can_search_locally() or not query.strip():
+            self._cancel_remote_search()
+            started = time.perf_counter()
             self.license_table.set_search(query)
+            self.license_service.record_search('local', started)
             self._update_license_count()
+            
+            if not query.strip() and getattr(self, '_showing_search_results', False):
+                self._showing_search_results = False
+                self.load_licenses()
+            return
+        
+        # Большие данные - спрашиваем сервер после паузы в наборе
+        self._cancel_remote_search()
+        self._search_timer = self.after(self.SEARCH_DELAY_MS, self._run_remote_search, query)
+    
+    def _cancel_remote_search(self):
+        """Отменить отложенный серверный поиск"""
+        timer = getattr(self, '_search_timer', None)
+        if timer:
+            self.after_cancel(timer)
+            self._search_timer = None
+    
+    def _run_remote_search(self, query: str):
+        """Поиск на сервере (предыдущий запрос отменяется)"""
+        self._search_timer = None
+        self.set_status(f"🔎 Поиск '{query}'...", "loading")
+        
+        # Запрос, вытесненный следующим, отменяется - не начатый не уйдёт
+        # на сервер, у начатого обработчики не вызываются
+        previous = getattr(self, '_search_token', None)
+        if previous is not None:
+            previous.cancel()
+        self._search_token = CancellationToken()
+        
+        self.executor.submit(
+            self.license_service.search, query,
+            token=self._search_token,
+            on_done=lambda results: self._show_search_results(query, results),
+            on_error=lambda e: self.set_status(f"❌ Ошибка поиска: {e}", "error")
+        )
+    
+    def _show_search_results(self, query: str, results: List[Dict]):
+        """Показать результаты серверного поиска"""
+        # Пока шёл запрос, пользователь мог изменить строку поиска
+        if self.search_entry.get() != query:
+            return
+        
+        self._showing_search_results = True
+        self._rendered_licenses = None
+        self.license_table.set_search('')
+        self.license_table.load_licenses(results)
+        self._update_license_count()
+        self.set_status(f"🔎 Найдено: {len(results)}", "success")
     
     def _on_license_select(self, license):
         """Обработка выбора лицензии"""
@@ -269,7 +391,9 @@ class UIMixin:
         pass
     
     def _show_context_menu(self, license, event):
-        """Показ контекстного меню для лицензии"""
+        """Показ контекстного меню для лицензии (или для выделенных)"""
+        selected = self.license_table.get_selected_licenses()
+        
         # Создаем премиальное контекстное меню
         menu = ctk.CTkToplevel(self)
         menu.overrideredirect(True)
@@ -278,16 +402,26 @@ class UIMixin:
         # Позиционирование
         x = self.winfo_pointerx()
         y = self.winfo_pointery()
-        menu.geometry(f"160x200+{x}+{y}")
         
-        # Пункты меню
-        menu_items = [
-            ("🔍 Детали", lambda: self.show_license_details(license)),
-            ("✏️ Редактировать", lambda: self.edit_license_dialog(license)),
-            ("⏰ Продлить", lambda: self.extend_license_dialog(license)),
-            ("🔒 Заблокировать", lambda: self.block_license(license)),
-            ("🗑️ Удалить", lambda: self.delete_license(license))
-        ]
+        # Пункты меню: несколько строк - массовые операции
+        if len(selected) > 1:
+            count = len(selected)
+            menu.geometry(f"220x170+{x}+{y}")
+            menu_items = [
+                (f"⏰ Продлить ({count})", lambda: self.bulk_extend_dialog(selected)),
+                (f"🔒 Заблокировать ({count})", lambda: self.bulk_block_licenses(selected, True)),
+                (f"🔓 Разблокировать ({count})", lambda: self.bulk_block_licenses(selected, False)),
+                (f"🗑️ Удалить ({count})", lambda: self.bulk_delete_licenses(selected))
+            ]
+        else:
+            menu.geometry(f"160x200+{x}+{y}")
+            menu_items = [
+                ("🔍 Детали", lambda: self.show_license_details(license)),
+                ("✏️ Редактировать", lambda: self.edit_license_dialog(license)),
+                ("⏰ Продлить", lambda: self.extend_license_dialog(license)),
+                ("🔒 Заблокировать", lambda: self.block_license(license)),
+                ("🗑️ Удалить", lambda: self.delete_license(license))
+            ]
         
         for text, command in menu_items:
             btn = ctk.CTkButton(
@@ -298,7 +432,7 @@ class UIMixin:
                 hover_color=DarkTheme.JADE_GREEN,
                 text_color=DarkTheme.PURE_WHITE,
                 anchor="w",
-                width=150,
+                width=210 if len(selected) > 1 else 150,
                 height=30,
                 font=("Inter", 11)
             )
@@ -313,50 +447,18 @@ class UIMixin:
     def update_statistics(self, stats: Dict[str, Any] = None):
         """Обновление статистики с анимацией"""
         if stats is None:
-            # Если статистика не передана, вычисляем из лицензий
+            # Статистика не передана - запрашиваем агрегат сервера
+            if hasattr(self, '_update_statistics_from_licenses'):
+                self._update_statistics_from_licenses()
+                return
             stats = self._calculate_statistics()
         
         if self.stats_panel:
             self.stats_panel.update_stats(stats)
     
     def _calculate_statistics(self) -> Dict[str, Any]:
-        """Вычислить статистику из списка лицензий"""
-        stats = {
-            'total': len(self.licenses),
-            'active': 0,
-            'expired': 0,
-            'blocked': 0,
-            'inactive': 0,
-            'balance': 0.0
-        }
-        
-        for license in self.licenses:
-            if hasattr(license, '__dict__'):
-                status = getattr(license, 'status', 'created')
-                balance = getattr(license, 'last_balance', 0)
-                account_type = getattr(license, 'account_type', 'Real')
-            else:
-                status = license.get('status', 'created')
-                balance = license.get('last_balance', 0)
-                account_type = license.get('account_type', 'Real')
-            
-            if status == 'active':
-                stats['active'] += 1
-            elif status == 'expired':
-                stats['expired'] += 1
-            elif status == 'blocked':
-                stats['blocked'] += 1
-            else:
-                stats['inactive'] += 1
-            
-            # Считаем баланс только для реальных счетов
-            if account_type == 'Real':
-                try:
-                    stats['balance'] += float(balance)
-                except:
-                    pass
-        
-        return stats
+        """Вычислить статистику из списка лицензий (без связи с сервером)"""
+        return panel_statistics(self.licenses)
     
     def _update_license_count(self):
         """Обновить счетчик лицензий"""
@@ -473,10 +575,24 @@ class UIMixin:
             self.config.set_window_size(width, height)
             self.config.save()
         
+        # Новые фоновые задачи не принимаем, начатые изменения дожидаемся
+        if hasattr(self, 'executor'):
+            self.executor.shutdown()
+        if hasattr(self, 'ui_queue'):
+            self.ui_queue.stop()
+        
+        # Останавливаем автообновление
+        if hasattr(self, 'stop_auto_refresh'):
+            self.stop_auto_refresh()
+        if hasattr(self, 'stop_live_updates'):
+            self.stop_live_updates()
+        
         # Отключаемся от сервера
         if hasattr(self, 'license_service') and self.license_service:
             if hasattr(self.license_service, 'disconnect'):
                 self.license_service.disconnect()
+            if hasattr(self.license_service, 'shutdown'):
+                self.license_service.shutdown()
         
         # Закрываем окно
         self.destroy()
@@ -6,9 +6,26 @@ API модули для FoxterAI License Manager
 from .base_client import BaseAPIClient
 from .licenses_api import LicensesAPI
 from .auth_api import AuthAPI
+from .async_client import AsyncAPIClient, EventLoopThread
+from .cache import ResponseCache
+from .metrics import MetricsRegistry
+from . import wire_format
+from .transport import (HTTPTransport, CircuitBreaker, CircuitOpenError, RetryPolicy,
+                        get_transport, release_transport)
 
 __all__ = [
     'BaseAPIClient',
     'LicensesAPI', 
-    'AuthAPI'
+    'AuthAPI',
+    'AsyncAPIClient',
+    'EventLoopThread',
+    'HTTPTransport',
+    'CircuitBreaker',
+    'CircuitOpenError',
+    'RetryPolicy',
+    'get_transport',
+    'release_transport',
+    'ResponseCache',
+    'MetricsRegistry',
+    'wire_format'
 ]
\ No newline at end of file
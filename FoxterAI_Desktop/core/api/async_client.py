@@ -0,0 +1,267 @@
+"""
+Асинхронный транспорт для API сервера лицензий
+Один фоновый поток с циклом asyncio и общий пул соединений
+"""
+
+import asyncio
+import functools
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
+
+
+class EventLoopThread:
+    """Фоновый поток с собственным циклом asyncio"""
+    
+    def __init__(self, name: str = 'FoxterAI-asyncio'):
+        """
+        Инициализация потока цикла событий
+        
+        Args:
+            name: Имя потока (для отладки)
+        """
+        self.name = name
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._ready = threading.Event()
+        self._lock = threading.Lock()
+    
+    def start(self):
+        """Запустить поток цикла (повторный вызов ничего не делает)"""
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return
+            
+            self._ready.clear()
+            self._thread = threading.Thread(target=self._run, name=self.name)
+            self._thread.daemon = True
+            self._thread.start()
+        
+        self._ready.wait()
+    
+    def _run(self):
+        """Тело потока - крутим цикл до остановки"""
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        self._ready.set()
+        
+        try:
+            self.loop.run_forever()
+        finally:
+            self.loop.close()
+    
+    @property
+    def is_running(self) -> bool:
+        """Работает ли цикл"""
+        return bool(self._thread and self._thread.is_alive() and self.loop)
+    
+    def submit(self, coro: Awaitable) -> Future:
+        """
+        Запланировать корутину в фоновом цикле
+        
+        Args:
+            coro: Корутина
+        
+        Returns:
+            Future: concurrent.futures.Future с результатом
+        """
+        self.start()
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+    
+    def stop(self, timeout: float = 2.0):
+        """
+        Остановить цикл и дождаться завершения потока
+        
+        Args:
+            timeout: Сколько ждать поток, секунд
+        """
+        with self._lock:
+            if not self.is_running:
+                return
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            thread = self._thread
+        
+        thread.join(timeout)
+
+
+class AsyncAPIClient:
+    """
+    Асинхронная обёртка над APIClient
+    
+    Повторяет его интерфейс корутинами. Блокирующие вызовы requests
+    выполняются в ограниченном пуле потоков, принадлежащем циклу, поверх
+    общего HTTPTransport - так параллельные запросы переиспользуют
+    keep-alive соединения из одного пула (его размер не меньше
+    max_concurrency).
+    """
+    
+    def __init__(self, api_client, max_concurrency: int = 8,
+                 loop_thread: Optional[EventLoopThread] = None):
+        """
+        Инициализация асинхронного клиента
+        
+        Args:
+            api_client: Синхронный APIClient (modules.api_client)
+            max_concurrency: Максимум одновременных запросов
+            loop_thread: Общий поток цикла (создаётся, если не передан)
+        """
+        self.api_client = api_client
+        self.max_concurrency = max(1, int(max_concurrency))
+        self.loop_thread = loop_thread or EventLoopThread()
+        
+        self._worker_threads = set()
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_concurrency,
+            thread_name_prefix='FoxterAI-http',
+            initializer=self._register_worker
+        )
+    
+    # ==================== ИНФРАСТРУКТУРА ====================
+    
+    def _register_worker(self):
+        """Запомнить поток пула (см. in_worker)"""
+        self._worker_threads.add(threading.get_ident())
+    
+    def in_worker(self) -> bool:
+        """
+        Выполняется ли код в потоке цикла или пула этого клиента
+        
+        Ждать отсюда результат submit() нельзя: ожидание займёт поток,
+        который нужен самой задаче.
+        """
+        ident = threading.get_ident()
+        thread = self.loop_thread._thread
+        return ident in self._worker_threads or (thread is not None and thread.ident == ident)
+    
+    async def call(self, func: Callable, *args, **kwargs) -> Any:
+        """Выполнить синхронный метод клиента в пуле потоков"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, functools.partial(func, *args, **kwargs)
+        )
+    
+    def submit(self, coro: Awaitable) -> Future:
+        """
+        Запустить корутину в фоновом цикле
+        
+        Args:
+            coro: Корутина этого клиента
+        
+        Returns:
+            Future: Результат для UI (add_done_callback / result)
+        """
+        return self.loop_thread.submit(coro)
+    
+    def run_sync(self, func: Callable, *args, **kwargs) -> Future:
+        """
+        Выполнить произвольную синхронную функцию через общий пул
+        
+        Args:
+            func: Функция
+        
+        Returns:
+            Future: Результат выполнения
+        """
+        return self.submit(self.call(func, *args, **kwargs))
+    
+    async def gather(self, **coros: Awaitable) -> Dict[str, Any]:
+        """
+        Выполнить именованные корутины параллельно
+        
+        Returns:
+            Dict: Результаты по именам (исключение вместо результата при ошибке)
+        """
+        names = list(coros.keys())
+        results = await asyncio.gather(*coros.values(), return_exceptions=True)
+        return dict(zip(names, results))
+    
+    async def map_bounded(self, func: Callable[[Any], Awaitable], items: Iterable,
+                          limit: Optional[int] = None,
+                          on_progress: Optional[Callable[[int, int, Any, Any], None]] = None
+                          ) -> List[Any]:
+        """
+        Применить корутину к элементам с ограничением параллельности
+        
+        Args:
+            func: Корутинная функция от одного элемента
+            items: Элементы
+            limit: Максимум одновременных вызовов
+            on_progress: Вызывается как on_progress(done, total, item, result)
+        
+        Returns:
+            List: Результаты в порядке элементов (исключения не пробрасываются)
+        """
+        items = list(items)
+        total = len(items)
+        semaphore = asyncio.Semaphore(limit or self.max_concurrency)
+        done = 0
+        
+        async def worker(item):
+            nonlocal done
+            async with semaphore:
+                try:
+                    result = await func(item)
+                except Exception as e:
+                    result = e
+            done += 1
+            if on_progress:
+                try:
+                    on_progress(done, total, item, result)
+                except Exception as e:
+                    print(f"⚠️ Ошибка в on_progress: {e}")
+            return result
+        
+        return await asyncio.gather(*(worker(item) for item in items))
+    
+    def close(self):
+        """Остановить пул потоков (поток цикла может быть общим)"""
+        self._executor.shutdown(wait=False)
+    
+    # ==================== МЕТОДЫ API ====================
+    
+    async def test_connection(self) -> bool:
+        """Проверить соединение с сервером"""
+        return await self.call(self.api_client.test_connection)
+    
+    async def get_licenses(self) -> List[Dict]:
+        """Получить список всех лицензий"""
+        return await self.call(self.api_client.get_licenses)
+    
+    async def get_licenses_delta(self, since: Optional[str] = None,
+                                 etag: Optional[str] = None,
+                                 last_modified: Optional[str] = None) -> Dict[str, Any]:
+        """Получить изменения списка лицензий"""
+        return await self.call(self.api_client.get_licenses_delta,
+                                since=since, etag=etag, last_modified=last_modified)
+    
+    async def get_statistics(self) -> Dict:
+        """Получить статистику по лицензиям"""
+        return await self.call(self.api_client.get_statistics)
+    
+    async def get_events(self, limit: int = 100) -> List[Dict]:
+        """Получить события"""
+        return await self.call(self.api_client.get_events, limit)
+    
+    async def create_license(self, **data) -> Dict:
+        """Создать новую лицензию"""
+        return await self.call(self.api_client.create_license, **data)
+    
+    async def update_license(self, license_key: str, **kwargs) -> Dict:
+        """Обновить данные лицензии"""
+        return await self.call(self.api_client.update_license, license_key, **kwargs)
+    
+    async def delete_license(self, license_key: str) -> Dict:
+        """Удалить лицензию"""
+        return await self.call(self.api_client.delete_license, license_key)
+    
+    async def block_license(self, license_key: str, reason: str = None) -> Dict:
+        """Заблокировать лицензию"""
+        return await self.call(self.api_client.block_license, license_key, reason)
+    
+    async def unblock_license(self, license_key: str) -> Dict:
+        """Разблокировать лицензию"""
+        return await self.call(self.api_client.unblock_license, license_key)
+    
+    async def extend_license(self, license_key: str, months: int) -> Dict:
+        """Продлить лицензию"""
+        return await self.call(self.api_client.extend_license, license_key, months)
\ No newline at end of file
@@ -3,6 +3,7 @@ API для аутентификации и проверки подключени
 ИСПРАВЛЕНО: правильная проверка подключения к серверу
 """
 
+import time
 from typing import Dict, Optional
 from .base_client import BaseAPIClient
 
@@ -18,10 +19,10 @@ class AuthAPI(BaseAPIClient):
             bool: True если сервер доступен и API ключ валиден
         """
         try:
-            # ИСПРАВЛЕНО: используем /api/licenses для проверки, так как / не существует
-            response = self.get('/api/licenses')
-            # Если получили ответ и он содержит success - значит подключение работает
-            return response.get('success', False)
+            # Сначала дешёвая проверка живости, ключ - только если сервер отвечает
+            if self.check_health().get('status') == 'error':
+                return False
+            return self.verify_api_key().get('valid', False)
         except Exception as e:
             print(f"[AuthAPI] Ошибка проверки подключения: {e}")
             return False
@@ -30,12 +31,14 @@ class AuthAPI(BaseAPIClient):
         """
         Проверить валидность API ключа
         
+        Используется агрегат /api/statistics - самый лёгкий эндпоинт с
+        авторизацией (список лицензий для проверки ключа не скачивается).
+        
         Returns:
             Dict: Информация о ключе и правах доступа
         """
         try:
-            # Используем запрос к лицензиям для проверки ключа
-            response = self.get('/api/licenses')
+            response = self.get('/api/statistics')
             if response.get('success'):
                 return {
                     'valid': True,
@@ -59,21 +62,26 @@ class AuthAPI(BaseAPIClient):
         Returns:
             Dict: Версия сервера и другая информация
         """
+        return self.cache.get_or_load(
+            'server_info', (), self._fetch_server_info,
+            should_cache=lambda info: 'error' not in info
+        )
+    
+    def _fetch_server_info(self) -> Dict:
+        """Запросить информацию о сервере (GET /api/version, без авторизации)"""
         try:
-            # Пробуем получить статистику как индикатор работы сервера
-            response = self.get('/api/statistics')
-            if response.get('success'):
-                stats = response.get('statistics', {})
+            response = self.get('/api/version')
+            version = response.get('версия', response.get('version'))
+            if version:
                 return {
-                    'version': '3.0',
+                    'version': version,
+                    'api_version': response.get('версия_api', response.get('api_version')),
                     'name': 'FoxterAI License Server',
-                    'uptime': 0,  # Сервер не предоставляет uptime
-                    'licenses_count': stats.get('total', 0)
+                    'features': response.get('функции', response.get('features', []))
                 }
             return {
-                'version': '3.0',
                 'name': 'FoxterAI License Server',
-                'error': 'Could not get statistics'
+                'error': 'Could not get version'
             }
         except Exception as e:
             return {
@@ -82,29 +90,26 @@ class AuthAPI(BaseAPIClient):
     
     def check_health(self) -> Dict:
         """
-        Проверить здоровье сервера
+        Проверить здоровье сервера (GET /health, без авторизации)
         
         Returns:
             Dict: Статус компонентов сервера
         """
         try:
-            # Проверяем доступность API через запрос лицензий
-            response = self.get('/api/licenses')
+            started = time.monotonic()
+            response = self.get('/health')
+            response_time = time.monotonic() - started
             
-            if response.get('success'):
-                return {
-                    'status': 'healthy',
-                    'database': True,  # Если вернулись лицензии - БД работает
-                    'api': True,
-                    'response_time': 0
-                }
-            else:
-                return {
-                    'status': 'unhealthy',
-                    'database': False,
-                    'api': True,  # API отвечает, но что-то не так
-                    'response_time': 0
-                }
+            database = response.get('база_данных', response.get('database'))
+            database_ok = database in (None, True, 'подключена', 'connected')
+            
+            return {
+                'status': 'healthy' if database_ok else 'unhealthy',
+                'database': database_ok,
+                'api': True,
+                'uptime': response.get('время_работы', response.get('uptime', 0)),
+                'response_time': response_time
+            }
         except Exception as e:
             return {
                 'status': 'error',
@@ -7,6 +7,8 @@ import requests
 from typing import Dict, Optional, Any
 import json
 
+from .transport import get_transport, release_transport, CircuitOpenError
+
 
 class BaseAPIClient:
     """Базовый класс для работы с API"""
@@ -24,15 +26,10 @@ class BaseAPIClient:
         self.api_key = api_key
         self.timeout = timeout
         
-        # Создаём сессию для переиспользования соединения
-        self.session = requests.Session()
-        
-        # Устанавливаем заголовки по умолчанию
-        self.session.headers.update({
-            'Content-Type': 'application/json',
-            'User-Agent': 'FoxterAI-Desktop/2.2',
-            'X-API-Key': self.api_key
-        })
+        # Общий транспорт: один пул соединений на сервер для всех клиентов
+        self.transport = get_transport(self.base_url, self.api_key, timeout)
+        self.session = self.transport.session
+        self.cache = self.transport.cache
     
     def _make_request(self, method: str, endpoint: str, 
                      data: Optional[Dict] = None,
@@ -57,7 +54,7 @@ class BaseAPIClient:
         
         try:
             # Выполняем запрос
-            response = self.session.request(
+            response = self.transport.request(
                 method=method,
                 url=url,
                 json=data,
@@ -81,6 +78,8 @@ class BaseAPIClient:
             # Парсим JSON ответ
             return response.json()
             
+        except CircuitOpenError:
+            raise
         except requests.exceptions.Timeout:
             raise TimeoutError(f"Превышено время ожидания ({self.timeout}с)")
         except requests.exceptions.ConnectionError:
@@ -140,8 +139,10 @@ class BaseAPIClient:
         return self._make_request('DELETE', endpoint)
     
     def close(self):
-        """Закрыть сессию"""
-        self.session.close()
+        """Закрыть клиент (общий транспорт закрывается с последним владельцем)"""
+        if self.transport is not None:
+            release_transport(self.transport)
+            self.transport = None
     
     def __enter__(self):
         """Контекстный менеджер - вход"""
@@ -0,0 +1,173 @@
+"""
+Кэш ответов API для эндпоинтов чтения
+TTL по эндпоинтам, вытеснение LRU и явная инвалидация при изменениях
+"""
+
+import copy
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+
+class ResponseCache:
+    """
+    Потокобезопасный кэш ответов с TTL и ограничением размера
+    
+    Записи адресуются парой (эндпоинт, аргументы). Время жизни задаётся
+    для каждого эндпоинта отдельно, при переполнении вытесняется давно
+    не использованная запись.
+    """
+    
+    # Время жизни по эндпоинтам, секунд
+    DEFAULT_TTLS = {
+        'license': 30.0,
+        'statistics': 15.0,
+        'server_info': 60.0,
+        'events': 10.0
+    }
+    
+    # Эндпоинты, которые зависят от любой лицензии
+    AGGREGATE_ENDPOINTS = ('statistics', 'server_info', 'events')
+    
+    def __init__(self, max_entries: int = 512, ttls: Optional[Dict[str, float]] = None):
+        """
+        Инициализация кэша
+        
+        Args:
+            max_entries: Максимум записей
+            ttls: Переопределение времени жизни по эндпоинтам
+        """
+        self.max_entries = max(1, int(max_entries))
+        self.ttls = dict(self.DEFAULT_TTLS)
+        if ttls:
+            self.ttls.update(ttls)
+        
+        self._entries: 'OrderedDict[Tuple, Tuple[float, Any]]' = OrderedDict()
+        self._lock = threading.Lock()
+        
+        self._hits: Dict[str, int] = {}
+        self._misses: Dict[str, int] = {}
+        self._evictions = 0
+    
+    def get(self, endpoint: str, *args) -> Tuple[bool, Any]:
+        """
+        Получить запись
+        
+        Args:
+            endpoint: Имя эндпоинта
+            *args: Аргументы запроса
+        
+        Returns:
+            tuple: (найдено, копия значения)
+        """
+        key = (endpoint,) + args
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self._entries.move_to_end(key)
+                self._hits[endpoint] = self._hits.get(endpoint, 0) + 1
+                value = entry[1]
+            else:
+                if entry is not None:
+                    del self._entries[key]
+                self._misses[endpoint] = self._misses.get(endpoint, 0) + 1
+                return False, None
+        
+        # Копия - вызывающий код может менять результат
+        return True, copy.deepcopy(value)
+    
+    def set(self, endpoint: str, args: Tuple, value: Any):
+        """
+        Сохранить запись
+        
+        Args:
+            endpoint: Имя эндпоинта
+            args: Аргументы запроса
+            value: Значение
+        """
+        ttl = self.ttls.get(endpoint, 0)
+        if ttl <= 0:
+            return
+        
+        key = (endpoint,) + tuple(args)
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, copy.deepcopy(value))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+    
+    def get_or_load(self, endpoint: str, args: Tuple, loader: Callable[[], Any],
+                    should_cache: Callable[[Any], bool] = bool) -> Any:
+        """
+        Вернуть значение из кэша или загрузить и сохранить
+        
+        Args:
+            endpoint: Имя эндпоинта
+            args: Аргументы запроса
+            loader: Функция загрузки
+            should_cache: Кэшировать ли результат (по умолчанию - непустой)
+        
+        Returns:
+            Any: Значение
+        """
+        hit, value = self.get(endpoint, *args)
+        if hit:
+            return value
+        
+        value = loader()
+        if should_cache(value):
+            self.set(endpoint, args, value)
+        return value
+    
+    def invalidate(self, endpoint: str, *args):
+        """Удалить одну запись"""
+        with self._lock:
+            self._entries.pop((endpoint,) + args, None)
+    
+    def invalidate_endpoint(self, endpoint: str):
+        """Удалить все записи эндпоинта"""
+        with self._lock:
+            for key in [k for k in self._entries if k[0] == endpoint]:
+                del self._entries[key]
+    
+    def invalidate_license(self, license_key: Optional[str] = None):
+        """
+        Сбросить данные, затронутые изменением лицензии
+        
+        Args:
+            license_key: Ключ изменённой лицензии (None - только агрегаты)
+        """
+        if license_key:
+            self.invalidate('license', license_key)
+        for endpoint in self.AGGREGATE_ENDPOINTS:
+            self.invalidate_endpoint(endpoint)
+    
+    def clear(self):
+        """Очистить кэш"""
+        with self._lock:
+            self._entries.clear()
+    
+    def stats(self) -> Dict[str, Any]:
+        """
+        Счётчики попаданий и промахов
+        
+        Returns:
+            Dict: {'hits', 'misses', 'hit_rate', 'evictions', 'size', 'endpoints'}
+        """
+        with self._lock:
+            hits = sum(self._hits.values())
+            misses = sum(self._misses.values())
+            endpoints = {
+                name: {'hits': self._hits.get(name, 0), 'misses': self._misses.get(name, 0)}
+                for name in sorted(set(self._hits) | set(self._misses))
+            }
+            return {
+                'hits': hits,
+                'misses': misses,
+                'hit_rate': hits / (hits + misses) if hits + misses else 0.0,
+                'evictions': self._evictions,
+                'size': len(self._entries),
+                'endpoints': endpoints
+            }
\ No newline at end of file
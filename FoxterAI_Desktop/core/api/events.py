@@ -0,0 +1,270 @@
+"""
+Подписка на поток событий сервера (Server-Sent Events)
+Разбор text/event-stream и чтение в фоне с переподключением по Last-Event-ID
+"""
+
+import random
+import threading
+from typing import Any, Callable, Dict, List, Optional
+
+import requests
+
+from .transport import CircuitOpenError
+
+
+# Путь потока событий на сервере
+EVENTS_PATH = '/api/events/stream'
+
+
+class SSEParser:
+    """
+    Инкрементальный разбор text/event-stream
+    
+    Куски тела подаются в feed() как пришли из сети; готовые события
+    возвращаются словарями {'id', 'event', 'data'}. Комментарии
+    (строки с ':') - это пинги сервера, они только продлевают соединение.
+    """
+    
+    def __init__(self):
+        self._buf = b''
+        self._data: List[str] = []
+        self._event = ''
+        self._id: Optional[str] = None
+        self.last_id: Optional[str] = None
+        self.retry: Optional[int] = None
+    
+    def feed(self, chunk: bytes) -> List[Dict[str, Any]]:
+        """
+        Разобрать очередной кусок
+        
+        Args:
+            chunk: Байты из сети (могут обрываться посреди строки)
+        
+        Returns:
+            List[Dict]: Завершённые события
+        """
+        self._buf += chunk
+        events = []
+        
+        while True:
+            end = self._buf.find(b'\n')
+            if end < 0:
+                break
+            line = self._buf[:end].rstrip(b'\r').decode('utf-8', errors='replace')
+            self._buf = self._buf[end + 1:]
+            
+            if not line:
+                event = self._dispatch()
+                if event:
+                    events.append(event)
+                continue
+            if line.startswith(':'):
+                continue
+            
+            field, _, value = line.partition(':')
+            if value.startswith(' '):
+                value = value[1:]
+            
+            if field == 'data':
+                self._data.append(value)
+            elif field == 'event':
+                self._event = value
+            elif field == 'id' and '\0' not in value:
+                self._id = value
+            elif field == 'retry' and value.isdigit():
+                self.retry = int(value)
+        
+        return events
+    
+    def _dispatch(self) -> Optional[Dict[str, Any]]:
+        """Пустая строка завершает событие"""
+        if self._id is not None:
+            self.last_id = self._id
+        
+        if not self._data:
+            self._event = ''
+            return None
+        
+        event = {
+            'id': self.last_id,
+            'event': self._event or 'message',
+            'data': '\n'.join(self._data)
+        }
+        self._data = []
+        self._event = ''
+        return event
+
+
+class EventStream:
+    """
+    Чтение потока событий в фоновом потоке
+    
+    Соединение держится постоянно; при обрыве - переподключение с
+    нарастающей паузой и заголовком Last-Event-ID, чтобы сервер дослал
+    пропущенное. Если сервер не поддерживает поток (404), чтение
+    прекращается - остаётся обычный опрос.
+    """
+    
+    # Состояния для on_state
+    CONNECTING = 'connecting'
+    CONNECTED = 'connected'
+    DISCONNECTED = 'disconnected'
+    UNSUPPORTED = 'unsupported'
+    STOPPED = 'stopped'
+    
+    def __init__(self, transport, on_event: Callable[[Dict[str, Any]], None],
+                 on_state: Optional[Callable[[str], None]] = None,
+                 path: str = EVENTS_PATH, read_timeout: float = 45.0,
+                 max_backoff: float = 60.0):
+        """
+        Инициализация подписки
+        
+        Args:
+            transport: HTTPTransport (пул соединений и API ключ)
+            on_event: Вызывается в фоновом потоке для каждого события
+            on_state: Вызывается при смене состояния соединения
+            path: Путь потока событий
+            read_timeout: Сколько ждать данных (сервер шлёт пинги чаще)
+            max_backoff: Максимальная пауза между переподключениями, секунд
+        """
+        self.transport = transport
+        self.on_event = on_event
+        self.on_state = on_state
+        self.path = path
+        self.read_timeout = read_timeout
+        self.max_backoff = max_backoff
+        
+        self.state = self.STOPPED
+        self.last_event_id: Optional[str] = None
+        self.retry_delay = 3.0
+        self.reconnects = 0
+        
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._response = None
+    
+    @property
+    def connected(self) -> bool:
+        """Поток событий открыт"""
+        return self.state == self.CONNECTED
+    
+    def start(self):
+        """Запустить чтение в фоне"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='FoxterAI-events', daemon=True)
+        self._thread.start()
+    
+    def stop(self):
+        """Остановить чтение и закрыть соединение"""
+        self._stop.set()
+        response = self._response
+        if response is not None:
+            # Прерывает блокирующее чтение в фоновом потоке
+            try:
+                response.close()
+            except Exception:
+                pass
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(timeout=2)
+        self._thread = None
+        self._set_state(self.STOPPED)
+    
+    def _set_state(self, state: str):
+        if state == self.state:
+            return
+        self.state = state
+        if self.on_state:
+            try:
+                self.on_state(state)
+            except Exception as e:
+                print(f"⚠️ Ошибка в обработчике состояния потока событий: {e}")
+    
+    def _run(self):
+        """Цикл подключения и чтения"""
+        failures = 0
+        
+        while not self._stop.is_set():
+            self._set_state(self.CONNECTING)
+            try:
+                if self._read_stream():
+                    failures = 0
+            except CircuitOpenError as e:
+                print(f"⚠️ Поток событий: {e}")
+            except _StreamUnsupported:
+                print("ℹ️ Сервер не поддерживает поток событий - только опрос")
+                self._set_state(self.UNSUPPORTED)
+                return
+            except Exception as e:
+                if self._stop.is_set():
+                    break
+                print(f"⚠️ Поток событий прерван: {e}")
+            
+            if self._stop.is_set():
+                break
+            
+            self._set_state(self.DISCONNECTED)
+            failures += 1
+            self.reconnects += 1
+            
+            # Пауза от retry сервера, удваивается при повторных ошибках
+            delay = min(self.retry_delay * 2 ** min(failures - 1, 5), self.max_backoff)
+            delay *= 1 + random.uniform(-0.2, 0.2)
+            self._stop.wait(delay)
+    
+    def _read_stream(self) -> bool:
+        """
+        Одно соединение: читать события до обрыва
+        
+        Returns:
+            bool: True если соединение было открыто (ошибки подряд сбрасываются)
+        """
+        headers = {'Accept': 'text/event-stream', 'Cache-Control': 'no-cache'}
+        if self.last_event_id is not None:
+            headers['Last-Event-ID'] = self.last_event_id
+        
+        response = self.transport.get(
+            self.path,
+            headers=headers,
+            stream=True,
+            timeout=(self.transport.timeout, self.read_timeout)
+        )
+        self._response = response
+        
+        with response:
+            if response.status_code in (404, 405, 501):
+                raise _StreamUnsupported()
+            if response.status_code == 401:
+                print("❌ Поток событий: неверный API ключ")
+                self._stop.set()
+                return False
+            response.raise_for_status()
+            
+            parser = SSEParser()
+            self._set_state(self.CONNECTED)
+            
+            try:
+                for chunk in response.iter_content(chunk_size=None):
+                    if self._stop.is_set():
+                        break
+                    for event in parser.feed(chunk):
+                        self.last_event_id = parser.last_id
+                        try:
+                            self.on_event(event)
+                        except Exception as e:
+                            print(f"⚠️ Ошибка обработки события: {e}")
+                    if parser.retry is not None:
+                        self.retry_delay = parser.retry / 1000
+            except (requests.exceptions.RequestException, AttributeError, ValueError):
+                # Закрытие из stop() или обрыв - в обоих случаях выходим в цикл
+                if not self._stop.is_set():
+                    raise
+            finally:
+                self._response = None
+        
+        return True
+
+
+class _StreamUnsupported(Exception):
+    """Сервер не отдаёт поток событий"""
\ No newline at end of file
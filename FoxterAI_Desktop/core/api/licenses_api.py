@@ -3,13 +3,19 @@ API для работы с лицензиями
 """
 
 from typing import List, Dict, Optional
-from datetime import datetime
 from .base_client import BaseAPIClient
+from core.models.normalize import default_normalizer, normalize_license
 
 
 class LicensesAPI(BaseAPIClient):
     """API для управления лицензиями"""
     
+    # До какого размера загруженного списка искать локально
+    LOCAL_SEARCH_THRESHOLD = 20000
+    
+    # Поля, по которым ищет сервер (POST /api/search)
+    SEARCH_FIELDS = ('all', 'key', 'client', 'account', 'robot')
+    
     def get_all(self) -> List[Dict]:
         """
         Получить все лицензии
@@ -22,7 +28,7 @@ class LicensesAPI(BaseAPIClient):
             if response.get('success'):
                 licenses = response.get('licenses', [])
                 # Добавляем вычисляемые поля
-                return [self._enrich_license(lic) for lic in licenses]
+                return default_normalizer.normalize_many(licenses)
             return []
         except Exception as e:
             print(f"Ошибка получения лицензий: {e}")
@@ -34,10 +40,18 @@ class LicensesAPI(BaseAPIClient):
         
         Args:
             license_key: Ключ лицензии
-            
+        
         Returns:
             Optional[Dict]: Данные лицензии или None
         """
+        return self.cache.get_or_load(
+            'license', (license_key,),
+            lambda: self._fetch_by_key(license_key),
+            should_cache=lambda result: result is not None
+        )
+    
+    def _fetch_by_key(self, license_key: str) -> Optional[Dict]:
+        """Загрузить лицензию по ключу с сервера"""
         try:
             response = self.get(f'/api/licenses/{license_key}')
             if response.get('success'):
@@ -58,7 +72,7 @@ class LicensesAPI(BaseAPIClient):
             client_telegram: Telegram клиента
             months: Количество месяцев
             notes: Заметки
-            
+        
         Returns:
             Dict: Результат создания с ключом лицензии
         """
@@ -72,6 +86,8 @@ class LicensesAPI(BaseAPIClient):
         
         try:
             response = self.post('/api/licenses/create', data)
+            if response.get('success'):
+                self.cache.invalidate_license()
             return response
         except Exception as e:
             return {
@@ -86,7 +102,7 @@ class LicensesAPI(BaseAPIClient):
         Args:
             license_key: Ключ лицензии
             **fields: Поля для обновления
-            
+        
         Returns:
             Dict: Результат обновления
         """
@@ -107,6 +123,8 @@ class LicensesAPI(BaseAPIClient):
         
         try:
             response = self.put(f'/api/licenses/{license_key}', data)
+            if response.get('success'):
+                self.cache.invalidate_license(license_key)
             return response
         except Exception as e:
             return {
@@ -120,12 +138,14 @@ class LicensesAPI(BaseAPIClient):
         
         Args:
             license_key: Ключ лицензии
-            
+        
         Returns:
             Dict: Результат удаления
         """
         try:
             response = self.delete(f'/api/licenses/{license_key}')
+            if response.get('success'):
+                self.cache.invalidate_license(license_key)
             return response
         except Exception as e:
             return {
@@ -139,7 +159,7 @@ class LicensesAPI(BaseAPIClient):
         
         Args:
             license_key: Ключ лицензии
-            
+        
         Returns:
             Dict: Результат блокировки
         """
@@ -151,7 +171,7 @@ class LicensesAPI(BaseAPIClient):
         
         Args:
             license_key: Ключ лицензии
-            
+        
         Returns:
             Dict: Результат разблокировки
         """
@@ -164,13 +184,15 @@ class LicensesAPI(BaseAPIClient):
         Args:
             license_key: Ключ лицензии
             months: На сколько месяцев продлить
-            
+        
         Returns:
             Dict: Результат продления
         """
         try:
-            response = self.post(f'/api/licenses/{license_key}/extend', 
+            response = self.post(f'/api/licenses/{license_key}/extend',
                                 {'months': months})
+            if response.get('success'):
+                self.cache.invalidate_license(license_key)
             return response
         except Exception as e:
             return {
@@ -188,7 +210,7 @@ class LicensesAPI(BaseAPIClient):
             account_number: Номер торгового счёта
             balance: Текущий баланс
             robot_version: Версия робота
-            
+        
         Returns:
             Dict: Результат проверки
         """
@@ -212,13 +234,21 @@ class LicensesAPI(BaseAPIClient):
         """
         Получить статистику по лицензиям
         
+        Агрегат считает сервер (GET /api/statistics) - список лицензий
+        не скачивается.
+        
         Returns:
             Dict: Статистика
         """
-        licenses = self.get_all()
-        
+        return self.cache.get_or_load(
+            'statistics', ('licenses_api',), self._fetch_statistics,
+            should_cache=lambda stats: 'error' not in stats
+        )
+    
+    def _fetch_statistics(self) -> Dict:
+        """Запросить агрегат статистики с сервера"""
         stats = {
-            'total': len(licenses),
+            'total': 0,
             'active': 0,
             'expired': 0,
             'blocked': 0,
@@ -228,41 +258,84 @@ class LicensesAPI(BaseAPIClient):
             'total_accounts': 0
         }
         
-        for license in licenses:
-            status = license.get('status', '').lower()
-            
-            if status == 'active':
-                stats['active'] += 1
-            elif status == 'expired':
-                stats['expired'] += 1
-            elif status == 'blocked':
-                stats['blocked'] += 1
-            elif status == 'created':
-                stats['created'] += 1
-            
-            balance = license.get('last_balance', 0)
-            if balance > 0:
-                stats['total_balance'] += balance
-            
-            if license.get('account_number'):
-                stats['total_accounts'] += 1
+        response = self.get('/api/statistics')
+        if not response.get('success'):
+            stats['error'] = response.get('error', 'Could not get statistics')
+            return stats
+        
+        data = response.get('statistics', {})
+        counts = data.get('licenses', {})
+        metrics = data.get('metrics', {})
+        
+        for status in ('total', 'active', 'expired', 'blocked'):
+            stats[status] = counts.get(status, 0)
+        stats['created'] = counts.get('inactive', 0)
+        stats['total_balance'] = metrics.get('total_balance', 0)
+        stats['total_accounts'] = metrics.get('unique_accounts', 0)
         
         if stats['total_accounts'] > 0:
             stats['average_balance'] = stats['total_balance'] / stats['total_accounts']
         
         return stats
     
-    def search(self, query: str) -> List[Dict]:
+    def search(self, query: str, field: str = 'all',
+               licenses: Optional[List[Dict]] = None) -> List[Dict]:
         """
         Поиск лицензий
         
+        Если передан уже загруженный список и он не больше
+        LOCAL_SEARCH_THRESHOLD, ищем по нему локально. Иначе поиск
+        выполняет сервер (POST /api/search) - весь список не скачивается.
+        
         Args:
             query: Поисковый запрос
-            
+            field: Поле поиска ('all', 'key', 'client', 'account', 'robot')
+            licenses: Уже загруженный полный список (необязательно)
+        
+        Returns:
+            List[Dict]: Найденные лицензии
+        """
+        if licenses is not None and len(licenses) <= self.LOCAL_SEARCH_THRESHOLD:
+            return self.search_local(licenses, query)
+        return self.search_remote(query, field)
+    
+    def search_remote(self, query: str, field: str = 'all') -> List[Dict]:
+        """
+        Поиск на сервере
+        
+        Args:
+            query: Поисковый запрос
+            field: Поле поиска
+        
+        Returns:
+            List[Dict]: Найденные лицензии (сервер отдаёт не больше 100)
+        """
+        if not query:
+            return []
+        
+        if field not in self.SEARCH_FIELDS:
+            field = 'all'
+        
+        try:
+            response = self.post('/api/search', {'query': query, 'field': field})
+            if response.get('success'):
+                return [self._enrich_license(lic) for lic in response.get('results', [])]
+            return []
+        except Exception as e:
+            print(f"Ошибка поиска лицензий: {e}")
+            return []
+    
+    def search_local(self, all_licenses: List[Dict], query: str) -> List[Dict]:
+        """
+        Поиск по уже загруженному списку
+        
+        Args:
+            all_licenses: Список лицензий
+            query: Поисковый запрос
+        
         Returns:
             List[Dict]: Найденные лицензии
         """
-        all_licenses = self.get_all()
         query_lower = query.lower()
         
         results = []
@@ -287,73 +360,8 @@ class LicensesAPI(BaseAPIClient):
         
         Args:
             license: Данные лицензии
-            
+        
         Returns:
-            Dict: Обогащённые данные
+            Dict: Обработанная запись (общий конвейер LicenseNormalizer)
         """
-        # Копируем оригинальные данные
-        enriched = license.copy()
-        
-        # Добавляем форматированные даты
-        date_fields = ['created_date', 'activation_date', 'expiry_date', 'last_check']
-        for field in date_fields:
-            if enriched.get(field):
-                # Сохраняем оригинал
-                enriched[f'{field}_raw'] = enriched[field]
-                # Добавляем форматированную версию
-                enriched[f'{field}_formatted'] = self._format_datetime(enriched[field])
-                # Добавляем короткую версию (только дата)
-                enriched[f'{field}_short'] = self._format_date(enriched[field])
-        
-        # Вычисляем дни до истечения
-        if enriched.get('expiry_date') and enriched.get('status') == 'active':
-            days_left = self._calculate_days_left(enriched['expiry_date'])
-            enriched['days_left'] = days_left
-            
-            # Добавляем уровень критичности
-            if days_left <= 3:
-                enriched['urgency'] = 'critical'
-            elif days_left <= 7:
-                enriched['urgency'] = 'warning'
-            elif days_left <= 30:
-                enriched['urgency'] = 'attention'
-            else:
-                enriched['urgency'] = 'normal'
-        else:
-            enriched['days_left'] = -1
-            enriched['urgency'] = 'none'
-        
-        return enriched
-    
-    def _format_datetime(self, date_str: str) -> str:
-        """Форматировать дату и время"""
-        try:
-            dt = datetime.fromisoformat(date_str.replace('Z', '+00:00'))
-            return dt.strftime('%d.%m.%Y %H:%M')
-        except:
-            return date_str
-    
-    def _format_date(self, date_str: str) -> str:
-        """Форматировать только дату"""
-        try:
-            dt = datetime.fromisoformat(date_str.replace('Z', '+00:00'))
-            return dt.strftime('%d.%m.%Y')
-        except:
-            if 'T' in date_str:
-                return date_str.split('T')[0]
-            return date_str[:10] if len(date_str) >= 10 else date_str
-    
-    def _calculate_days_left(self, expiry_date: str) -> int:
-        """Вычислить дни до истечения"""
-        try:
-            # Парсим дату
-            expiry = datetime.fromisoformat(expiry_date.replace('Z', '+00:00'))
-            # ВАЖНО: убираем timezone если есть
-            if expiry.tzinfo is not None:
-                expiry = expiry.replace(tzinfo=None)
-            
-            now = datetime.now()
-            delta = expiry - now
-            return max(0, delta.days)
-        except:
-            return -1
\ No newline at end of file
+        return normalize_license(license)
\ No newline at end of file
@@ -0,0 +1,294 @@
+"""
+Метрики HTTP запросов к серверу лицензий
+Счётчики, объём передачи и гистограммы задержек по эндпоинтам,
+отдельно - время разбора ответа и обработки строк
+"""
+
+import bisect
+import math
+import os
+import re
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+
+# Границы корзин гистограммы, секунд (как у Prometheus по умолчанию)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Сегменты пути с цифрами - идентификаторы (ключи лицензий, id)
+_ID_SEGMENT = re.compile(r'\d')
+
+# Служебные подпути /api/licenses, которые не являются ключами
+_LICENSE_ROUTES = frozenset({'stats', 'batch', 'search', 'stream'})
+
+
+def endpoint_name(method: str, url: str) -> str:
+    """
+    Имя эндпоинта для метрик: метод и путь без хоста, запроса и ключей
+    
+    '/api/licenses/FXAI-000001-ABCD/extend' -> 'POST /api/licenses/:key/extend'
+    """
+    path = urlsplit(url).path or '/'
+    segments = path.strip('/').split('/')
+    
+    for i, segment in enumerate(segments):
+        if i == 2 and segments[:2] == ['api', 'licenses'] and segment not in _LICENSE_ROUTES:
+            segments[i] = ':key'
+        elif _ID_SEGMENT.search(segment):
+            segments[i] = ':id'
+    
+    return f"{method.upper()} /{'/'.join(segments)}"
+
+
+class LatencyHistogram:
+    """
+    Гистограмма задержек
+    
+    Корзины с накоплением - для выгрузки в OpenMetrics, последние
+    sample_size замеров - для процентилей p50/p95/p99.
+    """
+    
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS, sample_size: int = 1024):
+        """
+        Инициализация гистограммы
+        
+        Args:
+            buckets: Верхние границы корзин, секунд
+            sample_size: Сколько последних замеров хранить для процентилей
+        """
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self._samples = deque(maxlen=sample_size)
+    
+    def observe(self, seconds: float):
+        """Учесть один замер"""
+        self.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        self._samples.append(seconds)
+    
+    def percentile(self, q: float) -> float:
+        """Процентиль по последним замерам, секунд (0 - замеров нет)"""
+        if not self._samples:
+            return 0.0
+        ordered = sorted(self._samples)
+        # Ближайший ранг
+        index = min(len(ordered), max(1, math.ceil(q / 100 * len(ordered)))) - 1
+        return ordered[index]
+    
+    def cumulative(self) -> List[Tuple[float, int]]:
+        """Корзины с накоплением [(граница, количество)], последняя - +Inf"""
+        result = []
+        running = 0
+        for bound, count in zip(self.buckets + (float('inf'),), self.counts):
+            running += count
+            result.append((bound, running))
+        return result
+    
+    def snapshot(self) -> Dict[str, float]:
+        """Сводка в миллисекундах"""
+        return {
+            'count': self.count,
+            'avg_ms': self.total / self.count * 1000 if self.count else 0.0,
+            'p50_ms': self.percentile(50) * 1000,
+            'p95_ms': self.percentile(95) * 1000,
+            'p99_ms': self.percentile(99) * 1000,
+            'max_ms': self.max * 1000
+        }
+
+
+class EndpointStats:
+    """Счётчики одного эндпоинта"""
+    
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.statuses: Dict[int, int] = {}
+        self.latency = LatencyHistogram()
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """Сводка эндпоинта"""
+        result = {
+            'count': self.count,
+            'errors': self.errors,
+            'bytes_in': self.bytes_in,
+            'bytes_out': self.bytes_out,
+            'statuses': dict(self.statuses)
+        }
+        result.update(self.latency.snapshot())
+        return result
+
+
+class MetricsRegistry:
+    """
+    Потокобезопасный сборщик метрик транспорта
+    
+    Сетевое время (до заголовков ответа, а для обычных запросов - до
+    конца тела) пишется по эндпоинтам. Время разбора тела ('decode') и
+    обработки строк ('enrich') пишется отдельно как этапы, чтобы медленное
+    обновление можно было разложить на сеть, сервер и клиент.
+    """
+    
+    def __init__(self):
+        self._endpoints: Dict[str, EndpointStats] = {}
+        self._stages: Dict[Tuple[str, str], LatencyHistogram] = {}
+        self._lock = threading.Lock()
+        self.started = time.time()
+    
+    # ==================== ЗАПИСЬ ====================
+    
+    def record_request(self, endpoint: str, elapsed: float, status: Optional[int] = None,
+                       bytes_in: int = 0, bytes_out: int = 0, error: bool = False):
+        """
+        Учесть один HTTP запрос (каждую попытку отдельно)
+        
+        Args:
+            endpoint: Имя эндпоинта (см. endpoint_name)
+            elapsed: Сетевое время, секунд
+            status: Код ответа (None - ошибка сети)
+            bytes_in: Байт получено
+            bytes_out: Байт отправлено
+            error: Запрос завершился ошибкой
+        """
+        with self._lock:
+            stats = self._endpoints.get(endpoint)
+            if stats is None:
+                stats = self._endpoints[endpoint] = EndpointStats()
+            
+            stats.count += 1
+            stats.bytes_in += bytes_in
+            stats.bytes_out += bytes_out
+            stats.latency.observe(elapsed)
+            if error:
+                stats.errors += 1
+            if status is not None:
+                stats.statuses[status] = stats.statuses.get(status, 0) + 1
+    
+    def record_stage(self, stage: str, endpoint: str, elapsed: float):
+        """
+        Учесть время этапа обработки ответа
+        
+        Args:
+            stage: 'decode' или 'enrich'
+            endpoint: Эндпоинт, к которому относится ответ
+            elapsed: Длительность, секунд
+        """
+        with self._lock:
+            histogram = self._stages.get((stage, endpoint))
+            if histogram is None:
+                histogram = self._stages[(stage, endpoint)] = LatencyHistogram()
+            histogram.observe(elapsed)
+    
+    @contextmanager
+    def timer(self, stage: str, endpoint: str):
+        """Замерить этап: with metrics.timer('decode', 'GET /api/licenses'): ..."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record_stage(stage, endpoint, time.perf_counter() - started)
+    
+    def reset(self):
+        """Сбросить все метрики"""
+        with self._lock:
+            self._endpoints.clear()
+            self._stages.clear()
+            self.started = time.time()
+    
+    # ==================== ЧТЕНИЕ ====================
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Снимок метрик
+        
+        Returns:
+            Dict: {'since', 'endpoints': {имя: {...}}, 'stages': {этап: {имя: {...}}}}
+        """
+        with self._lock:
+            endpoints = {name: stats.snapshot() for name, stats in sorted(self._endpoints.items())}
+            stages: Dict[str, Dict[str, Any]] = {}
+            for (stage, endpoint), histogram in sorted(self._stages.items()):
+                stages.setdefault(stage, {})[endpoint] = histogram.snapshot()
+        
+        return {'since': self.started, 'endpoints': endpoints, 'stages': stages}
+    
+    def to_openmetrics(self, prefix: str = 'foxterai_client') -> str:
+        """
+        Метрики в текстовом формате OpenMetrics
+        
+        Args:
+            prefix: Префикс имён метрик
+        
+        Returns:
+            str: Текст, заканчивающийся '# EOF'
+        """
+        lines = []
+        
+        def family(name: str, kind: str, help_text: str):
+            lines.append(f"# TYPE {prefix}_{name} {kind}")
+            lines.append(f"# HELP {prefix}_{name} {help_text}")
+        
+        def histogram(name: str, labels: str, hist: LatencyHistogram):
+            for bound, count in hist.cumulative():
+                le = '+Inf' if bound == float('inf') else repr(bound)
+                lines.append(f'{prefix}_{name}_bucket{{{labels},le="{le}"}} {count}')
+            lines.append(f'{prefix}_{name}_count{{{labels}}} {hist.count}')
+            lines.append(f'{prefix}_{name}_sum{{{labels}}} {hist.total:.6f}')
+        
+        with self._lock:
+            endpoints = sorted(self._endpoints.items())
+            stages = sorted(self._stages.items())
+            
+            counters = [
+                ('requests', 'Запросы к серверу', lambda s: s.count),
+                ('request_errors', 'Запросы с ошибкой', lambda s: s.errors),
+                ('received_bytes', 'Получено байт', lambda s: s.bytes_in),
+                ('sent_bytes', 'Отправлено байт', lambda s: s.bytes_out)
+            ]
+            for name, help_text, value in counters:
+                family(name, 'counter', help_text)
+                for endpoint, stats in endpoints:
+                    lines.append(f'{prefix}_{name}_total{{endpoint="{endpoint}"}} {value(stats)}')
+            
+            family('request_duration_seconds', 'histogram', 'Сетевое время запроса')
+            for endpoint, stats in endpoints:
+                histogram('request_duration_seconds', f'endpoint="{endpoint}"', stats.latency)
+            
+            family('stage_duration_seconds', 'histogram', 'Разбор и обработка ответа')
+            for (stage, endpoint), hist in stages:
+                histogram('stage_duration_seconds', f'stage="{stage}",endpoint="{endpoint}"', hist)
+        
+        lines.append('# EOF')
+        return '\n'.join(lines) + '\n'
+    
+    def write_openmetrics(self, path: str) -> bool:
+        """
+        Записать метрики в файл OpenMetrics (атомарно, через временный файл)
+        
+        Args:
+            path: Путь к файлу
+        
+        Returns:
+            bool: True если записано
+        """
+        tmp_path = f"{path}.tmp"
+        try:
+            directory = os.path.dirname(os.path.abspath(path))
+            os.makedirs(directory, exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(self.to_openmetrics())
+            os.replace(tmp_path, path)
+            return True
+        except OSError as e:
+            print(f"⚠️ Не удалось записать метрики в {path}: {e}")
+            return False
\ No newline at end of file
@@ -0,0 +1,198 @@
+"""
+Потоковый разбор JSON ответов API
+Элементы массива отдаются по мере чтения, не дожидаясь всего тела
+"""
+
+import codecs
+import json
+import time
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+from core.api.wire_format import suspicious_text
+
+
+_WHITESPACE = ' \t\n\r'
+
+# Сколько символов прошлого куска проверять вместе с новым (длина признака)
+_BOUNDARY = 16
+
+
+class JSONArrayStream:
+    """
+    Инкрементальный разбор массива внутри JSON объекта
+    
+    Поддерживает ответы вида {"success": true, "licenses": [...], ...}
+    и просто [...]. Поля верхнего уровня, кроме массива, сохраняются в
+    fields. В памяти держится только ещё не разобранный хвост буфера.
+    """
+    
+    def __init__(self, chunks: Iterable[bytes], array_key: str = 'licenses',
+                 encoding: str = 'utf-8'):
+        """
+        Инициализация разбора
+        
+        Args:
+            chunks: Куски тела ответа (bytes)
+            array_key: Поле с массивом элементов
+            encoding: Кодировка тела (см. wire_format.charset)
+        """
+        self.array_key = array_key
+        self.fields: Dict[str, Any] = {}
+        self.found = False
+        
+        # Встретились признаки испорченной кодировки (до текущего места
+        # тела): строкам нужен EncodingFixer
+        self.suspicious = False
+        
+        self._chunks = iter(chunks)
+        self._decoder = codecs.getincrementaldecoder(encoding)(errors='replace')
+        self._json = json.JSONDecoder()
+        self._buf = ''
+        self._pos = 0
+        self._eof = False
+    
+    # ==================== БУФЕР ====================
+    
+    def _fill(self) -> bool:
+        """Дочитать следующий кусок; False - тело закончилось"""
+        if self._eof:
+            return False
+        
+        # Разобранную часть отбрасываем, чтобы буфер не рос
+        if self._pos:
+            self._buf = self._buf[self._pos:]
+            self._pos = 0
+        
+        for chunk in self._chunks:
+            if chunk:
+                self._append(self._decoder.decode(chunk))
+                return True
+        
+        self._append(self._decoder.decode(b'', final=True))
+        self._eof = True
+        return False
+    
+    def _append(self, text: str):
+        """Добавить текст в буфер, отмечая признаки испорченной кодировки"""
+        if not self.suspicious and text:
+            # Признак может прийтись на границу кусков - проверяем с хвостом
+            start = max(0, len(self._buf) - _BOUNDARY)
+            self._buf += text
+            self.suspicious = suspicious_text(self._buf[start:])
+        else:
+            self._buf += text
+    
+    def _peek(self) -> str:
+        """Следующий значимый символ ('' в конце тела)"""
+        while True:
+            while self._pos < len(self._buf) and self._buf[self._pos] in _WHITESPACE:
+                self._pos += 1
+            if self._pos < len(self._buf):
+                return self._buf[self._pos]
+            if not self._fill():
+                return ''
+    
+    def _expect(self, char: str):
+        """Пропустить ожидаемый символ"""
+        if self._peek() != char:
+            raise ValueError(f"Некорректный JSON: ожидался '{char}'")
+        self._pos += 1
+    
+    def _value(self) -> Any:
+        """Разобрать одно значение, дочитывая тело при необходимости"""
+        self._peek()
+        while True:
+            try:
+                value, end = self._json.raw_decode(self._buf, self._pos)
+                # Число на границе куска может быть обрезано
+                if end < len(self._buf) or self._eof:
+                    self._pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self._eof:
+                    raise
+            self._fill()
+    
+    # ==================== РАЗБОР ====================
+    
+    def __iter__(self) -> Iterator[Any]:
+        """Элементы массива по одному"""
+        first = self._peek()
+        
+        if first == '[':
+            self.found = True
+            yield from self._items()
+            return
+        
+        self._expect('{')
+        if self._peek() == '}':
+            self._pos += 1
+            return
+        
+        while True:
+            key = self._value()
+            self._expect(':')
+            
+            if key == self.array_key and self._peek() == '[':
+                self.found = True
+                yield from self._items()
+            else:
+                self.fields[key] = self._value()
+            
+            separator = self._peek()
+            self._pos += 1
+            if separator == '}':
+                return
+            if separator != ',':
+                raise ValueError("Некорректный JSON: ожидалась ',' или '}'")
+    
+    def _items(self) -> Iterator[Any]:
+        """Элементы массива, начиная с '['"""
+        self._expect('[')
+        if self._peek() == ']':
+            self._pos += 1
+            return
+        
+        while True:
+            yield self._value()
+            
+            separator = self._peek()
+            self._pos += 1
+            if separator == ']':
+                return
+            if separator != ',':
+                raise ValueError("Некорректный JSON: ожидалась ',' или ']'")
+
+
+def iter_batches(items: Iterable[Any], batch_size: int = 200,
+                 time_budget: float = 0.05,
+                 transform: Optional[Callable[[Any], Any]] = None) -> Iterator[List[Any]]:
+    """
+    Сгруппировать элементы в пачки по размеру или по времени
+    
+    Пачка отдаётся, как только набрано batch_size элементов или с момента
+    предыдущей пачки прошло time_budget секунд - первые строки появляются
+    быстро даже при медленной сети.
+    
+    Args:
+        items: Элементы
+        batch_size: Максимальный размер пачки
+        time_budget: Максимальное время набора пачки, секунд
+        transform: Обработка каждого элемента
+    
+    Yields:
+        List: Пачка элементов
+    """
+    batch = []
+    started = time.monotonic()
+    
+    for item in items:
+        batch.append(transform(item) if transform else item)
+        
+        if len(batch) >= batch_size or time.monotonic() - started >= time_budget:
+            yield batch
+            batch = []
+            started = time.monotonic()
+    
+    if batch:
+        yield batch
\ No newline at end of file
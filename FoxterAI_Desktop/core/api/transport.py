@@ -0,0 +1,461 @@
+"""
+Общий HTTP транспорт для всех API клиентов
+Пул соединений, повторы с экспоненциальной задержкой и circuit breaker
+"""
+
+import random
+import ssl
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .cache import ResponseCache
+from .metrics import MetricsRegistry, endpoint_name
+from .wire_format import accept_encoding
+
+
+# Методы, которые безопасно повторять
+# (DELETE не повторяем: после потерянного ответа повтор получит 404)
+IDEMPOTENT_METHODS = frozenset({'GET', 'HEAD', 'OPTIONS', 'PUT'})
+
+# Коды ответа, при которых сервер временно недоступен
+RETRY_STATUSES = frozenset({502, 503, 504})
+
+# Ошибки, означающие недоступность сервера (считаются предохранителем)
+UNAVAILABLE_ERRORS = (requests.exceptions.ConnectionError, requests.exceptions.Timeout)
+
+
+class CircuitOpenError(ConnectionError):
+    """Сервер недоступен - запрос отклонён без обращения к сети"""
+
+
+class CircuitBreaker:
+    """
+    Предохранитель для недоступного сервера
+    
+    После failure_threshold ошибок подряд переходит в состояние open и
+    сразу отклоняет запросы. Через reset_timeout пропускает один пробный
+    запрос (half_open): успех закрывает предохранитель, ошибка - снова
+    открывает.
+    
+    Считается только недоступность сервера (соединение, таймаут,
+    502/503/504): ошибка одного обработчика (500, 4xx) означает, что
+    сервер отвечает, и не блокирует остальные эндпоинты.
+    """
+    
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+    
+    def __init__(self, failure_threshold: int = 3, reset_timeout: float = 15.0):
+        """
+        Инициализация предохранителя
+        
+        Args:
+            failure_threshold: Ошибок подряд до размыкания
+            reset_timeout: Через сколько секунд пробовать снова
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self._trial_owner: Optional[int] = None
+        self._lock = threading.Lock()
+    
+    @property
+    def state(self) -> str:
+        """Текущее состояние с учётом истёкшего таймаута"""
+        with self._lock:
+            if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                return self.HALF_OPEN
+            return self._state
+    
+    def allow_request(self) -> bool:
+        """
+        Можно ли выполнять запрос сейчас
+        
+        Returns:
+            bool: False если предохранитель разомкнут
+        """
+        with self._lock:
+            if self._state == self.CLOSED:
+                return True
+            
+            if time.monotonic() - self._opened_at < self.reset_timeout:
+                return False
+            
+            # Пропускаем только один пробный запрос
+            if self._trial_in_flight:
+                return False
+            self._state = self.HALF_OPEN
+            self._trial_in_flight = True
+            self._trial_owner = threading.get_ident()
+            return True
+    
+    def retry_after(self) -> float:
+        """Сколько секунд осталось до пробного запроса"""
+        with self._lock:
+            if self._state == self.CLOSED:
+                return 0.0
+            return max(0.0, self.reset_timeout - (time.monotonic() - self._opened_at))
+    
+    def record_success(self):
+        """Запрос прошёл - замыкаем предохранитель"""
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+            self._trial_in_flight = False
+            self._trial_owner = None
+    
+    def record_failure(self):
+        """Запрос не прошёл - считаем ошибку"""
+        with self._lock:
+            self._failures += 1
+            self._trial_in_flight = False
+            self._trial_owner = None
+            
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                if self._state != self.OPEN:
+                    print(f"⛔ Сервер недоступен, запросы приостановлены на {self.reset_timeout:.0f}с")
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+    
+    def release_trial(self):
+        """
+        Пробный запрос этого потока завершился без итога
+        
+        Например, прерван исключением не из сети: следующий запрос
+        снова сможет стать пробным, иначе предохранитель не замкнулся бы
+        никогда.
+        """
+        with self._lock:
+            if self._trial_in_flight and self._trial_owner == threading.get_ident():
+                self._trial_in_flight = False
+                self._trial_owner = None
+    
+    def reset(self):
+        """Принудительно замкнуть (например, при ручном переподключении)"""
+        self.record_success()
+
+
+class RetryPolicy:
+    """Политика повторов с экспоненциальной задержкой и jitter"""
+    
+    def __init__(self, max_retries: int = 2, backoff_base: float = 0.3,
+                 backoff_max: float = 3.0):
+        """
+        Инициализация политики
+        
+        Args:
+            max_retries: Максимум повторов после первой попытки
+            backoff_base: Базовая задержка, секунд
+            backoff_max: Максимальная задержка, секунд
+        """
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+    
+    def delay(self, attempt: int) -> float:
+        """
+        Задержка перед повтором (full jitter)
+        
+        Args:
+            attempt: Номер повтора, начиная с 1
+        
+        Returns:
+            float: Задержка в секундах
+        """
+        cap = min(self.backoff_max, self.backoff_base * (2 ** (attempt - 1)))
+        return random.uniform(0, cap)
+    
+    def should_retry(self, method: str, attempt: int,
+                     error: Optional[Exception] = None,
+                     status: Optional[int] = None) -> bool:
+        """
+        Нужно ли повторить запрос
+        
+        Неидемпотентные запросы повторяются только если соединение не
+        было установлено (запрос гарантированно не дошёл до сервера).
+        Истёкшее ожидание ответа (ReadTimeout) не повторяется ни для
+        каких методов: каждый повтор стоил бы полного таймаута, а
+        зависший сервер быстрее распознаёт предохранитель.
+        """
+        if attempt > self.max_retries:
+            return False
+        
+        if isinstance(error, requests.exceptions.ReadTimeout):
+            return False
+        
+        if method.upper() in IDEMPOTENT_METHODS:
+            if error is not None:
+                return isinstance(error, (requests.exceptions.ConnectionError,
+                                          requests.exceptions.Timeout))
+            return status in RETRY_STATUSES
+        
+        return isinstance(error, requests.exceptions.ConnectTimeout)
+
+
+class PooledHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter с общим SSL контекстом для всех соединений пула"""
+    
+    def __init__(self, ssl_context: Optional[ssl.SSLContext] = None, **kwargs):
+        self._ssl_context = ssl_context
+        super().__init__(**kwargs)
+    
+    def init_poolmanager(self, *args, **kwargs):
+        if self._ssl_context is not None:
+            kwargs['ssl_context'] = self._ssl_context
+        return super().init_poolmanager(*args, **kwargs)
+
+
+class HTTPTransport:
+    """
+    Общий транспорт для BaseAPIClient и APIClient
+    
+    Повторяет интерфейс requests.Session (get/post/put/delete/request,
+    headers), поэтому клиенты используют его вместо собственной сессии.
+    """
+    
+    def __init__(self, base_url: str, api_key: str = '', timeout: int = 10,
+                 pool_connections: int = 4, pool_maxsize: int = 16,
+                 retry_policy: Optional[RetryPolicy] = None,
+                 breaker: Optional[CircuitBreaker] = None):
+        """
+        Инициализация транспорта
+        
+        Args:
+            base_url: Базовый URL сервера
+            api_key: API ключ
+            timeout: Таймаут по умолчанию, секунд
+            pool_connections: Количество пулов (хостов)
+            pool_maxsize: Соединений в пуле на хост
+            retry_policy: Политика повторов
+            breaker: Предохранитель
+        """
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.breaker = breaker or CircuitBreaker()
+        
+        # Кэш ответов и метрики общие для всех клиентов этого сервера
+        self.cache = ResponseCache()
+        self.metrics = MetricsRegistry()
+        
+        self.session = requests.Session()
+        self.session.headers.update({
+            'Content-Type': 'application/json',
+            'User-Agent': 'FoxterAI-Desktop/3.0',
+            'Connection': 'keep-alive',
+            'Accept-Encoding': accept_encoding(),
+            'X-API-Key': api_key
+        })
+        
+        # Для https один SSL контекст на все соединения (сертификаты
+        # загружаются один раз); экономия на рукопожатиях - только за счёт
+        # keep-alive соединений пула, возобновление TLS сессий не настроено
+        ssl_context = ssl.create_default_context() if self.base_url.startswith('https') else None
+        
+        adapter = PooledHTTPAdapter(
+            ssl_context=ssl_context,
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            max_retries=0
+        )
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+    
+    @property
+    def headers(self):
+        """Заголовки по умолчанию (как у requests.Session)"""
+        return self.session.headers
+    
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """
+        Выполнить запрос с повторами и предохранителем
+        
+        Args:
+            method: HTTP метод
+            url: Полный URL или путь относительно base_url
+        
+        Returns:
+            requests.Response: Ответ сервера
+        
+        Raises:
+            CircuitOpenError: Сервер помечен недоступным
+            requests.exceptions.RequestException: Ошибка сети после повторов
+        """
+        method = method.upper()
+        if url.startswith('/'):
+            url = f"{self.base_url}{url}"
+        kwargs.setdefault('timeout', self.timeout)
+        
+        endpoint = endpoint_name(method, url)
+        
+        attempt = 0
+        while True:
+            if not self.breaker.allow_request():
+                raise CircuitOpenError(
+                    f"Сервер недоступен, повтор через {self.breaker.retry_after():.0f}с"
+                )
+            
+            try:
+                response, error = self._attempt(method, url, endpoint, kwargs)
+            finally:
+                # Пробный запрос, прерванный не сетевой ошибкой, не должен
+                # навсегда оставить предохранитель полуоткрытым
+                self.breaker.release_trial()
+            
+            attempt += 1
+            if error is not None:
+                if not self.retry_policy.should_retry(method, attempt, error=error):
+                    raise error
+            elif (response.status_code in RETRY_STATUSES and
+                  self.retry_policy.should_retry(method, attempt, status=response.status_code)):
+                response.close()
+            else:
+                return response
+            time.sleep(self.retry_policy.delay(attempt))
+    
+    def _attempt(self, method: str, url: str, endpoint: str, kwargs: Dict):
+        """
+        Одна попытка запроса с учётом в предохранителе и метриках
+        
+        Returns:
+            tuple: (ответ, None) или (None, ошибка сети)
+        """
+        started = time.perf_counter()
+        try:
+            response = self.session.request(method, url, **kwargs)
+        except requests.exceptions.RequestException as e:
+            self.metrics.record_request(endpoint, time.perf_counter() - started, error=True)
+            if isinstance(e, UNAVAILABLE_ERRORS):
+                self.breaker.record_failure()
+            return None, e
+        
+        # Сервер ответил: недоступностью считаются только 502/503/504
+        if response.status_code in RETRY_STATUSES:
+            self.breaker.record_failure()
+        else:
+            self.breaker.record_success()
+        
+        self._record_response(endpoint, response, time.perf_counter() - started,
+                              kwargs.get('stream', False))
+        return response, None
+    
+    def _record_response(self, endpoint: str, response: requests.Response,
+                         elapsed: float, stream: bool):
+        """
+        Записать метрики ответа
+        
+        Размер берётся из Content-Length (байты по сети, до распаковки).
+        Если заголовка нет, для обычного ответа считается уже прочитанное
+        тело; потоковое тело не читаем, чтобы не сломать разбор.
+        """
+        bytes_in = response.headers.get('Content-Length')
+        if bytes_in is not None and bytes_in.isdigit():
+            bytes_in = int(bytes_in)
+        elif not stream:
+            bytes_in = len(response.content)
+        else:
+            bytes_in = 0
+        
+        body = response.request.body if response.request is not None else None
+        bytes_out = len(body) if body else 0
+        
+        self.metrics.record_request(
+            endpoint, elapsed,
+            status=response.status_code,
+            bytes_in=bytes_in,
+            bytes_out=bytes_out,
+            error=response.status_code >= 400
+        )
+    
+    def get(self, url: str, **kwargs) -> requests.Response:
+        """GET запрос"""
+        return self.request('GET', url, **kwargs)
+    
+    def post(self, url: str, **kwargs) -> requests.Response:
+        """POST запрос"""
+        return self.request('POST', url, **kwargs)
+    
+    def put(self, url: str, **kwargs) -> requests.Response:
+        """PUT запрос"""
+        return self.request('PUT', url, **kwargs)
+    
+    def delete(self, url: str, **kwargs) -> requests.Response:
+        """DELETE запрос"""
+        return self.request('DELETE', url, **kwargs)
+    
+    def close(self):
+        """Закрыть все соединения пула"""
+        self.cache.clear()
+        self.session.close()
+
+
+# Общие транспорты по (base_url, api_key) и число их владельцев
+_transports: Dict[Tuple[str, str], HTTPTransport] = {}
+_transport_refs: Dict[Tuple[str, str], int] = {}
+_transports_lock = threading.Lock()
+
+
+def get_transport(base_url: str, api_key: str = '', timeout: int = 10) -> HTTPTransport:
+    """
+    Получить общий транспорт для сервера
+    
+    Args:
+        base_url: Базовый URL сервера
+        api_key: API ключ
+        timeout: Таймаут по умолчанию
+    
+    Returns:
+        HTTPTransport: Транспорт (один на сервер и ключ)
+    
+    Каждый вызов нужно закрыть парным release_transport().
+    """
+    key = (base_url.rstrip('/'), api_key)
+    with _transports_lock:
+        transport = _transports.get(key)
+        if transport is None:
+            transport = HTTPTransport(base_url, api_key, timeout)
+            _transports[key] = transport
+        _transport_refs[key] = _transport_refs.get(key, 0) + 1
+        return transport
+
+
+def release_transport(transport: HTTPTransport):
+    """
+    Отпустить транспорт, полученный из get_transport()
+    
+    Когда его отпускает последний владелец, соединения пула
+    закрываются и транспорт убирается из общих.
+    
+    Args:
+        transport: Транспорт
+    """
+    with _transports_lock:
+        key = next((k for k, t in _transports.items() if t is transport), None)
+        if key is None:
+            # Уже закрыт close_transports() или не общий
+            return
+        refs = _transport_refs.get(key, 1) - 1
+        if refs > 0:
+            _transport_refs[key] = refs
+            return
+        del _transports[key]
+        _transport_refs.pop(key, None)
+    transport.close()
+
+
+def close_transports():
+    """Закрыть все общие транспорты"""
+    with _transports_lock:
+        for transport in _transports.values():
+            transport.close()
+        _transports.clear()
+        _transport_refs.clear()
\ No newline at end of file
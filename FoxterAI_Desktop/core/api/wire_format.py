@@ -0,0 +1,294 @@
+"""
+Компактные форматы ответа для списка лицензий
+Согласование сжатия (gzip/br) и тела (MessagePack / колоночный JSON),
+выбор кодировки тела по байтам и charset
+"""
+
+import codecs
+import json
+import os
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+
+# urllib3 сам распаковывает br, если установлен brotli или brotlicffi
+try:
+    import brotli  # noqa: F401
+    BROTLI_AVAILABLE = True
+except ImportError:
+    try:
+        import brotlicffi  # noqa: F401
+        BROTLI_AVAILABLE = True
+    except ImportError:
+        BROTLI_AVAILABLE = False
+
+
+MEDIA_JSON = 'application/json'
+MEDIA_COLUMNS = 'application/vnd.foxterai.columns+json'
+MEDIA_MSGPACK = 'application/x-msgpack'
+
+SCHEMA_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    'schema_mapping.json'
+)
+
+_schema_cache: Optional[Dict[str, Any]] = None
+
+# Кодировка JSON без charset - UTF-8 (RFC 8259). Тело, которое в
+# объявленной кодировке не читается, пробуем в следующих по порядку
+# (терминалы MT4 на русской Windows пишут в CP1251; Latin-1 читает всё)
+DEFAULT_CHARSET = 'utf-8'
+FALLBACK_CHARSETS = ('utf-8', 'cp1251', 'latin-1')
+
+
+# Признаки строк, которым может понадобиться EncodingFixer:
+# - символы Latin-1 (U+0080-U+00FF) и символ замены - след UTF-8 или
+#   CP1251, прочитанных как Latin-1;
+# - 'Р'/'С' перед символом верхней половины CP1251 - след UTF-8,
+#   прочитанного как CP1251.
+# Каждый признак ищется и символом, и \u-экранированием (json.dumps с
+# ensure_ascii). Шаблоны начинаются с постоянной части - её re ищет
+# быстро, а не пробует шаблон с каждой позиции.
+_CP1251_TAILS = [bytes([byte]).decode('cp1251') for byte in range(0x80, 0xC0) if byte != 0x98]
+_ESCAPED_TAILS = '|'.join(f'{ord(char):04x}|{ord(char):04X}' for char in _CP1251_TAILS)
+
+_LATIN1_TEXT = re.compile('[\u0080-\u00ff\ufffd]')
+_CP1251_TEXT = re.compile('[РС][' + ''.join(_CP1251_TAILS) + ']')
+_CP1251_BYTES = re.compile(
+    b'\xd0[\xa0\xa1](?:' + b'|'.join(re.escape(char.encode('utf-8')) for char in _CP1251_TAILS) + b')'
+)
+_ESCAPED = (
+    re.compile(r'\\u00[89a-fA-F][0-9a-fA-F]'),
+    re.compile(r'\\u0420\\u(?:' + _ESCAPED_TAILS + ')'),
+    re.compile(r'\\u0421\\u(?:' + _ESCAPED_TAILS + ')')
+)
+_ESCAPED_BYTES = tuple(re.compile(pattern.pattern.encode('ascii')) for pattern in _ESCAPED)
+
+
+def load_schema() -> Dict[str, Any]:
+    """
+    Загрузить schema_mapping.json (один раз)
+    
+    Returns:
+        Dict: {'version': int, 'fields': [имена полей по порядку]}
+    """
+    global _schema_cache
+    if _schema_cache is None:
+        try:
+            with open(SCHEMA_PATH, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            _schema_cache = {
+                'version': data.get('version', 0),
+                'fields': list(data.get('fields', {}).keys())
+            }
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Не удалось загрузить schema_mapping.json: {e}")
+            _schema_cache = {'version': 0, 'fields': []}
+    return _schema_cache
+
+
+def accept_encoding() -> str:
+    """Значение Accept-Encoding с учётом доступных декодеров"""
+    return 'gzip, deflate, br' if BROTLI_AVAILABLE else 'gzip, deflate'
+
+
+def accept_header() -> str:
+    """Значение Accept для списка лицензий (JSON всегда как запасной)"""
+    types = []
+    if MSGPACK_AVAILABLE:
+        types.append(f'{MEDIA_MSGPACK};q=1.0')
+    types.append(f'{MEDIA_COLUMNS};q=0.9')
+    types.append(f'{MEDIA_JSON};q=0.5')
+    return ', '.join(types)
+
+
+def media_type(content_type: Optional[str]) -> str:
+    """Тип тела без параметров (charset и т.п.)"""
+    return (content_type or MEDIA_JSON).split(';', 1)[0].strip().lower()
+
+
+def charset(content_type: Optional[str]) -> Optional[str]:
+    """
+    Кодировка из параметра charset заголовка Content-Type
+    
+    Returns:
+        Optional[str]: Каноническое имя кодировки или None (нет или неизвестна)
+    """
+    for param in (content_type or '').split(';')[1:]:
+        name, _, value = param.partition('=')
+        if name.strip().lower() == 'charset':
+            try:
+                return codecs.lookup(value.strip().strip('"\'')).name
+            except LookupError:
+                return None
+    return None
+
+
+def suspicious_text(text: str) -> bool:
+    """Есть ли в тексте признаки испорченной кодировки"""
+    if not text.isascii() and (_LATIN1_TEXT.search(text) or _CP1251_TEXT.search(text)):
+        return True
+    return '\\u' in text and (
+        '\\ufffd' in text or '\\uFFFD' in text or any(p.search(text) for p in _ESCAPED)
+    )
+
+
+def suspicious_bytes(content: bytes) -> bool:
+    """То же для тела в UTF-8 - по байтам, без декодирования"""
+    # Первый байт символов U+0080-U+00FF в UTF-8 - 0xC2/0xC3
+    if b'\xc2' in content or b'\xc3' in content or b'\xef\xbf\xbd' in content:
+        return True
+    if _CP1251_BYTES.search(content):
+        return True
+    return b'\\u' in content and (
+        b'\\ufffd' in content or b'\\uFFFD' in content or any(p.search(content) for p in _ESCAPED_BYTES)
+    )
+
+
+def _decode_text(content: bytes, charsets) -> str:
+    """Текст тела в первой подходящей кодировке (одно успешное декодирование)"""
+    for name in charsets:
+        try:
+            return content.decode(name)
+        except (UnicodeDecodeError, LookupError):
+            continue
+    return content.decode('latin-1')
+
+
+def decode_payload(content: bytes, content_type: Optional[str]) -> Tuple[Any, bool]:
+    """
+    Разобрать тело ответа и проверить, нужна ли строкам правка кодировки
+    
+    Кодировка выбирается один раз на ответ: charset из Content-Type или
+    UTF-8, а если тело в ней не читается - FALLBACK_CHARSETS. Тело в
+    UTF-8 проверяется на признаки порчи прямо в байтах, до json.loads;
+    без них строки верны и EncodingFixer не нужен.
+    
+    Args:
+        content: Тело ответа (уже распакованное из gzip/br)
+        content_type: Заголовок Content-Type
+    
+    Returns:
+        tuple: (данные как из decode_body, нужна ли правка кодировки)
+    """
+    kind = media_type(content_type)
+    declared = charset(content_type) or DEFAULT_CHARSET
+    
+    if kind == MEDIA_MSGPACK:
+        # Строки MessagePack - всегда UTF-8
+        return decode_body(content, content_type), suspicious_bytes(content)
+    
+    # UTF-8 (не UTF-16/32 без charset - там в начале нулевые байты)
+    if declared in ('utf-8', 'ascii') and b'\x00' not in content[:4]:
+        try:
+            text = content.decode('utf-8')
+        except UnicodeDecodeError:
+            pass
+        else:
+            return _expand(json.loads(text)), suspicious_bytes(content)
+    
+    # Другая кодировка или тело не в объявленной
+    text = _decode_text(content, (declared,) + FALLBACK_CHARSETS)
+    return _expand(json.loads(text)), suspicious_text(text)
+
+
+def decode_body(content: bytes, content_type: Optional[str]) -> Any:
+    """
+    Разобрать тело ответа по Content-Type
+    
+    Колоночный вид ({'format': 'columns', 'fields': [...], 'rows': [...]})
+    разворачивается в обычный {'licenses': [...]}, поэтому вызывающий код
+    не зависит от того, какой формат выбрал сервер.
+    
+    Args:
+        content: Тело ответа (уже распакованное из gzip/br)
+        content_type: Заголовок Content-Type
+    
+    Returns:
+        Any: Данные как из обычного JSON ответа
+    """
+    kind = media_type(content_type)
+    
+    if kind == MEDIA_MSGPACK:
+        if not MSGPACK_AVAILABLE:
+            raise ValueError("Сервер прислал MessagePack, но модуль msgpack не установлен")
+        data = msgpack.unpackb(content, raw=False)
+    else:
+        data = json.loads(content)
+    
+    return _expand(data)
+
+
+def _expand(data: Any) -> Any:
+    """Колоночный ответ - в обычный, остальное как есть"""
+    if isinstance(data, dict) and data.get('format') == 'columns':
+        return expand_columns(data)
+    return data
+
+
+def decode_response(response) -> Any:
+    """Разобрать requests.Response с учётом согласованного формата"""
+    return decode_body(response.content, response.headers.get('Content-Type'))
+
+
+def decode_response_payload(response) -> Tuple[Any, bool]:
+    """Разобрать requests.Response: (данные, нужна ли правка кодировки)"""
+    return decode_payload(response.content, response.headers.get('Content-Type'))
+
+
+def expand_columns(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Развернуть колоночный ответ в список словарей
+    
+    Args:
+        payload: {'format': 'columns', 'fields': [...], 'rows': [[...], ...], ...}
+                 Если fields нет - используется порядок schema_mapping.json
+    
+    Returns:
+        Dict: Тот же ответ с 'licenses' вместо 'fields'/'rows'
+    """
+    fields = payload.get('fields') or load_schema()['fields']
+    rows = payload.get('rows') or []
+    
+    result = {k: v for k, v in payload.items() if k not in ('format', 'fields', 'rows')}
+    result['licenses'] = [dict(zip(fields, row)) for row in rows]
+    return result
+
+
+def encode_columns(licenses: List[Dict[str, Any]], **extra) -> Dict[str, Any]:
+    """
+    Свернуть список лицензий в колоночный вид
+    
+    Поля идут в порядке schema_mapping.json (только встречающиеся в
+    данных), поля вне схемы - следом в порядке появления.
+    
+    Args:
+        licenses: Лицензии
+        **extra: Прочие поля ответа (success, count, ...)
+    
+    Returns:
+        Dict: {'format': 'columns', 'schema_version', 'fields', 'rows', ...}
+    """
+    schema = load_schema()
+    present = {}
+    for lic in licenses:
+        for name in lic:
+            present.setdefault(name, None)
+    
+    fields = [name for name in schema['fields'] if name in present]
+    known = set(fields)
+    fields.extend(name for name in present if name not in known)
+    
+    payload = dict(extra)
+    payload.update({
+        'format': 'columns',
+        'schema_version': schema['version'],
+        'fields': fields,
+        'rows': [[lic.get(name) for name in fields] for lic in licenses]
+    })
+    return payload
\ No newline at end of file
@@ -3,10 +3,21 @@
 Классы для представления бизнес-объектов
 """
 
+from .dates import ParsedDate, parse_date, parse_datetime
+from .frame import LicenseFrame
 from .license import License
-from .stats import Statistics
+from .normalize import LicenseNormalizer, normalize_license
+from .stats import Statistics, panel_statistics, panel_statistics_from_server
 
 __all__ = [
     'License',
-    'Statistics'
+    'LicenseFrame',
+    'LicenseNormalizer',
+    'normalize_license',
+    'ParsedDate',
+    'parse_date',
+    'parse_datetime',
+    'Statistics',
+    'panel_statistics',
+    'panel_statistics_from_server'
 ]
\ No newline at end of file
@@ -0,0 +1,130 @@
+"""
+Разбор дат сервера
+Одна и та же строка ISO 8601 разбирается один раз: дата и строки для
+показа запоминаются по исходной строке
+"""
+
+from datetime import datetime, timezone
+from typing import Any, Dict, NamedTuple, Optional
+
+from utils.lru_cache import BoundedLRU
+
+
+# Сколько различных строк помнить (при переполнении вытесняются давно не
+# встречавшиеся - повторяющиеся сроки и даты создания остаются в кэше)
+CACHE_SIZE = 65536
+
+
+class ParsedDate(NamedTuple):
+    """Разобранная дата и её вид для показа"""
+    value: datetime   # Без часового пояса, приведена к UTC
+    formatted: str    # 'DD.MM.YYYY HH:MM'
+    short: str        # 'DD.MM.YYYY'
+
+
+_cache = BoundedLRU(CACHE_SIZE)
+
+
+def utc_now() -> datetime:
+    """Текущее время в UTC без часового пояса - в тех же часах, что parse_date"""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def _naive_utc(dt: datetime) -> datetime:
+    """Дата с часовым поясом -> UTC без пояса (без пояса - как есть)"""
+    if dt.tzinfo is None:
+        return dt
+    return dt.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def _display(dt: datetime) -> ParsedDate:
+    """Дата со строками для показа (f-строки вместо strftime - в разы быстрее)"""
+    short = f'{dt.day:02d}.{dt.month:02d}.{dt.year:04d}'
+    return ParsedDate(dt, f'{short} {dt.hour:02d}:{dt.minute:02d}', short)
+
+
+def _parse(text: str) -> Optional[datetime]:
+    """Разобрать строку без кэша"""
+    # Формат сервера: 'YYYY-MM-DDTHH:MM:SS[.ffffff]Z' - сразу UTC
+    if len(text) >= 20 and text[-1] == 'Z' and text[10] == 'T':
+        try:
+            return datetime.fromisoformat(text[:-1])
+        except ValueError:
+            pass
+    
+    text = text.strip()
+    if text.endswith('Z'):
+        text = text[:-1] + '+00:00'
+    
+    try:
+        return _naive_utc(datetime.fromisoformat(text))
+    except ValueError:
+        pass
+    
+    # Доли секунды не из 3/6 цифр (Python < 3.11) - отбрасываем, пояс сохраняем
+    head, dot, tail = text.partition('.')
+    if dot:
+        offset = next((i for i, c in enumerate(tail) if c in '+-'), len(tail))
+        try:
+            return _naive_utc(datetime.fromisoformat(head + tail[offset:]))
+        except ValueError:
+            pass
+    
+    try:
+        return datetime.strptime(text.split('T')[0].split(' ')[0], '%Y-%m-%d')
+    except ValueError:
+        return None
+
+
+def _parse_display(text: str) -> Optional[ParsedDate]:
+    """Разобрать строку и подготовить строки для показа"""
+    dt = _parse(text)
+    return _display(dt) if dt is not None else None
+
+
+def parse_date(value: Any, memo: bool = True) -> Optional[ParsedDate]:
+    """
+    Разобрать дату сервера с запоминанием
+    
+    Понимает ISO 8601 ('T' или пробел, доли секунды, 'Z' и смещение)
+    и просто дату 'YYYY-MM-DD'. Дата со смещением приводится к UTC.
+    
+    Args:
+        value: Строка или datetime
+        memo: Запоминать результат (False - для почти уникальных отметок
+              вроде last_check: они только вытесняли бы полезные записи)
+    
+    Returns:
+        Optional[ParsedDate]: Дата и строки для показа или None
+    """
+    if not value:
+        return None
+    
+    if isinstance(value, datetime):
+        return _display(_naive_utc(value))
+    
+    text = value if isinstance(value, str) else str(value)
+    if not memo:
+        return _parse_display(text)
+    return _cache.get_or_compute(text, _parse_display)
+
+
+def parse_datetime(value: Any, memo: bool = True) -> Optional[datetime]:
+    """
+    Разобрать дату сервера в datetime без часового пояса (UTC)
+    
+    Returns:
+        Optional[datetime]: Дата или None
+    """
+    parsed = parse_date(value, memo)
+    return parsed.value if parsed is not None else None
+
+
+def cache_info() -> Dict[str, int]:
+    """Попадания, промахи, вытеснения и размер кэша разбора"""
+    return _cache.stats()
+
+
+def clear_cache():
+    """Очистить кэш разбора"""
+    _cache.clear()
\ No newline at end of file
@@ -0,0 +1,377 @@
+"""
+Колоночное представление списка лицензий (pandas)
+Сроки, срочность, флаги и строки для показа считаются операциями над
+столбцами целиком, а не построчно - для таблицы и статистики
+"""
+
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from .dates import parse_datetime, utc_now
+from .normalize import DATE_FIELDS, NO_EXPIRY_DAYS, _DAYS_LEFT_TEXT, _short_fallback
+
+
+# Поля строк, которые переносятся в столбцы (остальные не нужны)
+FIELDS = (
+    'license_key', 'client_name', 'client_telegram', 'account_number', 'broker_name',
+    'robot_name', 'robot_version', 'account_type', 'status',
+    'last_balance', 'last_equity', 'last_profit'
+) + DATE_FIELDS
+
+URGENCY_LEVELS = ('critical', 'warning', 'attention', 'normal', 'none')
+
+# Статус для колонки таблицы (как LicenseTable._get_status_display)
+STATUS_DISPLAY = {
+    'active': '✅ Активна',
+    'expired': '⏰ Истекла',
+    'blocked': '🔒 Заблокирована',
+    'created': '🌙 Не активирована'
+}
+
+_DAY = np.timedelta64(1, 'D')
+_MINUTE = np.timedelta64(1, 'm')
+
+# Шаблон 'DD.MM.YYYY HH:MM' и позиции цифр: (столбец, компонент, делитель)
+_DATE_TEMPLATE = np.frombuffer(b'00.00.0000 00:00', dtype=np.uint8)
+_DATE_DIGITS = (
+    (0, 'day', 10), (1, 'day', 1), (3, 'month', 10), (4, 'month', 1),
+    (6, 'year', 1000), (7, 'year', 100), (8, 'year', 10), (9, 'year', 1),
+    (11, 'hour', 10), (12, 'hour', 1), (14, 'minute', 10), (15, 'minute', 1)
+)
+
+
+class LicenseFrame:
+    """
+    Список лицензий по столбцам
+    
+    Строится из ответа /api/licenses (обычного или колоночного) или из
+    уже обработанных записей. Статус, days_left, срочность и флаги сроков
+    и проблем вычисляются сразу - так же, как LicenseNormalizer, но по
+    столбцу целиком; даты разбираются один раз на поле при первом
+    обращении. Кодировку текста frame не исправляет: в приложении он
+    строится из записей, уже прошедших конвейер.
+    """
+    
+    def __init__(self, df: pd.DataFrame, now: Optional[datetime] = None,
+                 records: Optional[List[Dict]] = None):
+        """
+        Args:
+            df: Строки лицензий по столбцам
+            now: Время отсчёта сроков в UTC (по умолчанию - сейчас)
+            records: Исходные записи в том же порядке (если frame из них)
+        """
+        self.df = df.reset_index(drop=True)
+        self.now = now or utc_now()
+        self.records = records
+        self._dates: Dict[str, np.ndarray] = {}
+        self._table_rows: Optional[List[tuple]] = None
+        self._enrich()
+    
+    # ==================== ПОСТРОЕНИЕ ====================
+    
+    @classmethod
+    def from_records(cls, rows: Iterable[Dict], now: Optional[datetime] = None) -> 'LicenseFrame':
+        """Построить из списка словарей (сырых или обработанных)"""
+        rows = rows if isinstance(rows, list) else list(rows)
+        columns = {field: [row.get(field) for row in rows] for field in FIELDS}
+        return cls(pd.DataFrame(columns, dtype=object), now, rows)
+    
+    @classmethod
+    def from_payload(cls, payload: Any, now: Optional[datetime] = None) -> 'LicenseFrame':
+        """
+        Построить из ответа /api/licenses
+        
+        Args:
+            payload: {'format': 'columns', 'fields', 'rows'}, {'licenses': [...]}
+                     или сам список лицензий
+        """
+        if isinstance(payload, dict) and payload.get('format') == 'columns':
+            from core.api import wire_format
+            fields = payload.get('fields') or wire_format.load_schema()['fields']
+            df = pd.DataFrame(payload.get('rows') or [], columns=fields, dtype=object)
+            return cls(df.reindex(columns=list(FIELDS)), now)
+        
+        if isinstance(payload, dict):
+            payload = payload.get('licenses') or []
+        return cls.from_records(payload, now)
+    
+    def __len__(self) -> int:
+        return len(self.df)
+    
+    # ==================== ВЫЧИСЛЯЕМЫЕ ПОЛЯ ====================
+    
+    def column(self, name: str) -> np.ndarray:
+        """Столбец как массив объектов (None, если столбца нет)"""
+        if name in self.df.columns:
+            return self.df[name].to_numpy(dtype=object)
+        return np.full(len(self.df), None, dtype=object)
+    
+    def _enrich(self):
+        """Статус, сроки, срочность и проблемы - как LicenseNormalizer._add_state"""
+        df = self.df
+        now = np.datetime64(self.now, 'us')
+        
+        raw_status = pd.Series(self.column('status'), dtype=object)
+        status = raw_status.where(raw_status.map(_is_text), 'created').str.lower().to_numpy(dtype=object, copy=True)
+        
+        # Дни до окончания: как timedelta.days (округление вниз)
+        expiry = self.dates('expiry_date')
+        has_expiry = ~np.isnat(expiry)
+        days_left = np.full(len(df), NO_EXPIRY_DAYS, dtype=np.int64)
+        days_left[has_expiry] = (expiry[has_expiry] - now) // _DAY
+        
+        # Сервер ещё не перевёл в expired - показываем как есть
+        status[(status == 'active') & has_expiry & (days_left < 0)] = 'expired'
+        
+        is_active = status == 'active'
+        df['status'] = status
+        df['days_left'] = days_left
+        df['is_active'] = is_active
+        df['is_expired'] = status == 'expired'
+        df['is_blocked'] = status == 'blocked'
+        df['is_created'] = status == 'created'
+        
+        df['urgency'] = pd.Categorical(
+            np.select(
+                [~is_active, days_left <= 3, days_left <= 7, days_left <= 30],
+                ['none', 'critical', 'warning', 'attention'],
+                'normal'
+            ),
+            categories=URGENCY_LEVELS
+        )
+        df['expiring_critical'] = is_active & (days_left <= 3)
+        df['expiring_soon'] = is_active & (days_left > 3) & (days_left <= 7)
+        
+        # Текст срока: статус, 'N дн.' для активных со сроком, иначе бессрочная
+        text = np.full(len(df), 'Бессрочная', dtype=object)
+        dated = is_active & has_expiry
+        text[dated] = np.char.add(days_left[dated].astype(str), ' дн.').astype(object)
+        text[dated & (days_left == 0)] = 'Истекает сегодня!'
+        for value, label in _DAYS_LEFT_TEXT.items():
+            text[status == value] = label
+        df['days_left_text'] = text
+        
+        # Проблемы (только у активных); баланс - как float(x or 0)
+        balance = pd.to_numeric(pd.Series(self.column('last_balance')), errors='coerce').fillna(0).to_numpy()
+        last_check = self.dates('last_check')
+        checked = ~np.isnat(last_check)
+        stale = np.zeros(len(df), dtype=bool)
+        stale[checked] = (now - last_check[checked]) // _DAY > 7
+        
+        df['low_balance'] = is_active & (balance < 100)
+        df['stale_check'] = is_active & stale
+        df['has_problems'] = df['expiring_critical'] | df['low_balance'] | df['stale_check']
+    
+    # ==================== ДАТЫ ====================
+    
+    def dates(self, field: str) -> np.ndarray:
+        """
+        Даты поля в UTC без пояса (datetime64[us], NaT если нет)
+        
+        Разбор - один раз на поле и pandas по столбцу; строки, которые он
+        не понял (редкие форматы), разбираются parse_datetime по одной.
+        """
+        if field not in self._dates:
+            raw = self.column(field)
+            parsed = pd.to_datetime(pd.Series(raw), errors='coerce', utc=True, format='ISO8601')
+            values = parsed.dt.tz_localize(None).to_numpy(dtype='datetime64[us]', copy=True)
+            
+            unparsed = np.flatnonzero(np.isnat(values) & _present(raw))
+            for i in unparsed:
+                dt = parse_datetime(raw[i])
+                if dt is not None:
+                    values[i] = np.datetime64(dt, 'us')
+            self._dates[field] = values
+        return self._dates[field]
+    
+    def epoch(self, field: str) -> np.ndarray:
+        """Секунды от эпохи (float, NaN если даты нет)"""
+        values = self.dates(field)
+        seconds = values.astype(np.int64) / 1e6
+        return np.where(np.isnat(values), np.nan, seconds)
+    
+    def formatted(self, field: str) -> Dict[str, np.ndarray]:
+        """
+        Строки даты для показа: {'formatted': 'DD.MM.YYYY HH:MM', 'short': 'DD.MM.YYYY'}
+        
+        Цифры раскладываются по шаблону байтов по всему столбцу, без
+        форматирования каждой строки. Нет даты - None; неразобранная
+        строка показывается как есть (как в конвейере).
+        """
+        values = self.dates(field)
+        missing = np.isnat(values)
+        
+        minutes = np.where(missing, np.datetime64(0, 'us'), values).astype('datetime64[m]')
+        days = minutes.astype('datetime64[D]')
+        months = days.astype('datetime64[M]')
+        of_day = ((minutes - days) // _MINUTE).astype(np.int64)
+        parts = {
+            'year': months.astype('datetime64[Y]').astype(np.int64) + 1970,
+            'month': months.astype(np.int64) % 12 + 1,
+            'day': (days - months).astype(np.int64) + 1,
+            'hour': of_day // 60,
+            'minute': of_day % 60
+        }
+        
+        chars = np.tile(_DATE_TEMPLATE, (len(values), 1))
+        for column, part, divisor in _DATE_DIGITS:
+            chars[:, column] = 48 + (parts[part] // divisor) % 10
+        
+        formatted = chars.view('S16').ravel().astype('U16').astype(object)
+        short = np.ascontiguousarray(chars[:, :10]).view('S10').ravel().astype('U10').astype(object)
+        
+        raw = self.column(field)
+        present = _present(raw)
+        for i in np.flatnonzero(missing & present):
+            formatted[i] = raw[i]
+            short[i] = _short_fallback(raw[i])
+        formatted[~present] = None
+        short[~present] = None
+        return {'formatted': formatted, 'short': short}
+    
+    # ==================== ВЫБОРКИ ====================
+    
+    def counts(self) -> Dict[str, int]:
+        """Количество по статусам"""
+        counts = self.df['status'].value_counts()
+        return {status: int(counts.get(status, 0)) for status in ('active', 'expired', 'blocked', 'created')}
+    
+    def with_status(self, status: str) -> List[Dict]:
+        """Записи с этим статусом, в исходном порядке"""
+        return self.rows(np.flatnonzero(self.df['status'].to_numpy(dtype=object) == status))
+    
+    def total(self, field: str) -> float:
+        """Сумма числового поля (нечисловые значения пропускаются)"""
+        return float(np.nansum(self.numbers(field)))
+    
+    def numbers(self, field: str) -> np.ndarray:
+        """
+        Числовое поле (float, NaN если значения нет)
+        
+        Строки не преобразуются: число - только то, что пришло числом.
+        """
+        values = self.column(field)
+        inferred = pd.Series(values, dtype=object).infer_objects()
+        if inferred.dtype.kind in 'biuf':
+            # Весь столбец - числа и пропуски: проверять каждое не нужно
+            return inferred.to_numpy(dtype=float, na_value=np.nan)
+        
+        numeric = np.fromiter((isinstance(value, (int, float)) for value in values),
+                              dtype=bool, count=len(values))
+        result = np.full(len(values), np.nan)
+        result[numeric] = values[numeric].astype(float)
+        return result
+    
+    def truthy(self, field: str) -> np.ndarray:
+        """Маска непустых значений (как bool(value) у записи)"""
+        values = self.column(field)
+        return np.fromiter(map(bool, values), dtype=bool, count=len(values))
+    
+    def rows(self, indices: Iterable[int]) -> List[Dict]:
+        """Записи по номерам строк (исходные, если frame построен из записей)"""
+        indices = list(indices)
+        if self.records is not None:
+            return [self.records[i] for i in indices]
+        part = self.df.take(indices)
+        columns = {name: part[name].to_numpy(dtype=object).tolist() for name in FIELDS}
+        return [dict(zip(columns, row)) for row in zip(*columns.values())]
+    
+    def table_rows(self) -> List[tuple]:
+        """
+        Строки для LicenseTable: (ключ, значения колонок, тег)
+        
+        Совпадает с LicenseTable._row_values, но каждая колонка
+        форматируется по столбцу целиком. Считается один раз на frame.
+        """
+        if self._table_rows is None:
+            self._table_rows = self._format_table_rows()
+        return self._table_rows
+    
+    def _format_table_rows(self) -> List[tuple]:
+        """Значения колонок таблицы для всех строк"""
+        count = len(self.df)
+        
+        def text(field: str, empty: tuple = ()) -> np.ndarray:
+            values = self.column(field).copy()
+            values[_blank(values, empty)] = '-'
+            return values
+        
+        keys = self.column('license_key').copy()
+        keys[_blank(keys)] = 'N/A'
+        
+        balance = self.numbers('last_balance')
+        balance_str = _money('$', np.where(balance > 0, balance, 0.0))
+        
+        equity = self.numbers('last_equity')
+        has_equity = ~np.isnan(equity)
+        equity_str = np.full(count, '-', dtype=object)
+        equity_str[has_equity] = _money('$', np.where(equity[has_equity] > 0, equity[has_equity], 0.0))
+        
+        profit = self.numbers('last_profit')
+        plus = profit >= 0
+        minus = profit < 0
+        profit_str = np.full(count, '-', dtype=object)
+        profit_str[plus] = _money('+$', profit[plus])
+        profit_str[minus] = _money('-$', -profit[minus])
+        
+        account_type = self.column('account_type')
+        type_str = np.full(count, '-', dtype=object)
+        type_str[_isin(account_type, ('Real', 'real', 'REAL'))] = 'Real'
+        type_str[_isin(account_type, ('Demo', 'demo', 'DEMO'))] = 'Demo'
+        
+        days_left = self.df['days_left'].to_numpy()
+        days_str = np.char.add(days_left.astype(str), 'д').astype(object)
+        warn = (days_left > 0) & (days_left <= 7)
+        days_str[warn] = np.char.add('⚠️ ', days_str[warn].astype(str)).astype(object)
+        days_str[days_left == 0] = 'Сегодня!'
+        days_str[(days_left == NO_EXPIRY_DAYS) | (days_left < 0)] = '∞'
+        
+        status = self.df['status'].to_numpy(dtype=object)
+        status_display = status.copy()
+        tag = np.full(count, '', dtype=object)
+        for value, label in STATUS_DISPLAY.items():
+            same = status == value
+            status_display[same] = label
+            tag[same] = value
+        tag[(status == 'active') & warn] = 'expiring'
+        tag[plus] = 'profit_plus'
+        tag[minus] = 'profit_minus'
+        
+        values = zip(
+            keys.tolist(), text('client_name').tolist(), text('account_number', ('',)).tolist(),
+            text('broker_name', ('',)).tolist(), text('robot_name').tolist(),
+            text('robot_version').tolist(), balance_str.tolist(), equity_str.tolist(),
+            profit_str.tolist(), type_str.tolist(), days_str.tolist(), status_display.tolist()
+        )
+        return list(zip(keys.tolist(), values, tag.tolist()))
+
+
+def _is_text(value: Any) -> bool:
+    """Непустая строка"""
+    return isinstance(value, str) and bool(value)
+
+
+def _present(values: np.ndarray) -> np.ndarray:
+    """Маска заполненных значений (не None/NaN и не пустая строка)"""
+    return ~pd.isna(values) & (values != '')
+
+
+def _blank(values: np.ndarray, empty: tuple = ()) -> np.ndarray:
+    """Маска пропусков для показа: None, 'None' и значения из empty"""
+    return pd.isna(values) | _isin(values, ('None',) + empty)
+
+
+def _isin(values: np.ndarray, choices: tuple) -> np.ndarray:
+    """Маска значений из choices (по хэшу - в столбце бывают и None, и строки)"""
+    return pd.Series(values, dtype=object).isin(choices).to_numpy()
+
+
+def _money(prefix: str, amounts: np.ndarray) -> np.ndarray:
+    """Суммы вида '$1234.50' для массива чисел"""
+    if not len(amounts):
+        return np.empty(0, dtype=object)
+    template = prefix + '%.2f'
+    return np.array(list(map(template.__mod__, amounts.tolist())), dtype=object)
\ No newline at end of file
@@ -5,9 +5,11 @@
 """
 
 from typing import Optional, Dict, Any
-from datetime import datetime, timedelta
+from datetime import datetime
 from enum import Enum
 
+from .normalize import UNIQUE_DATE_FIELDS, normalize_license, parse_datetime
+
 
 class LicenseStatus(Enum):
     """Статусы лицензии"""
@@ -34,8 +36,14 @@ class License:
         Инициализация лицензии
         
         Args:
-            data: Словарь с данными лицензии
+            data: Словарь с данными лицензии (запись API клиента или сырая
+                  строка сервера - она пройдёт общий конвейер обработки)
         """
+        # Вычисляемые поля берём из обработанной записи, не пересчитывая
+        data = normalize_license(data)
+        self._data = data
+        self._dates: Dict[str, Optional[datetime]] = {}
+        
         # Основные поля
         self.key: str = data.get('license_key', '')
         self.license_key = self.key  # Для совместимости
@@ -43,31 +51,11 @@ class License:
         self.client_contact: str = data.get('client_contact', '')
         self.client_telegram: str = data.get('client_telegram', '')
         self.notes: str = data.get('notes', '')
+        self.status: str = data['status']
         
-        # Статус
-        status_str = data.get('status', 'created')
-        try:
-            self.status = status_str.lower() if isinstance(status_str, str) else 'created'
-        except:
-            self.status = 'created'
-        
-        # Счёт - ИСПРАВЛЕНО: правильная обработка владельца счета
+        # Счёт
         self.account_number: Optional[str] = str(data.get('account_number', '')) if data.get('account_number') else None
-        
-        # ИСПРАВЛЕНО: Обработка владельца счета
-        owner_raw = data.get('account_owner', '')
-        if owner_raw and owner_raw not in ['None', 'null', '', None]:
-            # Очищаем от мусора
-            self.account_owner = str(owner_raw).strip()
-            # Если владелец не был передан роботом, используем placeholder
-            if self.account_owner in ['', 'None']:
-                self.account_owner = f"Счет {self.account_number}" if self.account_number else "Не указан"
-        else:
-            # Если счет активирован но владелец не передан
-            if self.account_number:
-                self.account_owner = f"Счет {self.account_number}"
-            else:
-                self.account_owner = "Не активирован"
+        self.account_owner: str = data['account_owner']
         
         self.broker: str = data.get('broker_name', '')
         self.broker_name = self.broker  # Для совместимости
@@ -75,12 +63,6 @@ class License:
         self.balance: float = float(data.get('last_balance', 0) or 0)
         self.last_balance = self.balance  # Для совместимости
         
-        # Даты
-        self.created_date = self._parse_date(data.get('created_date'))
-        self.activation_date = self._parse_date(data.get('activation_date'))
-        self.expiry_date = self._parse_date(data.get('expiry_date'))
-        self.last_check = self._parse_date(data.get('last_check'))
-        
         # Версии и технические данные
         self.robot_name: str = data.get('robot_name', '')
         self.robot_version: str = data.get('robot_version', '')
@@ -94,142 +76,45 @@ class License:
         self.failed_checks: int = int(data.get('failed_checks', 0) or 0)
         self.heartbeat_count: int = int(data.get('heartbeat_count', 0) or 0)
         
-        # ИСПРАВЛЕНО: Если days_left уже вычислен на сервере - используем его
-        if 'days_left' in data and data['days_left'] is not None:
-            self.days_left = int(data['days_left'])
-        else:
-            self.days_left = -1
-        
-        # Вычисляемые поля
-        self._calculate_fields()
+        # Вычисляемые поля (LicenseNormalizer)
+        self.days_left: int = data['days_left']
+        self.days_left_text: str = data['days_left_text']
+        self.is_active: bool = data['is_active']
+        self.is_expired: bool = data['is_expired']
+        self.is_blocked: bool = data['is_blocked']
+        self.is_created: bool = data['is_created']
+        self.urgency = LicenseUrgency(data['urgency'])
+        self.has_problems: bool = data['has_problems']
+        self.problems = list(data['problems'])
     
-    def _parse_date(self, date_str: Any) -> Optional[datetime]:
-        """Парсинг даты из различных форматов"""
-        if not date_str:
-            return None
-        
-        if isinstance(date_str, datetime):
-            # Если уже datetime и есть timezone - убираем её
-            if date_str.tzinfo is not None:
-                return date_str.replace(tzinfo=None)
-            return date_str
-        
-        try:
-            # ISO формат с timezone
-            if 'T' in str(date_str):
-                # Убираем микросекунды если есть
-                date_str = str(date_str).split('.')[0]
-                if date_str.endswith('Z'):
-                    date_str = date_str[:-1] + '+00:00'
-                
-                # Пробуем с timezone
-                try:
-                    dt = datetime.fromisoformat(date_str)
-                    # ВАЖНО: убираем timezone
-                    if dt.tzinfo is not None:
-                        dt = dt.replace(tzinfo=None)
-                    return dt
-                except:
-                    # Пробуем без timezone
-                    if '+' in date_str or 'Z' in date_str:
-                        date_str = date_str.split('+')[0].split('Z')[0]
-                    return datetime.fromisoformat(date_str)
-            
-            # Другие форматы
-            return datetime.strptime(str(date_str), '%Y-%m-%d %H:%M:%S')
-        except:
-            # Последняя попытка
-            try:
-                date_only = str(date_str).split('T')[0].split(' ')[0]
-                return datetime.strptime(date_only, '%Y-%m-%d')
-            except:
-                return None
+    # Даты разбираются при первом обращении
     
-    def _calculate_fields(self):
-        """Вычислить дополнительные поля"""
-        # Используем timezone-naive datetime для сравнения
-        now = datetime.now()
-        
-        # ИСПРАВЛЕНО: Правильный расчет дней для активных лицензий
-        # Если days_left не был установлен ранее - вычисляем
-        if self.days_left == -1:
-            if self.expiry_date:
-                # Убеждаемся, что обе даты timezone-naive
-                expiry = self.expiry_date
-                if expiry.tzinfo is not None:
-                    expiry = expiry.replace(tzinfo=None)
-                
-                delta = expiry - now
-                self.days_left = max(0, delta.days)
-            else:
-                # Если нет даты истечения
-                if self.status == 'created':
-                    self.days_left = -1  # Не активирована
-                else:
-                    self.days_left = 999  # Бессрочная
-        
-        # Флаги состояния
-        self.is_active = self.status == 'active'
-        self.is_expired = self.status == 'expired'
-        self.is_blocked = self.status == 'blocked'
-        self.is_created = self.status == 'created'
-        
-        # ИСПРАВЛЕНО: Текстовое представление оставшихся дней
-        if self.status == 'created':
-            self.days_left_text = '(не активирована)'
-        elif self.status == 'expired':
-            self.days_left_text = 'Истекла'
-        elif self.status == 'blocked':
-            self.days_left_text = 'Заблокирована'
-        elif self.expiry_date and self.is_active:
-            if self.days_left == 0:
-                self.days_left_text = 'Истекает сегодня!'
-            elif self.days_left < 0:
-                self.days_left_text = 'Истекла'
-            else:
-                self.days_left_text = f'{self.days_left} дн.'
-        else:
-            self.days_left_text = 'Бессрочная'
-        
-        # Уровень срочности
-        if self.is_active:
-            if self.days_left <= 3:
-                self.urgency = LicenseUrgency.CRITICAL
-            elif self.days_left <= 7:
-                self.urgency = LicenseUrgency.WARNING
-            elif self.days_left <= 30:
-                self.urgency = LicenseUrgency.ATTENTION
-            else:
-                self.urgency = LicenseUrgency.NORMAL
-        else:
-            self.urgency = LicenseUrgency.NONE
-        
-        # Проблемы
-        self.has_problems = False
-        self.problems = []
-        
-        if self.is_active:
-            # Проверка критичного срока
-            if self.days_left <= 3:
-                self.has_problems = True
-                self.problems.append('Срок истекает!')
-            
-            # Проверка баланса
-            if self.balance < 100:
-                self.has_problems = True
-                self.problems.append('Низкий баланс')
-            
-            # Проверка активности
-            if self.last_check:
-                # Убеждаемся, что last_check timezone-naive
-                last_check = self.last_check
-                if last_check.tzinfo is not None:
-                    last_check = last_check.replace(tzinfo=None)
-                
-                days_since_check = (now - last_check).days
-                if days_since_check > 7:
-                    self.has_problems = True
-                    self.problems.append('Давно не проверялась')
+    @property
+    def created_date(self) -> Optional[datetime]:
+        return self._date('created_date')
+    
+    @property
+    def activation_date(self) -> Optional[datetime]:
+        return self._date('activation_date')
+    
+    @property
+    def expiry_date(self) -> Optional[datetime]:
+        return self._date('expiry_date')
+    
+    @property
+    def last_check(self) -> Optional[datetime]:
+        return self._date('last_check')
+    
+    def _date(self, field: str) -> Optional[datetime]:
+        """Дата поля (разобранная один раз)"""
+        if field not in self._dates:
+            self._dates[field] = self._parse_date(self._data.get(field),
+                                                  memo=field not in UNIQUE_DATE_FIELDS)
+        return self._dates[field]
+    
+    def _parse_date(self, date_str: Any, memo: bool = True) -> Optional[datetime]:
+        """Парсинг даты из различных форматов"""
+        return parse_datetime(date_str, memo)
     
     def to_dict(self) -> Dict[str, Any]:
         """
@@ -0,0 +1,281 @@
+"""
+Нормализация лицензий
+Сырая строка сервера за один проход превращается в готовую к показу
+запись: исправленная кодировка, владелец счёта, даты для отображения,
+дни до окончания, срочность и проблемы
+"""
+
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from .dates import parse_date, parse_datetime, utc_now
+
+try:
+    from modules.encoding_fix import EncodingFixer, repair_mt4_text
+except ImportError:
+    EncodingFixer = None
+    repair_mt4_text = str.strip
+
+
+# Поля с датами (для каждого добавляются _raw, _formatted и _short)
+DATE_FIELDS = ('created_date', 'activation_date', 'expiry_date', 'last_check')
+
+# Даты, почти уникальные для каждой строки - разбираются без кэша
+UNIQUE_DATE_FIELDS = frozenset({'last_check'})
+
+# Дни до окончания, если срок не задан или не разобран
+NO_EXPIRY_DAYS = 999
+
+# Отметка обработанной записи и версия обработки: запись другой версии
+# (например, из старого снимка на диске) обрабатывается заново
+NORMALIZED_KEY = '_normalized'
+NORMALIZED_VERSION = 3
+
+# Поля, от которых зависят вычисляемые (days_left, urgency, problems...)
+STATE_FIELDS = ('status', 'expiry_date', 'last_balance', 'last_check')
+
+# Вычисляемые из STATE_FIELDS (status - истёкшие активные становятся expired)
+DERIVED_FIELDS = ('status', 'days_left', 'is_active', 'is_expired', 'is_blocked', 'is_created',
+                  'days_left_text', 'urgency', 'problems', 'has_problems')
+
+# Поля из терминала MT4 кроме владельца (кодировка терминала не UTF-8)
+MT4_TEXT_FIELDS = ('broker_name', 'robot_name')
+
+# Все поля MT4: их исправляет только детектор (repair_mt4_text) по
+# исходной строке - общее исправление кодировки их не трогает
+MT4_FIELDS = ('account_owner',) + MT4_TEXT_FIELDS
+
+_DAYS_LEFT_TEXT = {
+    'created': '(не активирована)',
+    'expired': 'Истекла',
+    'blocked': 'Заблокирована'
+}
+
+
+def _short_fallback(value: Any) -> str:
+    """Дата без времени из неразобранной строки"""
+    text = str(value)
+    if 'T' in text:
+        return text.split('T')[0]
+    return text[:10]
+
+
+class LicenseNormalizer:
+    """
+    Конвейер обработки строк лицензий
+    
+    Каждая сырая строка проходит его ровно один раз - в APIClient, в
+    LicensesAPI или в License, если пришла необработанной. Результат -
+    новый словарь со всеми полями, нужными таблице, диалогам и модели;
+    обработанная запись помечена NORMALIZED_KEY и повторно не
+    обрабатывается.
+    """
+    
+    def __init__(self, fix_encoding: Optional[Callable[[Dict], Dict]] = None):
+        """
+        Args:
+            fix_encoding: Исправление кодировки словаря (по умолчанию
+                          EncodingFixer.fix_dict_encoding, если доступен)
+        """
+        if fix_encoding is None:
+            fix_encoding = EncodingFixer.fix_dict_encoding if EncodingFixer else dict
+        self.fix_encoding = fix_encoding
+    
+    # ==================== ЗАПИСИ ====================
+    
+    def normalize(self, raw: Dict, now: Optional[datetime] = None,
+                  fix_encoding: bool = True) -> Dict:
+        """
+        Обработать строку сервера
+        
+        Args:
+            raw: Сырая лицензия
+            now: Текущее время в UTC (для пачки - одно на всю пачку)
+            fix_encoding: Исправлять кодировку строк (False - ответ уже
+                          проверен при разборе, см. wire_format.decode_payload)
+        
+        Returns:
+            Dict: Готовая к показу запись
+        """
+        if raw.get(NORMALIZED_KEY) == NORMALIZED_VERSION:
+            return raw
+        
+        record = self._fix_text(raw) if fix_encoding else dict(raw)
+        record['account_owner'] = self._account_owner(record)
+        self._repair_mt4(record)
+        
+        status = record.get('status')
+        record['status'] = status.lower() if isinstance(status, str) and status else 'created'
+        
+        parsed = self._add_dates(record, DATE_FIELDS)
+        self._add_state(record, parsed.get('expiry_date'), parsed.get('last_check'),
+                        now or utc_now())
+        
+        record[NORMALIZED_KEY] = NORMALIZED_VERSION
+        return record
+    
+    def normalize_many(self, rows: Iterable[Dict], fix_encoding: bool = True) -> List[Dict]:
+        """Обработать список строк (время отсчёта одно на весь список)"""
+        now = utc_now()
+        return [self.normalize(raw, now, fix_encoding) for raw in rows]
+    
+    def patch(self, row: Dict, patch: Dict, now: Optional[datetime] = None) -> Dict:
+        """
+        Обработать частичное обновление строки (событие сервера)
+        
+        В результате - пришедшие поля и вычисляемые из них; остальные поля
+        строки не трогаются.
+        
+        Args:
+            row: Текущая запись
+            patch: Изменённые поля без license_key
+            now: Текущее время в UTC
+        
+        Returns:
+            Dict: Поля для row.update()
+        """
+        fields = self._fix_text(patch)
+        if 'account_owner' in fields:
+            fields['account_owner'] = self._account_owner(dict(row, **fields))
+        self._repair_mt4(fields)
+        if isinstance(fields.get('status'), str):
+            fields['status'] = fields['status'].lower()
+        
+        self._add_dates(fields, [name for name in DATE_FIELDS if name in fields])
+        
+        if any(name in fields for name in STATE_FIELDS):
+            merged = dict(row, **fields)
+            self._add_state(merged, parse_datetime(merged.get('expiry_date')),
+                            parse_datetime(merged.get('last_check'), memo=False),
+                            now or utc_now())
+            fields.update((name, merged[name]) for name in DERIVED_FIELDS)
+        
+        return fields
+    
+    # ==================== ЭТАПЫ ====================
+    
+    def _fix_text(self, raw: Dict) -> Dict:
+        """
+        Исправить кодировку строк, кроме полей MT4
+        
+        Поля MT4 остаются исходными: после общего исправления детектор
+        уже не распознал бы испорченный текст (CP1252 'ÐŸÐµÑ‚Ñ€Ð¾Ð²').
+        """
+        mt4 = {field: raw[field] for field in MT4_FIELDS if field in raw}
+        if not mt4:
+            return self.fix_encoding(raw)
+        
+        record = self.fix_encoding({key: value for key, value in raw.items() if key not in mt4})
+        record.update(mt4)
+        return record
+    
+    @staticmethod
+    def _account_owner(record: Dict) -> str:
+        """Владелец счёта: исправить кодировку MT4 или подставить заглушку"""
+        owner_raw = record.get('account_owner')
+        account = record.get('account_number')
+        
+        if not owner_raw or owner_raw in ('None', 'null'):
+            return f"Счет {account}" if account else 'Не активирован'
+        if not isinstance(owner_raw, str):
+            return str(owner_raw).strip()
+        
+        return repair_mt4_text(owner_raw) or f"Счет {account or 'N/A'}"
+        
+    @staticmethod
+    def _repair_mt4(record: Dict):
+        """Исправить кодировку брокера и робота (строки из MT4)"""
+        for field in MT4_TEXT_FIELDS:
+            value = record.get(field)
+            if value and isinstance(value, str):
+                record[field] = repair_mt4_text(value)
+    
+    @staticmethod
+    def _add_dates(record: Dict, fields: Iterable[str]) -> Dict[str, Optional[datetime]]:
+        """
+        Добавить _raw/_formatted/_short для дат
+        
+        Returns:
+            Dict: Разобранные даты по полям (для вычисления сроков)
+        """
+        parsed = {}
+        for field in fields:
+            value = record.get(field)
+            if not value:
+                continue
+            date = parse_date(value, memo=field not in UNIQUE_DATE_FIELDS)
+            record[f'{field}_raw'] = value
+            if date is not None:
+                parsed[field] = date.value
+                record[f'{field}_formatted'] = date.formatted
+                record[f'{field}_short'] = date.short
+            else:
+                parsed[field] = None
+                record[f'{field}_formatted'] = value
+                record[f'{field}_short'] = _short_fallback(value)
+        return parsed
+    
+    @staticmethod
+    def _add_state(record: Dict, expiry: Optional[datetime], last_check: Optional[datetime],
+                   now: datetime):
+        """Дни до окончания, статус истёкших, срочность и проблемы (все даты - UTC)"""
+        status = record.get('status')
+        
+        if expiry is not None:
+            days_left = (expiry - now).days
+            # Сервер ещё не перевёл в expired - показываем как есть
+            if days_left < 0 and status == 'active':
+                status = record['status'] = 'expired'
+        else:
+            days_left = NO_EXPIRY_DAYS
+        record['days_left'] = days_left
+        
+        is_active = status == 'active'
+        record['is_active'] = is_active
+        record['is_expired'] = status == 'expired'
+        record['is_blocked'] = status == 'blocked'
+        record['is_created'] = status == 'created'
+        
+        if status in _DAYS_LEFT_TEXT:
+            text = _DAYS_LEFT_TEXT[status]
+        elif is_active and expiry is not None:
+            text = 'Истекает сегодня!' if days_left == 0 else f'{days_left} дн.'
+        else:
+            text = 'Бессрочная'
+        record['days_left_text'] = text
+        
+        if not is_active:
+            urgency = 'none'
+        elif days_left <= 3:
+            urgency = 'critical'
+        elif days_left <= 7:
+            urgency = 'warning'
+        elif days_left <= 30:
+            urgency = 'attention'
+        else:
+            urgency = 'normal'
+        record['urgency'] = urgency
+        
+        problems = []
+        if is_active:
+            if days_left <= 3:
+                problems.append('Срок истекает!')
+            try:
+                balance = float(record.get('last_balance') or 0)
+            except (TypeError, ValueError):
+                balance = 0.0
+            if balance < 100:
+                problems.append('Низкий баланс')
+            if last_check is not None and (now - last_check).days > 7:
+                problems.append('Давно не проверялась')
+        record['problems'] = problems
+        record['has_problems'] = bool(problems)
+
+
+# Общий конвейер (кодировка - EncodingFixer по умолчанию)
+default_normalizer = LicenseNormalizer()
+
+
+def normalize_license(raw: Dict, now: Optional[datetime] = None) -> Dict:
+    """Обработать строку общим конвейером"""
+    return default_normalizer.normalize(raw, now)
\ No newline at end of file
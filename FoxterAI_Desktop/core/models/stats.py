@@ -5,7 +5,13 @@
 """
 
 from typing import List, Dict, Any, Optional
-from datetime import datetime, timedelta
+from datetime import timedelta
+
+import numpy as np
+import pandas as pd
+
+from .dates import utc_now
+from .frame import LicenseFrame
 
 
 class Statistics:
@@ -16,13 +22,16 @@ class Statistics:
         Инициализация статистики
         
         Args:
-            licenses: Список лицензий для анализа
+            licenses: Список лицензий (объекты License) или LicenseFrame
         """
         self.licenses = licenses or []
         self._stats = self._calculate()
     
     def _calculate(self) -> Dict[str, Any]:
         """Рассчитать всю статистику"""
+        if isinstance(self.licenses, LicenseFrame):
+            return self._calculate_frame(self.licenses)
+        
         stats = {
             # Количество
             'total': len(self.licenses),
@@ -67,7 +76,7 @@ class Statistics:
         
         real_balances = []  # Балансы только реальных счетов
         all_balances = []   # Все балансы для статистики
-        now = datetime.now()
+        now = utc_now()  # Даты лицензий - UTC
         month_ago = now - timedelta(days=30)
         today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
         
@@ -98,7 +107,7 @@ class Statistics:
                             'message': f"Лицензия {license.key} истекает через {license.days_left} дн.",
                             'license': license
                         })
-                        
+            
             elif status == 'expired':
                 stats['expired'] += 1
                 
@@ -111,7 +120,7 @@ class Statistics:
                     delta = now - expiry
                     if delta.days <= 30:
                         stats['expired_recently'] += 1
-                        
+            
             elif status == 'blocked':
                 stats['blocked'] += 1
                 stats['problems'].append({
@@ -119,7 +128,7 @@ class Statistics:
                     'message': f"Лицензия {license.key} заблокирована",
                     'license': license
                 })
-                
+            
             elif status == 'created':
                 stats['created'] += 1
             
@@ -181,7 +190,7 @@ class Statistics:
                 broker = license.broker
             elif hasattr(license, 'broker_name'):
                 broker = license.broker_name
-                
+            
             if broker:
                 stats['unique_brokers'].add(broker)
             
@@ -239,12 +248,116 @@ class Statistics:
         
         return stats
     
+    def _calculate_frame(self, frame: LicenseFrame) -> Dict[str, Any]:
+        """
+        Та же статистика по столбцам LicenseFrame
+        
+        Счётчики - суммы масок; проблемы собираются по маскам и
+        упорядочиваются по строкам, как при обходе списка. В проблемах
+        'license' - запись списка, а не объект License.
+        """
+        df = frame.df
+        now = np.datetime64(frame.now, 'us')
+        day = np.timedelta64(1, 'D')
+        
+        status = df['status'].to_numpy(dtype=object)
+        days_left = df['days_left'].to_numpy()
+        active = status == 'active'
+        blocked = status == 'blocked'
+        critical = active & (days_left >= 0) & (days_left <= 3)
+        soon = active & (days_left > 3) & (days_left <= 7)
+        
+        expiry = frame.dates('expiry_date')
+        recent = (status == 'expired') & ~np.isnat(expiry)
+        recent[recent] = (now - expiry[recent]) // day <= 30
+        
+        # Тип счёта: явный 'real'/'demo', иначе по балансу (демо - больше 100k)
+        balance = pd.to_numeric(pd.Series(frame.column('last_balance')), errors='coerce').fillna(0).to_numpy()
+        account_type = frame.column('account_type')
+        demo = (account_type == 'demo') | ((account_type != 'real') & (balance > 100000))
+        real_balance = ~demo & (balance > 0)
+        real_values = balance[real_balance]
+        low_balance = real_balance & (balance < 100) & active
+        
+        activation = frame.dates('activation_date')
+        activated = ~np.isnat(activation)
+        activated[activated] = activation[activated] >= now - 30 * day
+        
+        last_check = frame.dates('last_check')
+        checked = ~np.isnat(last_check)
+        checked_today = checked.copy()
+        checked_today[checked] = last_check[checked] >= now.astype('datetime64[D]')
+        never_checked = ~checked & active
+        
+        broker = frame.column('broker_name')
+        client = frame.column('client_name')
+        counts = frame.counts()
+        
+        stats = {
+            'total': len(frame),
+            'active': counts['active'],
+            'expired': counts['expired'],
+            'blocked': counts['blocked'],
+            'created': counts['created'],
+            'total_balance': float(real_values.sum()),
+            'average_balance': float(real_values.mean()) if len(real_values) else 0.0,
+            'max_balance': float(real_values.max()) if len(real_values) else 0.0,
+            'min_balance': float(real_values.min()) if len(real_values) else 0.0,
+            'real_accounts_count': int((~demo).sum()),
+            'demo_accounts_count': int(demo.sum()),
+            'total_accounts': int(frame.truthy('account_number').sum()),
+            'expiring_soon': int(soon.sum()),
+            'expiring_critical': int(critical.sum()),
+            'expired_recently': int(recent.sum()),
+            'activated_this_month': int(activated.sum()),
+            'checked_today': int(checked_today.sum()),
+            'never_checked': int(never_checked.sum()),
+            'clients_with_telegram': int(frame.truthy('client_telegram').sum()),
+            'problems': self._frame_problems(frame, {
+                'critical': critical, 'soon': soon, 'blocked': blocked,
+                'low_balance': low_balance, 'never_checked': never_checked
+            }, days_left, balance),
+            'unique_brokers_count': len(pd.unique(broker[frame.truthy('broker_name')])),
+            'unique_clients_count': len(pd.unique(client[frame.truthy('client_name')]))
+        }
+        stats['balance'] = stats['total_balance']
+        return stats
+    
+    @staticmethod
+    def _frame_problems(frame: LicenseFrame, masks: Dict[str, np.ndarray],
+                        days_left: np.ndarray, balance: np.ndarray) -> List[Dict]:
+        """Проблемы по маскам в порядке строк (внутри строки - как в _calculate)"""
+        keys = frame.column('license_key')
+        clients = frame.column('client_name')
+        kinds = (
+            ('critical', 'critical', lambda i: f"Лицензия {keys[i]} истекает через {days_left[i]} дн."),
+            ('soon', 'warning', lambda i: f"Лицензия {keys[i]} истекает через {days_left[i]} дн."),
+            ('blocked', 'info', lambda i: f"Лицензия {keys[i]} заблокирована"),
+            ('low_balance', 'warning', lambda i: f"Низкий баланс у {clients[i]}: ${balance[i]:.0f}"),
+            ('never_checked', 'info', lambda i: f"Лицензия {keys[i]} не проверялась")
+        )
+        
+        rows = [np.flatnonzero(masks[name]) for name, _, _ in kinds]
+        if not any(len(part) for part in rows):
+            return []
+        
+        kind = np.concatenate([np.full(len(part), n) for n, part in enumerate(rows)])
+        rows = np.concatenate(rows)
+        order = np.lexsort((kind, rows))
+        records = frame.rows(rows[order])
+        
+        problems = []
+        for n, i, record in zip(kind[order].tolist(), rows[order].tolist(), records):
+            _, problem_type, message = kinds[n]
+            problems.append({'type': problem_type, 'message': message(i), 'license': record})
+        return problems
+    
     def update(self, licenses: List):
         """
         Обновить статистику с новым списком лицензий
         
         Args:
-            licenses: Новый список лицензий
+            licenses: Новый список лицензий или LicenseFrame
         """
         self.licenses = licenses
         self._stats = self._calculate()
@@ -464,7 +577,7 @@ class Statistics:
             alerts.append(f"❓ {never_checked} лицензий ни разу не проверялись")
         
         # Подсчет проблем с балансом (только реальные счета)
-        low_balance_count = sum(1 for p in self.problems 
+        low_balance_count = sum(1 for p in self.problems
                                 if 'баланс' in p.get('message', '').lower())
         if low_balance_count > 0:
             alerts.append(f"💰 {low_balance_count} реальных счетов с низким балансом")
@@ -486,13 +599,13 @@ class Statistics:
         
         Args:
             balance: Сумма для форматирования (если None, берется total_balance)
-            
+        
         Returns:
             str: Форматированная сумма
         """
         if balance is None:
             balance = self.total_balance
-            
+        
         if balance >= 1000000:
             return f"${balance/1000000:.1f}M"
         elif balance >= 1000:
@@ -556,4 +669,93 @@ class Statistics:
     
     def __repr__(self) -> str:
         """Представление для отладки"""
-        return f"<Statistics licenses={self.total} real_accounts={self.real_accounts_count} health={self.get_health_score():.1f}%>"
\ No newline at end of file
+        return f"<Statistics licenses={self.total} real_accounts={self.real_accounts_count} health={self.get_health_score():.1f}%>"
+
+# ==================== ПАНЕЛЬ СТАТИСТИКИ ====================
+
+def empty_panel_statistics() -> Dict[str, Any]:
+    """Нулевая статистика для панели"""
+    return {'total': 0, 'active': 0, 'expired': 0, 'blocked': 0, 'inactive': 0, 'balance': 0.0}
+
+
+def panel_statistics(licenses: List) -> Dict[str, Any]:
+    """
+    Статистика для панели за один проход по списку
+    
+    Считает так же, как GET /api/statistics: неактивные - статус
+    'created', баланс - только по счетам с account_type 'Real'.
+    Используется, когда агрегат сервера недоступен (нет подключения).
+    
+    Args:
+        licenses: Лицензии (словари или объекты License) или LicenseFrame
+    
+    Returns:
+        Dict: {'total', 'active', 'expired', 'blocked', 'inactive', 'balance'}
+    """
+    if isinstance(licenses, LicenseFrame):
+        return _panel_statistics_frame(licenses)
+    
+    stats = empty_panel_statistics()
+    counters = {'active': 'active', 'expired': 'expired', 'blocked': 'blocked', 'created': 'inactive'}
+    balance = 0.0
+    
+    for license in licenses or ():
+        if isinstance(license, dict):
+            status = license.get('status')
+            account_type = license.get('account_type')
+            last_balance = license.get('last_balance')
+        else:
+            status = getattr(license, 'status', None)
+            account_type = getattr(license, 'account_type', None)
+            last_balance = getattr(license, 'last_balance', None)
+        
+        counter = counters.get(status)
+        if counter:
+            stats[counter] += 1
+        
+        if account_type == 'Real' and last_balance:
+            try:
+                balance += float(last_balance)
+            except (TypeError, ValueError):
+                pass
+    
+    stats['total'] = len(licenses or ())
+    stats['balance'] = balance
+    return stats
+
+
+def _panel_statistics_frame(frame: LicenseFrame) -> Dict[str, Any]:
+    """panel_statistics по столбцам LicenseFrame"""
+    counts = frame.counts()
+    balance = pd.to_numeric(pd.Series(frame.column('last_balance')), errors='coerce').to_numpy()
+    real = frame.column('account_type') == 'Real'
+    return {
+        'total': len(frame),
+        'active': counts['active'],
+        'expired': counts['expired'],
+        'blocked': counts['blocked'],
+        'inactive': counts['created'],
+        'balance': float(np.nansum(balance[real]))
+    }
+
+
+def panel_statistics_from_server(data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Привести ответ GET /api/statistics к ключам панели
+    
+    Args:
+        data: {'licenses': {...}, 'metrics': {...}} из поля 'statistics'
+    
+    Returns:
+        Dict: {'total', 'active', 'expired', 'blocked', 'inactive', 'balance'}
+    """
+    counts = data.get('licenses') or {}
+    metrics = data.get('metrics') or {}
+    return {
+        'total': int(counts.get('total') or 0),
+        'active': int(counts.get('active') or 0),
+        'expired': int(counts.get('expired') or 0),
+        'blocked': int(counts.get('blocked') or 0),
+        'inactive': int(counts.get('inactive') or 0),
+        'balance': float(metrics.get('total_balance') or 0)
+    }
\ No newline at end of file
@@ -4,7 +4,13 @@
 """
 
 from .license_service import LicenseService
+from .task_executor import CancellationToken, TaskCancelled, TaskExecutor
+from .ui_dispatch import UIDispatcher
 
 __all__ = [
-    'LicenseService'
+    'LicenseService',
+    'TaskExecutor',
+    'CancellationToken',
+    'TaskCancelled',
+    'UIDispatcher'
 ]
\ No newline at end of file
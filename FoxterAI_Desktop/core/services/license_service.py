@@ -4,8 +4,13 @@
 """
 
 from typing import List, Dict, Optional, Callable, Any
+from collections import OrderedDict
+from concurrent.futures import Future
+import asyncio
+import hashlib
 import threading
-from datetime import datetime
+import time
+from datetime import datetime, date
 
 # Используем СУЩЕСТВУЮЩИЙ API клиент из modules
 import sys
@@ -24,10 +29,52 @@ except ImportError:
         print("❌ APIClient не найден!")
         APIClient = None
 
+from core.api.async_client import AsyncAPIClient
+from core.api.transport import close_transports
+from core.api.events import EVENTS_PATH
+from core.services.live_updates import LiveUpdates
+from core.services.snapshot_store import SnapshotStore
+from core.services.search_index import LicenseSearchIndex
+from core.models.dates import parse_datetime
+from core.models.frame import LicenseFrame
+from core.models.stats import panel_statistics, panel_statistics_from_server
+
 
 class LicenseService:
     """Сервис для управления лицензиями"""
     
+    # Через сколько дельта-синхронизаций делать полную (ловим удаления)
+    FULL_SYNC_EVERY = 20
+    
+    # Поля, по которым вычисляется высшая отметка снимка
+    HIGH_WATER_FIELDS = ('last_update', 'last_check', 'activation_date', 'created_date')
+    
+    # Массовые операции
+    BULK_STATUS_CHUNK = 200   # Ключей в одном запросе /api/batch-update
+    BULK_CONCURRENCY = 4      # Параллельных запросов при продлении/удалении
+    
+    # Сколько ждать перед отложенной загрузкой, чтобы собрать серию запросов
+    REFRESH_DEBOUNCE = 0.25
+    
+    # Потоковая загрузка полного списка
+    STREAM_BATCH_SIZE = 200     # Максимум строк в пачке
+    STREAM_TIME_BUDGET = 0.05   # Максимальное время набора пачки, секунд
+    
+    # Постраничный режим
+    PAGE_CACHE_SIZE = 8    # Сколько страниц держать в памяти
+    PREFETCH_PAGES = 1     # Сколько соседних страниц подгружать с каждой стороны
+    
+    # Поиск: до этого размера загруженного списка ищем локально, иначе на сервере
+    SEARCH_LOCAL_THRESHOLD = 20000
+    SEARCH_FIELDS = ('license_key', 'client_name', 'client_contact', 'client_telegram',
+                     'account_number', 'broker_name', 'robot_name')
+    
+    # Как часто (не чаще) переписывать файл метрик OpenMetrics, секунд
+    METRICS_DUMP_INTERVAL = 10.0
+    
+    # Живые обновления: сколько различных лицензий копить до полной перезагрузки
+    LIVE_MAX_PENDING = 5000
+    
     def __init__(self):
         """Инициализация сервиса"""
         print("🔧 Инициализация LicenseService...")
@@ -42,6 +89,75 @@ class LicenseService:
         self.licenses: List[Dict] = []
         self.statistics = {}
         
+        # Снимок для дельта-синхронизации
+        self.delta_sync_enabled = True
+        self._snapshot: Dict[str, Dict] = {}
+        self._high_water: Optional[str] = None
+        self._etag: Optional[str] = None
+        self._last_modified: Optional[str] = None
+        self._validators_accept: Optional[str] = None  # Accept запроса, на который выданы ETag/Last-Modified
+        self._deltas_since_full = 0
+        self._snapshot_epoch = 0       # Растёт при удалениях и сбросе снимка вне синхронизации
+        self._snapshot_day: Optional[date] = None
+        self._snapshot_unchanged = False
+        self._sync_lock = threading.Lock()
+        
+        # Зеркало снимка в SQLite для поиска и фильтров (только полный список)
+        self.search_index: Optional[LicenseSearchIndex] = (
+            None if self.config['paged_mode'] else LicenseSearchIndex()
+        )
+        
+        # Хэш содержимого последнего списка: одинаковый хэш - перерисовка
+        # не нужна (см. _load_licenses и автообновление)
+        self.content_hash: Optional[str] = None
+        self.last_load_ok = False
+        
+        # Полный список отдаётся в UI пачками по мере загрузки
+        self.streaming_enabled = True
+        
+        # Постраничный режим: видимая страница первой, соседние - в фоне
+        self.paged_mode = self.config['paged_mode']
+        self.page_size = max(1, self.config['items_per_page'])
+        self.total_licenses = 0
+        self._pages: 'OrderedDict[int, Dict]' = OrderedDict()
+        self._page_futures: Dict[int, Future] = {}
+        self._pages_lock = threading.Lock()
+        
+        # Поиск: последний запрос и замеры времени по способам
+        self._search_future: Optional[Future] = None
+        self._search_lock = threading.Lock()
+        self.search_metrics = {
+            'local': {'count': 0, 'total_ms': 0.0, 'last_ms': 0.0, 'max_ms': 0.0},
+            'remote': {'count': 0, 'total_ms': 0.0, 'last_ms': 0.0, 'max_ms': 0.0}
+        }
+        
+        # Живые обновления по потоку событий сервера
+        self.live_updates_enabled = self.config['live_updates']
+        self.live_updates: Optional[LiveUpdates] = None
+        
+        # Файл для выгрузки метрик (пусто - не выгружать)
+        self.metrics_file = self.config['metrics_file']
+        self._metrics_dumped_at = 0.0
+        
+        # Объединение одновременных загрузок (single-flight)
+        self._flight_lock = threading.Lock()
+        self._flight: Optional[Future] = None
+        self._flight_force_full = False
+        self._flight_version = 0
+        self._trailing: Optional[Future] = None
+        self._trailing_force_full = False
+        self._data_version = 0         # Растёт при каждом изменении через API
+        self._generation = 0           # Номер последней запущенной загрузки
+        self._applied_generation = 0   # Номер загрузки, чьи данные показаны
+        
+        self._rows_version = 0         # Растёт при живых обновлениях строк
+        self._saved_rows_version = 0   # _rows_version на момент записи снимка
+        
+        # Колоночное представление полного списка (таблица и статистика)
+        self._frame: Optional[LicenseFrame] = None
+        self._frame_version = 0        # _rows_version, по которому построен frame
+        self._frame_lock = threading.Lock()
+        
         # Состояние
         self.is_connected = False
         self.last_error = None
@@ -50,6 +166,7 @@ class LicenseService:
         self.on_connected: Optional[Callable] = None
         self.on_disconnected: Optional[Callable] = None
         self.on_licenses_loaded: Optional[Callable] = None
+        self.on_licenses_batch: Optional[Callable] = None
         self.on_error: Optional[Callable] = None
         
         print("✅ LicenseService инициализирован")
@@ -68,7 +185,12 @@ class LicenseService:
             'port': config.getint('SERVER', 'port', fallback=3000),
             'protocol': config.get('SERVER', 'protocol', fallback='http'),
             'timeout': config.getint('SERVER', 'timeout', fallback=10),
-            'api_key': config.get('SERVER', 'api_key', fallback='')
+            'api_key': config.get('SERVER', 'api_key', fallback=''),
+            'items_per_page': config.getint('APP', 'items_per_page', fallback=50),
+            'paged_mode': config.getboolean('APP', 'paged_mode', fallback=False),
+            'metrics_file': config.get('APP', 'metrics_file', fallback=''),
+            'live_updates': config.getboolean('APP', 'live_updates', fallback=True),
+            'snapshot_cache': config.get('APP', 'snapshot_cache', fallback='cache/licenses_snapshot.db')
         }
         
         print(f"📌 Конфигурация: {conf_dict['protocol']}://{conf_dict['host']}:{conf_dict['port']}")
@@ -78,6 +200,17 @@ class LicenseService:
     
     def _init_api_client(self):
         """Инициализировать API клиент"""
+        self.async_client = None
+        
+        # Снимок на диске - только для полного списка (не постранично)
+        if self.config['snapshot_cache'] and not self.config['paged_mode']:
+            self.snapshot_store = SnapshotStore(
+                self.config['snapshot_cache'],
+                f"{self.config['protocol']}://{self.config['host']}:{self.config['port']}"
+            )
+        else:
+            self.snapshot_store = None
+        
         if not APIClient:
             print("❌ КРИТИЧЕСКАЯ ОШИБКА: APIClient не найден!")
             self.api_client = None
@@ -96,12 +229,16 @@ class LicenseService:
             
             print(f"✅ API клиент создан для {self.config['protocol']}://{self.config['host']}:{self.config['port']}")
             
+            # Асинхронный клиент поверх той же сессии (один фоновый цикл)
+            self.async_client = AsyncAPIClient(self.api_client)
+        
         except Exception as e:
             print(f"❌ Ошибка создания API клиента: {e}")
             self.api_client = None
     
     def set_callbacks(self, on_connected=None, on_disconnected=None,
-                      on_licenses_loaded=None, on_error=None):
+                      on_licenses_loaded=None, on_error=None,
+                      on_licenses_batch=None):
         """
         Установить callback функции
         
@@ -110,12 +247,15 @@ class LicenseService:
             on_disconnected: Вызывается при отключении
             on_licenses_loaded: Вызывается после загрузки лицензий
             on_error: Вызывается при ошибке
+            on_licenses_batch: Вызывается с каждой пачкой при потоковой
+                               загрузке как on_licenses_batch(batch, first)
         """
         print("📎 Установка callbacks...")
         self.on_connected = on_connected
         self.on_disconnected = on_disconnected
         self.on_licenses_loaded = on_licenses_loaded
         self.on_error = on_error
+        self.on_licenses_batch = on_licenses_batch
     
     def connect(self) -> bool:
         """
@@ -170,7 +310,7 @@ class LicenseService:
                     self.on_disconnected()
                 
                 return False
-            
+        
         except Exception as e:
             print(f"❌ ИСКЛЮЧЕНИЕ при подключении: {e}")
             import traceback
@@ -185,22 +325,213 @@ class LicenseService:
             
             return False
     
+    def connect_and_load(self) -> Dict[str, Any]:
+        """
+        Подключиться и сразу получить список лицензий
+        
+        Живость проверяется дешёвым /health, а API ключ - первым
+        авторизованным запросом списка, который заодно заполняет снимок.
+        Холодное подключение стоит одной загрузки списка вместо двух
+        (проверка ключа + загрузка). В постраничном режиме список целиком
+        не нужен - выполняется обычное подключение.
+        
+        Returns:
+            Dict: {'connected': bool, 'licenses': List[Dict] или None,
+                   'load_error': str или None}; при load_error сервер
+                  доступен и ключ принят, но список не получен - licenses
+                  None, а не пустой список
+        """
+        result = {'connected': False, 'licenses': None, 'load_error': None}
+        
+        if self.paged_mode or not hasattr(self.api_client, 'ping'):
+            result['connected'] = self.connect()
+            return result
+        
+        print("\n🔌 === ПОДКЛЮЧЕНИЕ И ЗАГРУЗКА ===")
+        
+        if not self.api_client.ping():
+            print("❌ Сервер не отвечает на /health")
+            self._set_disconnected("Сервер недоступен")
+            return result
+        
+        # Ключ проверит сам запрос списка - без отдельного запроса
+        self.is_connected = True
+        licenses = self.get_licenses()
+        
+        if self.api_client.key_rejected:
+            self._set_disconnected("Неверный API ключ")
+            return result
+        
+        print("✅ ПОДКЛЮЧЕНИЕ УСПЕШНО!")
+        self.last_error = None
+        if self.on_connected:
+            self.on_connected()
+        
+        result['connected'] = True
+        if self.last_load_ok:
+            result['licenses'] = licenses
+        else:
+            # Пустой список тут - ошибка загрузки, а не пустая база
+            result['load_error'] = "Не удалось загрузить список лицензий"
+        return result
+    
+    def _set_disconnected(self, error: str):
+        """Отметить неудачное подключение"""
+        self.is_connected = False
+        self.last_error = error
+        
+        if self.on_disconnected:
+            self.on_disconnected()
+    
+    def reset_circuit(self):
+        """Сбросить предохранитель транспорта (ручное переподключение)"""
+        transport = getattr(self.api_client, 'transport', None)
+        if transport is not None:
+            transport.breaker.reset()
+    
     def disconnect(self):
         """Отключиться от сервера"""
         print("🔌 Отключение от сервера")
         self.is_connected = False
+        self.stop_live_updates()
         
         if self.on_disconnected:
             self.on_disconnected()
     
-    def get_licenses(self) -> List[Dict]:
+    def get_licenses(self, force_full: bool = False) -> List[Dict]:
         """
         Получить список всех лицензий
         
+        При включённой дельта-синхронизации запрашивает только изменения
+        относительно последнего снимка и объединяет их по license_key.
+        Одновременные вызовы разделяют один запрос (см. _join_flight).
+        Ждать можно из любого потока: загрузки идут в своих потоках, а не
+        в пуле асинхронного клиента.
+        
+        Args:
+            force_full: Принудительно загрузить полный список
+        
         Returns:
             List[Dict]: Список лицензий
         """
-        print("\n📋 === ПОЛУЧЕНИЕ ЛИЦЕНЗИЙ ===")
+        future, runner = self._join_flight(force_full)
+        if runner:
+            runner()
+        return future.result()
+    
+    def _join_flight(self, force_full: bool = False):
+        """
+        Присоединиться к загрузке лицензий или запустить новую
+        
+        - нет активной загрузки - запускаем сразу;
+        - активная загрузка начата после последнего изменения данных
+          (и покрывает force_full) - ждём её результат;
+        - иначе все такие вызовы собираются в одну отложенную загрузку,
+          которая стартует после активной и паузы REFRESH_DEBOUNCE.
+        
+        Returns:
+            tuple: (Future с результатом, функция для запуска или None)
+        """
+        with self._flight_lock:
+            if self._trailing is not None:
+                self._trailing_force_full |= force_full
+                return self._trailing, None
+            
+            if self._flight is None:
+                future = self._start_flight_locked(force_full)
+                return future, lambda: self._run_flight(future)
+            
+            covers = self._flight_force_full or not force_full
+            if covers and self._flight_version == self._data_version:
+                return self._flight, None
+            
+            trailing = Future()
+            self._trailing = trailing
+            self._trailing_force_full = force_full
+            current = self._flight
+        
+        return trailing, lambda: self._run_trailing(current, trailing)
+    
+    def _start_flight_locked(self, force_full: bool, future: Optional[Future] = None) -> Future:
+        """Сделать загрузку активной (вызывается под _flight_lock)"""
+        self._generation += 1
+        self._flight = future or Future()
+        self._flight.generation = self._generation
+        self._flight.force_full = force_full
+        self._flight_force_full = force_full
+        self._flight_version = self._data_version
+        return self._flight
+    
+    def _run_flight(self, future: Future):
+        """Выполнить активную загрузку и раздать результат"""
+        started = time.perf_counter()
+        try:
+            result = self._load_licenses(future.force_full, future.generation)
+        except Exception as e:
+            result = e
+        
+        # Полное время обновления: сеть + разбор + обработка + слияние
+        registry = getattr(self.api_client, 'metrics', None)
+        if registry is not None:
+            registry.record_stage('refresh', 'licenses', time.perf_counter() - started)
+        self._maybe_dump_metrics()
+        
+        with self._flight_lock:
+            if self._flight is future:
+                self._flight = None
+        
+        if isinstance(result, Exception):
+            future.set_exception(result)
+        else:
+            future.set_result(result)
+    
+    def _run_trailing(self, current: Future, trailing: Future):
+        """
+        Запланировать отложенную загрузку после активной
+        
+        Не блокирует вызывающий поток: загрузка стартует таймером через
+        REFRESH_DEBOUNCE после завершения активной.
+        """
+        def schedule(_):
+            timer = threading.Timer(self.REFRESH_DEBOUNCE, self._start_trailing, (trailing,))
+            timer.daemon = True
+            timer.start()
+        
+        current.add_done_callback(schedule)
+    
+    def _start_trailing(self, trailing: Future):
+        """Сделать отложенную загрузку активной и выполнить её"""
+        with self._flight_lock:
+            self._trailing = None
+            self._start_flight_locked(self._trailing_force_full, trailing)
+        
+        self._run_flight(trailing)
+    
+    @staticmethod
+    def _spawn_flight(runner: Callable[[], None]):
+        """
+        Запустить загрузку в отдельном потоке
+        
+        Не в пуле асинхронного клиента: его потоки ждут результат загрузки
+        (get_licenses), и загрузка, стоящая в той же очереди, могла бы не
+        дождаться свободного потока.
+        """
+        threading.Thread(target=runner, name='FoxterAI-licenses', daemon=True).start()
+    
+    def _load_licenses(self, force_full: bool, generation: int) -> List[Dict]:
+        """
+        Загрузить лицензии с сервера
+        
+        Args:
+            force_full: Принудительно загрузить полный список
+            generation: Номер загрузки - результат старше уже показанного
+                        отбрасывается
+        
+        Returns:
+            List[Dict]: Список лицензий
+        """
+        print(f"\n📋 === ПОЛУЧЕНИЕ ЛИЦЕНЗИЙ (#{generation}) ===")
+        self.last_load_ok = False
         
         if not self.api_client:
             print("❌ API клиент не инициализирован")
@@ -217,7 +548,10 @@ class LicenseService:
             print(f"🌐 Endpoint: {self.config['protocol']}://{self.config['host']}:{self.config['port']}/api/licenses")
             
             # Получаем лицензии через API
-            licenses = self.api_client.get_licenses()
+            if self.delta_sync_enabled and hasattr(self.api_client, 'get_licenses_delta'):
+                licenses = self._sync_licenses(force_full)
+            else:
+                licenses = self.api_client.get_licenses()
             
             print(f"📦 Тип ответа: {type(licenses)}")
             
@@ -228,18 +562,42 @@ class LicenseService:
                 if len(licenses) > 0:
                     print(f"📝 Пример лицензии: {licenses[0]}")
                 
+                if generation < self._applied_generation:
+                    print(f"⏭️ Результат загрузки #{generation} устарел, показаны данные #{self._applied_generation}")
+                    return self.licenses
+                
+                self._applied_generation = generation
                 self.licenses = licenses
+                self.last_load_ok = True
+                
+                # 304 или пустая дельта - содержимое заведомо то же, хэш не считаем
+                if self._snapshot_unchanged and self.content_hash is not None:
+                    changed = False
+                else:
+                    content_hash = self._content_hash(licenses)
+                    changed = content_hash != self.content_hash
+                    self.content_hash = content_hash
+                
+                # Столбцы для таблицы и статистики - здесь, в фоне,
+                # до того как список уйдёт в UI
+                if changed:
+                    self.get_license_frame()
                 
-                # Вызываем callback
-                if self.on_licenses_loaded:
+                # Вызываем callback (только если данные изменились)
+                if changed and self.on_licenses_loaded:
                     print("🔔 Вызываем on_licenses_loaded callback")
                     self.on_licenses_loaded(licenses)
+                elif not changed:
+                    print("♻️ Содержимое не изменилось, перерисовка не нужна")
+                
+                if changed:
+                    self._save_snapshot()
                 
                 return licenses
             else:
                 print("⚠️ Получен None от API")
                 return []
-            
+        
         except Exception as e:
             print(f"❌ ИСКЛЮЧЕНИЕ при получении лицензий: {e}")
             import traceback
@@ -250,6 +608,270 @@ class LicenseService:
             
             return []
     
+    @staticmethod
+    def _content_hash(licenses: List[Dict]) -> str:
+        """Хэш содержимого списка (порядок строк и полей учитывается)"""
+        data = repr(licenses).encode('utf-8', 'surrogatepass')
+        return hashlib.blake2b(data, digest_size=16).hexdigest()
+    
+    def _sync_licenses(self, force_full: bool = False) -> Optional[List[Dict]]:
+        """
+        Синхронизировать снимок лицензий с сервером
+        
+        Args:
+            force_full: Игнорировать снимок и загрузить всё заново
+        
+        Returns:
+            Optional[List[Dict]]: Актуальный список или None при ошибке
+        """
+        # Под блокировкой только решение и слияние: загрузка и разбор ответа
+        # идут без неё, иначе живые обновления, локальный поиск и массовые
+        # операции ждали бы всю сетевую загрузку. Две синхронизации
+        # одновременно не идут - их запускает только _run_flight.
+        with self._sync_lock:
+            # Полная загрузка нужна при пустом снимке, периодически (чтобы
+            # увидеть удаления) и при смене дня (days_left у строк устаревает)
+            day_changed = self._snapshot_day != date.today()
+            need_full = (
+                force_full
+                or day_changed
+                or not self._snapshot
+                or self._deltas_since_full >= self.FULL_SYNC_EVERY
+            )
+            since = None if need_full else self._high_water
+            
+            # Полный список при наличии подписчика грузим потоково
+            stream = (
+                need_full
+                and self.streaming_enabled
+                and self.on_licenses_batch is not None
+                and hasattr(self.api_client, 'get_licenses_stream')
+            )
+            
+            # Условные заголовки нельзя слать, если снимок заведомо устарел
+            # или ETag выдан на другое представление (поток всегда JSON,
+            # дельта - колоночный формат)
+            accept = self.api_client.list_accept(streaming=stream) \
+                if hasattr(self.api_client, 'list_accept') else None
+            use_validators = not force_full and not day_changed and self._validators_accept == accept
+            etag = self._etag if use_validators else None
+            last_modified = self._last_modified if use_validators else None
+            epoch = self._snapshot_epoch
+        
+        print(f"🔁 Синхронизация: {'полная' if need_full else f'дельта с {since}'}")
+        if stream:
+            result = self.api_client.get_licenses_stream(
+                self._make_batch_emitter(),
+                etag=etag,
+                last_modified=last_modified,
+                batch_size=self.STREAM_BATCH_SIZE,
+                time_budget=self.STREAM_TIME_BUDGET
+            )
+        else:
+            result = self.api_client.get_licenses_delta(
+                since=since, etag=etag, last_modified=last_modified
+            )
+        mode = result.get('mode')
+        
+        with self._sync_lock:
+            self._snapshot_unchanged = False
+            if mode == 'error':
+                return None
+            
+            # Пока шла загрузка, снимок меняли (удаления, правки, сброс) -
+            # ответ мог их не застать, следующая синхронизация будет полной
+            touched = epoch != self._snapshot_epoch
+            
+            if mode == 'not_modified':
+                self._snapshot_unchanged = not touched
+                print("♻️ Данные не изменились (304)")
+                if touched:
+                    self._deltas_since_full = self.FULL_SYNC_EVERY
+                elif need_full:
+                    self._deltas_since_full = 0
+                else:
+                    self._deltas_since_full += 1
+                return list(self._snapshot.values())
+            
+            self._etag = result.get('etag')
+            self._last_modified = result.get('last_modified')
+            self._validators_accept = result.get('accept', accept)
+            
+            if mode == 'delta':
+                changed = result.get('licenses', [])
+                deleted = result.get('deleted', [])
+                print(f"🧩 Дельта: изменено {len(changed)}, удалено {len(deleted)}")
+                self._snapshot_unchanged = not changed and not deleted
+                self._merge_snapshot(changed, deleted)
+                self._deltas_since_full += 1
+            else:
+                # Сервер не умеет дельты или это полная загрузка
+                self._replace_snapshot(result.get('licenses', []))
+            
+            self._high_water = result.get('server_time') or self._compute_high_water(
+                self._snapshot.values()
+            )
+            if touched:
+                self._deltas_since_full = self.FULL_SYNC_EVERY
+            return list(self._snapshot.values())
+    
+    def _make_batch_emitter(self) -> Callable[[List[Dict]], None]:
+        """Обёртка над on_licenses_batch, отмечающая первую пачку"""
+        state = {'first': True}
+        
+        def emit(batch: List[Dict]):
+            first, state['first'] = state['first'], False
+            callback = self.on_licenses_batch
+            if callback:
+                try:
+                    callback(batch, first)
+                except Exception as e:
+                    print(f"⚠️ Ошибка в on_licenses_batch: {e}")
+        
+        return emit
+    
+    def _replace_snapshot(self, licenses: List[Dict]):
+        """Заменить снимок полным списком"""
+        self._snapshot = {}
+        for lic in licenses:
+            self._snapshot[lic.get('license_key')] = lic
+        self._deltas_since_full = 0
+        self._snapshot_day = date.today()
+        
+        if self.search_index is not None:
+            self.search_index.rebuild(self._snapshot.values())
+    
+    def _merge_snapshot(self, changed: List[Dict], deleted: List[str]):
+        """
+        Объединить изменения со снимком по license_key
+        
+        Новые лицензии попадают в начало списка (сервер сортирует по
+        дате создания по убыванию), изменённые остаются на своих местах.
+        """
+        new_rows = {}
+        for lic in changed:
+            key = lic.get('license_key')
+            if key in self._snapshot:
+                self._snapshot[key] = lic
+            else:
+                new_rows[key] = lic
+        
+        for key in deleted:
+            self._snapshot.pop(key, None)
+        
+        if new_rows:
+            new_rows.update(self._snapshot)
+            self._snapshot = new_rows
+        
+        if self.search_index is not None:
+            self.search_index.merge(changed, deleted)
+    
+    def _compute_high_water(self, licenses) -> Optional[str]:
+        """
+        Вычислить высшую отметку времени по строкам снимка
+        
+        Returns:
+            Optional[str]: Отметка в формате ISO или None
+        """
+        latest = None
+        for lic in licenses:
+            for field in self.HIGH_WATER_FIELDS:
+                value = lic.get(field)
+                if not value or not isinstance(value, str):
+                    continue
+                dt = parse_datetime(value)
+                if dt is None:
+                    continue
+                if latest is None or dt > latest:
+                    latest = dt
+        
+        return latest.isoformat() + 'Z' if latest else None
+    
+    def _mark_snapshot_dirty(self, deleted_key: Optional[str] = None):
+        """
+        Отметить снимок устаревшим после изменения через API
+        
+        Сервер не обновляет отметки времени при правках администратора,
+        поэтому следующая синхронизация будет полной.
+        """
+        with self._sync_lock:
+            if deleted_key:
+                self._snapshot.pop(deleted_key, None)
+                if self.search_index is not None:
+                    self.search_index.merge([], [deleted_key])
+            self._deltas_since_full = self.FULL_SYNC_EVERY
+            self._snapshot_epoch += 1
+        
+        # Загрузки, начатые до изменения, больше не годятся для новых вызовов
+        with self._flight_lock:
+            self._data_version += 1
+        
+        self.invalidate_pages()
+    
+    def load_cached_snapshot(self) -> Optional[Dict[str, Any]]:
+        """
+        Восстановить снимок, сохранённый при прошлом запуске
+        
+        Строки становятся текущим списком, а ETag и отметки - основой
+        первой синхронизации: если на сервере ничего не изменилось, она
+        закончится ответом 304 без перерисовки.
+        
+        Returns:
+            Optional[Dict]: {'licenses': [...], 'saved_at': timestamp} или None
+        """
+        if self.snapshot_store is None:
+            return None
+        
+        cached = self.snapshot_store.load()
+        if not cached:
+            return None
+        
+        with self._sync_lock:
+            self._replace_snapshot(cached['licenses'])
+            self._snapshot_day = datetime.fromtimestamp(cached['saved_at']).date()
+            self._etag = cached.get('etag')
+            self._last_modified = cached.get('last_modified')
+            self._validators_accept = cached.get('accept')
+            self._high_water = cached.get('high_water')
+            self._snapshot_epoch += 1
+            licenses = list(self._snapshot.values())
+        
+        self.licenses = licenses
+        self.content_hash = cached.get('content_hash')
+        print(f"📂 Восстановлен снимок: {len(licenses)} лицензий "
+              f"от {datetime.fromtimestamp(cached['saved_at']):%d.%m.%Y %H:%M}")
+        
+        return {'licenses': licenses, 'saved_at': cached['saved_at']}
+    
+    def _save_snapshot(self):
+        """Сохранить текущий снимок на диск (после загрузки с изменениями)"""
+        if self.snapshot_store is None or not self._snapshot:
+            return
+        
+        # Под блокировкой: живые обновления меняют строки на месте
+        with self._sync_lock:
+            self._saved_rows_version = self._rows_version
+            self.snapshot_store.save(list(self._snapshot.values()), {
+                'etag': self._etag,
+                'last_modified': self._last_modified,
+                'accept': self._validators_accept,
+                'high_water': self._high_water,
+                'content_hash': self.content_hash
+            })
+    
+    def invalidate_snapshot(self):
+        """Сбросить снимок - следующая загрузка будет полной"""
+        with self._sync_lock:
+            self._snapshot = {}
+            self._high_water = None
+            self._etag = None
+            self._last_modified = None
+            self._validators_accept = None
+            self._deltas_since_full = 0
+            self._snapshot_epoch += 1
+            if self.search_index is not None:
+                self.search_index.clear()
+    
     def get_statistics(self) -> Dict:
         """
         Получить статистику
@@ -270,13 +892,72 @@ class LicenseService:
             print(f"❌ Ошибка получения статистики: {e}")
             return {}
     
+    def get_panel_statistics(self) -> Dict[str, Any]:
+        """
+        Статистика для панели
+        
+        При подключении берётся агрегат GET /api/statistics (кэш клиента
+        держит его недолго и сбрасывает при изменениях). Локальный подсчёт
+        за один проход - только без связи с сервером.
+        
+        Returns:
+            Dict: {'total', 'active', 'expired', 'blocked', 'inactive',
+                   'balance', 'source': 'server' | 'local'}
+        """
+        if self.api_client and self.is_connected:
+            stats = self.get_statistics()
+            if stats and 'licenses' in stats:
+                result = panel_statistics_from_server(stats)
+                result['source'] = 'server'
+                return result
+        
+        frame = self.get_license_frame()
+        result = panel_statistics(frame if frame is not None else self.licenses)
+        result['source'] = 'local'
+        return result
+    
+    def get_license_frame(self) -> Optional[LicenseFrame]:
+        """
+        LicenseFrame загруженного списка
+        
+        Строится один раз на загрузку и заново после живых обновлений
+        строк. Вызывать из фона: на 100 тыс. строк это около секунды.
+        
+        Returns:
+            Optional[LicenseFrame]: None в постраничном режиме (полного
+                                    списка на клиенте нет)
+        """
+        if self.paged_mode:
+            return None
+        
+        with self._frame_lock:
+            licenses, version = self.licenses, self._rows_version
+            frame = self.peek_license_frame(licenses)
+            if frame is None:
+                frame = LicenseFrame.from_records(licenses)
+                frame.table_rows()
+                self._frame, self._frame_version = frame, version
+            return frame
+    
+    def peek_license_frame(self, licenses: List[Dict]) -> Optional[LicenseFrame]:
+        """
+        Уже построенный LicenseFrame этого списка - без построения
+        
+        Для потока UI: None, если frame ещё нет, он от другого списка или
+        строки с тех пор изменились.
+        """
+        frame = self._frame
+        if frame is not None and frame.records is licenses and self._frame_version == self._rows_version:
+            return frame
+        return None
+    
     def create_license(self, data: Dict) -> Dict:
         """
         Создать новую лицензию
         
         Args:
             data: Данные для создания лицензии
-            
+        
         Returns:
             Dict: Результат создания
         """
@@ -298,8 +979,10 @@ class LicenseService:
             )
             
             print(f"📦 Результат создания: {result}")
+            if result.get('success'):
+                self._mark_snapshot_dirty()
             return result
-            
+        
         except Exception as e:
             print(f"❌ Ошибка создания лицензии: {e}")
             return {'success': False, 'error': str(e)}
@@ -311,7 +994,7 @@ class LicenseService:
         Args:
             license_key: Ключ лицензии
             updates: Обновления
-            
+        
         Returns:
             bool: True если успешно
         """
@@ -323,6 +1006,8 @@ class LicenseService:
             result = self.api_client.update_license(license_key, **updates)
             success = result.get('success', False)
             print(f"📦 Результат: {success}")
+            if success:
+                self._mark_snapshot_dirty()
             return success
         except Exception as e:
             print(f"❌ Ошибка обновления лицензии: {e}")
@@ -334,7 +1019,7 @@ class LicenseService:
         
         Args:
             license_key: Ключ лицензии
-            
+        
         Returns:
             bool: True если успешно
         """
@@ -346,6 +1031,8 @@ class LicenseService:
             result = self.api_client.delete_license(license_key)
             success = result.get('success', False)
             print(f"📦 Результат: {success}")
+            if success:
+                self._mark_snapshot_dirty(deleted_key=license_key)
             return success
         except Exception as e:
             print(f"❌ Ошибка удаления лицензии: {e}")
@@ -358,7 +1045,7 @@ class LicenseService:
         Args:
             license_key: Ключ лицензии
             months: Количество месяцев
-            
+        
         Returns:
             bool: True если успешно
         """
@@ -370,6 +1057,8 @@ class LicenseService:
             result = self.api_client.extend_license(license_key, months)
             success = result.get('success', False)
             print(f"📦 Результат: {success}")
+            if success:
+                self._mark_snapshot_dirty()
             return success
         except Exception as e:
             print(f"❌ Ошибка продления лицензии: {e}")
@@ -381,7 +1070,7 @@ class LicenseService:
         
         Args:
             license_key: Ключ лицензии
-            
+        
         Returns:
             bool: True если успешно
         """
@@ -394,20 +1083,233 @@ class LicenseService:
         
         Args:
             license_key: Ключ лицензии
-            
+        
         Returns:
             bool: True если успешно
         """
         print(f"🔓 Разблокировка лицензии {license_key[:12]}...")
         return self.update_license(license_key, {'status': 'active'})
     
+    # ==================== МАССОВЫЕ ОПЕРАЦИИ ====================
+    
+    def bulk_set_status(self, license_keys: List[str], status: str,
+                        on_progress: Optional[Callable] = None) -> Dict:
+        """
+        Массово изменить статус через POST /api/batch-update
+        
+        Ключи отправляются пачками по BULK_STATUS_CHUNK, после каждой
+        пачки вызывается on_progress(done, total).
+        
+        Args:
+            license_keys: Ключи лицензий
+            status: Новый статус (active, blocked, expired)
+            on_progress: Callback прогресса
+        
+        Returns:
+            Dict: {'success': bool, 'requested': N, 'updated': M, 'errors': [...]}
+        """
+        keys = [k for k in dict.fromkeys(license_keys) if k]
+        summary = {'success': False, 'requested': len(keys), 'updated': 0, 'errors': []}
+        
+        if not self.api_client or not self.is_connected:
+            summary['errors'].append('Нет подключения к серверу')
+            return summary
+        
+        print(f"📦 Массовая смена статуса на '{status}' для {len(keys)} лицензий")
+        
+        done = 0
+        for start in range(0, len(keys), self.BULK_STATUS_CHUNK):
+            chunk = keys[start:start + self.BULK_STATUS_CHUNK]
+            try:
+                result = self.api_client.batch_update_status(chunk, status)
+            except Exception as e:
+                result = {'success': False, 'error': str(e)}
+            
+            if result.get('success'):
+                summary['updated'] += int(result.get('updated', 0) or 0)
+            else:
+                summary['errors'].append(result.get('error', 'Неизвестная ошибка'))
+            
+            done += len(chunk)
+            self._notify_progress(on_progress, done, len(keys))
+        
+        summary['success'] = not summary['errors']
+        if summary['updated']:
+            self._mark_snapshot_dirty()
+        
+        print(f"📦 Обновлено {summary['updated']} из {len(keys)}")
+        return summary
+    
+    def bulk_set_status_async(self, license_keys: List[str], status: str,
+                              on_progress: Optional[Callable] = None) -> Future:
+        """Массово изменить статус в фоне (см. bulk_set_status)"""
+        return self._submit(self.bulk_set_status, license_keys, status, on_progress)
+    
+    def bulk_block(self, license_keys: List[str],
+                   on_progress: Optional[Callable] = None) -> Dict:
+        """Массово заблокировать лицензии"""
+        return self.bulk_set_status(license_keys, 'blocked', on_progress)
+    
+    def bulk_unblock(self, license_keys: List[str],
+                     on_progress: Optional[Callable] = None) -> Dict:
+        """Массово разблокировать лицензии"""
+        return self.bulk_set_status(license_keys, 'active', on_progress)
+    
+    def bulk_extend(self, license_keys: List[str], months: int,
+                    on_progress: Optional[Callable] = None,
+                    max_concurrency: Optional[int] = None) -> Dict[str, Dict]:
+        """
+        Массово продлить лицензии с ограниченной параллельностью
+        
+        Args:
+            license_keys: Ключи лицензий
+            months: Количество месяцев
+            on_progress: Вызывается как on_progress(done, total)
+            max_concurrency: Максимум одновременных запросов
+        
+        Returns:
+            Dict[str, Dict]: Результат по каждому ключу {'success', 'error'}
+        """
+        return self._wait_bulk(lambda: self.bulk_extend_async(license_keys, months, on_progress,
+                                                              max_concurrency))
+    
+    def bulk_extend_async(self, license_keys: List[str], months: int,
+                          on_progress: Optional[Callable] = None,
+                          max_concurrency: Optional[int] = None) -> Future:
+        """Массово продлить лицензии в фоновом цикле (см. bulk_extend)"""
+        print(f"⏰ Массовое продление {len(license_keys)} лицензий на {months} мес.")
+        return self._bulk_fan_out(
+            license_keys,
+            lambda client, key: client.extend_license(key, months),
+            on_progress, max_concurrency
+        )
+    
+    def bulk_delete(self, license_keys: List[str],
+                    on_progress: Optional[Callable] = None,
+                    max_concurrency: Optional[int] = None) -> Dict[str, Dict]:
+        """
+        Массово удалить лицензии с ограниченной параллельностью
+        
+        Args:
+            license_keys: Ключи лицензий
+            on_progress: Вызывается как on_progress(done, total)
+            max_concurrency: Максимум одновременных запросов
+        
+        Returns:
+            Dict[str, Dict]: Результат по каждому ключу {'success', 'error'}
+        """
+        return self._wait_bulk(lambda: self.bulk_delete_async(license_keys, on_progress, max_concurrency))
+    
+    def bulk_delete_async(self, license_keys: List[str],
+                          on_progress: Optional[Callable] = None,
+                          max_concurrency: Optional[int] = None) -> Future:
+        """Массово удалить лицензии в фоновом цикле (см. bulk_delete)"""
+        print(f"🗑️ Массовое удаление {len(license_keys)} лицензий")
+        return self._bulk_fan_out(
+            license_keys,
+            lambda client, key: client.delete_license(key),
+            on_progress, max_concurrency,
+            on_results=self._forget_deleted
+        )
+        
+    def _forget_deleted(self, results: Dict[str, Dict]):
+        """Убрать удалённые ключи из снимка и индекса поиска"""
+        with self._sync_lock:
+            deleted = [key for key, result in results.items() if result['success']]
+            for key in deleted:
+                self._snapshot.pop(key, None)
+            if deleted:
+                self._snapshot_epoch += 1
+            if self.search_index is not None:
+                self.search_index.merge([], deleted)
+    
+    def _wait_bulk(self, start: Callable[[], Future]) -> Dict[str, Dict]:
+        """Запустить массовую операцию и дождаться её (не из потоков асинхронного клиента)"""
+        if self.async_client and self.async_client.in_worker():
+            raise RuntimeError('Массовую операцию нельзя ждать из потока асинхронного клиента - '
+                               'используйте bulk_*_async')
+        return start().result()
+    
+    def _bulk_fan_out(self, license_keys: List[str], operation: Callable,
+                      on_progress: Optional[Callable],
+                      max_concurrency: Optional[int],
+                      on_results: Optional[Callable[[Dict[str, Dict]], None]] = None) -> Future:
+        """
+        Выполнить операцию для каждого ключа через асинхронный клиент
+        
+        Запросы идут в фоновом цикле через map_bounded; вызывающий поток
+        ничего не ждёт и не занимает поток пула.
+        
+        Args:
+            license_keys: Ключи лицензий
+            operation: operation(async_client, key) -> корутина с ответом API
+            on_progress: Callback прогресса (done, total)
+            max_concurrency: Ограничение параллельности
+            on_results: Дополнительная обработка результатов (в фоновом цикле)
+        
+        Returns:
+            Future: Результат по каждому ключу
+        """
+        keys = [k for k in dict.fromkeys(license_keys) if k]
+        
+        if not self.async_client or not self.is_connected:
+            future = Future()
+            future.set_result({key: {'success': False, 'error': 'Нет подключения к серверу'} for key in keys})
+            return future
+        
+        client = self.async_client
+        
+        def progress(done, total, key, result):
+            self._notify_progress(on_progress, done, total)
+        
+        async def run():
+            responses = await client.map_bounded(
+                lambda key: operation(client, key), keys,
+                limit=max_concurrency or self.BULK_CONCURRENCY,
+                on_progress=progress
+            )
+            results = self._bulk_results(keys, responses)
+            if on_results is not None:
+                on_results(results)
+            return results
+        
+        return client.submit(run())
+    
+    def _bulk_results(self, keys: List[str], responses: List[Any]) -> Dict[str, Dict]:
+        """Ответы по ключам -> {'success', 'error'} и отметка изменённого снимка"""
+        results = {}
+        for key, response in zip(keys, responses):
+            if isinstance(response, Exception):
+                results[key] = {'success': False, 'error': str(response)}
+            elif isinstance(response, dict) and response.get('success'):
+                results[key] = {'success': True, 'error': None}
+            else:
+                error = response.get('error', 'Неизвестная ошибка') if isinstance(response, dict) else 'Нет ответа'
+                results[key] = {'success': False, 'error': error}
+        
+        succeeded = sum(1 for r in results.values() if r['success'])
+        print(f"📦 Успешно {succeeded} из {len(keys)}")
+        
+        if succeeded:
+            self._mark_snapshot_dirty()
+        return results
+    
+    def _notify_progress(self, on_progress: Optional[Callable], done: int, total: int):
+        """Безопасно вызвать callback прогресса"""
+        if not on_progress:
+            return
+        try:
+            on_progress(done, total)
+        except Exception as e:
+            print(f"⚠️ Ошибка в callback прогресса: {e}")
+    
     def get_license_by_key(self, license_key: str) -> Optional[Dict]:
         """
         Получить лицензию по ключу
         
         Args:
             license_key: Ключ лицензии
-            
+        
         Returns:
             Optional[Dict]: Данные лицензии или None
         """
@@ -420,4 +1322,481 @@ class LicenseService:
         """Обновить данные с сервера"""
         print("🔄 Обновление данных...")
         self.get_licenses()
-        self.get_statistics()
\ No newline at end of file
+        self.get_statistics()
+    
+    # ==================== ЖИВЫЕ ОБНОВЛЕНИЯ ====================
+    
+    def start_live_updates(self, on_pending: Optional[Callable[[], None]] = None,
+                           on_state: Optional[Callable[[str], None]] = None) -> bool:
+        """
+        Подписаться на поток событий сервера
+        
+        Args:
+            on_pending: Появились необработанные события (вызывается из
+                        фонового потока, только когда буфер был пуст)
+            on_state: Смена состояния соединения (из фонового потока)
+        
+        Returns:
+            bool: True если подписка запущена
+        """
+        if not self.live_updates_enabled or not self.api_client:
+            return False
+        
+        if self.live_updates is None:
+            self.live_updates = LiveUpdates(
+                self.api_client.transport, on_pending, self.LIVE_MAX_PENDING, on_state
+            )
+        else:
+            self.live_updates.on_pending = on_pending
+            self.live_updates.on_state = on_state
+        
+        self.live_updates.start()
+        return True
+    
+    def stop_live_updates(self):
+        """Отписаться от потока событий"""
+        if self.live_updates is not None:
+            self.live_updates.stop()
+    
+    @property
+    def live_connected(self) -> bool:
+        """Поток событий открыт"""
+        return self.live_updates is not None and self.live_updates.connected
+    
+    def apply_live_updates(self) -> Dict[str, Any]:
+        """
+        Применить накопленные события к списку в памяти
+        
+        Строки обновляются на месте - это те же словари, что показаны в
+        таблице, поэтому перерисовать нужно только их.
+        
+        Returns:
+            Dict: {'licenses': [изменённые строки], 'resync': bool}
+                  resync - нужна обычная синхронизация (события потеряны
+                  или пришла лицензия, которой нет в списке)
+        """
+        result = {'licenses': [], 'resync': False}
+        if self.live_updates is None:
+            return result
+        
+        drained = self.live_updates.drain()
+        if drained['resync']:
+            result['resync'] = True
+            return result
+        
+        patches = drained['patches']
+        if not patches or not self.api_client:
+            return result
+        
+        with self.api_client.metrics.timer('enrich', f'GET {EVENTS_PATH}'), self._sync_lock:
+            if self.paged_mode:
+                rows = {lic.get('license_key'): lic for lic in self.licenses}
+            else:
+                rows = self._snapshot
+            
+            for key, fields in patches.items():
+                row = rows.get(key)
+                if row is None:
+                    # Новая лицензия: полных данных в событии нет. На чужой
+                    # странице в постраничном режиме - просто не видна
+                    result['resync'] = result['resync'] or not self.paged_mode
+                    continue
+                row.update(self.api_client.process_patch(fields, row))
+                result['licenses'].append(row)
+            
+            if result['licenses']:
+                self._rows_version += 1
+            
+            # Зеркало поиска - только если изменились поля поиска или статус
+            indexed = ('status', 'expiry_date') + LicenseSearchIndex.FIELDS
+            if self.search_index is not None and any(
+                field in fields for fields in patches.values() for field in indexed
+            ):
+                self.search_index.update(result['licenses'])
+        
+        return result
+    
+    # ==================== ПОСТРАНИЧНЫЙ РЕЖИМ ====================
+    
+    def get_page(self, page: int) -> Dict[str, Any]:
+        """
+        Получить страницу списка лицензий
+        
+        Страница берётся из кэша или загружается; после этого соседние
+        страницы подгружаются в фоне.
+        
+        Args:
+            page: Номер страницы (с 0)
+        
+        Returns:
+            Dict: {'success', 'page', 'pages', 'total', 'page_size', 'licenses'}
+        """
+        page = max(0, page)
+        result = self._load_page(page).result()
+        
+        if result['success']:
+            self._prefetch_around(page, result['pages'])
+        return result
+    
+    def get_page_async(self, page: int) -> Future:
+        """Получить страницу в фоне"""
+        return self._submit(self.get_page, page)
+    
+    def _load_page(self, page: int) -> Future:
+        """
+        Страница из кэша или общая загрузка (один запрос на страницу)
+        
+        Returns:
+            Future: Результат страницы
+        """
+        with self._pages_lock:
+            cached = self._pages.get(page)
+            if cached is not None:
+                self._pages.move_to_end(page)
+                future = Future()
+                future.set_result(cached)
+                return future
+            
+            future = self._page_futures.get(page)
+            if future is not None:
+                return future
+            
+            future = Future()
+            self._page_futures[page] = future
+            version = self._data_version
+        
+        try:
+            result = self._fetch_page(page)
+        except Exception as e:
+            result = {'success': False, 'error': str(e), 'page': page, 'pages': 0,
+                      'total': 0, 'page_size': self.page_size, 'licenses': []}
+        
+        with self._pages_lock:
+            self._page_futures.pop(page, None)
+            # Страницу, загруженную до изменения данных, не кэшируем
+            if result['success'] and version == self._data_version:
+                self._pages[page] = result
+                self._pages.move_to_end(page)
+                while len(self._pages) > self.PAGE_CACHE_SIZE:
+                    self._pages.popitem(last=False)
+        
+        future.set_result(result)
+        return future
+    
+    def _fetch_page(self, page: int) -> Dict[str, Any]:
+        """Загрузить страницу с сервера"""
+        print(f"📄 Загрузка страницы {page + 1} (по {self.page_size})")
+        
+        if not self.api_client:
+            raise ConnectionError("API клиент не инициализирован")
+        
+        data = self.api_client.get_licenses_page(page * self.page_size, self.page_size)
+        total = data.get('total', 0)
+        if data.get('success'):
+            self.total_licenses = total
+        elif self.api_client.key_rejected:
+            self._set_disconnected("Неверный API ключ")
+        
+        return {
+            'success': bool(data.get('success')),
+            'error': data.get('error'),
+            'page': page,
+            'pages': max(1, -(-total // self.page_size)),
+            'total': total,
+            'page_size': self.page_size,
+            'licenses': data.get('licenses', [])
+        }
+    
+    def _prefetch_around(self, page: int, pages: int):
+        """Подгрузить соседние страницы в фоне"""
+        for offset in range(1, self.PREFETCH_PAGES + 1):
+            for neighbour in (page + offset, page - offset):
+                if 0 <= neighbour < pages:
+                    with self._pages_lock:
+                        known = neighbour in self._pages or neighbour in self._page_futures
+                    if not known:
+                        self._submit(self._load_page, neighbour)
+    
+    def invalidate_pages(self):
+        """Сбросить кэш страниц"""
+        with self._pages_lock:
+            self._pages.clear()
+    
+    # ==================== ПОИСК ====================
+    
+    def can_search_locally(self) -> bool:
+        """Загружен ли полный список подходящего размера для локального поиска"""
+        return (
+            not self.paged_mode
+            and bool(self.licenses)
+            and (len(self.licenses) <= self.SEARCH_LOCAL_THRESHOLD or self._index_matches(self.licenses))
+        )
+    
+    def _index_matches(self, licenses: List) -> bool:
+        """Отражает ли зеркало поиска этот список (та же загрузка)"""
+        return (
+            self.search_index is not None
+            and bool(licenses)
+            and self.search_index.count == len(licenses)
+        )
+    
+    def search_keys(self, query: str = '', status: Optional[str] = None,
+                    total: Optional[int] = None) -> Optional[List[str]]:
+        """
+        Найти лицензии по зеркалу поиска
+        
+        Args:
+            query: Подстрока (от 3 символов) или начало значения поля
+            status: Только с этим статусом (None - любые)
+            total: Размер списка, который фильтрует вызывающий; если зеркало
+                   построено по другому списку - None
+        
+        Returns:
+            Optional[List[str]]: Ключи в порядке списка или None (зеркала
+                                 нет или оно не соответствует списку)
+        """
+        index = self.search_index
+        if index is None or not index.count or (total is not None and total != index.count):
+            return None
+        return index.search(query, status)
+    
+    def search(self, query: str, field: str = 'all') -> List[Dict]:
+        """
+        Найти лицензии
+        
+        По загруженному списку ищем локально, для больших данных и в
+        постраничном режиме - на сервере (POST /api/search).
+        
+        Args:
+            query: Поисковый запрос
+            field: Поле для поиска на сервере ('all', 'key', 'client', ...)
+        
+        Returns:
+            List[Dict]: Найденные лицензии
+        """
+        query = (query or '').strip()
+        if not query:
+            return list(self.licenses)
+        
+        started = time.perf_counter()
+        
+        if self.can_search_locally():
+            path = 'local'
+            results = self._search_local(query)
+        elif self.api_client and hasattr(self.api_client, 'search_licenses'):
+            path = 'remote'
+            results = self.api_client.search_licenses(query, field)
+        else:
+            path = 'local'
+            results = self._search_local(query)
+        
+        elapsed = self.record_search(path, started)
+        print(f"🔎 Поиск '{query}' ({path}): {len(results)} за {elapsed:.1f} мс")
+        return results
+    
+    def _search_local(self, query: str) -> List[Dict]:
+        """Поиск по загруженному списку"""
+        if self._index_matches(self.licenses):
+            keys = self.search_index.search(query)
+            with self._sync_lock:
+                return [self._snapshot[key] for key in keys if key in self._snapshot]
+        
+        query = query.lower()
+        fields = self.SEARCH_FIELDS
+        return [
+            lic for lic in self.licenses
+            if any(query in str(lic.get(name) or '').lower() for name in fields)
+        ]
+    
+    def search_async(self, query: str, field: str = 'all') -> Future:
+        """
+        Найти лицензии в фоне
+        
+        Предыдущий незавершённый поиск отменяется: его Future получает
+        cancelled(), а результат, если запрос уже ушёл, отбрасывается.
+        
+        Returns:
+            Future: Результат поиска
+        """
+        with self._search_lock:
+            if self._search_future is not None:
+                self._search_future.cancel()
+            
+            future = self._submit(self.search, query, field)
+            self._search_future = future
+        return future
+    
+    def record_search(self, path: str, started: float) -> float:
+        """
+        Учесть время поиска
+        
+        Args:
+            path: 'local' или 'remote'
+            started: Момент начала (time.perf_counter)
+        
+        Returns:
+            float: Длительность в миллисекундах
+        """
+        elapsed = (time.perf_counter() - started) * 1000
+        metrics = self.search_metrics[path]
+        metrics['count'] += 1
+        metrics['total_ms'] += elapsed
+        metrics['last_ms'] = elapsed
+        metrics['max_ms'] = max(metrics['max_ms'], elapsed)
+        return elapsed
+    
+    def search_stats(self) -> Dict[str, Dict[str, float]]:
+        """Замеры поиска со средним временем по способам"""
+        return {
+            path: dict(m, avg_ms=m['total_ms'] / m['count'] if m['count'] else 0.0)
+            for path, m in self.search_metrics.items()
+        }
+    
+    def cache_stats(self) -> Dict[str, Any]:
+        """
+        Счётчики кэша ответов API
+        
+        Returns:
+            Dict: Попадания, промахи, размер и разбивка по эндпоинтам
+        """
+        cache = getattr(self.api_client, 'cache', None)
+        return cache.stats() if cache else {}
+    
+    def metrics(self) -> Dict[str, Any]:
+        """
+        Снимок метрик для диагностики
+        
+        Returns:
+            Dict: {'since', 'endpoints': {эндпоинт: count, errors, bytes_in,
+                   bytes_out, p50_ms, p95_ms, p99_ms, ...},
+                   'stages': {'decode' | 'enrich' | 'refresh': {...}},
+                   'cache', 'circuit', 'search', 'live', 'licenses'}
+        """
+        registry = getattr(self.api_client, 'metrics', None)
+        if registry is not None:
+            snapshot = registry.snapshot()
+        else:
+            snapshot = {'since': None, 'endpoints': {}, 'stages': {}}
+        
+        transport = getattr(self.api_client, 'transport', None)
+        snapshot.update({
+            'cache': self.cache_stats(),
+            'circuit': transport.breaker.state if transport is not None else None,
+            'search': self.search_stats(),
+            'live': self.live_updates.stats() if self.live_updates is not None else None,
+            'licenses': len(self.licenses)
+        })
+        return snapshot
+    
+    def dump_metrics(self, path: Optional[str] = None) -> bool:
+        """
+        Записать метрики в текстовый файл OpenMetrics
+        
+        Args:
+            path: Путь к файлу (по умолчанию APP.metrics_file из config.ini)
+        
+        Returns:
+            bool: True если файл записан
+        """
+        path = path or self.metrics_file
+        registry = getattr(self.api_client, 'metrics', None)
+        if not path or registry is None:
+            return False
+        
+        self._metrics_dumped_at = time.monotonic()
+        return registry.write_openmetrics(path)
+    
+    def _maybe_dump_metrics(self):
+        """Выгрузить метрики, если файл задан и прошло METRICS_DUMP_INTERVAL"""
+        if self.metrics_file and time.monotonic() - self._metrics_dumped_at >= self.METRICS_DUMP_INTERVAL:
+            self.dump_metrics()
+    
+    # ==================== АСИНХРОННЫЙ ИНТЕРФЕЙС ====================
+    
+    def _submit(self, func: Callable, *args, **kwargs) -> Future:
+        """
+        Выполнить синхронный метод сервиса в фоновом цикле
+        
+        Returns:
+            Future: Результат (уже завершённый, если клиента нет)
+        """
+        if self.async_client:
+            return self.async_client.run_sync(func, *args, **kwargs)
+        
+        # Без клиента выполняем сразу - методы сами вернут ошибку
+        future = Future()
+        try:
+            future.set_result(func(*args, **kwargs))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+    
+    def connect_async(self) -> Future:
+        """Подключиться к серверу в фоне"""
+        return self._submit(self.connect)
+    
+    def connect_and_load_async(self) -> Future:
+        """Подключиться и получить список лицензий в фоне"""
+        return self._submit(self.connect_and_load)
+    
+    def get_panel_statistics_async(self) -> Future:
+        """Статистика для панели в фоне"""
+        return self._submit(self.get_panel_statistics)
+    
+    def get_licenses_async(self, force_full: bool = False) -> Future:
+        """
+        Получить лицензии в фоне
+        
+        Returns:
+            Future: Общий для одновременных вызовов (один запрос на всех)
+        """
+        future, runner = self._join_flight(force_full)
+        if runner:
+            self._spawn_flight(runner)
+        return future
+    
+    def load_dashboard_async(self) -> Future:
+        """
+        Загрузить лицензии и статистику параллельно
+        
+        Returns:
+            Future: Результат вида {'licenses': [...], 'statistics': {...}}
+        """
+        if not self.async_client:
+            return self._submit(lambda: {
+                'licenses': self.get_licenses(),
+                'statistics': self.get_statistics()
+            })
+        
+        client = self.async_client
+        
+        async def load():
+            # Лицензии - общей загрузкой, без занятого ожиданием потока пула
+            results = await client.gather(
+                licenses=asyncio.wrap_future(self.get_licenses_async()),
+                statistics=client.call(self.get_statistics)
+            )
+            for name, value in results.items():
+                if isinstance(value, Exception):
+                    print(f"❌ Ошибка загрузки {name}: {value}")
+                    results[name] = [] if name == 'licenses' else {}
+            return results
+        
+        return client.submit(load())
+    
+    def shutdown(self):
+        """Остановить фоновый цикл и закрыть соединения"""
+        self.stop_live_updates()
+        
+        # Живые обновления меняли строки после записи снимка - дописываем
+        if self._rows_version != self._saved_rows_version:
+            self._save_snapshot()
+        
+        if self.metrics_file:
+            self.dump_metrics()
+        
+        if self.async_client:
+            self.async_client.close()
+            self.async_client.loop_thread.stop()
+        
+        close_transports()
\ No newline at end of file
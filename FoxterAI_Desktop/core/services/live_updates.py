@@ -0,0 +1,197 @@
+"""
+Живые обновления лицензий по потоку событий сервера
+Патчи по ключу лицензии копятся и объединяются, пока UI их не заберёт
+"""
+
+import json
+import threading
+from typing import Any, Callable, Dict, Optional
+
+from core.api.events import EventStream
+
+
+class PatchBuffer:
+    """
+    Накопитель патчей с объединением и ограничением размера
+    
+    Для каждой лицензии хранится последнее значение каждого поля - сколько
+    бы событий ни пришло между отрисовками, UI получит одну строку на
+    ключ. Если различных ключей накопилось больше max_keys, патчи
+    отбрасываются и запрашивается полная перезагрузка: она дешевле, чем
+    тысячи точечных обновлений.
+    """
+    
+    def __init__(self, max_keys: int = 5000):
+        """
+        Args:
+            max_keys: Сколько различных лицензий держать до перезагрузки
+        """
+        self.max_keys = max_keys
+        self._patches: Dict[str, Dict[str, Any]] = {}
+        self._resync = False
+        self._lock = threading.Lock()
+        
+        self.received = 0
+        self.coalesced = 0
+        self.dropped = 0
+    
+    def put(self, key: str, fields: Dict[str, Any]) -> bool:
+        """
+        Добавить патч
+        
+        Returns:
+            bool: True если буфер был пуст (UI нужно разбудить)
+        """
+        with self._lock:
+            was_empty = not self._patches and not self._resync
+            self.received += 1
+            
+            if self._resync:
+                # Всё равно будет полная перезагрузка
+                self.dropped += 1
+                return was_empty
+            
+            pending = self._patches.get(key)
+            if pending is not None:
+                pending.update(fields)
+                self.coalesced += 1
+            elif len(self._patches) >= self.max_keys:
+                self.dropped += len(self._patches) + 1
+                self._patches.clear()
+                self._resync = True
+            else:
+                self._patches[key] = dict(fields)
+            
+            return was_empty
+    
+    def request_resync(self) -> bool:
+        """
+        Запросить полную перезагрузку (накопленные патчи не нужны)
+        
+        Returns:
+            bool: True если буфер был пуст
+        """
+        with self._lock:
+            was_empty = not self._patches and not self._resync
+            self.dropped += len(self._patches)
+            self._patches.clear()
+            self._resync = True
+            return was_empty
+    
+    def drain(self) -> Dict[str, Any]:
+        """
+        Забрать всё накопленное
+        
+        Returns:
+            Dict: {'patches': {ключ: поля}, 'resync': bool}
+        """
+        with self._lock:
+            patches, self._patches = self._patches, {}
+            resync, self._resync = self._resync, False
+        return {'patches': patches, 'resync': resync}
+    
+    def __len__(self) -> int:
+        return len(self._patches)
+    
+    def stats(self) -> Dict[str, int]:
+        """Счётчики событий"""
+        return {
+            'received': self.received,
+            'coalesced': self.coalesced,
+            'dropped': self.dropped,
+            'pending': len(self._patches)
+        }
+
+
+class LiveUpdates:
+    """
+    Подписка на события лицензий
+    
+    События 'license' несут ключ и изменённые поля (проверки и heartbeat
+    роботов: last_check, last_balance, last_equity, last_profit...),
+    'resync' - сервер не может дослать пропущенное. Обработка в UI идёт в
+    его темпе: on_pending вызывается только когда буфер был пуст, а
+    забирает данные сам UI через drain().
+    """
+    
+    def __init__(self, transport, on_pending: Optional[Callable[[], None]] = None,
+                 max_pending: int = 5000, on_state: Optional[Callable[[str], None]] = None):
+        """
+        Args:
+            transport: HTTPTransport
+            on_pending: Появились данные (вызывается из фонового потока)
+            max_pending: Предел буфера патчей, лицензий
+            on_state: Смена состояния соединения (из фонового потока)
+        """
+        self.on_pending = on_pending
+        self.on_state = on_state
+        self.buffer = PatchBuffer(max_pending)
+        self.stream = EventStream(transport, self._on_event, self._on_state)
+        self._was_connected = False
+    
+    @property
+    def connected(self) -> bool:
+        return self.stream.connected
+    
+    @property
+    def state(self) -> str:
+        return self.stream.state
+    
+    def start(self):
+        self.stream.start()
+    
+    def stop(self):
+        self.stream.stop()
+    
+    def drain(self) -> Dict[str, Any]:
+        return self.buffer.drain()
+    
+    def stats(self) -> Dict[str, Any]:
+        """Счётчики для диагностики"""
+        stats = self.buffer.stats()
+        stats.update({'state': self.stream.state, 'reconnects': self.stream.reconnects})
+        return stats
+    
+    def _on_event(self, event: Dict[str, Any]):
+        """Событие из фонового потока"""
+        kind = event['event']
+        
+        if kind == 'license':
+            try:
+                data = json.loads(event['data'])
+            except ValueError:
+                print(f"⚠️ Некорректное событие: {event['data'][:100]}")
+                return
+            key = data.pop('license_key', None)
+            if not key:
+                return
+            wake = self.buffer.put(key, data)
+        elif kind == 'resync':
+            wake = self.buffer.request_resync()
+        else:
+            return
+        
+        if wake:
+            self._notify()
+    
+    def _on_state(self, state: str):
+        """Соединение восстановлено после обрыва без дослачи - нужна сверка"""
+        if state == EventStream.CONNECTED:
+            if self._was_connected and self.stream.last_event_id is None:
+                if self.buffer.request_resync():
+                    self._notify()
+            self._was_connected = True
+        print(f"📡 Поток событий: {state}")
+        
+        if self.on_state:
+            try:
+                self.on_state(state)
+            except Exception as e:
+                print(f"⚠️ Ошибка в on_state: {e}")
+    
+    def _notify(self):
+        if self.on_pending:
+            try:
+                self.on_pending()
+            except Exception as e:
+                print(f"⚠️ Ошибка в on_pending: {e}")
\ No newline at end of file
@@ -0,0 +1,115 @@
+"""
+Политика фонового автообновления
+Интервал из APP.auto_refresh со случайным разбросом, замедление при
+ошибках и медленных ответах, ускорение при активном окне
+"""
+
+import random
+from typing import Optional
+
+
+class RefreshScheduler:
+    """
+    Расчёт задержки до следующего автообновления
+    
+    Сам ничего не запускает - приложение спрашивает next_delay() и
+    сообщает результат обновления через record_result().
+    """
+    
+    # Во сколько раз чаще обновлять, пока окно в фокусе
+    FOCUS_FACTOR = 0.5
+    
+    # Во сколько раз реже опрашивать, пока изменения приходят потоком событий
+    LIVE_FACTOR = 4.0
+    
+    # Ответ медленнее этого считается признаком нагрузки на сервер, секунд
+    SLOW_THRESHOLD = 3.0
+    
+    # Максимальная степень двойки при замедлении
+    MAX_BACKOFF_STEPS = 5
+    
+    def __init__(self, interval: float, min_interval: float = 10.0,
+                 max_interval: float = 900.0, jitter: float = 0.1):
+        """
+        Инициализация политики
+        
+        Args:
+            interval: Базовый интервал, секунд (0 - автообновление отключено)
+            min_interval: Нижняя граница задержки, секунд
+            max_interval: Верхняя граница задержки, секунд
+            jitter: Случайный разброс, доля интервала (0.1 = ±10%)
+        """
+        self.interval = max(0.0, float(interval))
+        self.min_interval = min_interval
+        self.max_interval = max(max_interval, min_interval)
+        self.jitter = jitter
+        
+        self.focused = True
+        self.paused = False
+        self.live = False
+        self.failures = 0
+        self.slow_streak = 0
+        self.last_elapsed = 0.0
+    
+    @property
+    def enabled(self) -> bool:
+        """Автообновление включено в настройках"""
+        return self.interval > 0
+    
+    def set_focused(self, focused: bool):
+        """Окно получило или потеряло фокус"""
+        self.focused = focused
+    
+    def set_paused(self, paused: bool):
+        """Приостановить (окно свёрнуто) или возобновить"""
+        self.paused = paused
+    
+    def set_live(self, live: bool):
+        """Поток событий открыт - опрос нужен только для сверки"""
+        self.live = live
+    
+    def record_result(self, ok: bool, elapsed: float):
+        """
+        Учесть результат обновления
+        
+        Args:
+            ok: Обновление прошло без ошибок
+            elapsed: Длительность, секунд
+        """
+        self.last_elapsed = elapsed
+        self.failures = 0 if ok else self.failures + 1
+        self.slow_streak = self.slow_streak + 1 if ok and elapsed > self.SLOW_THRESHOLD else 0
+    
+    def next_delay(self) -> Optional[float]:
+        """
+        Задержка до следующего обновления
+        
+        Ошибки удваивают интервал за каждую подряд, медленные ответы - за
+        каждые две подряд (не больше MAX_BACKOFF_STEPS удвоений).
+        
+        Returns:
+            Optional[float]: Секунд или None (отключено / на паузе)
+        """
+        if not self.enabled or self.paused:
+            return None
+        
+        delay = self.interval
+        if self.focused:
+            delay *= self.FOCUS_FACTOR
+        if self.live:
+            delay *= self.LIVE_FACTOR
+        
+        steps = min(self.failures + self.slow_streak // 2, self.MAX_BACKOFF_STEPS)
+        delay *= 2 ** steps
+        
+        delay = min(max(delay, self.min_interval), self.max_interval)
+        
+        # Разброс, чтобы клиенты не приходили к серверу одновременно
+        if self.jitter:
+            delay *= 1 + random.uniform(-self.jitter, self.jitter)
+        return delay
+    
+    @property
+    def backing_off(self) -> bool:
+        """Интервал сейчас увеличен из-за ошибок или медленных ответов"""
+        return self.failures > 0 or self.slow_streak >= 2
\ No newline at end of file
@@ -0,0 +1,229 @@
+"""
+Локальное зеркало лицензий в SQLite для поиска и фильтрации
+Полнотекстовый индекс FTS5 (триграммы) по полям поиска
+"""
+
+import sqlite3
+import threading
+from typing import Dict, Iterable, List, Optional
+
+
+def _fts5_trigram_available() -> bool:
+    """Собран ли SQLite с FTS5 и токенизатором trigram (SQLite 3.34+)"""
+    try:
+        conn = sqlite3.connect(':memory:')
+        try:
+            conn.execute("CREATE VIRTUAL TABLE probe USING fts5(a, tokenize='trigram')")
+        finally:
+            conn.close()
+        return True
+    except sqlite3.Error:
+        return False
+
+
+FTS5_AVAILABLE = _fts5_trigram_available()
+
+
+class LicenseSearchIndex:
+    """
+    Зеркало снимка лицензий в SQLite в памяти
+    
+    Для каждой лицензии хранятся ключ, статус, порядок в списке и поля
+    поиска в нижнем регистре. Запросы от 3 символов ищут подстроку по
+    триграммному индексу FTS5, более короткие - начало значения поля по
+    обычным индексам. Без FTS5 подстрока ищется перебором (instr).
+    
+    Результат - ключи лицензий в порядке списка; сами строки остаются в
+    снимке LicenseService.
+    """
+    
+    # Поля полнотекстового поиска
+    FIELDS = ('license_key', 'client_name', 'client_contact', 'client_telegram',
+              'account_number', 'broker_name', 'robot_name', 'notes')
+    
+    # Минимальная длина запроса для триграммного индекса
+    MIN_TRIGRAM = 3
+    
+    def __init__(self):
+        self.fts_enabled = FTS5_AVAILABLE
+        self._lock = threading.Lock()
+        self._conn = self._create()
+        self._min_ord = 0
+        self.count = 0
+    
+    # ==================== СХЕМА ====================
+    
+    def _create(self) -> sqlite3.Connection:
+        """Пустая база со схемой (триггеры FTS - после заполнения)"""
+        conn = sqlite3.connect(':memory:', check_same_thread=False)
+        columns = ', '.join(f'{field} TEXT' for field in self.FIELDS)
+        conn.execute(f'''
+            CREATE TABLE licenses (
+                id INTEGER PRIMARY KEY,
+                key TEXT NOT NULL,
+                ord INTEGER NOT NULL,
+                status TEXT,
+                {columns}
+            )
+        ''')
+        if self.fts_enabled:
+            conn.execute(f'''
+                CREATE VIRTUAL TABLE licenses_fts USING fts5(
+                    {', '.join(self.FIELDS)},
+                    content='licenses', content_rowid='id', tokenize='trigram'
+                )
+            ''')
+        return conn
+    
+    def _finish(self, conn: sqlite3.Connection):
+        """Индексы и триггеры, поддерживающие FTS в актуальном состоянии"""
+        conn.execute('CREATE UNIQUE INDEX licenses_key ON licenses(key)')
+        conn.execute('CREATE INDEX licenses_ord ON licenses(ord)')
+        conn.execute('CREATE INDEX licenses_status ON licenses(status, ord)')
+        for field in self.FIELDS:
+            conn.execute(f'CREATE INDEX licenses_{field} ON licenses({field})')
+        
+        if not self.fts_enabled:
+            return
+        
+        conn.execute("INSERT INTO licenses_fts(licenses_fts) VALUES ('rebuild')")
+        
+        fields = ', '.join(self.FIELDS)
+        new = ', '.join(f'new.{field}' for field in self.FIELDS)
+        old = ', '.join(f'old.{field}' for field in self.FIELDS)
+        delete_old = (f"INSERT INTO licenses_fts(licenses_fts, rowid, {fields}) "
+                      f"VALUES ('delete', old.id, {old});")
+        insert_new = f"INSERT INTO licenses_fts(rowid, {fields}) VALUES (new.id, {new});"
+        conn.executescript(f'''
+            CREATE TRIGGER licenses_ai AFTER INSERT ON licenses BEGIN {insert_new} END;
+            CREATE TRIGGER licenses_ad AFTER DELETE ON licenses BEGIN {delete_old} END;
+            CREATE TRIGGER licenses_au AFTER UPDATE ON licenses BEGIN {delete_old} {insert_new} END;
+        ''')
+    
+    def _values(self, lic: Dict) -> tuple:
+        """Ключ, статус и поля поиска строки (в нижнем регистре)"""
+        return (lic.get('license_key'), lic.get('status')) + tuple(
+            str(lic.get(field) or '').lower() for field in self.FIELDS
+        )
+    
+    # ==================== ОБНОВЛЕНИЕ ====================
+    
+    def rebuild(self, licenses: Iterable[Dict]):
+        """
+        Заполнить заново (полная синхронизация)
+        
+        Новая база строится отдельно и подменяет старую - поиск во время
+        построения работает по прежним данным.
+        """
+        conn = self._create()
+        columns = ', '.join(self.FIELDS)
+        placeholders = ', '.join('?' * (len(self.FIELDS) + 3))
+        rows = [(ord_,) + self._values(lic) for ord_, lic in enumerate(licenses)]
+        
+        with conn:
+            conn.executemany(
+                f'INSERT INTO licenses (ord, key, status, {columns}) VALUES ({placeholders})', rows
+            )
+            self._finish(conn)
+        
+        with self._lock:
+            old, self._conn = self._conn, conn
+            self._min_ord = 0
+            self.count = len(rows)
+        old.close()
+    
+    def merge(self, changed: List[Dict], deleted: Iterable[str]):
+        """
+        Применить дельту так же, как LicenseService._merge_snapshot
+        
+        Изменённые строки остаются на своих местах, новые - в начало списка.
+        """
+        columns = ', '.join(self.FIELDS)
+        assignments = ', '.join(f'{field} = ?' for field in ('status',) + self.FIELDS)
+        placeholders = ', '.join('?' * (len(self.FIELDS) + 3))
+        
+        with self._lock, self._conn as conn:
+            new_rows = []
+            for lic in changed:
+                values = self._values(lic)
+                cursor = conn.execute(
+                    f'UPDATE licenses SET {assignments} WHERE key = ?',
+                    values[1:] + values[:1]
+                )
+                if not cursor.rowcount:
+                    new_rows.append(values)
+            
+            if new_rows:
+                start = self._min_ord - len(new_rows)
+                conn.executemany(
+                    f'INSERT INTO licenses (ord, key, status, {columns}) VALUES ({placeholders})',
+                    [(start + i,) + values for i, values in enumerate(new_rows)]
+                )
+                self._min_ord = start
+            
+            keys = [(key,) for key in deleted]
+            if keys:
+                conn.executemany('DELETE FROM licenses WHERE key = ?', keys)
+            
+            self.count = conn.execute('SELECT COUNT(*) FROM licenses').fetchone()[0]
+    
+    def update(self, licenses: List[Dict]):
+        """Перезаписать поля существующих строк (живые обновления)"""
+        self.merge(licenses, ())
+    
+    def clear(self):
+        """Очистить зеркало"""
+        self.rebuild(())
+    
+    # ==================== ПОИСК ====================
+    
+    def search(self, query: str = '', status: Optional[str] = None) -> List[str]:
+        """
+        Найти лицензии
+        
+        Args:
+            query: Подстрока (от 3 символов) или начало значения поля
+            status: Только с этим статусом (None - любые)
+        
+        Returns:
+            List[str]: Ключи лицензий в порядке списка
+        """
+        query = (query or '').strip().lower()
+        conditions, params = [], []
+        source = 'licenses'
+        
+        if status:
+            # С запросом выборку задаёт он, индекс статуса только мешает (+)
+            conditions.append('+licenses.status = ?' if query else 'licenses.status = ?')
+            params.append(status)
+        
+        if query and len(query) >= self.MIN_TRIGRAM and self.fts_enabled:
+            # Фраза из триграмм = подстрока
+            source = 'licenses JOIN licenses_fts ON licenses_fts.rowid = licenses.id'
+            conditions.append('licenses_fts MATCH ?')
+            params.append('"' + query.replace('"', '""') + '"')
+        elif query and len(query) >= self.MIN_TRIGRAM:
+            conditions.append('(' + ' OR '.join(
+                f'instr(licenses.{field}, ?) > 0' for field in self.FIELDS
+            ) + ')')
+            params.extend([query] * len(self.FIELDS))
+        elif query:
+            # Короткий запрос - начало значения по индексам полей
+            upper = query[:-1] + chr(ord(query[-1]) + 1)
+            conditions.append('(' + ' OR '.join(
+                f'(licenses.{field} >= ? AND licenses.{field} < ?)' for field in self.FIELDS
+            ) + ')')
+            for _ in self.FIELDS:
+                params.extend([query, upper])
+        
+        sql = f'SELECT licenses.ord, licenses.key FROM {source}'
+        if conditions:
+            sql += ' WHERE ' + ' AND '.join(conditions)
+        
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        
+        # Порядок списка восстанавливаем сами: ORDER BY ord заставляет
+        # SQLite обходить всю таблицу по индексу порядка вместо выборки
+        rows.sort()
+        return [key for _, key in rows]
\ No newline at end of file
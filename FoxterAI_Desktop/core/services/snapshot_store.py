@@ -0,0 +1,157 @@
+"""
+Локальный кэш последнего списка лицензий (SQLite)
+Позволяет показать данные сразу при запуске, до ответа сервера
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from typing import Any, Dict, List, Optional
+
+from core.api import wire_format
+
+
+class SnapshotStore:
+    """
+    Снимок обработанных лицензий и состояния синхронизации в файле SQLite
+    
+    Строки хранятся в порядке списка как JSON, рядом - ETag, Last-Modified,
+    высшая отметка и хэш содержимого, чтобы первая синхронизация после
+    запуска была условной. Снимок привязан к версии формата, к
+    schema_mapping.json и к адресу сервера: при изменении любого из них
+    он молча отбрасывается.
+    """
+    
+    # Версия формата файла (менять при изменении таблиц или обработки строк)
+    FORMAT_VERSION = 4
+    
+    def __init__(self, path: str, server: str = ''):
+        """
+        Инициализация хранилища
+        
+        Args:
+            path: Путь к файлу кэша
+            server: Адрес сервера (снимок другого сервера не подходит)
+        """
+        self.path = path
+        self.server = server
+        self.fingerprint = self._schema_fingerprint()
+    
+    @classmethod
+    def _schema_fingerprint(cls) -> str:
+        """Отпечаток формата: версия файла + версия и поля schema_mapping.json"""
+        schema = wire_format.load_schema()
+        fields = ','.join(schema['fields']).encode('utf-8')
+        digest = hashlib.blake2b(fields, digest_size=8).hexdigest()
+        return f"{cls.FORMAT_VERSION}:{schema['version']}:{digest}"
+    
+    def _connect(self) -> sqlite3.Connection:
+        """Открыть файл и создать таблицы при необходимости"""
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        
+        conn = sqlite3.connect(self.path, timeout=5)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.executescript('''
+            CREATE TABLE IF NOT EXISTS meta (
+                key TEXT PRIMARY KEY,
+                value TEXT
+            );
+            CREATE TABLE IF NOT EXISTS licenses (
+                pos INTEGER PRIMARY KEY,
+                license_key TEXT,
+                data TEXT NOT NULL
+            );
+        ''')
+        return conn
+    
+    def save(self, licenses: List[Dict], state: Dict[str, Any]) -> bool:
+        """
+        Сохранить снимок (целиком заменяет предыдущий)
+        
+        Args:
+            licenses: Обработанные лицензии в порядке списка
+            state: etag, last_modified, high_water, content_hash
+        
+        Returns:
+            bool: True если сохранено
+        """
+        started = time.perf_counter()
+        rows = [
+            (pos, lic.get('license_key'), json.dumps(lic, ensure_ascii=False, default=str))
+            for pos, lic in enumerate(licenses)
+        ]
+        meta = dict(state, fingerprint=self.fingerprint, server=self.server,
+                    saved_at=time.time(), count=len(rows))
+        
+        try:
+            conn = self._connect()
+            try:
+                with conn:
+                    conn.execute('DELETE FROM licenses')
+                    conn.executemany('INSERT INTO licenses (pos, license_key, data) VALUES (?, ?, ?)', rows)
+                    conn.execute('DELETE FROM meta')
+                    conn.executemany('INSERT INTO meta (key, value) VALUES (?, ?)',
+                                     [(key, json.dumps(value)) for key, value in meta.items()])
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            print(f"⚠️ Не удалось сохранить снимок в {self.path}: {e}")
+            return False
+        
+        print(f"💾 Снимок сохранён: {len(rows)} лицензий за {(time.perf_counter() - started) * 1000:.0f} мс")
+        return True
+    
+    def load(self) -> Optional[Dict[str, Any]]:
+        """
+        Прочитать снимок
+        
+        Returns:
+            Optional[Dict]: {'licenses': [...], 'etag', 'last_modified',
+                             'high_water', 'content_hash', 'saved_at'}
+                            или None (файла нет, устарел формат, другой сервер)
+        """
+        if not os.path.exists(self.path):
+            return None
+        
+        try:
+            conn = self._connect()
+            try:
+                meta = {key: json.loads(value) for key, value in conn.execute('SELECT key, value FROM meta')}
+                if not meta:
+                    return None
+                
+                if meta.get('fingerprint') != self.fingerprint or meta.get('server') != self.server:
+                    print("♻️ Сохранённый снимок другого формата или сервера - не используется")
+                    self.clear(conn)
+                    return None
+                
+                licenses = [json.loads(data) for (data,) in
+                            conn.execute('SELECT data FROM licenses ORDER BY pos')]
+            finally:
+                conn.close()
+        except (sqlite3.Error, ValueError) as e:
+            print(f"⚠️ Не удалось прочитать снимок {self.path}: {e}")
+            return None
+        
+        if len(licenses) != meta.get('count'):
+            return None
+        
+        meta['licenses'] = licenses
+        return meta
+    
+    def clear(self, conn: Optional[sqlite3.Connection] = None):
+        """Удалить снимок"""
+        own = conn is None
+        try:
+            conn = conn or self._connect()
+            with conn:
+                conn.execute('DELETE FROM licenses')
+                conn.execute('DELETE FROM meta')
+            if own:
+                conn.close()
+        except sqlite3.Error as e:
+            print(f"⚠️ Не удалось очистить снимок {self.path}: {e}")
\ No newline at end of file
@@ -0,0 +1,300 @@
+"""
+Общий пул фоновых задач приложения
+Ограниченное число потоков, Future с обработчиками в потоке UI,
+отмена задач и упорядоченное завершение
+"""
+
+import threading
+import time
+from concurrent.futures import CancelledError, Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+
+class TaskCancelled(CancelledError):
+    """Задача отменена через CancellationToken"""
+
+
+class CancellationToken:
+    """
+    Признак отмены задачи
+    
+    Задача, не успевшая начаться, не запускается; начавшаяся может сама
+    проверять token.cancelled между шагами. Обработчики отменённой
+    задачи в потоке UI не вызываются.
+    """
+    
+    def __init__(self):
+        self._event = threading.Event()
+    
+    @property
+    def cancelled(self) -> bool:
+        """Отменена ли задача"""
+        return self._event.is_set()
+    
+    def cancel(self):
+        """Отменить задачу"""
+        self._event.set()
+    
+    def raise_if_cancelled(self):
+        """Прервать задачу, если она отменена"""
+        if self._event.is_set():
+            raise TaskCancelled()
+
+
+class TaskExecutor:
+    """
+    Пул фоновых задач с очередями по видам работы
+    
+    'io' - чтение с сервера, 'write' - изменения (создание, продление,
+    блокировка...). Изменения идут отдельной очередью: чтение не
+    задерживает их, а при закрытии они дожидаются завершения, тогда как
+    ещё не начатое чтение отменяется.
+    
+    Результат задачи передаётся в поток UI через ui_dispatch
+    (обычно UIDispatcher.post).
+    """
+    
+    # Потоков в каждой очереди
+    LANES = {'io': 4, 'write': 2}
+    
+    # Сколько ждать незавершённые изменения при закрытии, секунд
+    SHUTDOWN_TIMEOUT = 10.0
+    
+    def __init__(self, ui_dispatch: Optional[Callable] = None,
+                 lanes: Optional[Dict[str, int]] = None):
+        """
+        Инициализация пула
+        
+        Args:
+            ui_dispatch: ui_dispatch(func, *args, key=...) - выполнить в потоке UI
+                         (без него обработчики вызываются в фоновом потоке)
+            lanes: Потоков по очередям (по умолчанию LANES)
+        """
+        self.ui_dispatch = ui_dispatch
+        self._pools = {
+            lane: ThreadPoolExecutor(max_workers=max(1, int(workers)),
+                                     thread_name_prefix=f'FoxterAI-{lane}')
+            for lane, workers in (lanes or self.LANES).items()
+        }
+        # Незавершённые задачи: Future -> (очередь, токен)
+        self._tasks: Dict[Future, Tuple[str, CancellationToken]] = {}
+        self._lock = threading.Lock()
+        self._closing = False
+        self._stats = {'submitted': 0, 'completed': 0, 'failed': 0, 'cancelled': 0}
+    
+    # ==================== ЗАДАЧИ ====================
+    
+    def submit(self, func: Callable, *args,
+               lane: str = 'io',
+               token: Optional[CancellationToken] = None,
+               on_done: Optional[Callable[[Any], None]] = None,
+               on_error: Optional[Callable[[Exception], None]] = None,
+               key: Optional[Hashable] = None,
+               **kwargs) -> Future:
+        """
+        Выполнить функцию в фоне
+        
+        Args:
+            func: Функция
+            lane: Очередь ('io' или 'write')
+            token: Признак отмены (создаётся, если не передан)
+            on_done: Обработчик результата (в потоке UI)
+            on_error: Обработчик исключения (в потоке UI)
+            key: Цель обновления для on_done (см. call_in_ui)
+        
+        Returns:
+            Future: Результат выполнения
+        """
+        token = token or CancellationToken()
+        
+        def run():
+            token.raise_if_cancelled()
+            return func(*args, **kwargs)
+        
+        with self._lock:
+            if self._closing:
+                raise RuntimeError('TaskExecutor остановлен')
+            future = self._pools[lane].submit(run)
+            self._tasks[future] = (lane, token)
+            self._stats['submitted'] += 1
+        
+        future.add_done_callback(self._forget)
+        self.watch(future, on_done, on_error, token, key)
+        return future
+    
+    def track(self, future: Future, lane: str = 'write',
+              on_done: Optional[Callable[[Any], None]] = None,
+              on_error: Optional[Callable[[Exception], None]] = None,
+              key: Optional[Hashable] = None) -> Future:
+        """
+        Учитывать Future фонового цикла сервиса как задачу очереди lane
+        
+        Такой Future не занимает поток пула, но при закрытии изменения
+        дожидаются так же, как запущенные через submit.
+        
+        Args:
+            future: Future
+            lane: Очередь ('write' - ждать при закрытии)
+            on_done: Обработчик результата
+            on_error: Обработчик исключения
+            key: Цель обновления для on_done (см. call_in_ui)
+        
+        Returns:
+            Future: Тот же future
+        """
+        token = CancellationToken()
+        with self._lock:
+            if self._closing:
+                raise RuntimeError('TaskExecutor остановлен')
+            self._tasks[future] = (lane, token)
+            self._stats['submitted'] += 1
+        
+        future.add_done_callback(self._forget)
+        return self.watch(future, on_done, on_error, token, key)
+    
+    def watch(self, future: Future,
+              on_done: Optional[Callable[[Any], None]] = None,
+              on_error: Optional[Callable[[Exception], None]] = None,
+              token: Optional[CancellationToken] = None,
+              key: Optional[Hashable] = None) -> Future:
+        """
+        Передать результат готового Future в поток UI
+        
+        Для Future, полученных не из submit (фоновый цикл сервиса).
+        
+        Args:
+            future: Future
+            on_done: Обработчик результата
+            on_error: Обработчик исключения
+            token: Отменённый токен - обработчики не вызываются
+            key: Цель обновления для on_done (см. call_in_ui)
+        
+        Returns:
+            Future: Тот же future
+        """
+        if on_done is None and on_error is None:
+            return future
+        
+        def deliver(done: Future):
+            if done.cancelled() or (token is not None and token.cancelled):
+                return
+            error = done.exception()
+            if isinstance(error, CancelledError):
+                return
+            if error is not None:
+                if on_error is not None:
+                    self.call_in_ui(on_error, error)
+                else:
+                    print(f"❌ Ошибка фоновой задачи: {error}")
+            elif on_done is not None:
+                self.call_in_ui(on_done, done.result(), key=key)
+        
+        future.add_done_callback(deliver)
+        return future
+    
+    def call_in_ui(self, func: Callable, *args, key: Optional[Hashable] = None):
+        """
+        Вызвать функцию в потоке UI (из любого потока)
+        
+        Args:
+            func: Функция
+            key: Цель обновления - ждущий вызов с тем же ключом заменяется
+        """
+        # При закрытии поток UI ждёт пул - передача в него заблокировала бы оба
+        if self._closing:
+            return
+        if self.ui_dispatch is None:
+            func(*args)
+            return
+        try:
+            if key is None:
+                self.ui_dispatch(func, *args)
+            else:
+                self.ui_dispatch(func, *args, key=key)
+        except RuntimeError as e:
+            # Окно уже закрыто
+            print(f"⚠️ Результат фоновой задачи не передан в UI: {e}")
+    
+    def _forget(self, future: Future):
+        """Задача завершилась - убрать её токен и учесть итог"""
+        with self._lock:
+            self._tasks.pop(future, None)
+            if future.cancelled() or isinstance(future.exception(), CancelledError):
+                self._stats['cancelled'] += 1
+            elif future.exception() is not None:
+                self._stats['failed'] += 1
+            else:
+                self._stats['completed'] += 1
+    
+    # ==================== ОТМЕНА И ЗАВЕРШЕНИЕ ====================
+    
+    def cancel_all(self, lane: Optional[str] = None):
+        """
+        Отменить задачи (ещё не начатые не запустятся)
+        
+        Args:
+            lane: Только эта очередь (None - все)
+        """
+        with self._lock:
+            tasks = list(self._tasks.items())
+        for future, (task_lane, token) in tasks:
+            if lane is None or task_lane == lane:
+                token.cancel()
+                future.cancel()
+    
+    def shutdown(self, timeout: Optional[float] = None) -> bool:
+        """
+        Остановить пул
+        
+        Новые задачи не принимаются, не начатое чтение отменяется,
+        изменения на сервере дожидаются завершения (не дольше timeout).
+        Обработчики UI после начала остановки не вызываются.
+        
+        Args:
+            timeout: Сколько ждать изменения, секунд (по умолчанию SHUTDOWN_TIMEOUT)
+        
+        Returns:
+            bool: True если все изменения завершились
+        """
+        with self._lock:
+            if self._closing:
+                return True
+            self._closing = True
+            pending = list(self._tasks.items())
+        
+        writes = []
+        for future, (lane, token) in pending:
+            if lane == 'write':
+                writes.append(future)
+            else:
+                token.cancel()
+                future.cancel()
+        
+        if writes:
+            print(f"⏳ Ожидание незавершённых изменений: {len(writes)}")
+        
+        deadline = time.monotonic() + (self.SHUTDOWN_TIMEOUT if timeout is None else timeout)
+        finished = True
+        for future in writes:
+            try:
+                future.result(max(0.0, deadline - time.monotonic()))
+            except CancelledError:
+                pass
+            except Exception as e:
+                if not future.done():
+                    finished = False
+                    print(f"⚠️ Изменение не завершилось до закрытия: {e or 'таймаут'}")
+        
+        for pool in self._pools.values():
+            pool.shutdown(wait=False, cancel_futures=True)
+        return finished
+    
+    @property
+    def is_closing(self) -> bool:
+        """Пул останавливается или остановлен"""
+        return self._closing
+    
+    def stats(self) -> Dict[str, int]:
+        """Счётчики задач и число незавершённых"""
+        with self._lock:
+            return dict(self._stats, pending=len(self._tasks))
\ No newline at end of file
@@ -0,0 +1,142 @@
+"""
+Очередь обновлений интерфейса
+Фоновые потоки кладут вызовы в очередь, поток UI разбирает её
+периодически и не дольше бюджета кадра
+"""
+
+import itertools
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+class UIDispatcher:
+    """
+    Потокобезопасная очередь вызовов для потока UI
+    
+    post() можно вызывать из любого потока - он не обращается к Tk.
+    Очередь разбирает один периодический pump() в потоке UI: за кадр
+    выполняется столько вызовов, сколько укладывается в FRAME_BUDGET,
+    остальные ждут следующего кадра - окно не замирает под потоком
+    результатов.
+    
+    Вызовы с одинаковым key сливаются: пока вызов ждёт в очереди, новый
+    с тем же ключом заменяет его и встаёт в конец очереди - выполнится
+    только последний и не раньше вызовов, поставленных до него (иначе
+    устаревший список мог бы перезаписать более новые порции потока).
+    """
+    
+    # Пауза между кадрами, пока в очереди есть вызовы, мс
+    FRAME_MS = 16
+    
+    # Пауза проверки пустой очереди, мс
+    IDLE_MS = 50
+    
+    # Сколько времени кадра можно занять вызовами, секунд
+    FRAME_BUDGET = 0.008
+    
+    def __init__(self, schedule: Callable[[int, Callable], Any],
+                 frame_budget: Optional[float] = None):
+        """
+        Инициализация очереди
+        
+        Args:
+            schedule: schedule(ms, func) - вызвать func в потоке UI через ms
+                      (метод after окна)
+            frame_budget: Бюджет кадра, секунд (по умолчанию FRAME_BUDGET)
+        """
+        self.schedule = schedule
+        self.frame_budget = self.FRAME_BUDGET if frame_budget is None else frame_budget
+        self._queue: 'OrderedDict[Hashable, tuple]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._sequence = itertools.count()
+        self._running = False
+        self._stats = {'posted': 0, 'merged': 0, 'executed': 0, 'failed': 0,
+                       'frames': 0, 'deferred_frames': 0, 'max_frame_ms': 0.0}
+    
+    def start(self):
+        """Запустить разбор очереди (в потоке UI)"""
+        if self._running:
+            return
+        self._running = True
+        self.schedule(0, self.pump)
+    
+    def stop(self):
+        """Остановить разбор; ждущие вызовы отбрасываются, новые не принимаются"""
+        with self._lock:
+            self._running = False
+            self._queue.clear()
+    
+    @property
+    def is_running(self) -> bool:
+        """Разбирается ли очередь"""
+        return self._running
+    
+    def post(self, func: Callable, *args, key: Optional[Hashable] = None) -> bool:
+        """
+        Поставить вызов в очередь (из любого потока)
+        
+        Args:
+            func: Функция
+            key: Цель обновления - ждущий вызов с тем же ключом заменяется
+                 (новый встаёт в конец очереди)
+        
+        Returns:
+            bool: False если очередь остановлена
+        """
+        with self._lock:
+            if not self._running:
+                return False
+            self._stats['posted'] += 1
+            if key is None:
+                key = (None, next(self._sequence))
+            elif key in self._queue:
+                self._stats['merged'] += 1
+                del self._queue[key]
+            self._queue[key] = (func, args)
+        return True
+    
+    def pump(self):
+        """Выполнить вызовы в пределах бюджета кадра и запланировать следующий кадр"""
+        if not self._running:
+            return
+        
+        started = time.perf_counter()
+        deadline = started + self.frame_budget
+        executed = 0
+        
+        while True:
+            with self._lock:
+                if not self._queue:
+                    break
+                _, (func, args) = self._queue.popitem(last=False)
+            
+            try:
+                func(*args)
+            except Exception as e:
+                self._stats['failed'] += 1
+                print(f"❌ Ошибка обновления интерфейса ({getattr(func, '__name__', func)}): {e}")
+            executed += 1
+            
+            if time.perf_counter() >= deadline:
+                break
+        
+        with self._lock:
+            pending = bool(self._queue)
+        
+        if executed:
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            self._stats['executed'] += executed
+            self._stats['frames'] += 1
+            self._stats['max_frame_ms'] = max(self._stats['max_frame_ms'], elapsed_ms)
+            if pending:
+                self._stats['deferred_frames'] += 1
+        
+        if self._running:
+            self.schedule(self.FRAME_MS if pending else self.IDLE_MS, self.pump)
+    
+    def stats(self) -> Dict[str, Any]:
+        """Счётчики очереди и число ждущих вызовов"""
+        with self._lock:
+            return dict(self._stats, pending=len(self._queue))
\ No newline at end of file
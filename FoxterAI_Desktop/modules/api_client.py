@@ -6,14 +6,21 @@ API клиент для работы с сервером лицензий Foxter
 import requests
 import json
 import configparser
-from datetime import datetime
-from typing import Dict, List, Optional, Any
+import time
+from typing import Dict, List, Optional, Any, Callable, Tuple
 from .encoding_fix import EncodingFixer
+from core.api.transport import get_transport
+from core.api.streaming import JSONArrayStream, iter_batches
+from core.api import wire_format
+from core.models.normalize import LicenseNormalizer
 
 
 class APIClient:
     """Клиент для работы с API сервера лицензий"""
     
+    # Имя эндпоинта списка в метриках транспорта
+    LIST_ENDPOINT = 'GET /api/licenses'
+    
     def __init__(self, host: str, port: int, protocol: str = 'http', timeout: int = 10):
         """
         Инициализация клиента
@@ -26,8 +33,8 @@ class APIClient:
         """
         self.base_url = f"{protocol}://{host}:{port}"
         self.timeout = timeout
-        self.session = requests.Session()
         self.encoding_fixer = EncodingFixer()
+        self.normalizer = LicenseNormalizer(self.encoding_fixer.fix_dict_encoding)
         
         # Загружаем API ключ напрямую из конфига
         self.api_key = self._load_api_key()
@@ -35,12 +42,19 @@ class APIClient:
         if not self.api_key:
             raise ValueError("API ключ не найден в config.ini! Добавьте api_key в секцию [SERVER]")
         
-        # Заголовки по умолчанию с API ключом
-        self.session.headers.update({
-            'Content-Type': 'application/json',
-            'User-Agent': 'FoxterAI-Desktop/3.0',
-            'X-API-Key': self.api_key
-        })
+        # Общий транспорт (пул соединений, повторы, предохранитель).
+        # Заголовки с API ключом он устанавливает сам; интерфейс как у
+        # requests.Session, поэтому методы ниже работают через него
+        self.transport = get_transport(self.base_url, self.api_key, timeout)
+        self.session = self.transport
+        self.cache = self.transport.cache
+        self.metrics = self.transport.metrics
+        
+        # Просить у сервера компактное тело списка (с откатом на JSON)
+        self.compact_format = True
+        
+        # Последний авторизованный запрос получил 401
+        self.key_rejected = False
     
     def _load_api_key(self) -> str:
         """Загрузить API ключ из config.ini"""
@@ -58,34 +72,30 @@ class APIClient:
         """
         Проверить соединение с сервером
         
+        Живость проверяется по /health, ключ - по агрегату /api/statistics
+        (ответ заодно попадает в кэш для панели статистики). Список
+        лицензий ради проверки не скачивается.
+        
         Returns:
             bool: True если сервер доступен и API ключ валиден
         """
-        try:
-            response = self.session.get(
-                f"{self.base_url}/api/licenses",
-                timeout=self.timeout
-            )
-            
-            # Проверяем статус код
-            if response.status_code == 401:
-                print("ОШИБКА: Неверный API ключ!")
-                print(f"Текущий ключ: {self.api_key}")
-                return False
-                
-            # Если получили ответ - проверяем его структуру
-            if response.status_code == 200:
-                try:
-                    data = response.json()
-                    # Проверяем success в ответе
-                    if isinstance(data, dict):
-                        return data.get('success', False)
-                    return True
-                except:
-                    return True
-                    
+        if not self.ping():
             return False
-            
+        
+        self.get_statistics()
+        return not self.key_rejected
+    
+    def ping(self) -> bool:
+        """
+        Проверить, что сервер отвечает (GET /health, без авторизации)
+        
+        Returns:
+            bool: True если сервер доступен
+        """
+        try:
+            response = self.session.get(f"{self.base_url}/health", timeout=self.timeout)
+            return response.status_code == 200
+        
         except requests.exceptions.ConnectionError:
             print(f"Не удалось подключиться к {self.base_url}")
             return False
@@ -96,6 +106,48 @@ class APIClient:
             print(f"Ошибка проверки подключения: {e}")
             return False
     
+    def get_server_version(self) -> Dict:
+        """
+        Получить версию сервера (GET /api/version, без авторизации)
+        
+        Returns:
+            Dict: {'version', 'api_version', 'features'} или {} при ошибке
+        """
+        return self.cache.get_or_load('server_info', ('version',), self._fetch_server_version)
+    
+    def _fetch_server_version(self) -> Dict:
+        """Запросить версию сервера"""
+        try:
+            response = self.session.get(f"{self.base_url}/api/version", timeout=self.timeout)
+            response.raise_for_status()
+            
+            data = response.json()
+            return {
+                'version': data.get('версия', data.get('version')),
+                'api_version': data.get('версия_api', data.get('api_version')),
+                'features': data.get('функции', data.get('features', []))
+            }
+        
+        except Exception as e:
+            print(f"Ошибка получения версии сервера: {e}")
+            return {}
+    
+    def _check_auth(self, response, action: str) -> bool:
+        """
+        Запомнить, принял ли сервер API ключ
+        
+        Args:
+            response: Ответ сервера
+            action: Для сообщения об ошибке
+        
+        Returns:
+            bool: False если ключ отклонён (401)
+        """
+        self.key_rejected = response.status_code == 401
+        if self.key_rejected:
+            print(f"ОШИБКА: Неверный API ключ {action}")
+        return not self.key_rejected
+    
     def get_licenses(self) -> List[Dict]:
         """
         Получить список всех лицензий
@@ -106,127 +158,420 @@ class APIClient:
         try:
             response = self.session.get(
                 f"{self.base_url}/api/licenses",
+                headers=self._list_headers(),
                 timeout=self.timeout
             )
             
-            if response.status_code == 401:
-                print("ОШИБКА: Неверный API ключ при получении лицензий")
+            if not self._check_auth(response, "при получении лицензий"):
                 return []
-                
+            
             response.raise_for_status()
             
-            data = response.json()
+            data, needs_fix = self._decode(response)
+            licenses = self._extract_licenses(data)
+            if licenses is None:
+                return []
+            
+            # Исправляем кодировку (если нужно) и добавляем вычисляемые поля
+            fixed_licenses = self._process_licenses(licenses, fix_encoding=needs_fix)
             
-            # Сервер возвращает {success: true, licenses: [...]}
+            print(f"📦 Тип ответа: {type(licenses)}")
+            print(f"✅ ПОЛУЧЕНО {len(fixed_licenses)} ЛИЦЕНЗИЙ!")
+            
+            return fixed_licenses
+        
+        except Exception as e:
+            print(f"Ошибка получения лицензий: {e}")
+            return []
+    
+    def get_licenses_delta(self, since: Optional[str] = None,
+                           etag: Optional[str] = None,
+                           last_modified: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Получить изменения списка лицензий относительно прошлого снимка
+        
+        Отправляет условные заголовки If-None-Match / If-Modified-Since и
+        параметр since. Сервер может ответить 304 (ничего не изменилось),
+        дельтой ({delta: true, licenses: [...], deleted: [...]}) или
+        полным списком, если дельты он не поддерживает.
+        
+        Args:
+            since: Высшая отметка времени прошлого снимка (ISO)
+            etag: ETag прошлого ответа
+            last_modified: Last-Modified прошлого ответа
+        
+        Returns:
+            Dict: {'mode': 'not_modified' | 'delta' | 'full' | 'error',
+                   'licenses': [...], 'deleted': [...],
+                   'etag': ..., 'last_modified': ..., 'server_time': ...,
+                   'accept': Accept запроса - к нему относятся etag и last_modified}
+        """
+        result = {
+            'mode': 'error',
+            'licenses': [],
+            'deleted': [],
+            'etag': etag,
+            'last_modified': last_modified,
+            'server_time': None
+        }
+        
+        headers = self._list_headers()
+        result['accept'] = headers.get('Accept', '')
+        if etag:
+            headers['If-None-Match'] = etag
+        if last_modified:
+            headers['If-Modified-Since'] = last_modified
+        
+        params = {'since': since} if since else None
+        
+        try:
+            response = self.session.get(
+                f"{self.base_url}/api/licenses",
+                params=params,
+                headers=headers,
+                timeout=self.timeout
+            )
+            
+            if not self._check_auth(response, "при получении лицензий"):
+                return result
+            
+            # Данные не изменились - тело пустое
+            if response.status_code == 304:
+                result['mode'] = 'not_modified'
+                return result
+            
+            response.raise_for_status()
+            
+            data, needs_fix = self._decode(response)
+            licenses = self._extract_licenses(data)
+            if licenses is None:
+                return result
+            
+            # Дельту признаём только если сервер явно её подтвердил,
+            # иначе считаем ответ полным списком
+            is_delta = bool(since) and isinstance(data, dict) and data.get('delta') is True
+            
+            result['mode'] = 'delta' if is_delta else 'full'
+            result['licenses'] = self._process_licenses(licenses, fix_encoding=needs_fix)
+            result['deleted'] = list(data.get('deleted') or []) if is_delta else []
+            result['etag'] = response.headers.get('ETag')
+            result['last_modified'] = response.headers.get('Last-Modified')
             if isinstance(data, dict):
-                if data.get('success', False):
-                    licenses = data.get('licenses', [])
-                else:
-                    error = data.get('error', 'Unknown error')
-                    print(f"Ошибка от сервера: {error}")
-                    return []
-            elif isinstance(data, list):
-                # На всякий случай если формат изменится
-                licenses = data
-            else:
-                print(f"Неожиданный формат ответа: {type(data)}")
-                return []
+                result['server_time'] = data.get('server_time')
+            
+            return result
+        
+        except Exception as e:
+            print(f"Ошибка получения изменений лицензий: {e}")
+            return result
+    
+    def get_licenses_stream(self, on_batch: Callable[[List[Dict]], None],
+                            etag: Optional[str] = None,
+                            last_modified: Optional[str] = None,
+                            batch_size: int = 200,
+                            time_budget: float = 0.05) -> Dict[str, Any]:
+        """
+        Загрузить полный список лицензий потоково
+        
+        Массив licenses разбирается по мере чтения тела ответа, строки
+        обрабатываются (_process_license) и отдаются в on_batch пачками по
+        размеру или времени - первые строки можно показать, пока остальные
+        ещё загружаются. Целиком сырой JSON в памяти не держится.
+        
+        Args:
+            on_batch: Вызывается с каждой пачкой обработанных лицензий
+            etag: ETag прошлого ответа
+            last_modified: Last-Modified прошлого ответа
+            batch_size: Максимальный размер пачки
+            time_budget: Максимальное время набора пачки, секунд
+        
+        Returns:
+            Dict: Как у get_licenses_delta (mode: 'full' | 'not_modified' | 'error')
+        """
+        result = {
+            'mode': 'error',
+            'licenses': [],
+            'deleted': [],
+            'etag': etag,
+            'last_modified': last_modified,
+            'server_time': None
+        }
+        
+        # Потоковый разбор понимает только JSON - просим его явно, чтобы
+        # ETag соответствовал представлению (см. list_accept)
+        headers = self._list_headers(streaming=True)
+        result['accept'] = headers['Accept']
+        if etag:
+            headers['If-None-Match'] = etag
+        if last_modified:
+            headers['If-Modified-Since'] = last_modified
+        
+        try:
+            response = self.session.get(
+                f"{self.base_url}/api/licenses",
+                headers=headers,
+                timeout=self.timeout,
+                stream=True
+            )
             
-            # Исправляем кодировку и добавляем вычисляемые поля
-            fixed_licenses = []
-            for lic in licenses:
-                # Исправляем кодировку всего словаря
-                fixed_lic = self.encoding_fixer.fix_dict_encoding(lic)
+            with response:
+                if not self._check_auth(response, "при получении лицензий"):
+                    return result
+                
+                if response.status_code == 304:
+                    result['mode'] = 'not_modified'
+                    return result
+                
+                response.raise_for_status()
+                
+                stream = JSONArrayStream(
+                    response.iter_content(chunk_size=64 * 1024),
+                    array_key='licenses',
+                    encoding=wire_format.charset(response.headers.get('Content-Type'))
+                    or wire_format.DEFAULT_CHARSET
+                )
                 
-                # Специальная обработка поля account_owner (часто приходит в неправильной кодировке из MT4)
-                if 'account_owner' in fixed_lic and fixed_lic['account_owner']:
-                    owner_raw = fixed_lic['account_owner']
-                    
-                    if isinstance(owner_raw, str):
-                        # Проверяем на признаки неправильной кодировки
-                        if any(ord(c) > 127 for c in owner_raw) or any(c in owner_raw for c in ['ï', '¿', '½', 'ð', 'Ð', '$n']):
-                            # Пробуем исправить кодировку
-                            fixed_owner = None
-                            
-                            # Попытка 1: UTF-8 интерпретированный как Latin-1
-                            try:
-                                test = owner_raw.encode('latin-1', errors='ignore').decode('utf-8', errors='ignore')
-                                if test and not any(c in test for c in ['�', 'ï', '¿']):
-                                    fixed_owner = test
-                            except:
-                                pass
-                            
-                            # Попытка 2: CP1251 интерпретированный как UTF-8
-                            if not fixed_owner:
-                                try:
-                                    test = owner_raw.encode('latin-1', errors='ignore').decode('cp1251', errors='ignore')
-                                    if test and not any(c in test for c in ['�', 'ï', '¿']):
-                                        fixed_owner = test
-                                except:
-                                    pass
-                            
-                            # Попытка 3: Двойная кодировка
-                            if not fixed_owner:
-                                try:
-                                    test = owner_raw.encode('utf-8', errors='ignore').decode('cp1251', errors='ignore')
-                                    if test and not any(c in test for c in ['�']):
-                                        fixed_owner = test
-                                except:
-                                    pass
-                            
-                            # Используем исправленное значение или оставляем очищенное
-                            if fixed_owner:
-                                # Очищаем от непечатных символов
-                                cleaned = ''.join(c for c in fixed_owner if c.isprintable() or c.isspace())
-                                fixed_lic['account_owner'] = cleaned.strip()
-                            else:
-                                # Если не удалось исправить - очищаем мусор
-                                cleaned = ''.join(c for c in owner_raw if ord(c) < 128 and (c.isalnum() or c.isspace() or c in '.-_'))
-                                fixed_lic['account_owner'] = cleaned.strip() if cleaned.strip() else f"Счет {lic.get('account_number', 'N/A')}"
-                        else:
-                            # Если нет проблем с кодировкой - просто очищаем пробелы
-                            fixed_lic['account_owner'] = owner_raw.strip()
-                else:
-                    # Если поле отсутствует или пустое
-                    fixed_lic['account_owner'] = 'Не активирован'
+                # Разбор идёт вперемешку с чтением сети, поэтому отдельно
+                # замеряется только обработка строк
+                enrich_time = 0.0
                 
-                # Добавляем форматированные даты
-                for date_field in ['created_date', 'activation_date', 'expiry_date', 'last_check']:
-                    if date_field in fixed_lic and fixed_lic[date_field]:
-                        try:
-                            dt = datetime.fromisoformat(fixed_lic[date_field].replace('Z', '+00:00'))
-                            fixed_lic[f'{date_field}_formatted'] = dt.strftime('%d.%m.%Y %H:%M')
-                        except:
-                            fixed_lic[f'{date_field}_formatted'] = fixed_lic[date_field]
+                def process(lic):
+                    nonlocal enrich_time
+                    started = time.perf_counter()
+                    # Кодировку правим, только если в прочитанной части
+                    # тела были признаки порчи
+                    processed = self._process_license(lic, fix_encoding=stream.suspicious)
+                    enrich_time += time.perf_counter() - started
+                    return processed
                 
-                # ИСПРАВЛЕНО: Вычисляем дни до истечения - ВСЕГДА должно быть число, не None!
-                if fixed_lic.get('expiry_date'):
-                    try:
-                        expiry = datetime.fromisoformat(fixed_lic['expiry_date'].replace('Z', '+00:00'))
-                        days_left = (expiry - datetime.now()).days
-                        fixed_lic['days_left'] = days_left
-                        
-                        # Обновляем статус если истек
-                        if days_left < 0 and fixed_lic.get('status') == 'active':
-                            fixed_lic['status'] = 'expired'
-                    except:
-                        fixed_lic['days_left'] = 999  # Если не удается вычислить - ставим большое число
-                else:
-                    fixed_lic['days_left'] = 999  # Если нет даты истечения - ставим большое число
+                licenses = result['licenses']
+                for batch in iter_batches(stream, batch_size, time_budget, transform=process):
+                    licenses.extend(batch)
+                    on_batch(batch)
                 
-                fixed_licenses.append(fixed_lic)
+                self.metrics.record_stage('enrich', self.LIST_ENDPOINT, enrich_time)
+                
+                if not stream.found and not stream.fields.get('success', False):
+                    print(f"Ошибка от сервера: {stream.fields.get('error', 'Unknown error')}")
+                    return result
+                
+                result['mode'] = 'full'
+                result['etag'] = response.headers.get('ETag')
+                result['last_modified'] = response.headers.get('Last-Modified')
+                result['server_time'] = stream.fields.get('server_time')
+                
+                print(f"✅ ПОЛУЧЕНО {len(licenses)} ЛИЦЕНЗИЙ (потоково)")
+                return result
+        
+        except Exception as e:
+            print(f"Ошибка потоковой загрузки лицензий: {e}")
+            result['licenses'] = []
+            return result
+    
+    def get_licenses_page(self, offset: int = 0, limit: int = 50) -> Dict[str, Any]:
+        """
+        Получить одну страницу списка лицензий (limit/offset)
+        
+        Если сервер не поддерживает постраничную выдачу и вернул весь
+        список, страница вырезается локально (paged = False).
+        
+        Args:
+            offset: Смещение от начала списка
+            limit: Размер страницы
+        
+        Returns:
+            Dict: {'success', 'licenses', 'total', 'offset', 'limit',
+                   'has_more', 'paged'}
+        """
+        return self._fetch_page(offset, limit)[0]
+    
+    def _fetch_page(self, offset: int, limit: int):
+        """
+        Запрос страницы
+        
+        Returns:
+            tuple: (страница, полный сырой список или None, если сервер
+                    выдал именно страницу)
+        """
+        result = {
+            'success': False,
+            'licenses': [],
+            'total': 0,
+            'offset': offset,
+            'limit': limit,
+            'has_more': False,
+            'paged': False
+        }
+        
+        try:
+            response = self.session.get(
+                f"{self.base_url}/api/licenses",
+                params={'limit': limit, 'offset': offset},
+                headers=self._list_headers(),
+                timeout=self.timeout
+            )
             
-            print(f"📦 Тип ответа: {type(licenses)}")
-            print(f"✅ ПОЛУЧЕНО {len(fixed_licenses)} ЛИЦЕНЗИЙ!")
+            if not self._check_auth(response, "при получении лицензий"):
+                result['error'] = 'Неверный API ключ'
+                return result, None
             
-            return fixed_licenses
+            response.raise_for_status()
+            
+            data, needs_fix = self._decode(response)
+            licenses = self._extract_licenses(data)
+            if licenses is None:
+                return result, None
             
+            full = None
+            paged = isinstance(data, dict) and 'total' in data
+            if paged:
+                total = int(data.get('total') or 0)
+            else:
+                full = licenses
+                total = len(licenses)
+                licenses = licenses[offset:offset + limit]
+            
+            result.update({
+                'success': True,
+                'licenses': self._process_licenses(licenses, fix_encoding=needs_fix),
+                'total': total,
+                'has_more': offset + len(licenses) < total,
+                'paged': paged
+            })
+            return result, full
+        
         except Exception as e:
-            print(f"Ошибка получения лицензий: {e}")
-            return []
+            print(f"Ошибка получения страницы лицензий: {e}")
+            return result, None
     
-    def create_license(self, client_name: str, client_contact: str = None, 
-                      client_telegram: str = None, months: int = 1, 
+    def iter_license_pages(self, page_size: int = 50):
+        """
+        Перебрать весь список лицензий постранично
+        
+        Args:
+            page_size: Размер страницы
+        
+        Yields:
+            Dict: Результат get_licenses_page для каждой страницы
+        
+        Raises:
+            ConnectionError: Страницу не удалось загрузить
+        """
+        offset = 0
+        while True:
+            page, full = self._fetch_page(offset, page_size)
+            if not page['success']:
+                raise ConnectionError(page.get('error') or
+                                      f"Не удалось загрузить страницу со смещением {offset}")
+            
+            yield page
+            
+            if full is not None:
+                # Сервер отдал весь список - остальные страницы режем локально
+                total = len(full)
+                for start in range(offset + page_size, total, page_size):
+                    rows = full[start:start + page_size]
+                    yield dict(page, offset=start,
+                               licenses=[self._process_license(lic) for lic in rows],
+                               has_more=start + len(rows) < total)
+                return
+            
+            if not page['has_more'] or not page['licenses']:
+                return
+            offset += len(page['licenses'])
+    
+    def _list_headers(self, streaming: bool = False) -> Dict[str, str]:
+        """Заголовки запроса списка: допустимые форматы тела"""
+        if streaming:
+            return {'Accept': wire_format.MEDIA_JSON}
+        if self.compact_format:
+            return {'Accept': wire_format.accept_header()}
+        return {}
+    
+    def list_accept(self, streaming: bool = False) -> str:
+        """
+        Accept запроса списка
+        
+        Сервер отдаёт разные представления (Vary: Accept) с разными ETag,
+        поэтому условные заголовки годятся только для того же Accept.
+        
+        Args:
+            streaming: Для потоковой загрузки (get_licenses_stream)
+        """
+        return self._list_headers(streaming).get('Accept', '')
+    
+    def _extract_licenses(self, data: Any) -> Optional[List[Dict]]:
+        """
+        Извлечь список лицензий из ответа сервера
+        
+        Args:
+            data: Разобранный JSON ответа
+        
+        Returns:
+            Optional[List[Dict]]: Список сырых лицензий или None при ошибке
+        """
+        # Сервер возвращает {success: true, licenses: [...]}
+        if isinstance(data, dict):
+            if data.get('success', False):
+                return data.get('licenses', [])
+            error = data.get('error', 'Unknown error')
+            print(f"Ошибка от сервера: {error}")
+            return None
+        elif isinstance(data, list):
+            # На всякий случай если формат изменится
+            return data
+        
+        print(f"Неожиданный формат ответа: {type(data)}")
+        return None
+    
+    def _decode(self, response, endpoint: str = None) -> Tuple[Any, bool]:
+        """
+        Разобрать тело ответа с замером времени (этап 'decode')
+        
+        Returns:
+            tuple: (данные, нужна ли строкам правка кодировки)
+        """
+        with self.metrics.timer('decode', endpoint or self.LIST_ENDPOINT):
+            return wire_format.decode_response_payload(response)
+    
+    def _process_licenses(self, licenses: List[Dict], endpoint: str = None,
+                          fix_encoding: bool = True) -> List[Dict]:
+        """Обработать строки списка с замером времени (этап 'enrich')"""
+        with self.metrics.timer('enrich', endpoint or self.LIST_ENDPOINT):
+            return self.normalizer.normalize_many(licenses, fix_encoding)
+    
+    def _process_license(self, lic: Dict, fix_encoding: bool = True) -> Dict:
+        """
+        Исправить кодировку лицензии и добавить вычисляемые поля
+        
+        Args:
+            lic: Сырые данные лицензии от сервера
+            fix_encoding: Исправлять кодировку (False - ответ без признаков порчи)
+        
+        Returns:
+            Dict: Обработанная лицензия (см. LicenseNormalizer)
+        """
+        return self.normalizer.normalize(lic, fix_encoding=fix_encoding)
+    
+    def process_patch(self, patch: Dict, row: Optional[Dict] = None) -> Dict:
+        """
+        Обработать частичное обновление лицензии (событие сервера)
+        
+        Обработка та же, что у полной строки, но в результате остаются
+        только пришедшие поля и вычисляемые из них - остальные поля
+        строки в памяти патч не трогает.
+        
+        Args:
+            patch: Изменённые поля без license_key
+            row: Текущая строка (вычисляемые поля зависят и от неё)
+        
+        Returns:
+            Dict: Поля для обновления строки
+        """
+        return self.normalizer.patch(row or {}, patch)
+    
+    def create_license(self, client_name: str, client_contact: str = None,
+                      client_telegram: str = None, months: int = 1,
                       notes: str = None) -> Dict:
         """
         Создать новую лицензию
@@ -237,7 +582,7 @@ class APIClient:
             client_telegram: Telegram клиента
             months: Срок действия в месяцах
             notes: Заметки
-            
+        
         Returns:
             Dict: Результат создания
         """
@@ -265,12 +610,14 @@ class APIClient:
             
             if response.status_code == 401:
                 return {'success': False, 'error': 'Неверный API ключ'}
-                
+            
             response.raise_for_status()
             
             result = response.json()
+            if result.get('success'):
+                self.cache.invalidate_license()
             return result
-            
+        
         except Exception as e:
             print(f"Ошибка создания лицензии: {e}")
             return {'success': False, 'error': str(e)}
@@ -282,7 +629,7 @@ class APIClient:
         Args:
             license_key: Ключ лицензии
             **kwargs: Поля для обновления
-            
+        
         Returns:
             Dict: Результат обновления
         """
@@ -298,12 +645,14 @@ class APIClient:
             
             if response.status_code == 401:
                 return {'success': False, 'error': 'Неверный API ключ'}
-                
+            
             response.raise_for_status()
             
             result = response.json()
+            if result.get('success'):
+                self.cache.invalidate_license(license_key)
             return result
-            
+        
         except Exception as e:
             print(f"Ошибка обновления лицензии: {e}")
             return {'success': False, 'error': str(e)}
@@ -314,7 +663,7 @@ class APIClient:
         
         Args:
             license_key: Ключ лицензии
-            
+        
         Returns:
             Dict: Результат удаления
         """
@@ -326,12 +675,14 @@ class APIClient:
             
             if response.status_code == 401:
                 return {'success': False, 'error': 'Неверный API ключ'}
-                
+            
             response.raise_for_status()
             
             result = response.json()
+            if result.get('success'):
+                self.cache.invalidate_license(license_key)
             return result
-            
+        
         except Exception as e:
             print(f"Ошибка удаления лицензии: {e}")
             return {'success': False, 'error': str(e)}
@@ -343,7 +694,7 @@ class APIClient:
         Args:
             license_key: Ключ лицензии
             reason: Причина блокировки
-            
+        
         Returns:
             Dict: Результат блокировки
         """
@@ -353,7 +704,7 @@ class APIClient:
                 data['block_reason'] = reason
             
             return self.update_license(license_key, **data)
-            
+        
         except Exception as e:
             print(f"Ошибка блокировки лицензии: {e}")
             return {'success': False, 'error': str(e)}
@@ -364,13 +715,13 @@ class APIClient:
         
         Args:
             license_key: Ключ лицензии
-            
+        
         Returns:
             Dict: Результат разблокировки
         """
         try:
             return self.update_license(license_key, status='active', block_reason='')
-            
+        
         except Exception as e:
             print(f"Ошибка разблокировки лицензии: {e}")
             return {'success': False, 'error': str(e)}
@@ -382,7 +733,7 @@ class APIClient:
         Args:
             license_key: Ключ лицензии
             months: Количество месяцев
-            
+        
         Returns:
             Dict: Результат продления
         """
@@ -395,16 +746,85 @@ class APIClient:
             
             if response.status_code == 401:
                 return {'success': False, 'error': 'Неверный API ключ'}
-                
+            
             response.raise_for_status()
             
             result = response.json()
+            if result.get('success'):
+                self.cache.invalidate_license(license_key)
             return result
-            
+        
         except Exception as e:
             print(f"Ошибка продления лицензии: {e}")
             return {'success': False, 'error': str(e)}
     
+    def batch_update_status(self, license_keys: List[str], status: str) -> Dict:
+        """
+        Массово изменить статус лицензий одним запросом
+        
+        Args:
+            license_keys: Ключи лицензий
+            status: Новый статус (active, blocked, expired)
+        
+        Returns:
+            Dict: {'success': ..., 'requested': N, 'updated': M}
+        """
+        try:
+            response = self.session.post(
+                f"{self.base_url}/api/batch-update",
+                json={'license_keys': list(license_keys), 'status': status},
+                timeout=self.timeout
+            )
+            
+            if response.status_code == 401:
+                return {'success': False, 'error': 'Неверный API ключ'}
+            
+            response.raise_for_status()
+            
+            result = response.json()
+            if result.get('success'):
+                for key in license_keys:
+                    self.cache.invalidate('license', key)
+                self.cache.invalidate_license()
+            return result
+        
+        except Exception as e:
+            print(f"Ошибка массового обновления статуса: {e}")
+            return {'success': False, 'error': str(e)}
+    
+    def search_licenses(self, query: str, field: str = 'all') -> List[Dict]:
+        """
+        Поиск лицензий на сервере (POST /api/search)
+        
+        Args:
+            query: Поисковый запрос
+            field: Поле поиска ('all', 'key', 'client', 'account', 'robot')
+        
+        Returns:
+            List[Dict]: Найденные лицензии (сервер отдаёт не больше 100)
+        """
+        try:
+            response = self.session.post(
+                f"{self.base_url}/api/search",
+                json={'query': query, 'field': field},
+                timeout=self.timeout
+            )
+            
+            if response.status_code == 401:
+                print("ОШИБКА: Неверный API ключ при поиске")
+                return []
+            
+            response.raise_for_status()
+            
+            data, needs_fix = self._decode(response, 'POST /api/search')
+            if data.get('success'):
+                return [self._process_license(lic, needs_fix) for lic in data.get('results', [])]
+            return []
+        
+        except Exception as e:
+            print(f"Ошибка поиска лицензий: {e}")
+            return []
+    
     def get_statistics(self) -> Dict:
         """
         Получить статистику по лицензиям
@@ -412,23 +832,26 @@ class APIClient:
         Returns:
             Dict: Статистика
         """
+        return self.cache.get_or_load('statistics', ('api_client',), self._fetch_statistics)
+    
+    def _fetch_statistics(self) -> Dict:
+        """Запросить статистику с сервера"""
         try:
             response = self.session.get(
                 f"{self.base_url}/api/statistics",
                 timeout=self.timeout
             )
             
-            if response.status_code == 401:
-                print("ОШИБКА: Неверный API ключ для статистики")
+            if not self._check_auth(response, "для статистики"):
                 return {}
-                
+            
             response.raise_for_status()
             
             data = response.json()
             if data.get('success'):
                 return data.get('statistics', {})
             return {}
-            
+        
         except Exception as e:
             print(f"Ошибка получения статистики: {e}")
             return {}
@@ -439,10 +862,14 @@ class APIClient:
         
         Args:
             limit: Максимальное количество событий
-            
+        
         Returns:
             List[Dict]: Список событий
         """
+        return self.cache.get_or_load('events', (limit,), lambda: self._fetch_events(limit))
+    
+    def _fetch_events(self, limit: int) -> List[Dict]:
+        """Запросить события с сервера"""
         try:
             response = self.session.get(
                 f"{self.base_url}/api/events",
@@ -453,21 +880,23 @@ class APIClient:
             if response.status_code == 401:
                 print("ОШИБКА: Неверный API ключ для событий")
                 return []
-                
+            
             response.raise_for_status()
             
-            data = response.json()
+            data, needs_fix = self._decode(response, 'GET /api/events')
             if data.get('success'):
                 events = data.get('events', [])
-                # Исправляем кодировку
+                # Исправляем кодировку, если в ответе были признаки порчи
+                if not needs_fix:
+                    return events
                 return [self.encoding_fixer.fix_dict_encoding(event) for event in events]
             return []
-            
+        
         except Exception as e:
             print(f"Ошибка получения событий: {e}")
             return []
     
-    def activate_license(self, license_key: str, owner_name: str, 
+    def activate_license(self, license_key: str, owner_name: str,
                         account_number: int, broker_server: str,
                         initial_balance: float = 0) -> Dict:
         """
@@ -479,7 +908,7 @@ class APIClient:
             account_number: Номер счета
             broker_server: Сервер брокера
             initial_balance: Начальный баланс
-            
+        
         Returns:
             Dict: Результат активации
         """
@@ -503,8 +932,10 @@ class APIClient:
             response.raise_for_status()
             
             result = response.json()
+            if result.get('success'):
+                self.cache.invalidate_license(license_key)
             return result
-            
+        
         except Exception as e:
             print(f"Ошибка активации лицензии: {e}")
             return {'success': False, 'error': str(e)}
\ No newline at end of file
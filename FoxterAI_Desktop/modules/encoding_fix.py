@@ -3,12 +3,51 @@
 Особенно важно для кириллицы из MT4
 """
 
-import chardet
+import re
+
+from utils.lru_cache import BoundedLRU
+
+# chardet импортируется только для байтов не в ASCII (см. _detect)
+chardet = None
+
+# Признаки испорченного текста (строка без них возвращается как есть)
+GARBAGE_CHARS = ('�', 'Ð', 'Ã')
+
+# Latin-1 -> CP1251 по символам: то же, что encode('latin-1').decode('cp1251')
+# для однобайтной кодировки; символ, которого нет в одной из них, - '�'
+LATIN1_TO_CP1251 = {
+    code: bytes([code]).decode('cp1251', errors='replace') for code in range(256)
+}
+
+
+class _TranslateLatin1(dict):
+    """Таблица для str.translate: символы вне Latin-1 -> '�'"""
+    
+    def __missing__(self, code):
+        return '�'
+
+
+LATIN1_TO_CP1251 = _TranslateLatin1(LATIN1_TO_CP1251)
+
+
+def _detect(data: bytes):
+    """Определить кодировку байтов (chardet загружается при первом вызове)"""
+    global chardet
+    if chardet is None:
+        import chardet as module
+        chardet = module
+    return chardet.detect(data)
 
 
 class EncodingFixer:
     """Класс для исправления проблем с кодировкой текста"""
     
+    # Сколько исправленных строк помнить (при переполнении вытесняются
+    # давно не встречавшиеся)
+    CACHE_SIZE = 16384
+    
+    _cache = BoundedLRU(CACHE_SIZE)
+    
     # Список возможных кодировок для проверки
     ENCODINGS = [
         'utf-8',
@@ -24,6 +63,9 @@ class EncodingFixer:
         """
         Исправить кодировку текста
         
+        Строки ASCII и строки без признаков порчи возвращаются сразу,
+        остальные исправляются один раз - результат запоминается.
+        
         Args:
             text: Текст с возможными проблемами кодировки
             
@@ -33,71 +75,80 @@ class EncodingFixer:
         if not text:
             return ""
         
-        # Если текст уже нормальный UTF-8
         if isinstance(text, str):
-            try:
-                text.encode('utf-8').decode('utf-8')
-                # Проверяем на мусорные символы
-                if not any(c in text for c in ['�', 'Ð', 'Ã']):
-                    return text
-            except:
-                pass
+            # ASCII испорченным не бывает
+            if text.isascii():
+                return text
+            
+            return EncodingFixer._cache.get_or_compute(text, EncodingFixer._fix_str)
         
-        # Пробуем автоопределение кодировки
         if isinstance(text, bytes):
-            detected = chardet.detect(text)
-            if detected['encoding']:
-                try:
-                    return text.decode(detected['encoding'])
-                except:
-                    pass
+            return EncodingFixer._fix_bytes(text)
         
-        # Пробуем разные комбинации декодирования
-        original = text
+        return str(text)
+    
+    @staticmethod
+    def _fix_str(text):
+        """Исправить строку (без кэша)"""
+        # Если текст уже нормальный UTF-8 без мусорных символов
+        try:
+            text.encode('utf-8')
+            if not any(c in text for c in GARBAGE_CHARS):
+                return text
+        except UnicodeEncodeError:
+            pass
         
-        # Если это строка с мусорными символами
-        if isinstance(text, str):
-            # Частые случаи двойного кодирования
-            try:
-                # UTF-8 -> Latin-1 -> UTF-8 (частая ошибка)
-                fixed = text.encode('latin-1').decode('utf-8')
-                if '�' not in fixed:
-                    return fixed
-            except:
-                pass
+        # Частые случаи двойного кодирования
+        try:
+            # UTF-8 -> Latin-1 -> UTF-8 (частая ошибка)
+            fixed = text.encode('latin-1').decode('utf-8')
+            if '�' not in fixed:
+                return fixed
+        except UnicodeError:
+            pass
             
-            try:
-                # CP1251 -> Latin-1 -> UTF-8
-                fixed = text.encode('latin-1').decode('cp1251')
-                if '�' not in fixed:
-                    return fixed
-            except:
-                pass
+        # CP1251 -> Latin-1 -> UTF-8 (по таблице; символ не из Latin-1 или
+        # байт вне CP1251 даёт '�' - как ошибка при encode/decode)
+        fixed = text.translate(LATIN1_TO_CP1251)
+        if '�' not in fixed:
+            return fixed
             
+        try:
+            # Обратное преобразование
+            fixed = text.encode('utf-8').decode('cp1251')
+            if '�' not in fixed:
+                return fixed
+        except UnicodeError:
+            pass
+        
+        # Если ничего не помогло, заменяем мусорные символы
+        return EncodingFixer.clean_garbage(text)
+    
+    @staticmethod
+    def _fix_bytes(data):
+        """Декодировать байты"""
+        # ASCII - без автоопределения
+        if data.isascii():
+            return data.decode('ascii')
+        
+        # Пробуем автоопределение кодировки
+        detected = _detect(data)
+        if detected['encoding']:
             try:
-                # Обратное преобразование
-                fixed = text.encode('utf-8').decode('cp1251')
-                if '�' not in fixed:
-                    return fixed
-            except:
+                return data.decode(detected['encoding'])
+            except (UnicodeDecodeError, LookupError):
                 pass
         
-        # Если это байты, пробуем все кодировки
-        if isinstance(text, bytes):
-            for encoding in EncodingFixer.ENCODINGS:
-                try:
-                    decoded = text.decode(encoding)
-                    if '�' not in decoded:
-                        return decoded
-                except:
-                    continue
-        
-        # Если ничего не помогло, возвращаем как есть
-        # но заменяем мусорные символы
-        if isinstance(text, str):
-            return EncodingFixer.clean_garbage(text)
+        # Пробуем все кодировки
+        for encoding in EncodingFixer.ENCODINGS:
+            try:
+                decoded = data.decode(encoding)
+                if '�' not in decoded:
+                    return decoded
+            except UnicodeDecodeError:
+                continue
         
-        return str(original)
+        return str(data)
     
     @staticmethod
     def clean_garbage(text):
@@ -138,16 +189,18 @@ class EncodingFixer:
         if not isinstance(data_dict, dict):
             return data_dict
         
+        fix_text = EncodingFixer.fix_text
         fixed = {}
         for key, value in data_dict.items():
             if isinstance(value, str):
-                fixed[key] = EncodingFixer.fix_text(value)
+                # Большинство значений - ASCII, без вызова fix_text
+                fixed[key] = value if value.isascii() else fix_text(value)
             elif isinstance(value, bytes):
-                fixed[key] = EncodingFixer.fix_text(value)
+                fixed[key] = fix_text(value)
             elif isinstance(value, dict):
                 fixed[key] = EncodingFixer.fix_dict(value)
             elif isinstance(value, list):
-                fixed[key] = [EncodingFixer.fix_text(item) if isinstance(item, (str, bytes)) else item 
+                fixed[key] = [fix_text(item) if isinstance(item, (str, bytes)) else item
                              for item in value]
             else:
                 fixed[key] = value
@@ -183,7 +236,169 @@ class EncodingFixer:
             text = text.encode()
         
         if isinstance(text, bytes):
-            result = chardet.detect(text)
+            result = _detect(text)
             return result.get('encoding', None)
         
-        return None
\ No newline at end of file
+        return None
+
+# ==================== ДАННЫЕ MT4 ====================
+
+# Источник строки по результату классификации
+SOURCE_CLEAN = 'clean'          # Нормальный текст
+SOURCE_UTF8 = 'utf-8'           # UTF-8, прочитанный как Latin-1/CP1252
+SOURCE_CP1251 = 'cp1251'        # CP1251, прочитанный как Latin-1/CP1252
+SOURCE_UTF8_CP1251 = 'utf-8/cp1251'  # UTF-8, прочитанный как CP1251
+
+
+def _byte_class(byte: int) -> str:
+    """
+    Класс байта для проверки последовательностей UTF-8
+    
+    'a' - буква ASCII, '.' - прочий ASCII, 'c' - байт продолжения,
+    '2'/'3'/'4' - начало последовательности из 2/3/4 байт,
+    'x' - байт, которого в UTF-8 не бывает
+    """
+    if byte < 0x80:
+        return 'a' if chr(byte).isalpha() else '.'
+    if byte < 0xC0:
+        return 'c'
+    if 0xC2 <= byte <= 0xDF:
+        return '2'
+    if 0xE0 <= byte <= 0xEF:
+        return '3'
+    if 0xF0 <= byte <= 0xF4:
+        return '4'
+    return 'x'
+
+
+class _ClassTable(dict):
+    """Таблица для str.translate: символ без байта в кодировке -> 'u'"""
+    
+    def __missing__(self, code):
+        return 'u'
+
+
+def _class_table(encoding: str) -> _ClassTable:
+    """Символ -> класс его байта в однобайтной кодировке"""
+    table = _ClassTable()
+    for byte in range(256):
+        try:
+            table[ord(bytes([byte]).decode(encoding))] = _byte_class(byte)
+        except UnicodeDecodeError:
+            continue
+    return table
+
+
+# Классы байтов, если строку прочитали как Latin-1 или CP1252 / как CP1251
+LATIN_CLASSES = _class_table('latin-1')
+LATIN_CLASSES.update(_class_table('cp1252'))
+CP1251_CLASSES = _class_table('cp1251')
+
+# Символы CP1252 (0x80-0x9F) -> символы Latin-1 с тем же байтом
+CP1252_TO_LATIN1 = {}
+for _byte in range(0x80, 0xA0):
+    try:
+        CP1252_TO_LATIN1[ord(bytes([_byte]).decode('cp1252'))] = _byte
+    except UnicodeDecodeError:
+        continue
+
+# Управляющие символы (кроме пробельных) удаляются из результата
+CONTROL_CHARS = {
+    code: None for code in list(range(0x20)) + list(range(0x7F, 0xA0))
+    if not chr(code).isspace()
+}
+
+# Строка классов = корректный UTF-8 (ASCII и целые многобайтные последовательности)
+_UTF8_SEQUENCE = re.compile(r'(?:[a.]|2c|3cc|4ccc)*')
+
+
+class MojibakeDetector:
+    """
+    Определение и исправление испорченной кодировки данных MT4
+    
+    Строка за один проход по таблицам классов байтов (str.translate)
+    относится к одному из источников: нормальный текст, UTF-8 или CP1251,
+    прочитанные как Latin-1/CP1252, или UTF-8, прочитанный как CP1251.
+    Исправление - ровно одно декодирование по найденному источнику.
+    Результат запоминается по исходной строке.
+    """
+    
+    # Сколько различных строк помнить (при переполнении вытесняются
+    # давно не встречавшиеся)
+    CACHE_SIZE = 16384
+    
+    def __init__(self):
+        self._cache = BoundedLRU(self.CACHE_SIZE)
+    
+    @staticmethod
+    def classify(text: str) -> str:
+        """
+        Определить источник строки
+        
+        Args:
+            text: Строка из MT4
+        
+        Returns:
+            str: SOURCE_CLEAN, SOURCE_UTF8, SOURCE_CP1251 или SOURCE_UTF8_CP1251
+        """
+        if text.isascii():
+            return SOURCE_CLEAN
+        
+        classes = text.translate(LATIN_CLASSES)
+        if 'u' not in classes:
+            # Все символы - байты: целые последовательности UTF-8 бывают
+            # только у испорченного текста
+            if _UTF8_SEQUENCE.fullmatch(classes):
+                return SOURCE_UTF8
+            # Буквы CP1251 (0xC0-0xFF) преобладают - кириллица; одиночные
+            # символы среди латиницы - настоящий Latin-1 (Müller)
+            high = sum(classes.count(cls) for cls in '234x')
+            return SOURCE_CP1251 if high >= classes.count('a') else SOURCE_CLEAN
+        
+        classes = text.translate(CP1251_CLASSES)
+        if 'u' not in classes and _UTF8_SEQUENCE.fullmatch(classes):
+            return SOURCE_UTF8_CP1251
+        
+        return SOURCE_CLEAN
+    
+    def repair(self, text: str) -> str:
+        """
+        Исправить строку из MT4
+        
+        Args:
+            text: Строка (не строка возвращается как есть)
+        
+        Returns:
+            str: Исправленный текст без управляющих символов и краевых пробелов
+        """
+        if not isinstance(text, str):
+            return text
+        return self._cache.get_or_compute(text, self._repair)
+    
+    def _repair(self, text: str) -> str:
+        """Исправить строку (без кэша)"""
+        fixed = self._decode(text, self.classify(text))
+        return fixed.translate(CONTROL_CHARS).strip()
+    
+    @staticmethod
+    def _decode(text: str, source: str) -> str:
+        """Одно декодирование по источнику (ошибка - строка как есть)"""
+        try:
+            if source == SOURCE_UTF8:
+                return text.translate(CP1252_TO_LATIN1).encode('latin-1').decode('utf-8')
+            if source == SOURCE_CP1251:
+                return text.translate(CP1252_TO_LATIN1).encode('latin-1').decode('cp1251')
+            if source == SOURCE_UTF8_CP1251:
+                return text.encode('cp1251').decode('utf-8')
+        except UnicodeError:
+            pass
+        return text
+
+
+# Общий детектор (кэш - на всё приложение)
+mt4_detector = MojibakeDetector()
+
+
+def repair_mt4_text(text: str) -> str:
+    """Исправить строку из MT4 общим детектором"""
+    return mt4_detector.repair(text)
\ No newline at end of file
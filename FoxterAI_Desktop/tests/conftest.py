@@ -0,0 +1,37 @@
+"""
+Общие фикстуры тестов
+Тесты запускаются из папки FoxterAI_Desktop: python -m pytest -q
+"""
+
+import os
+import sys
+
+import pytest
+
+# Добавляем корень проекта в путь
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.api.transport import close_transports
+from tools.standin_server import DEFAULT_API_KEY, StandInServer, make_licenses
+
+
+@pytest.fixture
+def standin():
+    """Заменитель сервера лицензий на свободном порту"""
+    server = StandInServer(('127.0.0.1', 0), make_licenses(120))
+    server.start_background()
+    yield server
+    server.shutdown()
+    server.server_close()
+    close_transports()
+
+
+@pytest.fixture
+def make_config(tmp_path, monkeypatch):
+    """config.ini с API ключом в рабочей папке теста"""
+    def write(api_key: str = DEFAULT_API_KEY):
+        (tmp_path / 'config.ini').write_text(
+            f"[SERVER]\napi_key = {api_key}\n", encoding='utf-8'
+        )
+        monkeypatch.chdir(tmp_path)
+    return write
\ No newline at end of file
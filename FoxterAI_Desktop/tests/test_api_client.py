@@ -0,0 +1,68 @@
+"""
+Тесты APIClient против локального заменителя сервера
+"""
+
+import pytest
+
+from modules.api_client import APIClient
+
+
+def make_client(server) -> APIClient:
+    host, port = server.server_address[:2]
+    return APIClient(host, port)
+
+
+def test_licenses_page(standin, make_config):
+    make_config()
+    client = make_client(standin)
+    
+    page = client.get_licenses_page(offset=0, limit=50)
+    
+    assert page['success']
+    assert page['total'] == 120
+    assert len(page['licenses']) == 50
+    assert page['has_more']
+
+
+def test_iter_license_pages(standin, make_config):
+    make_config()
+    client = make_client(standin)
+    
+    pages = list(client.iter_license_pages(page_size=50))
+    
+    assert [len(page['licenses']) for page in pages] == [50, 50, 20]
+
+
+def test_licenses_page_rejected_key(standin, make_config):
+    make_config('wrong-key')
+    client = make_client(standin)
+    
+    page = client.get_licenses_page(offset=0, limit=50)
+    
+    assert not page['success']
+    assert page['error'] == 'Неверный API ключ'
+    assert client.key_rejected
+
+
+def test_iter_license_pages_rejected_key(standin, make_config):
+    make_config('wrong-key')
+    client = make_client(standin)
+    
+    with pytest.raises(ConnectionError, match='Неверный API ключ'):
+        next(client.iter_license_pages(page_size=50))
+
+def test_service_page_rejected_key(standin, make_config):
+    from core.services.license_service import LicenseService
+    
+    make_config('wrong-key')
+    service = LicenseService()
+    service.config.update(host='127.0.0.1', port=standin.server_address[1], snapshot_cache='')
+    service._init_api_client()
+    service.is_connected = True
+    
+    result = service.get_page(0)
+    
+    assert not result['success']
+    assert result['error'] == 'Неверный API ключ'
+    assert not service.is_connected
+    assert service.last_error == 'Неверный API ключ'
\ No newline at end of file
@@ -0,0 +1,93 @@
+"""
+Тесты подключения с первой загрузкой списка
+"""
+
+import importlib.util
+import os
+
+from core.services.license_service import LicenseService
+
+
+def load_connection_mixin():
+    """ConnectionMixin без пакета app (тот тянет за собой Tk)"""
+    path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                        'app', 'mixins', 'connection_mixin.py')
+    spec = importlib.util.spec_from_file_location('connection_mixin', path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.ConnectionMixin
+
+
+def make_service(server) -> LicenseService:
+    service = LicenseService()
+    service.config.update(host='127.0.0.1', port=server.server_address[1], snapshot_cache='')
+    service._init_api_client()
+    return service
+
+
+def test_connect_and_load_reports_failed_list(standin, make_config):
+    standin.routes[('GET', '/api/licenses')] = \
+        lambda handler, query: handler._send_json({'success': False}, status=500)
+    make_config()
+    
+    result = make_service(standin).connect_and_load()
+    
+    assert result['connected']
+    assert result['licenses'] is None
+    assert result['load_error']
+
+
+def test_connect_and_load_empty_server(standin, make_config):
+    standin.set_licenses([])
+    make_config()
+    
+    result = make_service(standin).connect_and_load()
+    
+    assert result['connected']
+    assert result['licenses'] == []
+    assert result['load_error'] is None
+
+
+class FakeWindow(load_connection_mixin()):
+    """Окно без Tk: только то, что нужно обработчику подключения"""
+    
+    def __init__(self):
+        self.statuses = []
+        self.reloaded = []
+        self._stale_since = 1700000000.0
+        self._rendered_hash = 'snapshot'
+        self.license_service = type('Service', (), {'content_hash': 'snapshot'})()
+    
+    def set_status(self, text, kind):
+        self.statuses.append((text, kind))
+    
+    def _stale_text(self):
+        return 'снимка'
+    
+    def _show_connected(self):
+        pass
+    
+    def _handle_licenses_loaded(self, licenses):
+        self.reloaded.append(licenses)
+
+
+def test_failed_load_keeps_stale_marker():
+    window = FakeWindow()
+    
+    window._handle_connection_result({'connected': True, 'licenses': None,
+                                      'load_error': 'Не удалось загрузить список лицензий'})
+    
+    text, kind = window.statuses[-1]
+    assert kind == 'warning'
+    assert 'показаны данные от снимка' in text
+    assert window._stale_since is not None
+    assert not window.reloaded
+
+
+def test_confirmed_snapshot_clears_stale_marker():
+    window = FakeWindow()
+    
+    window._handle_connection_result({'connected': True, 'licenses': [{}], 'load_error': None})
+    
+    assert window.statuses[-1] == ('✅ Данные актуальны: 1 лицензий', 'success')
+    assert window._stale_since is None
\ No newline at end of file
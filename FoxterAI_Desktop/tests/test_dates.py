@@ -0,0 +1,59 @@
+"""
+Тесты разбора дат и общего LRU кэша
+"""
+
+from datetime import timedelta
+
+from core.models import dates
+from core.models.normalize import LicenseNormalizer
+from utils.lru_cache import BoundedLRU
+
+
+def test_lru_keeps_recently_used():
+    cache = BoundedLRU(2)
+    cache.put('a', 1)
+    cache.put('b', 2)
+    assert cache.lookup('a') == (True, 1)
+    
+    cache.put('c', 3)
+    
+    assert cache.lookup('b') == (False, None)
+    assert cache.lookup('a') == (True, 1)
+    assert cache.stats()['evictions'] == 1
+
+
+def test_lru_remembers_none():
+    cache = BoundedLRU(4)
+    calls = []
+    compute = lambda key: calls.append(key)
+    
+    cache.get_or_compute('x', compute)
+    cache.get_or_compute('x', compute)
+    
+    assert calls == ['x']
+
+
+def test_parse_date_utc():
+    parsed = dates.parse_date('2026-03-01T10:30:00+03:00')
+    
+    assert parsed.value.isoformat() == '2026-03-01T07:30:00'
+    assert parsed.formatted == '01.03.2026 07:30'
+
+
+def test_last_check_not_memoized():
+    dates.clear_cache()
+    raw = {'license_key': 'K', 'status': 'active',
+           'expiry_date': '2030-01-01T00:00:00Z', 'last_check': '2026-01-01T00:00:01.123Z'}
+    
+    LicenseNormalizer(dict).normalize(raw)
+    
+    assert dates.cache_info()['size'] == 1
+
+
+def test_days_left_in_utc():
+    now = dates.utc_now()
+    expiry = (now + timedelta(days=10, hours=1)).strftime('%Y-%m-%dT%H:%M:%SZ')
+    
+    record = LicenseNormalizer(dict).normalize({'status': 'active', 'expiry_date': expiry})
+    
+    assert record['days_left'] == 10
\ No newline at end of file
@@ -0,0 +1,92 @@
+"""
+Тесты LicenseFrame: те же значения, что у построчной обработки
+"""
+
+import math
+
+from core.models import License, LicenseFrame, Statistics, panel_statistics
+from core.models.dates import utc_now
+from core.models.normalize import DATE_FIELDS, LicenseNormalizer
+from core.services.license_service import LicenseService
+from tools.bench_frame import load_row_values
+from tools.standin_server import make_licenses
+
+DERIVED = ('status', 'days_left', 'urgency', 'days_left_text', 'is_active', 'is_expired',
+           'is_blocked', 'is_created', 'has_problems')
+
+
+def make_records(count=600):
+    rows = make_licenses(count)
+    rows[5]['account_type'] = 'demo'
+    rows[6]['last_balance'] = 250000
+    rows[7].update(status='active', last_balance=50)
+    now = utc_now()
+    return LicenseNormalizer(fix_encoding=dict).normalize_many(rows), now
+
+
+def test_derived_fields_match_normalizer():
+    records, now = make_records()
+    
+    frame = LicenseFrame.from_records(records, now)
+    
+    for field in DERIVED:
+        assert frame.df[field].tolist() == [record[field] for record in records], field
+    for field in DATE_FIELDS:
+        strings = frame.formatted(field)
+        assert strings['formatted'].tolist() == [record.get(f'{field}_formatted') for record in records]
+        assert strings['short'].tolist() == [record.get(f'{field}_short') for record in records]
+
+
+def test_table_rows_match_row_values():
+    records, now = make_records()
+    records += [
+        dict(records[0], last_profit=-0.0, last_equity=None, account_number='',
+             broker_name=None, robot_name='None', last_balance='12'),
+        dict(records[1], last_profit='x', last_equity=-5, account_type='DEMO')
+    ]
+    row_values = load_row_values()
+    
+    rows = LicenseFrame.from_records(records, now).table_rows()
+    
+    assert rows == [row_values(record) for record in records]
+
+
+def test_statistics_match_license_objects():
+    records, now = make_records()
+    frame = LicenseFrame.from_records(records, now)
+    
+    expected = Statistics([License(record) for record in records]).get_detailed()
+    actual = Statistics(frame).get_detailed()
+    
+    assert list(actual) == list(expected)
+    for key, value in expected.items():
+        if key == 'problems':
+            assert [(p['type'], p['message'], p['license']['license_key']) for p in actual[key]] == \
+                [(p['type'], p['message'], p['license'].key) for p in value]
+        elif isinstance(value, float):
+            assert math.isclose(actual[key], value), key
+        else:
+            assert actual[key] == value, key
+    assert panel_statistics(frame) == panel_statistics(records)
+    assert frame.with_status('blocked') == [record for record in records if record['status'] == 'blocked']
+
+
+def test_service_frame_follows_rows(standin, make_config):
+    make_config()
+    service = LicenseService()
+    service.config.update(host='127.0.0.1', port=standin.server_address[1], snapshot_cache='')
+    service._init_api_client()
+    
+    try:
+        licenses = service.get_licenses()
+        frame = service.peek_license_frame(licenses)
+        
+        assert frame is not None and frame.records is licenses
+        assert service.get_license_frame() is frame
+        
+        # Живое обновление строк - frame устарел, UI рисует построчно
+        service._rows_version += 1
+        assert service.peek_license_frame(licenses) is None
+        assert service.get_license_frame() is not frame
+    finally:
+        service.shutdown()
\ No newline at end of file
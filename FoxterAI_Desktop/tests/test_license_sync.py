@@ -0,0 +1,92 @@
+"""
+Тесты синхронизации снимка лицензий
+"""
+
+import threading
+import time
+
+from core.api import wire_format
+from core.services.license_service import LicenseService
+
+
+def make_service(server) -> LicenseService:
+    service = LicenseService()
+    service.config.update(host='127.0.0.1', port=server.server_address[1], snapshot_cache='')
+    service._init_api_client()
+    return service
+
+
+def test_sync_lock_free_during_download(standin, make_config):
+    started, release = threading.Event(), threading.Event()
+    
+    def slow(handler, query):
+        started.set()
+        release.wait(5)
+        handler._get_licenses(query)
+    
+    standin.routes[('GET', '/api/licenses')] = slow
+    make_config()
+    service = make_service(standin)
+    results = []
+    worker = threading.Thread(target=lambda: results.append(service._sync_licenses()))
+    worker.start()
+    
+    try:
+        assert started.wait(5)
+        # Снимок доступен живым обновлениям и поиску, пока идёт загрузка
+        assert service._sync_lock.acquire(timeout=1)
+        service._sync_lock.release()
+        service._mark_snapshot_dirty('FX-MISSING')
+    finally:
+        release.set()
+        worker.join(5)
+    
+    assert len(results[0]) == 120
+    # Ответ мог не застать изменение - следующая синхронизация полная
+    assert service._deltas_since_full == service.FULL_SYNC_EVERY
+
+
+def test_validators_keyed_by_representation(standin, make_config):
+    seen = []
+    
+    def record(handler, query):
+        seen.append((handler.headers.get('Accept'), handler.headers.get('If-None-Match')))
+        handler._get_licenses(query)
+    
+    standin.routes[('GET', '/api/licenses')] = record
+    make_config()
+    service = make_service(standin)
+    service.on_licenses_batch = lambda batch, first: None
+    
+    service._sync_licenses()   # полная потоковая - JSON
+    service._sync_licenses()   # дельта - другой Accept, ETag потока не годится
+    service._sync_licenses()   # дельта с тем же Accept - условный запрос
+    
+    assert seen[0] == (wire_format.MEDIA_JSON, None)
+    assert seen[1] == (wire_format.accept_header(), None)
+    assert seen[2] == (wire_format.accept_header(), standin.etag)
+    assert service._snapshot_unchanged
+
+def test_pool_threads_wait_for_flight_without_deadlock(standin, make_config):
+    make_config()
+    service = make_service(standin)
+    workers = service.async_client.max_concurrency
+    
+    def busy():
+        time.sleep(0.3)
+        return service.get_licenses()
+    
+    try:
+        # Весь пул занят задачами, которые присоединятся к загрузке,
+        # запущенной уже после них
+        waiting = [service._submit(busy) for _ in range(workers)]
+        time.sleep(0.05)
+        flight = service.get_licenses_async()
+        
+        assert len(flight.result(timeout=5)) == 120
+        assert all(len(future.result(timeout=5)) == 120 for future in waiting)
+        
+        dashboard = service.load_dashboard_async().result(timeout=5)
+        assert len(dashboard['licenses']) == 120
+    finally:
+        service.shutdown()
\ No newline at end of file
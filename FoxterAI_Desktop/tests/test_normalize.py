@@ -0,0 +1,62 @@
+"""
+Тесты конвейера нормализации: кодировка полей MT4
+"""
+
+from core.models.normalize import LicenseNormalizer
+from modules.api_client import APIClient
+from tools.standin_server import make_licenses
+
+# 'Петров' в UTF-8, прочитанный как CP1252
+OWNER_CP1252 = 'Петров'.encode('utf-8').decode('cp1252', errors='replace')
+
+# 'Алиса' в CP1251, прочитанный как Latin-1
+OWNER_CP1251 = 'Алиса'.encode('cp1251').decode('latin-1')
+
+
+def make_row(**fields):
+    row = {'license_key': 'FXAI-TEST', 'status': 'active', 'account_number': '12345',
+           'expiry_date': '2030-01-01T00:00:00Z', 'client_name': 'Иван'}
+    row.update(fields)
+    return row
+
+
+def test_cp1252_mojibake_owner():
+    assert OWNER_CP1252 == 'ÐŸÐµÑ‚Ñ€Ð¾Ð²'
+    
+    record = LicenseNormalizer().normalize(make_row(account_owner=OWNER_CP1252))
+    
+    assert record['account_owner'] == 'Петров'
+
+
+def test_mt4_fields_repaired_from_raw():
+    row = make_row(account_owner=OWNER_CP1251,
+                   broker_name='Брокер'.encode('utf-8').decode('cp1252', errors='replace'),
+                   robot_name='FoxterAI Scalper')
+    
+    record = LicenseNormalizer().normalize(row)
+    
+    assert record['account_owner'] == 'Алиса'
+    assert record['broker_name'] == 'Брокер'
+    assert record['robot_name'] == 'FoxterAI Scalper'
+    assert record['client_name'] == 'Иван'
+
+
+def test_patch_repairs_owner():
+    normalizer = LicenseNormalizer()
+    row = normalizer.normalize(make_row(account_owner='Иванов'))
+    
+    fields = normalizer.patch(row, {'account_owner': OWNER_CP1252})
+    
+    assert fields['account_owner'] == 'Петров'
+
+
+def test_api_client_pipeline(standin, make_config):
+    licenses = make_licenses(3)
+    licenses[0]['account_owner'] = OWNER_CP1252
+    standin.set_licenses(licenses)
+    make_config()
+    host, port = standin.server_address[:2]
+    
+    page = APIClient(host, port).get_licenses_page(offset=0, limit=3)
+    
+    assert page['licenses'][0]['account_owner'] == 'Петров'
\ No newline at end of file
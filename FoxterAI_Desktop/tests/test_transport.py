@@ -0,0 +1,71 @@
+"""
+Тесты HTTPTransport: повторы и предохранитель
+"""
+
+import pytest
+import requests
+
+from core.api.transport import CircuitBreaker, CircuitOpenError, HTTPTransport, RetryPolicy
+
+
+def make_response(status: int) -> requests.Response:
+    response = requests.Response()
+    response.status_code = status
+    response._content = b'{}'
+    return response
+
+
+def make_transport(handler) -> HTTPTransport:
+    transport = HTTPTransport('http://127.0.0.1:9', 'key',
+                              retry_policy=RetryPolicy(backoff_base=0.0),
+                              breaker=CircuitBreaker(failure_threshold=2, reset_timeout=0.0))
+    transport.session.request = lambda method, url, **kwargs: handler(method, url)
+    return transport
+
+
+def test_handler_error_does_not_open_breaker():
+    transport = make_transport(lambda method, url: make_response(500))
+    
+    for _ in range(5):
+        assert transport.get('/api/licenses').status_code == 500
+    
+    assert transport.breaker.state == CircuitBreaker.CLOSED
+
+
+def test_unavailable_server_opens_breaker():
+    transport = make_transport(lambda method, url: make_response(503))
+    transport.breaker.reset_timeout = 60.0
+    
+    with pytest.raises(CircuitOpenError):
+        transport.get('/api/licenses')
+    
+    assert transport.breaker.state == CircuitBreaker.OPEN
+
+
+def test_read_timeout_not_retried():
+    calls = []
+    
+    def handler(method, url):
+        calls.append(url)
+        raise requests.exceptions.ReadTimeout()
+    
+    transport = make_transport(handler)
+    with pytest.raises(requests.exceptions.ReadTimeout):
+        transport.get('/api/licenses')
+    
+    assert len(calls) == 1
+
+
+def test_interrupted_trial_is_released():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.0)
+    breaker.record_failure()
+    transport = make_transport(lambda method, url: (_ for _ in ()).throw(ValueError('bad')))
+    transport.breaker = breaker
+    
+    with pytest.raises(ValueError):
+        transport.get('/api/licenses')
+    
+    # Следующий запрос снова пропускается как пробный
+    assert breaker.allow_request()
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
\ No newline at end of file
@@ -0,0 +1,32 @@
+"""
+Тесты очереди обновлений интерфейса
+"""
+
+from core.services.ui_dispatch import UIDispatcher
+
+
+def make_dispatcher() -> UIDispatcher:
+    dispatcher = UIDispatcher(lambda ms, func: None, frame_budget=10.0)
+    dispatcher.start()
+    return dispatcher
+
+
+def test_merged_post_runs_after_earlier_posts():
+    dispatcher = make_dispatcher()
+    calls = []
+    
+    dispatcher.post(calls.append, 'licenses: old', key='licenses')
+    dispatcher.post(calls.append, 'batch 1')
+    dispatcher.post(calls.append, 'licenses: new', key='licenses')
+    dispatcher.post(calls.append, 'batch 2')
+    dispatcher.pump()
+    
+    assert calls == ['batch 1', 'licenses: new', 'batch 2']
+    assert dispatcher.stats()['merged'] == 1
+
+
+def test_stopped_dispatcher_rejects_posts():
+    dispatcher = make_dispatcher()
+    dispatcher.stop()
+    
+    assert not dispatcher.post(print)
\ No newline at end of file
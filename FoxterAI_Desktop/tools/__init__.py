@@ -0,0 +1,3 @@
+"""
+Служебные скрипты: заменитель сервера и замеры производительности
+"""
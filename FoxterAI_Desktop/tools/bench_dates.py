@@ -0,0 +1,78 @@
+"""
+Замер разбора дат
+Сравнивает прежний разбор (replace('Z', '+00:00') + fromisoformat +
+снятие пояса + strftime для показа) с общим разбором с кэшем
+(core/models/dates.py): первый проход по новым строкам и повторный - как
+при обновлении списка
+
+Запуск:
+    python tools/bench_dates.py
+    python tools/bench_dates.py --count 400000
+"""
+
+import argparse
+import os
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core.models import dates
+from tools.standin_server import make_licenses
+
+
+DATE_FIELDS = ('created_date', 'activation_date', 'expiry_date', 'last_check')
+
+
+def legacy(value):
+    """Прежний разбор: дата и две строки для показа"""
+    dt = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    if dt.tzinfo is not None:
+        dt = dt.replace(tzinfo=None)
+    return dt, dt.strftime('%d.%m.%Y %H:%M'), dt.strftime('%d.%m.%Y')
+
+
+def best_of(func, repeat: int = 3) -> float:
+    """Лучшее время из нескольких запусков, секунд"""
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Замер разбора дат')
+    parser.add_argument('--count', type=int, default=20000, help='Лицензий (по 4 даты)')
+    args = parser.parse_args()
+    
+    values = [lic[field] for lic in make_licenses(args.count) for field in DATE_FIELDS if lic.get(field)]
+    distinct = len(set(values))
+    
+    def cold():
+        dates.clear_cache()
+        for value in values:
+            dates.parse_date(value)
+    
+    def warm():
+        for value in values:
+            dates.parse_date(value)
+    
+    def uncached():
+        for value in values:
+            dates._display(dates._parse(value))
+    
+    print(f"\n📅 {len(values)} дат, различных {distinct} (кэш на {dates.CACHE_SIZE})")
+    print(f"{'вариант':<40}{'всего, мс':>12}{'на дату, нс':>16}")
+    for name, func in [('прежний (fromisoformat + strftime)', lambda: [legacy(v) for v in values]),
+                       ('без кэша (быстрый путь + f-строки)', uncached),
+                       ('с кэшем, первый проход', cold),
+                       ('с кэшем, повторный проход', warm)]:
+        elapsed = best_of(func)
+        print(f"{name:<40}{elapsed * 1000:>12.1f}{elapsed / len(values) * 1e9:>16.0f}")
+    print(f"📊 Кэш: {dates.cache_info()}")
+
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
@@ -0,0 +1,78 @@
+"""
+Замер разбора ответа /api/licenses
+Сравнивает прежний путь (json.loads, затем EncodingFixer для каждой
+строки) с выбором кодировки по байтам (wire_format.decode_payload): в
+чистом ответе правка кодировки пропускается целиком
+
+Запуск:
+    python tools/bench_decode.py
+    python tools/bench_decode.py --count 100000 --broken 0.01
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core.api import wire_format
+from core.models.normalize import LicenseNormalizer
+from tools.bench_encoding import corpus
+from tools.standin_server import make_licenses
+
+
+CONTENT_TYPE = 'application/json; charset=utf-8'
+
+
+def best_of(func, repeat: int = 3) -> float:
+    """Лучшее время из нескольких запусков, секунд"""
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def bench(name: str, rows, ensure_ascii: bool):
+    """Разбор и обработка одного тела ответа"""
+    body = json.dumps({'success': True, 'licenses': rows}, ensure_ascii=ensure_ascii).encode('utf-8')
+    normalizer = LicenseNormalizer()
+    
+    def before():
+        data = wire_format.decode_body(body, CONTENT_TYPE)
+        normalizer.normalize_many(data['licenses'])
+    
+    def after():
+        data, needs_fix = wire_format.decode_payload(body, CONTENT_TYPE)
+        normalizer.normalize_many(data['licenses'], needs_fix)
+    
+    def scan():
+        wire_format.suspicious_bytes(body)
+    
+    needs_fix = wire_format.decode_payload(body, CONTENT_TYPE)[1]
+    print(f"\n📦 {name}: {len(rows)} строк, {len(body) / 1e6:.1f} МБ, "
+          f"{'ensure_ascii' if ensure_ascii else 'UTF-8'} (правка нужна: {'да' if needs_fix else 'нет'})")
+    print(f"{'вариант':<40}{'всего, мс':>12}{'на строку, мкс':>18}")
+    for label, func in [('json.loads + EncodingFixer на строку', before),
+                        ('decode_payload + правка по признаку', after),
+                        ('  из них проверка байтов', scan)]:
+        elapsed = best_of(func)
+        print(f"{label:<40}{elapsed * 1000:>12.1f}{elapsed / len(rows) * 1e6:>18.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Замер разбора ответа /api/licenses')
+    parser.add_argument('--count', type=int, default=20000, help='Лицензий')
+    parser.add_argument('--broken', type=float, default=0.3, help='Доля испорченных полей')
+    args = parser.parse_args()
+    
+    clean = make_licenses(args.count)
+    bench('чистый ответ', clean, ensure_ascii=False)
+    bench('чистый ответ', clean, ensure_ascii=True)
+    bench('испорченный ответ', corpus(args.count, args.broken), ensure_ascii=False)
+
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
@@ -0,0 +1,150 @@
+"""
+Замер исправления кодировки
+Сравнивает прежний EncodingFixer (полная проверка и пробные
+перекодировки для каждой строки) с быстрым путём для ASCII и чистого
+текста, таблицей str.translate и кэшем по исходной строке
+
+Корпус - строки лицензий, где часть имён, владельцев и заметок испорчена
+так, как это делает MT4: UTF-8 или CP1251, прочитанные как Latin-1.
+Отдельно - исправление владельца счёта: прежние пробные перекодировки
+против MojibakeDetector (один проход по классам байтов, одно декодирование).
+
+Запуск:
+    python tools/bench_encoding.py
+    python tools/bench_encoding.py --count 50000 --broken 0.5
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from modules.encoding_fix import EncodingFixer, MojibakeDetector
+from tools.standin_server import make_licenses
+
+
+BROKEN_FIELDS = ('client_name', 'account_owner', 'notes')
+
+
+# ==================== ПРЕЖНЯЯ ОБРАБОТКА ====================
+
+def legacy_fix_text(text):
+    """Сокращённая копия EncodingFixer.fix_text до быстрого пути (только str)"""
+    if not text:
+        return ""
+    try:
+        text.encode('utf-8').decode('utf-8')
+        if not any(c in text for c in ['�', 'Ð', 'Ã']):
+            return text
+    except UnicodeError:
+        pass
+    for encode_as, decode_as in (('latin-1', 'utf-8'), ('latin-1', 'cp1251'), ('utf-8', 'cp1251')):
+        try:
+            fixed = text.encode(encode_as).decode(decode_as)
+            if '�' not in fixed:
+                return fixed
+        except UnicodeError:
+            pass
+    return EncodingFixer.clean_garbage(text)
+
+
+def legacy_owner(owner):
+    """Прежнее исправление account_owner (APIClient, затем LicenseNormalizer)"""
+    if not (any(ord(c) > 127 for c in owner) or any(c in owner for c in ('ï', '¿', '½', 'ð', 'Ð', '$n'))):
+        return owner.strip()
+    for encode_as, decode_as, garbage in (('latin-1', 'utf-8', ('�', 'ï', '¿')),
+                                          ('latin-1', 'cp1251', ('�', 'ï', '¿')),
+                                          ('utf-8', 'cp1251', ('�',))):
+        test = owner.encode(encode_as, errors='ignore').decode(decode_as, errors='ignore')
+        if test and not any(c in test for c in garbage):
+            return ''.join(c for c in test if c.isprintable() or c.isspace()).strip()
+    return ''.join(c for c in owner if ord(c) < 128 and (c.isalnum() or c.isspace() or c in '.-_')).strip()
+
+
+def legacy_fix_dict(data):
+    return {key: legacy_fix_text(value) if isinstance(value, str) else value
+            for key, value in data.items()}
+
+
+# ==================== КОРПУС ====================
+
+def corpus(count: int, broken: float, seed: int = 1):
+    """Строки лицензий с долей broken испорченных текстовых полей"""
+    rng = random.Random(seed)
+    rows = make_licenses(count)
+    for row in rows:
+        for field in BROKEN_FIELDS:
+            value = row.get(field)
+            if value and rng.random() < broken:
+                source = 'utf-8' if rng.random() < 0.7 else 'cp1251'
+                row[field] = value.encode(source).decode('latin-1')
+    return rows
+
+
+def best_of(func, repeat: int = 3) -> float:
+    """Лучшее время из нескольких запусков, секунд"""
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Замер исправления кодировки')
+    parser.add_argument('--count', type=int, default=20000, help='Лицензий')
+    parser.add_argument('--broken', type=float, default=0.3, help='Доля испорченных полей')
+    args = parser.parse_args()
+    
+    rows = corpus(args.count, args.broken)
+    strings = sum(isinstance(value, str) for row in rows for value in row.values())
+    
+    def cold():
+        EncodingFixer._cache.clear()
+        for row in rows:
+            EncodingFixer.fix_dict(row)
+    
+    def warm():
+        for row in rows:
+            EncodingFixer.fix_dict(row)
+    
+    mismatched = sum(legacy_fix_dict(row) != EncodingFixer.fix_dict(row) for row in rows)
+    print(f"\n🔤 {len(rows)} лицензий, {strings} строк, испорчено ~{args.broken:.0%} полей "
+          f"{', '.join(BROKEN_FIELDS)} (расхождений с прежним: {mismatched})")
+    print(f"{'вариант':<36}{'всего, мс':>12}{'на лицензию, мкс':>20}")
+    for name, func in [('прежний fix_dict', lambda: [legacy_fix_dict(row) for row in rows]),
+                       ('быстрый путь, пустой кэш', cold),
+                       ('быстрый путь, повторно (кэш)', warm)]:
+        elapsed = best_of(func)
+        print(f"{name:<36}{elapsed * 1000:>12.1f}{elapsed / len(rows) * 1e6:>20.1f}")
+    
+    # Владелец счёта: сырые значения, как их присылает MT4
+    owners = [row['account_owner'] for row in rows if row.get('account_owner')]
+    detector = MojibakeDetector()
+    
+    def detect_cold():
+        detector._cache.clear()
+        for owner in owners:
+            detector.repair(owner)
+    
+    def detect_warm():
+        for owner in owners:
+            detector.repair(owner)
+    
+    emptied = sum(not legacy_owner(owner) for owner in owners)
+    print(f"\n👤 {len(owners)} владельцев (прежний разбор стирает {emptied}, детектор - "
+          f"{sum(not detector.repair(owner) for owner in owners)})")
+    print(f"{'вариант':<36}{'всего, мс':>12}{'на строку, мкс':>20}")
+    for name, func in [('прежние пробные перекодировки', lambda: [legacy_owner(o) for o in owners]),
+                       ('детектор, без кэша', lambda: [detector._decode(o, detector.classify(o)) for o in owners]),
+                       ('детектор, пустой кэш', detect_cold),
+                       ('детектор, повторно (кэш)', detect_warm)]:
+        elapsed = best_of(func)
+        print(f"{name:<36}{elapsed * 1000:>12.1f}{elapsed / len(owners) * 1e6:>20.1f}")
+
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
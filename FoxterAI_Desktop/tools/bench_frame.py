@@ -0,0 +1,109 @@
+"""
+Замер LicenseFrame против построчной обработки
+Три части: вычисляемые поля и даты (LicenseNormalizer против столбцов),
+значения колонок таблицы (LicenseTable._row_values против
+LicenseFrame.table_rows) и Statistics (объекты License против frame)
+
+Запуск:
+    python tools/bench_frame.py
+    python tools/bench_frame.py --sizes 10000 100000
+"""
+
+import argparse
+import ast
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core.models import License, Statistics
+from core.models.dates import clear_cache
+from core.models.frame import LicenseFrame
+from core.models.normalize import DATE_FIELDS, LicenseNormalizer
+from tools.standin_server import make_licenses
+
+TABLE_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                          'ui', 'components', 'license_table.py')
+
+
+def load_row_values():
+    """
+    LicenseTable._row_values без Tk
+    
+    Модуль таблицы импортирует customtkinter, поэтому методы
+    форматирования строки берутся из исходника в отдельный класс.
+    """
+    with open(TABLE_PATH, encoding='utf-8') as f:
+        tree = ast.parse(f.read())
+    table = next(node for node in tree.body
+                 if isinstance(node, ast.ClassDef) and node.name == 'LicenseTable')
+    methods = [node for node in table.body if isinstance(node, ast.FunctionDef) and node.name in
+               ('_row_values', '_get_field', '_get_status_display', '_get_status_tag')]
+    
+    module = ast.parse('class TableRows:\n    pass')
+    module.body[0].body = methods
+    namespace = {}
+    exec(compile(module, TABLE_PATH, 'exec'), namespace)
+    return namespace['TableRows']()._row_values
+
+
+def best_of(func, repeat: int = 3) -> float:
+    """Лучшее время из нескольких запусков, секунд"""
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def bench(count: int):
+    """Все три части на count строках"""
+    rows = make_licenses(count)
+    normalizer = LicenseNormalizer(dict)
+    records = normalizer.normalize_many(rows)
+    licenses = [License(record) for record in records]
+    frame = LicenseFrame.from_records(records)
+    row_values = load_row_values()
+    
+    def rows_enrich():
+        # Кэш разбора дат сбрасывается - как при первой загрузке
+        clear_cache()
+        normalizer.normalize_many(rows)
+    
+    def frame_enrich():
+        enriched = LicenseFrame.from_records(rows)
+        for field in DATE_FIELDS:
+            enriched.formatted(field)
+            enriched.epoch(field)
+    
+    cases = [
+        ('обработка: LicenseNormalizer', rows_enrich),
+        ('обработка: LicenseFrame', frame_enrich),
+        ('таблица: _row_values по строкам', lambda: [row_values(record) for record in records]),
+        # table_rows запоминает результат - замеряется само форматирование
+        ('таблица: LicenseFrame.table_rows', frame._format_table_rows),
+        ('Statistics: объекты License', lambda: Statistics(licenses)),
+        ('Statistics: LicenseFrame', lambda: Statistics(frame)),
+        ('LicenseFrame.from_records (записи)', lambda: LicenseFrame.from_records(records)),
+        ('LicenseService: frame + строки таблицы', lambda: LicenseFrame.from_records(records).table_rows())
+    ]
+    
+    print(f"\n📦 {count} лицензий")
+    print(f"{'вариант':<42}{'всего, мс':>12}{'на строку, мкс':>18}")
+    for name, func in cases:
+        elapsed = best_of(func)
+        print(f"{name:<42}{elapsed * 1000:>12.1f}{elapsed / count * 1e6:>18.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Замер LicenseFrame')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000])
+    args = parser.parse_args()
+    
+    for count in args.sizes:
+        bench(count)
+
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
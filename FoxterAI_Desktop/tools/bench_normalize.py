@@ -0,0 +1,167 @@
+"""
+Замер обработки строк лицензий
+Сравнивает прежние три прохода (APIClient._process_license,
+LicensesAPI._enrich_license, License.__init__) с общим конвейером
+LicenseNormalizer
+
+Запуск:
+    python tools/bench_normalize.py
+    python tools/bench_normalize.py --sizes 1000 10000 100000
+"""
+
+import argparse
+import os
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core.models import License
+from core.models.normalize import LicenseNormalizer
+from tools.standin_server import make_licenses
+
+try:
+    from modules.encoding_fix import EncodingFixer
+except ImportError:
+    EncodingFixer = None
+
+
+DATE_FIELDS = ('created_date', 'activation_date', 'expiry_date', 'last_check')
+
+
+# ==================== ПРЕЖНЯЯ ОБРАБОТКА ====================
+# Сокращённые копии кода до общего конвейера - те же разборы дат,
+# форматирование и проверки на каждом из трёх проходов
+
+def _legacy_parse(value):
+    dt = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    return dt.replace(tzinfo=None) if dt.tzinfo is not None else dt
+
+
+def legacy_api_client(lic, fix_dict):
+    """Первый проход: APIClient._process_license"""
+    fixed = fix_dict(lic)
+    owner = fixed.get('account_owner')
+    if owner and isinstance(owner, str) and any(ord(c) > 127 for c in owner):
+        test = owner.encode('latin-1', errors='ignore').decode('utf-8', errors='ignore')
+        fixed['account_owner'] = ''.join(c for c in test if c.isprintable() or c.isspace()).strip()
+    elif owner:
+        fixed['account_owner'] = owner.strip()
+    else:
+        fixed['account_owner'] = 'Не активирован'
+    
+    for field in DATE_FIELDS:
+        if fixed.get(field):
+            try:
+                fixed[f'{field}_formatted'] = _legacy_parse(fixed[field]).strftime('%d.%m.%Y %H:%M')
+            except ValueError:
+                fixed[f'{field}_formatted'] = fixed[field]
+    
+    if fixed.get('expiry_date'):
+        try:
+            fixed['days_left'] = (_legacy_parse(fixed['expiry_date']) - datetime.now()).days
+        except ValueError:
+            fixed['days_left'] = 999
+    else:
+        fixed['days_left'] = 999
+    return fixed
+
+
+def legacy_enrich(license):
+    """Второй проход: LicensesAPI._enrich_license"""
+    enriched = license.copy()
+    for field in DATE_FIELDS:
+        if enriched.get(field):
+            enriched[f'{field}_raw'] = enriched[field]
+            enriched[f'{field}_formatted'] = _legacy_parse(enriched[field]).strftime('%d.%m.%Y %H:%M')
+            enriched[f'{field}_short'] = _legacy_parse(enriched[field]).strftime('%d.%m.%Y')
+    if enriched.get('expiry_date') and enriched.get('status') == 'active':
+        days_left = max(0, (_legacy_parse(enriched['expiry_date']) - datetime.now()).days)
+        enriched['days_left'] = days_left
+        enriched['urgency'] = ('critical' if days_left <= 3 else 'warning' if days_left <= 7
+                               else 'attention' if days_left <= 30 else 'normal')
+    else:
+        enriched['days_left'] = -1
+        enriched['urgency'] = 'none'
+    return enriched
+
+
+class LegacyLicense:
+    """Третий проход: License.__init__ (разбор дат и вычисляемые поля заново)"""
+    
+    def __init__(self, data):
+        self.key = data.get('license_key', '')
+        self.status = str(data.get('status', 'created')).lower()
+        self.account_number = str(data.get('account_number', '')) or None
+        owner = data.get('account_owner', '')
+        self.account_owner = str(owner).strip() if owner else f"Счет {self.account_number}"
+        self.balance = float(data.get('last_balance', 0) or 0)
+        self.dates = {}
+        for field in DATE_FIELDS:
+            value = data.get(field)
+            self.dates[field] = _legacy_parse(str(value).split('.')[0]) if value else None
+        
+        now = datetime.now()
+        expiry = self.dates['expiry_date']
+        self.days_left = max(0, (expiry - now).days) if expiry else 999
+        self.is_active = self.status == 'active'
+        self.days_left_text = f'{self.days_left} дн.' if self.is_active else 'Бессрочная'
+        self.urgency = 'critical' if self.is_active and self.days_left <= 3 else 'none'
+        self.problems = []
+        if self.is_active:
+            if self.balance < 100:
+                self.problems.append('Низкий баланс')
+            last_check = self.dates['last_check']
+            if last_check and (now - last_check).days > 7:
+                self.problems.append('Давно не проверялась')
+
+
+# ==================== ЗАМЕР ====================
+
+def best_of(func, repeat: int = 3) -> float:
+    """Лучшее время из нескольких запусков, секунд"""
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def bench(count: int):
+    """Обработка count строк: три прохода против одного"""
+    rows = make_licenses(count)
+    fix_dict = EncodingFixer.fix_dict_encoding if EncodingFixer else dict
+    normalizer = LicenseNormalizer(fix_dict)
+    
+    def before():
+        for lic in rows:
+            LegacyLicense(legacy_enrich(legacy_api_client(lic, fix_dict)))
+    
+    def after():
+        for record in normalizer.normalize_many(rows):
+            License(record)
+    
+    def after_records():
+        normalizer.normalize_many(rows)
+    
+    print(f"\n📦 {count} лицензий (кодировка: {'EncodingFixer' if EncodingFixer else 'нет'})")
+    print(f"{'вариант':<42}{'всего, мс':>12}{'на строку, мкс':>18}")
+    for name, func in [('три прохода (до)', before),
+                       ('конвейер + License', after),
+                       ('конвейер (только записи)', after_records)]:
+        elapsed = best_of(func)
+        print(f"{name:<42}{elapsed * 1000:>12.1f}{elapsed / count * 1e6:>18.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Замер обработки строк лицензий')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000])
+    args = parser.parse_args()
+    
+    for count in args.sizes:
+        bench(count)
+
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
@@ -0,0 +1,128 @@
+"""
+Замер форматов ответа /api/licenses
+Сравнивает объём передачи и время разбора для JSON, колоночного JSON и
+MessagePack (если установлен) с gzip/br сжатием и без
+
+Запуск:
+    python tools/bench_wire_format.py
+    python tools/bench_wire_format.py --sizes 1000 10000 100000 --http
+"""
+
+import argparse
+import gzip
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core.api import wire_format
+from tools.standin_server import StandInServer, make_licenses, encode_body
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+def best_of(func, repeat: int = 3) -> float:
+    """Лучшее время из нескольких запусков, секунд"""
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def bench_offline(count: int):
+    """Размер и время разбора без сети"""
+    licenses = make_licenses(count)
+    payload = {'success': True, 'licenses': licenses, 'count': count}
+    
+    media_types = [wire_format.MEDIA_JSON, wire_format.MEDIA_COLUMNS]
+    if wire_format.MSGPACK_AVAILABLE:
+        media_types.append(wire_format.MEDIA_MSGPACK)
+    
+    codecs = [('identity', None, None),
+              ('gzip', lambda b: gzip.compress(b, 6), gzip.decompress)]
+    if brotli is not None:
+        codecs.append(('br', lambda b: brotli.compress(b, quality=5), brotli.decompress))
+    
+    print(f"\n📦 {count} лицензий")
+    print(f"{'формат':<42}{'байт':>14}{'разбор, мс':>14}")
+    
+    for media in media_types:
+        body = encode_body(payload, media)
+        for name, compress, decompress in codecs:
+            wire = compress(body) if compress else body
+            
+            def decode():
+                raw = decompress(wire) if decompress else wire
+                data = wire_format.decode_body(raw, media)
+                assert len(data['licenses']) == count
+            
+            elapsed = best_of(decode)
+            label = f"{media.split('/')[-1]} + {name}"
+            print(f"{label:<42}{len(wire):>14,}{elapsed * 1000:>14.1f}")
+
+
+def bench_http(count: int):
+    """Полный запрос по HTTP к заменителю сервера"""
+    import requests
+    
+    server = StandInServer(('127.0.0.1', 0), make_licenses(count))
+    server.start_background()
+    try:
+        session = requests.Session()
+        session.headers['X-API-Key'] = server.api_key
+        url = f"{server.url}/api/licenses"
+        
+        variants = [
+            ('json', {'Accept': wire_format.MEDIA_JSON, 'Accept-Encoding': 'identity'}),
+            ('json + gzip', {'Accept': wire_format.MEDIA_JSON,
+                             'Accept-Encoding': wire_format.accept_encoding()}),
+            ('negotiated', {'Accept': wire_format.accept_header(),
+                            'Accept-Encoding': wire_format.accept_encoding()})
+        ]
+        
+        print(f"\n🌐 HTTP, {count} лицензий")
+        print(f"{'вариант':<42}{'байт':>14}{'запрос, мс':>14}")
+        for name, headers in variants:
+            sizes = {}
+            
+            def fetch():
+                # Байты как они пришли по сети (до распаковки)
+                response = session.get(url, headers=headers, stream=True)
+                sizes['wire'] = len(response.raw.read(decode_content=False))
+                response.close()
+            
+            def fetch_and_decode():
+                response = session.get(url, headers=headers)
+                data = wire_format.decode_response(response)
+                assert len(data['licenses']) == count
+            
+            fetch()
+            elapsed = best_of(fetch_and_decode)
+            print(f"{name:<42}{sizes['wire']:>14,}{elapsed * 1000:>14.1f}")
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Замер форматов ответа /api/licenses')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000])
+    parser.add_argument('--http', action='store_true', help='Также замер через локальный HTTP')
+    args = parser.parse_args()
+    
+    print(f"msgpack: {'да' if wire_format.MSGPACK_AVAILABLE else 'нет'}, "
+          f"brotli: {'да' if brotli is not None else 'нет'}")
+    
+    for count in args.sizes:
+        bench_offline(count)
+        if args.http:
+            bench_http(count)
+
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
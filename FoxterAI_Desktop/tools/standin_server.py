@@ -0,0 +1,503 @@
+"""
+Локальный заменитель сервера лицензий для тестов и замеров
+Отдаёт сгенерированные лицензии с теми же ответами, что и Node сервер,
+и дополнительно умеет gzip/br и компактные форматы тела
+
+Запуск:
+    python tools/standin_server.py --count 10000 --port 3000
+    python tools/standin_server.py --events-per-sec 50   # с потоком событий
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import random
+import sys
+import threading
+import time
+from collections import deque
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+# Добавляем корень проекта в путь
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core.api import wire_format
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+DEFAULT_API_KEY = 'FXA-Kj8$mN2@pQ9#vX5!wY3&zL7*'
+
+BROKERS = ['RoboForex-ECN', 'Alpari-MT4', 'ICMarkets-Live', 'Exness-Real', 'FxPro.com-Real']
+ROBOTS = ['FoxterAI Scalper', 'FoxterAI Grid', 'FoxterAI Trend']
+NAMES = ['Иван Петров', 'Мария Сидорова', 'Алексей Смирнов', 'John Smith', 'Ольга Кузнецова']
+STATUSES = ['active', 'active', 'active', 'expired', 'blocked', 'created']
+
+# Путь потока событий (Server-Sent Events)
+EVENTS_PATH = '/api/events/stream'
+
+
+def make_licenses(count: int, seed: int = 42) -> List[Dict[str, Any]]:
+    """
+    Сгенерировать правдоподобные лицензии (поля как в schema_mapping.json)
+    
+    Args:
+        count: Количество лицензий
+        seed: Зерно генератора (одинаковые данные между запусками)
+    
+    Returns:
+        List[Dict]: Лицензии, новые первыми
+    """
+    rng = random.Random(seed)
+    now = datetime.now().replace(microsecond=0)
+    licenses = []
+    
+    for i in range(count):
+        created = now - timedelta(days=rng.randint(0, 720), seconds=rng.randint(0, 86400))
+        months = rng.choice([1, 3, 6, 12])
+        status = rng.choice(STATUSES)
+        activated = created + timedelta(hours=rng.randint(1, 48)) if status != 'created' else None
+        expiry = created + timedelta(days=30 * months)
+        account = str(rng.randint(10_000_000, 99_999_999)) if activated else None
+        
+        licenses.append({
+            'id': i + 1,
+            'license_key': f"FXAI-{i:06d}-{rng.randint(0, 0xFFFF):04X}",
+            'client_name': rng.choice(NAMES),
+            'client_contact': f"+7900{rng.randint(1_000_000, 9_999_999)}",
+            'client_telegram': f"@client{i}",
+            'account_owner': rng.choice(NAMES) if activated else None,
+            'created_date': created.isoformat(),
+            'activation_date': activated.isoformat() if activated else None,
+            'expiry_date': expiry.isoformat(),
+            'months': months,
+            'account_number': account,
+            'broker_name': rng.choice(BROKERS) if activated else None,
+            'fingerprint': f"{account}_{i}" if activated else None,
+            'status': status,
+            'notes': '' if rng.random() < 0.7 else 'VIP клиент',
+            'last_check': (now - timedelta(minutes=rng.randint(0, 10_000))).isoformat() if activated else None,
+            'check_count': rng.randint(0, 5000),
+            'last_ip': f"10.0.{rng.randint(0, 255)}.{rng.randint(1, 254)}",
+            'last_balance': round(rng.uniform(100, 50_000), 2) if activated else 0,
+            'last_equity': round(rng.uniform(100, 50_000), 2) if activated else None,
+            'last_profit': round(rng.uniform(-500, 5_000), 2) if activated else None,
+            'robot_name': rng.choice(ROBOTS),
+            'robot_version': f"1.{rng.randint(0, 9)}",
+            'account_type': rng.choice(['Real', 'Demo']),
+            'last_update': (now - timedelta(minutes=rng.randint(0, 10_000))).isoformat(),
+            'terminal_version': f"build {rng.randint(1350, 1420)}",
+            'os_info': 'Windows 10',
+            'max_accounts': '1'
+        })
+    
+    licenses.sort(key=lambda lic: lic['created_date'], reverse=True)
+    return licenses
+
+
+def negotiate(accept: str) -> str:
+    """Выбрать формат тела по заголовку Accept (с учётом q)"""
+    best, best_q = wire_format.MEDIA_JSON, 0.0
+    for part in (accept or '').split(','):
+        pieces = [p.strip() for p in part.split(';')]
+        media = pieces[0].lower()
+        q = 1.0
+        for param in pieces[1:]:
+            if param.startswith('q='):
+                try:
+                    q = float(param[2:])
+                except ValueError:
+                    q = 0.0
+        if media == wire_format.MEDIA_MSGPACK and not wire_format.MSGPACK_AVAILABLE:
+            continue
+        if media in (wire_format.MEDIA_JSON, wire_format.MEDIA_COLUMNS,
+                     wire_format.MEDIA_MSGPACK) and q > best_q:
+            best, best_q = media, q
+    return best
+
+
+def encode_body(payload: Dict[str, Any], media: str) -> bytes:
+    """Закодировать ответ в выбранном формате"""
+    if media == wire_format.MEDIA_JSON:
+        return json.dumps(payload, ensure_ascii=False).encode('utf-8')
+    
+    licenses = payload.get('licenses', [])
+    extra = {k: v for k, v in payload.items() if k != 'licenses'}
+    columns = wire_format.encode_columns(licenses, **extra)
+    
+    if media == wire_format.MEDIA_MSGPACK:
+        return wire_format.msgpack.packb(columns, use_bin_type=True)
+    return json.dumps(columns, ensure_ascii=False).encode('utf-8')
+
+
+def compress(body: bytes, accept_encoding: str) -> Tuple[bytes, Optional[str]]:
+    """Сжать тело, если клиент это принимает"""
+    accepted = {p.split(';')[0].strip().lower() for p in (accept_encoding or '').split(',')}
+    if 'br' in accepted and brotli is not None:
+        return brotli.compress(body, quality=5), 'br'
+    if 'gzip' in accepted:
+        return gzip.compress(body, compresslevel=6), 'gzip'
+    return body, None
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Обработчик запросов заменителя сервера"""
+    
+    server_version = 'FoxterAI-StandIn/1.0'
+    protocol_version = 'HTTP/1.1'
+    
+    # ==================== ИНФРАСТРУКТУРА ====================
+    
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+    
+    def _authorized(self) -> bool:
+        """Проверка X-API-Key"""
+        if self.headers.get('X-API-Key') == self.server.api_key:
+            return True
+        self._send_json({'success': False, 'error': 'UNAUTHORIZED'}, status=401)
+        return False
+    
+    def _send_json(self, payload: Dict[str, Any], status: int = 200):
+        """Обычный JSON ответ"""
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self._send(body, 'application/json; charset=utf-8', status)
+    
+    def _send(self, body: bytes, content_type: str, status: int = 200,
+              headers: Optional[Dict[str, str]] = None):
+        """Отправить тело с заголовками"""
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        if self.command != 'HEAD':
+            self.wfile.write(body)
+    
+    # ==================== МАРШРУТЫ ====================
+    
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        route = self.server.routes.get(('GET', url.path))
+        
+        if url.path == '/health':
+            self._send_json({'статус': 'здоров', 'база_данных': 'подключена',
+                             'время_работы': self.server.uptime()})
+        elif url.path == '/api/version':
+            self._send_json({'версия': '4.0.0', 'версия_api': '2.0', 'функции': []})
+        elif route:
+            if self._authorized():
+                route(self, query)
+        elif url.path == '/api/licenses':
+            if self._authorized():
+                self._get_licenses(query)
+        elif url.path == '/api/statistics':
+            if self._authorized():
+                self._send_json({'success': True, 'statistics': self.server.statistics()})
+        elif url.path == EVENTS_PATH:
+            if self._authorized():
+                self._event_stream()
+        else:
+            self._send_json({'success': False, 'error': 'NOT_FOUND'}, status=404)
+    
+    def do_POST(self):
+        url = urlparse(self.path)
+        route = self.server.routes.get(('POST', url.path))
+        if not route:
+            self._send_json({'success': False, 'error': 'NOT_FOUND'}, status=404)
+            return
+        if self._authorized():
+            length = int(self.headers.get('Content-Length') or 0)
+            body = json.loads(self.rfile.read(length) or b'{}')
+            route(self, body)
+    
+    def _get_licenses(self, query: Dict[str, List[str]]):
+        """GET /api/licenses с согласованием формата, сжатием и limit/offset"""
+        limit = min(int(query.get('limit', ['0'])[0] or 0), 1000)
+        offset = max(int(query.get('offset', ['0'])[0] or 0), 0)
+        
+        etag = self.server.etag
+        if not limit and self.headers.get('If-None-Match') == etag:
+            self._send(b'', 'application/json', status=304, headers={'ETag': etag})
+            return
+        
+        licenses = self.server.licenses
+        if limit:
+            page = licenses[offset:offset + limit]
+            payload = {'success': True, 'licenses': page, 'count': len(page),
+                       'total': len(licenses), 'limit': limit, 'offset': offset}
+        else:
+            payload = {'success': True, 'licenses': licenses, 'count': len(licenses)}
+        
+        media = negotiate(self.headers.get('Accept', ''))
+        body = encode_body(payload, media)
+        body, encoding = compress(body, self.headers.get('Accept-Encoding', ''))
+        
+        headers = {'ETag': etag, 'Vary': 'Accept, Accept-Encoding'}
+        if encoding:
+            headers['Content-Encoding'] = encoding
+        content_type = media if media == wire_format.MEDIA_MSGPACK else f"{media}; charset=utf-8"
+        self._send(body, content_type, headers=headers)
+    
+    
+    def _event_stream(self):
+        """
+        GET /api/events/stream - события лицензий в формате text/event-stream
+        
+        С заголовком Last-Event-ID досылает пропущенное из журнала; если
+        столько уже не хранится - шлёт 'resync'. Пока событий нет, раз в
+        heartbeat секунд отправляет комментарий-пинг.
+        """
+        server = self.server
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream; charset=utf-8')
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+        
+        last_id = self.headers.get('Last-Event-ID', '')
+        cursor = int(last_id) if last_id.isdigit() else server.event_seq
+        
+        try:
+            self._write_chunk(f"retry: {server.event_retry_ms}\n\n".encode('utf-8'))
+            
+            while not server.closing:
+                events = server.wait_events(cursor, server.event_heartbeat)
+                if events is None:
+                    # Журнал не хранит столько - клиенту нужна полная сверка
+                    cursor = server.event_seq
+                    self._write_chunk(f"id: {cursor}\nevent: resync\ndata: {{}}\n\n".encode('utf-8'))
+                elif events:
+                    cursor = events[-1][0]
+                    self._write_chunk(''.join(
+                        f"id: {seq}\nevent: {name}\ndata: {data}\n\n" for seq, name, data in events
+                    ).encode('utf-8'))
+                else:
+                    self._write_chunk(b': ping\n\n')
+            
+            self.wfile.write(b'0\r\n\r\n')
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        # Соединение с потоком не переиспользуется
+        self.close_connection = True
+    
+    def _write_chunk(self, data: bytes):
+        """Один кусок chunked тела (отправляется сразу)"""
+        self.wfile.write(f"{len(data):X}\r\n".encode('ascii') + data + b'\r\n')
+        self.wfile.flush()
+
+
+class StandInServer(ThreadingHTTPServer):
+    """
+    Заменитель сервера лицензий
+    
+    Дополнительные маршруты регистрируются в routes как
+    {(метод, путь): функция(handler, query_или_тело)}.
+    
+    Изменения лицензий (update_license, simulate_activity) публикуются в
+    поток событий; в журнале хранятся последние event_backlog событий.
+    """
+    
+    daemon_threads = True
+    
+    def __init__(self, address: Tuple[str, int], licenses: List[Dict[str, Any]],
+                 api_key: str = DEFAULT_API_KEY, verbose: bool = False,
+                 event_backlog: int = 10000):
+        super().__init__(address, StandInHandler)
+        self.api_key = api_key
+        self.verbose = verbose
+        self.routes: Dict[Tuple[str, str], Any] = {}
+        self.lock = threading.Lock()
+        self.started = time.monotonic()
+        
+        # Поток событий
+        self.events: deque = deque(maxlen=event_backlog)
+        self.event_seq = 0
+        self.event_retry_ms = 3000
+        self.event_heartbeat = 15.0
+        self.events_cond = threading.Condition()
+        self.closing = False
+        
+        self.set_licenses(licenses)
+    
+    def set_licenses(self, licenses: List[Dict[str, Any]]):
+        """Заменить данные (ETag пересчитывается)"""
+        with self.lock:
+            self.licenses = licenses
+            self._by_key = {lic['license_key']: lic for lic in licenses}
+            digest = hashlib.md5(json.dumps(licenses, sort_keys=True).encode('utf-8')).hexdigest()
+            self._digest = digest[:16]
+            self.etag = f'W/"{self._digest}"'
+    
+    # ==================== СОБЫТИЯ ====================
+    
+    def publish(self, name: str, payload: Dict[str, Any]) -> int:
+        """
+        Опубликовать событие для всех подписчиков
+        
+        Returns:
+            int: Номер события
+        """
+        data = json.dumps(payload, ensure_ascii=False)
+        with self.events_cond:
+            self.event_seq += 1
+            self.events.append((self.event_seq, name, data))
+            self.events_cond.notify_all()
+            return self.event_seq
+    
+    def wait_events(self, cursor: int, timeout: float) -> Optional[List[Tuple[int, str, str]]]:
+        """
+        События после cursor (ждёт новых не дольше timeout)
+        
+        Returns:
+            Optional[List]: [(номер, имя, данные)]; None - часть уже вытеснена из журнала
+        """
+        with self.events_cond:
+            if cursor >= self.event_seq and not self.closing:
+                self.events_cond.wait(timeout)
+            if cursor >= self.event_seq:
+                return []
+            
+            oldest = self.events[0][0] if self.events else self.event_seq + 1
+            if cursor < oldest - 1:
+                return None
+            return list(self.events)[cursor - oldest + 1:]
+    
+    def update_license(self, license_key: str, fields: Dict[str, Any]) -> bool:
+        """
+        Изменить лицензию как это делают /check и /heartbeat робота
+        
+        Returns:
+            bool: False если ключа нет
+        """
+        with self.lock:
+            lic = self._by_key.get(license_key)
+            if lic is None:
+                return False
+            lic.update(fields)
+            seq = self.publish('license', dict(fields, license_key=license_key))
+            self.etag = f'W/"{self._digest}-{seq}"'
+        return True
+    
+    def simulate_activity(self, events_per_sec: float, seed: int = 7) -> threading.Thread:
+        """
+        Фоновые heartbeat роботов: случайные активированные лицензии
+        получают новые last_check, баланс, эквити и профит
+        
+        Args:
+            events_per_sec: Частота событий
+            seed: Зерно генератора
+        """
+        rng = random.Random(seed)
+        keys = [lic['license_key'] for lic in self.licenses if lic.get('activation_date')]
+        
+        def run():
+            interval = 1.0 / events_per_sec
+            while not self.closing and keys:
+                lic = self._by_key[rng.choice(keys)]
+                balance = round((lic.get('last_balance') or 1000) * rng.uniform(0.995, 1.005), 2)
+                equity = round(balance + rng.uniform(-200, 200), 2)
+                self.update_license(lic['license_key'], {
+                    'last_check': datetime.now().replace(microsecond=0).isoformat(),
+                    'last_balance': balance,
+                    'last_equity': equity,
+                    'last_profit': round(equity - balance + (lic.get('last_profit') or 0), 2),
+                    'check_count': (lic.get('check_count') or 0) + 1
+                })
+                time.sleep(interval)
+        
+        thread = threading.Thread(target=run, name='FoxterAI-standin-activity', daemon=True)
+        thread.start()
+        return thread
+    
+    def shutdown(self):
+        """Остановить сервер и закрыть открытые потоки событий"""
+        with self.events_cond:
+            self.closing = True
+            self.events_cond.notify_all()
+        super().shutdown()
+    
+    def statistics(self) -> Dict[str, Any]:
+        """Агрегаты в том же виде, что и GET /api/statistics"""
+        counts = {'total': len(self.licenses), 'active': 0, 'expired': 0,
+                  'blocked': 0, 'inactive': 0, 'universal_unused': 0}
+        balance = 0.0
+        robots, accounts = set(), set()
+        
+        for lic in self.licenses:
+            status = 'inactive' if lic['status'] == 'created' else lic['status']
+            if status in counts:
+                counts[status] += 1
+            if lic['status'] == 'created' and not lic.get('robot_name'):
+                counts['universal_unused'] += 1
+            if lic.get('account_type') == 'Real':
+                balance += lic.get('last_balance') or 0
+            robots.add(lic.get('robot_name'))
+            accounts.add(lic.get('account_number'))
+        
+        # COUNT(DISTINCT ...) не считает NULL
+        robots.discard(None)
+        accounts.discard(None)
+        
+        return {
+            'licenses': counts,
+            'metrics': {
+                'total_balance': round(balance, 2),
+                'unique_robots': len(robots),
+                'unique_accounts': len(accounts)
+            }
+        }
+    
+    def uptime(self) -> float:
+        """Время работы, секунд (как process.uptime() у Node сервера)"""
+        return time.monotonic() - self.started
+    
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+    
+    def start_background(self) -> threading.Thread:
+        """Запустить в фоновом потоке (для тестов и замеров)"""
+        thread = threading.Thread(target=self.serve_forever, name='FoxterAI-standin', daemon=True)
+        thread.start()
+        return thread
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Заменитель сервера лицензий FoxterAI')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=3000)
+    parser.add_argument('--count', type=int, default=1000, help='Количество лицензий')
+    parser.add_argument('--api-key', default=DEFAULT_API_KEY)
+    parser.add_argument('--events-per-sec', type=float, default=0,
+                        help='Частота событий heartbeat в потоке событий (0 - без событий)')
+    parser.add_argument('--verbose', action='store_true')
+    args = parser.parse_args()
+    
+    server = StandInServer((args.host, args.port), make_licenses(args.count),
+                           api_key=args.api_key, verbose=args.verbose)
+    print(f"🦊 Заменитель сервера: {server.url} ({args.count} лицензий)")
+    if args.events_per_sec > 0:
+        server.simulate_activity(args.events_per_sec)
+        print(f"📡 Поток событий: {server.url}{EVENTS_PATH} ({args.events_per_sec:g}/с)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n👋 Остановлен")
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
@@ -20,6 +20,14 @@ from themes.dark_theme import DarkTheme
 class LicenseTable(ctk.CTkFrame):
     """Оптимизированная таблица лицензий с премиальным дизайном"""
     
+    # Статус лицензии для каждого фильтра
+    STATUS_FILTERS = {
+        'Активные': 'active',
+        'Истекшие': 'expired',
+        'Заблокированные': 'blocked',
+        'Не активированные': 'created'
+    }
+    
     def __init__(self, parent):
         """
         Инициализация таблицы
@@ -48,13 +56,30 @@ class LicenseTable(ctk.CTkFrame):
         self.sort_column = None
         self.sort_reverse = False
         
+        # Потоковая загрузка: строки уже вставлены пачками
+        self._streaming = False
+        
+        # Строка таблицы по ключу лицензии (точечные обновления)
+        self._item_by_key = {}
+        
+        # Индексированный поиск: search_provider(query, status, total) -> ключи
+        # или None (см. LicenseService.search_keys); без него - перебор
+        self.search_provider = None
+        self._license_by_key = {}
+        self._license_by_key_for = None
+        
+        # LicenseFrame показанного списка и готовые строки из него:
+        # id(лицензии) -> (ключ, значения колонок, тег)
+        self._frame = None
+        self._row_cache = {}
+        
         self._create_widgets()
     
     def _create_widgets(self):
         """Создание виджетов таблицы с премиальным стилем"""
         # Контейнер таблицы с эффектом свечения
         self.table_container = ctk.CTkFrame(
-            self, 
+            self,
             fg_color=DarkTheme.BG_TERTIARY,
             corner_radius=DarkTheme.RADIUS_NORMAL,
             border_width=1,
@@ -83,11 +108,11 @@ class LicenseTable(ctk.CTkFrame):
         )
         
         self.tree = ttk.Treeview(
-            self.tree_frame, 
+            self.tree_frame,
             columns=columns,
             show='tree headings',
             height=20,
-            selectmode='browse'
+            selectmode='extended'
         )
         
         # Настройка стилей ПОСЛЕ создания tree
@@ -190,30 +215,98 @@ class LicenseTable(ctk.CTkFrame):
         self.tree.tag_configure('profit_plus', foreground=DarkTheme.STATUS_ACTIVE)  # Зеленый для прибыли
         self.tree.tag_configure('profit_minus', foreground=DarkTheme.STATUS_EXPIRED)  # Красный для убытка
     
-    def load_licenses(self, licenses: List):
+    def load_licenses(self, licenses: List, frame=None):
         """
         Загрузить лицензии в таблицу
         
         Args:
             licenses: Список лицензий (License объекты или словари)
+            frame: LicenseFrame этого списка (LicenseService.peek_license_frame) -
+                   значения колонок и фильтр по статусу берутся из него
         """
+        # Строки уже показаны пачками - просто принимаем итоговый список
+        if self._streaming:
+            self._streaming = False
+            if len(licenses) == len(self.licenses):
+                self.licenses = licenses
+                self._set_frame(licenses, frame)
+                self.filtered_licenses = self._filter_licenses(licenses)
+                return
+        
         # Очищаем таблицу
         self.tree.delete(*self.tree.get_children())
+        self._item_by_key.clear()
         
         # Сохраняем данные
         self.licenses = licenses
         self.filtered_licenses = licenses
+        self._set_frame(licenses, frame)
         
         # Применяем фильтры
         self._apply_filters()
     
+    def _set_frame(self, licenses: List, frame=None):
+        """Запомнить LicenseFrame списка и строки таблицы из него"""
+        if frame is not None and frame.records is not licenses:
+            frame = None
+        
+        self._frame = frame
+        if frame is None:
+            self._row_cache = {}
+        else:
+            self._row_cache = {id(license): row for license, row in zip(licenses, frame.table_rows())}
+    
+    def begin_stream(self):
+        """Начать потоковую загрузку - очистить таблицу"""
+        self.tree.delete(*self.tree.get_children())
+        self._item_by_key.clear()
+        self.licenses = []
+        self.filtered_licenses = []
+        self._set_frame(self.licenses)
+        self._streaming = True
+    
+    def append_licenses(self, batch: List):
+        """
+        Добавить пачку лицензий при потоковой загрузке
+        
+        Args:
+            batch: Лицензии пачки
+        """
+        self.licenses.extend(batch)
+        
+        filtered = self._filter_licenses(batch)
+        self.filtered_licenses.extend(filtered)
+        
+        for license in filtered:
+            self._insert_license(license)
+    
     def _apply_filters(self):
         """Применение фильтров и поиска"""
-        # Фильтруем данные
-        filtered = self.licenses
+        filtered = self._filter_licenses(self.licenses)
+        self.filtered_licenses = filtered
+        
+        # Очищаем и заполняем таблицу
+        self.tree.delete(*self.tree.get_children())
+        self._item_by_key.clear()
+        
+        for license in filtered:
+            self._insert_license(license)
+    
+    def _filter_licenses(self, licenses: List) -> List:
+        """Отфильтровать список по статусу и поисковому запросу"""
+        # Весь список - запросом к индексу вместо перебора строк
+        if licenses is self.licenses and (self.current_filter != 'Все' or self.search_query):
+            indexed = self._filter_indexed(licenses)
+            if indexed is not None:
+                return indexed
+        
+        filtered = licenses
         
         # Фильтр по статусу
-        if self.current_filter != 'Все':
+        if licenses is self.licenses and self._frame is not None and self.current_filter in self.STATUS_FILTERS:
+            # По столбцу статуса frame, без перебора строк
+            filtered = self._frame.with_status(self.STATUS_FILTERS[self.current_filter])
+        elif self.current_filter != 'Все':
             if self.current_filter == 'Активные':
                 filtered = [l for l in filtered if self._get_field(l, 'status') == 'active']
             elif self.current_filter == 'Истекшие':
@@ -228,16 +321,85 @@ class LicenseTable(ctk.CTkFrame):
             query = self.search_query.lower()
             filtered = [l for l in filtered if self._search_in_license(l, query)]
         
-        self.filtered_licenses = filtered
+        return list(filtered)
+    
+    def _filter_indexed(self, licenses: List):
+        """
+        Фильтр и поиск через search_provider
         
-        # Очищаем и заполняем таблицу
-        self.tree.delete(*self.tree.get_children())
+        Returns:
+            Optional[List]: Отфильтрованные лицензии или None (индекса нет
+                            или он построен по другому списку)
+        """
+        if self.search_provider is None:
+            return None
         
-        for license in filtered:
-            self._insert_license(license)
+        keys = self.search_provider(
+            self.search_query,
+            self.STATUS_FILTERS.get(self.current_filter),
+            len(licenses)
+        )
+        if keys is None:
+            return None
+        
+        # Словарь ключ -> лицензия пересобираем только при смене списка
+        if self._license_by_key_for is not licenses or len(self._license_by_key) != len(licenses):
+            self._license_by_key = {self._get_field(l, 'license_key'): l for l in licenses}
+            self._license_by_key_for = licenses
+        
+        by_key = self._license_by_key
+        return [by_key[key] for key in keys if key in by_key]
     
     def _insert_license(self, license):
         """Вставка лицензии в таблицу с оптимизированными полями"""
+        row = self._row_cache.get(id(license))
+        key, values, tag = row if row is not None else self._row_values(license)
+        
+        # Вставляем с тегом для стилизации
+        self._item_by_key[key] = self.tree.insert('', 'end', values=values, tags=(tag,))
+    
+    def patch_rows(self, licenses: List) -> int:
+        """
+        Перерисовать изменённые строки на месте, без перестроения таблицы
+        
+        Если строка из-за изменений попадает в фильтр или выпадает из него,
+        фильтры применяются заново.
+        
+        Args:
+            licenses: Изменённые лицензии (уже обновлённые в self.licenses)
+        
+        Returns:
+            int: Сколько строк перерисовано
+        """
+        if self._streaming:
+            return 0
+        
+        # Статусы и значения в frame устарели - дальше по строкам
+        self._frame = None
+        for license in licenses:
+            self._row_cache.pop(id(license), None)
+        
+        patched = 0
+        refilter = False
+        for license in licenses:
+            key = self._get_field(license, 'license_key', 'N/A')
+            item = self._item_by_key.get(key)
+            visible = bool(self._filter_licenses([license]))
+            
+            if (item is not None) != visible:
+                refilter = True
+                continue
+            if item is not None:
+                _, values, tag = self._row_values(license)
+                self.tree.item(item, values=values, tags=(tag,))
+                patched += 1
+        
+        if refilter:
+            self._apply_filters()
+        return patched
+    
+    def _row_values(self, license):
+        """Ключ, значения колонок и тег строки"""
         # Извлекаем ТОЛЬКО НУЖНЫЕ поля
         key = self._get_field(license, 'license_key', 'N/A')
         client_name = self._get_field(license, 'client_name', '-')
@@ -324,7 +486,7 @@ class LicenseTable(ctk.CTkFrame):
         # Определяем тег для строки
         tag = self._get_status_tag(status, days_left, profit_color_tag)
         
-        # Вставляем в таблицу ТОЛЬКО НУЖНЫЕ КОЛОНКИ
+        # ТОЛЬКО НУЖНЫЕ КОЛОНКИ
         values = (
             key,              # Ключ
             client_name,      # Клиент
@@ -340,8 +502,7 @@ class LicenseTable(ctk.CTkFrame):
             status_display    # Статус
         )
         
-        # Вставляем с тегом для стилизации
-        self.tree.insert('', 'end', values=values, tags=(tag,))
+        return key, values, tag
     
     def _get_field(self, obj, field_name, default='-'):
         """Безопасное получение поля из объекта или словаря"""
@@ -375,7 +536,7 @@ class LicenseTable(ctk.CTkFrame):
         # Если есть специальный тег для профита, используем его
         if profit_tag:
             return profit_tag
-            
+        
         if status == 'blocked':
             return 'blocked'
         elif status == 'expired':
@@ -391,8 +552,8 @@ class LicenseTable(ctk.CTkFrame):
     def _search_in_license(self, license, query):
         """Поиск в лицензии по оптимизированным полям"""
         searchable_fields = [
-            'license_key', 'client_name', 'account_number',
-            'broker_name', 'robot_name', 'robot_version'
+            'license_key', 'client_name', 'client_contact', 'client_telegram',
+            'account_number', 'broker_name', 'robot_name', 'notes'
         ]
         
         for field in searchable_fields:
@@ -437,6 +598,11 @@ class LicenseTable(ctk.CTkFrame):
     
     def _on_right_click(self, event):
         """Обработка правого клика"""
+        # Клик вне выделения - выделяем строку под курсором
+        item = self.tree.identify_row(event.y)
+        if item and item not in self.tree.selection():
+            self.tree.selection_set(item)
+        
         if self.callbacks['context_menu']:
             license = self.get_selected_license()
             if license:
@@ -465,6 +631,13 @@ class LicenseTable(ctk.CTkFrame):
                         return lic
         return None
     
+    def get_selected_licenses(self) -> List:
+        """Получить все выделенные лицензии (в порядке таблицы)"""
+        keys = {self.tree.item(item)['values'][0] for item in self.tree.selection()
+                if self.tree.item(item)['values']}
+        return [lic for lic in self.filtered_licenses
+                if self._get_field(lic, 'license_key') in keys]
+    
     def set_filter(self, filter_type: str):
         """Установить фильтр"""
         self.current_filter = filter_type
@@ -482,8 +655,10 @@ class LicenseTable(ctk.CTkFrame):
     def clear(self):
         """Очистить таблицу"""
         self.tree.delete(*self.tree.get_children())
+        self._item_by_key.clear()
         self.licenses = []
         self.filtered_licenses = []
+        self._set_frame(self.licenses)
     
     def update_licenses(self, licenses: List):
         """Обновить лицензии (алиас для load_licenses)"""
@@ -513,15 +688,30 @@ class LicenseTable(ctk.CTkFrame):
         # Обновляем в списке
         for i, lic in enumerate(self.licenses):
             if self._get_field(lic, 'license_key') == key:
+                self._row_cache.pop(id(lic), None)
                 self.licenses[i] = updated_license
                 break
         
+        # frame построен по прежней строке
+        self._frame = None
+        self._row_cache.pop(id(updated_license), None)
+        
         # Перезагружаем отображение
         self._apply_filters()
     
     def get_statistics(self) -> Dict:
         """Получить статистику по лицензиям"""
         total = len(self.licenses)
+        if self._frame is not None:
+            counts = self._frame.counts()
+            return {
+                'total': total,
+                **counts,
+                'balance': self._frame.total('last_balance'),
+                'equity': self._frame.total('last_equity'),
+                'profit': self._frame.total('last_profit')
+            }
+        
         active = len([l for l in self.licenses if self._get_field(l, 'status') == 'active'])
         expired = len([l for l in self.licenses if self._get_field(l, 'status') == 'expired'])
         blocked = len([l for l in self.licenses if self._get_field(l, 'status') == 'blocked'])
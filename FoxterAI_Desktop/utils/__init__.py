@@ -5,6 +5,7 @@
 
 from .formatters import *
 from .validators import *
+from .lru_cache import BoundedLRU
 
 __all__ = [
     # Форматтеры
@@ -20,5 +21,8 @@ __all__ = [
     'validate_phone',
     'validate_telegram',
     'validate_email',
-    'validate_api_key'
+    'validate_api_key',
+    
+    # Кэши
+    'BoundedLRU'
 ]
\ No newline at end of file
@@ -0,0 +1,84 @@
+"""
+Ограниченный кэш с вытеснением давно не использованных записей (LRU)
+Общий для кэшей разбора дат и исправления кодировки
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+
+class BoundedLRU:
+    """
+    Потокобезопасный словарь ограниченного размера
+    
+    При переполнении вытесняется запись, к которой дольше всего не
+    обращались: часто встречающиеся значения остаются в кэше, даже
+    когда через него проходит поток уникальных строк.
+    """
+    
+    def __init__(self, max_size: int):
+        """
+        Инициализация кэша
+        
+        Args:
+            max_size: Максимум записей
+        """
+        self.max_size = max(1, int(max_size))
+        self._entries: 'OrderedDict[Hashable, Any]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'evictions': 0}
+    
+    def lookup(self, key: Hashable) -> Tuple[bool, Any]:
+        """
+        Найти запись
+        
+        Returns:
+            tuple: (найдено, значение) - значение может быть и None
+        """
+        with self._lock:
+            try:
+                value = self._entries[key]
+            except KeyError:
+                self._stats['misses'] += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self._stats['hits'] += 1
+            return True, value
+    
+    def put(self, key: Hashable, value: Any):
+        """Запомнить значение (вытесняя давно не использованные записи)"""
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self._stats['evictions'] += 1
+    
+    def get_or_compute(self, key: Hashable, compute: Callable[[Hashable], Any]) -> Any:
+        """
+        Значение из кэша или compute(key) с запоминанием
+        
+        compute выполняется вне блокировки: два потока могут посчитать
+        одно значение дважды, но не ждут друг друга.
+        """
+        found, value = self.lookup(key)
+        if found:
+            return value
+        value = compute(key)
+        self.put(key, value)
+        return value
+    
+    def clear(self):
+        """Очистить кэш и счётчики"""
+        with self._lock:
+            self._entries.clear()
+            self._stats = {'hits': 0, 'misses': 0, 'evictions': 0}
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def stats(self) -> Dict[str, int]:
+        """Попадания, промахи, вытеснения и размер"""
+        with self._lock:
+            return dict(self._stats, size=len(self._entries), max_size=self.max_size)
\ No newline at end of file
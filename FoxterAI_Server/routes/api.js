@@ -10,6 +10,7 @@ const db = require('../database/connection');
 const authMiddleware = require('../middleware/auth');
 const { asyncHandler } = require('../middleware/errorHandler');
 const eventLogger = require('../services/eventLogger');
+const licenseEvents = require('../services/licenseEvents');
 const logger = require('../utils/logger');
 const config = require('../config/config');
 
@@ -317,6 +318,7 @@ router.post('/batch-update', authMiddleware, asyncHandler(async (req, res) => {
         );
         if (result.changes > 0) {
             updated++;
+            licenseEvents.publishLicense(key, { status });
         }
     }
     
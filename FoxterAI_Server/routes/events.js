@@ -0,0 +1,64 @@
+/**
+ * FoxterAI_Server/routes/events.js
+ * Поток изменений лицензий для десктопа (Server-Sent Events)
+ */
+
+const express = require('express');
+const router = express.Router();
+const authMiddleware = require('../middleware/auth');
+const licenseEvents = require('../services/licenseEvents');
+const logger = require('../utils/logger');
+
+// Пауза переподключения для клиента, мс
+const RETRY_MS = 3000;
+
+// Пинг открытого соединения, мс (меньше таймаута чтения клиента)
+const HEARTBEAT_MS = 15000;
+
+function formatEvent(event) {
+    return `id: ${event.id}\nevent: ${event.name}\ndata: ${event.data}\n\n`;
+}
+
+/**
+ * GET /api/events/stream
+ * События лицензий в формате text/event-stream
+ * С заголовком Last-Event-ID досылает пропущенное; если столько уже
+ * не хранится - шлёт resync
+ */
+router.get('/stream', authMiddleware, (req, res) => {
+    res.writeHead(200, {
+        'Content-Type': 'text/event-stream; charset=utf-8',
+        'Cache-Control': 'no-cache',
+        'Connection': 'keep-alive',
+        'X-Accel-Buffering': 'no'
+    });
+    req.socket.setTimeout(0);
+    req.socket.setNoDelay(true);
+    
+    res.write(`retry: ${RETRY_MS}\n\n`);
+    
+    const lastId = parseInt(req.headers['last-event-id'], 10);
+    if (!Number.isNaN(lastId)) {
+        const missed = licenseEvents.since(lastId);
+        if (missed === null) {
+            res.write(`id: ${licenseEvents.seq}\nevent: resync\ndata: {}\n\n`);
+        } else if (missed.length > 0) {
+            res.write(missed.map(formatEvent).join(''));
+        }
+    }
+    
+    const onEvent = event => res.write(formatEvent(event));
+    licenseEvents.on('event', onEvent);
+    
+    const heartbeat = setInterval(() => res.write(': ping\n\n'), HEARTBEAT_MS);
+    
+    logger.info(`Открыт поток событий с IP ${req.ip}`);
+    
+    req.on('close', () => {
+        clearInterval(heartbeat);
+        licenseEvents.off('event', onEvent);
+        logger.info(`Закрыт поток событий с IP ${req.ip}`);
+    });
+});
+
+module.exports = router;
\ No newline at end of file
@@ -14,6 +14,31 @@ const logger = require('../utils/logger');
 // Все маршруты требуют авторизации
 router.use(authMiddleware);
 
+// Колоночный формат списка: имена полей один раз, строки - массивами
+const COLUMNS_MEDIA_TYPE = 'application/vnd.foxterai.columns+json';
+
+function toColumns(licenses, extra = {}) {
+    const fields = [];
+    const known = new Set();
+    for (const license of licenses) {
+        for (const name of Object.keys(license)) {
+            if (!known.has(name)) {
+                known.add(name);
+                fields.push(name);
+            }
+        }
+    }
+    
+    return {
+        success: true,
+        count: licenses.length,
+        ...extra,
+        format: 'columns',
+        fields: fields,
+        rows: licenses.map(license => fields.map(name => license[name] === undefined ? null : license[name]))
+    };
+}
+
 // GET /api/licenses - получить все лицензии
 router.get('/', asyncHandler(async (req, res) => {
     const filters = {
@@ -21,14 +46,29 @@ router.get('/', asyncHandler(async (req, res) => {
         robot_name: req.query.robot_name
     };
     
+    // Постраничная выдача: ?limit=50&offset=100
+    const limit = Math.min(parseInt(req.query.limit, 10) || 0, 1000);
+    const offset = Math.max(parseInt(req.query.offset, 10) || 0, 0);
+    
     try {
-        const licenses = await licenseService.getAll(filters);
+        const licenses = await licenseService.getAll(filters, { limit, offset });
+        const paging = limit > 0
+            ? { total: await licenseService.count(filters), limit, offset }
+            : {};
+        
+        // Компактный колоночный формат, если десктоп его запросил
+        res.vary('Accept');
+        if (req.accepts(['application/json', COLUMNS_MEDIA_TYPE]) === COLUMNS_MEDIA_TYPE) {
+            res.type(COLUMNS_MEDIA_TYPE);
+            return res.send(JSON.stringify(toColumns(licenses || [], paging)));
+        }
         
         // ИСПРАВЛЕНО: Всегда возвращаем в правильном формате
         res.json({
             success: true,
             licenses: licenses || [],
-            count: licenses ? licenses.length : 0
+            count: licenses ? licenses.length : 0,
+            ...paging
         });
     } catch (error) {
         logger.error('Ошибка получения лицензий:', error);
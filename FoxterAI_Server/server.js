@@ -191,9 +191,12 @@ try {
     const statisticsRoutes = require('./routes/statistics');
     const adminRoutes = require('./routes/admin');
     
+    const eventsRoutes = require('./routes/events');
+    
     app.use('/api/licenses', licensesRoutes);
     app.use('/api/statistics', statisticsRoutes);
     app.use('/api/admin', adminRoutes);
+    app.use('/api/events', eventsRoutes); // поток изменений для десктопа
     
     // Дополнительные API маршруты
     const apiRoutes = require('./routes/api');
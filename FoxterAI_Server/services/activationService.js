@@ -8,6 +8,7 @@ const crypto = require('crypto');
 const db = require('../database/connection');
 const logger = require('../utils/logger');
 const eventLogger = require('./eventLogger');
+const licenseEvents = require('./licenseEvents');
 const config = require('../config/config');
 
 class ActivationService {
@@ -183,6 +184,11 @@ class ActivationService {
                     balance,
                     key
                 ]);
+                licenseEvents.publishRow(key, [
+                    'robot_name', 'robot_version', 'account_number', 'account_owner',
+                    'account_type', 'broker_name', 'activation_date', 'expiry_date', 'status',
+                    'terminal_version', 'os_info', 'last_balance', 'last_check', 'check_count'
+                ]);
                 
                 await eventLogger.log('LICENSE_ACTIVATED', maskedKey, robot_name, license.client_name,
                     `Универсальная лицензия активирована и зафиксирована за счетом ${maskedAccount}`, 'normal', { 
@@ -254,6 +260,10 @@ class ActivationService {
                 WHERE license_key = ?
             `, [ip, balance, terminal_version || null, os_info || null, 
                 account_owner || null, broker || null, account_type || null, key]);
+            licenseEvents.publishRow(key, [
+                'last_check', 'last_ip', 'check_count', 'last_balance', 'terminal_version',
+                'os_info', 'account_owner', 'broker_name', 'account_type'
+            ]);
             
             // Вычисляем дни до истечения
             let daysLeft = null;
@@ -334,6 +344,7 @@ class ActivationService {
                     "UPDATE licenses SET status = 'expired' WHERE license_key = ?",
                     [key]
                 );
+                licenseEvents.publishLicense(key, { status: 'expired' });
                 
                 return {
                     success: false,
@@ -372,6 +383,7 @@ class ActivationService {
                     failed_checks = 0
                 WHERE license_key = ?
             `, [ip, balance, key]);
+            licenseEvents.publishRow(key, ['last_check', 'last_ip', 'check_count', 'last_balance']);
             
             // Логируем успешную проверку
             await db.run(`
@@ -423,6 +435,9 @@ class ActivationService {
                     last_profit = ?
                 WHERE license_key = ?
             `, [ip, balance, equity, profit, key]);
+            licenseEvents.publishRow(key, [
+                'last_check', 'last_ip', 'heartbeat_count', 'last_balance', 'last_equity', 'last_profit'
+            ]);
             
             return { success: true };
             
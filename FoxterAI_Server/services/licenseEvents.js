@@ -0,0 +1,96 @@
+/**
+ * FoxterAI_Server/services/licenseEvents.js
+ * Журнал изменений лицензий для потока событий десктопа (Server-Sent Events)
+ */
+
+const EventEmitter = require('events');
+const db = require('../database/connection');
+const logger = require('../utils/logger');
+
+// Сколько последних событий хранить для досылки по Last-Event-ID
+const BACKLOG_SIZE = 10000;
+
+class LicenseEvents extends EventEmitter {
+    
+    constructor() {
+        super();
+        this.setMaxListeners(0);
+        this.seq = 0;
+        this.backlog = [];
+    }
+    
+    // Есть ли открытые потоки событий
+    hasSubscribers() {
+        return this.listenerCount('event') > 0;
+    }
+    
+    // Опубликовать событие для всех подписчиков
+    publish(name, payload) {
+        this.seq += 1;
+        
+        if (!this.hasSubscribers()) {
+            // Никто не слушает - журнал не ведём; переподключившийся
+            // клиент с устаревшим Last-Event-ID получит resync
+            this.backlog = [];
+            return this.seq;
+        }
+        
+        const event = { id: this.seq, name, data: JSON.stringify(payload) };
+        this.backlog.push(event);
+        if (this.backlog.length > BACKLOG_SIZE) {
+            this.backlog.splice(0, this.backlog.length - BACKLOG_SIZE);
+        }
+        
+        this.emit('event', event);
+        return this.seq;
+    }
+    
+    // Изменённые поля лицензии
+    publishLicense(licenseKey, fields) {
+        return this.publish('license', { ...fields, license_key: licenseKey });
+    }
+    
+    // Перечитать поля из базы и опубликовать (для UPDATE с выражениями SQL)
+    async publishRow(licenseKey, columns) {
+        if (!this.hasSubscribers()) {
+            // Читать нечего - только сдвигаем номер (см. publish)
+            this.publishLicense(licenseKey, {});
+            return;
+        }
+        
+        try {
+            const row = await db.get(
+                `SELECT ${columns.join(', ')} FROM licenses WHERE license_key = ?`,
+                [licenseKey]
+            );
+            if (row) {
+                this.publishLicense(licenseKey, row);
+            }
+        } catch (error) {
+            logger.error('Не удалось опубликовать изменение лицензии:', error);
+        }
+    }
+    
+    // Клиенту нужна полная сверка (удаление, потеря событий)
+    publishResync() {
+        return this.publish('resync', {});
+    }
+    
+    /**
+     * События после lastId
+     * Возвращает null, если часть уже не хранится
+     */
+    since(lastId) {
+        if (lastId >= this.seq) {
+            return [];
+        }
+        
+        const oldest = this.backlog.length > 0 ? this.backlog[0].id : this.seq + 1;
+        if (lastId < oldest - 1) {
+            return null;
+        }
+        return this.backlog.filter(event => event.id > lastId);
+    }
+}
+
+module.exports = new LicenseEvents();
\ No newline at end of file
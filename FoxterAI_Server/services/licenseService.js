@@ -7,6 +7,7 @@ const crypto = require('crypto');
 const db = require('../database/connection');
 const logger = require('../utils/logger');
 const eventLogger = require('./eventLogger');
+const licenseEvents = require('./licenseEvents');
 
 class LicenseService {
     
@@ -43,6 +44,7 @@ class LicenseService {
                  VALUES (?, ?, ?, ?, ?, ?, ?)`,
                 [license_key, client_name, client_contact, client_telegram, robotToSave, months, notes]
             );
+            licenseEvents.publishResync();
             
             // Логируем событие
             const licenseType = universal ? 'универсальная' : `для робота ${robot_name}`;
@@ -73,23 +75,43 @@ class LicenseService {
         }
     }
     
-    // Получение всех лицензий
-    async getAll(filters = {}) {
-        let query = 'SELECT * FROM licenses WHERE 1=1';
+    // Условия WHERE для списка лицензий
+    buildFilters(filters = {}) {
+        let where = ' WHERE 1=1';
         const params = [];
         
-        // Фильтры
         if (filters.status) {
-            query += ' AND status = ?';
+            where += ' AND status = ?';
             params.push(filters.status);
         }
         
         if (filters.robot_name) {
-            query += ' AND robot_name = ?';
+            where += ' AND robot_name = ?';
             params.push(filters.robot_name);
         }
         
-        query += ' ORDER BY created_date DESC';
+        return { where, params };
+    }
+    
+    // Количество лицензий по фильтрам
+    async count(filters = {}) {
+        const { where, params } = this.buildFilters(filters);
+        const row = await db.get(`SELECT COUNT(*) as total FROM licenses${where}`, params);
+        return row ? row.total : 0;
+    }
+    
+    // Получение всех лицензий (или одной страницы, если задан paging.limit)
+    async getAll(filters = {}, paging = {}) {
+        const { where, params } = this.buildFilters(filters);
+        let query = `SELECT * FROM licenses${where}`;
+        
+        // id - второй ключ, чтобы порядок страниц был стабильным
+        query += ' ORDER BY created_date DESC, id DESC';
+        
+        if (paging.limit) {
+            query += ' LIMIT ? OFFSET ?';
+            params.push(paging.limit, paging.offset || 0);
+        }
         
         try {
             const licenses = await db.all(query, params);
@@ -145,6 +167,7 @@ class LicenseService {
         
         try {
             await db.run(query, values);
+            licenseEvents.publishRow(licenseKey, allowedFields.filter(field => updates[field] !== undefined));
             logger.info(`Обновлена лицензия ${licenseKey.substring(0, 12)}...`);
             return { success: true };
         } catch (error) {
@@ -162,6 +185,7 @@ class LicenseService {
                 'UPDATE licenses SET status = ? WHERE license_key = ?',
                 [newStatus, licenseKey]
             );
+            licenseEvents.publishLicense(licenseKey, { status: newStatus });
             
             logger.info(`Лицензия ${licenseKey.substring(0, 12)}... ${blocked ? 'заблокирована' : 'разблокирована'}`);
             return { success: true };
@@ -175,6 +199,7 @@ class LicenseService {
     async delete(licenseKey) {
         try {
             await db.run('DELETE FROM licenses WHERE license_key = ?', [licenseKey]);
+            licenseEvents.publishResync();
             logger.info(`Удалена лицензия ${licenseKey.substring(0, 12)}...`);
             return { success: true };
         } catch (error) {
@@ -204,6 +229,7 @@ class LicenseService {
                 'UPDATE licenses SET expiry_date = ? WHERE license_key = ?',
                 [newExpiry.toISOString(), licenseKey]
             );
+            licenseEvents.publishLicense(licenseKey, { expiry_date: newExpiry.toISOString() });
             
             logger.info(`Продлена лицензия ${licenseKey.substring(0, 12)}... на ${months} месяцев`);
             return { success: true, new_expiry: newExpiry };